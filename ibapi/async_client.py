@@ -0,0 +1,544 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+asyncio flavour of the EClient.
+There is no EReader thread and no Queue: the socket is driven by the event
+loop through an asyncio protocol which frames the incoming data with the
+comm.RecvBuffer and hands the messages straight to the Decoder.
+The requests answering with a finite list (eg: reqContractDetails,
+reqHistoricalData) are coroutines returning that list and the subscriptions
+(eg: reqMktData, reqTickByTickData) return a Subscription to be iterated
+with 'async for'. All the answers still reach the wrapper, if one is given.
+"""
+
+import asyncio
+import logging
+
+from ibapi import columnar, comm, decoder
+from ibapi.client import EClient
+from ibapi.common import TickerId, TagValueList
+from ibapi.const import NO_VALID_ID
+from ibapi.contract import Contract, ContractDetails
+from ibapi.errors import CONNECT_FAIL, NOT_CONNECTED
+from ibapi.object_implem import Object
+from ibapi.server_versions import MIN_CLIENT_VER, MAX_CLIENT_VER, ServerCapabilities
+from ibapi.utils import BadMessage
+from ibapi.wrapper import EWrapper, overriddenCallbacks
+
+logger = logging.getLogger(__name__)
+
+
+def isWarning(errorCode: int) -> bool:
+    """the 21xx codes are informational, they do not end a request"""
+    return 2100 <= errorCode < 2200
+
+
+class RequestError(Exception):
+    def __init__(self, reqId, code, msg, advancedOrderRejectJson=""):
+        super().__init__(reqId, code, msg)
+        self.reqId = reqId
+        self.code = code
+        self.msg = msg
+        self.advancedOrderRejectJson = advancedOrderRejectJson
+
+
+class Answer(Object):
+    """One wrapper callback of a subscription, eg: name='tickPrice' and
+    args=(tickType, price, attrib); the reqId is left out."""
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __str__(self):
+        return f"{self.name}{self.args}"
+
+
+class Subscription(Object):
+    """Async iterator over the Answers of a streaming request. It ends when
+    the subscription is cancelled, the snapshot is complete or the
+    connection is lost."""
+
+    _END = object()
+
+    def __init__(self, client, reqId, cancelMeth):
+        self.client = client
+        self.reqId = reqId
+        self.cancelMeth = cancelMeth
+        self.answers = asyncio.Queue()
+        self.done = False
+        self.exc = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        answer = await self.answers.get()
+        if answer is Subscription._END:
+            # let any other consumer see the end as well
+            self.answers.put_nowait(answer)
+            if self.exc is not None:
+                raise self.exc
+            raise StopAsyncIteration
+        return answer
+
+    def publish(self, name, args):
+        if not self.done:
+            self.answers.put_nowait(Answer(name, args))
+
+    def finish(self):
+        if not self.done:
+            self.done = True
+            self.answers.put_nowait(Subscription._END)
+
+    def fail(self, exc):
+        """cancels the subscription, exc is raised to the consumers once
+        they have seen the answers already received"""
+        if not self.done:
+            self.exc = exc
+            self.cancel()
+
+    def cancel(self):
+        """cancels the subscription on the TWS side and ends the iteration"""
+        if not self.done:
+            if self.client.isConnected():
+                self.cancelMeth(self.client, self.reqId)
+            self.client.endRequest(self.reqId)
+
+    def __str__(self):
+        return f"Subscription ReqId: {self.reqId}, Done: {self.done}"
+
+
+class PendingRequest(Object):
+    """Collects the answers of a request until its end message, the items
+    are a NumPy array instead of a list when the answer is delivered as one
+    (see columnar.ARRAY_CALLBACKS)."""
+
+    def __init__(self, loop):
+        self.future = loop.create_future()
+        self.items = []
+
+    def publish(self, name, args):
+        if name in columnar.ARRAY_CALLBACKS:
+            self.items = args[0]
+        else:
+            self.items.append(args[0])
+
+    def finish(self):
+        if not self.future.done():
+            self.future.set_result(self.items)
+
+    def fail(self, exc):
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+class AsyncWrapper(object):
+    """Routes the answers to the pending requests and subscriptions of the
+    AsyncEClient, then forwards every callback to the user's wrapper."""
+
+    def __init__(self, client, wrapper):
+        self.client = client
+        self.wrapper = wrapper
+
+    def __getattr__(self, name):
+        return getattr(self.wrapper, name)
+
+    def overriddenCallbacks(self):
+        """the routed callbacks plus the ones of the user's wrapper, see
+        wrapper.overriddenCallbacks()"""
+        callbacks = overriddenCallbacks(self.wrapper)
+        if callbacks is None:
+            return None
+        # the array callbacks are opted in by the user's wrapper only
+        return callbacks | frozenset(
+            name
+            for name in vars(AsyncWrapper)
+            if hasattr(EWrapper, name) and name not in columnar.ARRAY_CALLBACKS
+        )
+
+    def error(
+        self,
+        reqId: TickerId,
+        errorCode: int,
+        errorString: str,
+        advancedOrderRejectJson="",
+    ):
+        self.client.requestError(reqId, errorCode, errorString, advancedOrderRejectJson)
+        self.wrapper.error(reqId, errorCode, errorString, advancedOrderRejectJson)
+
+    def contractDetails(self, reqId: int, contractDetails: ContractDetails):
+        self.client.publish(reqId, "contractDetails", (contractDetails,))
+        self.wrapper.contractDetails(reqId, contractDetails)
+
+    def bondContractDetails(self, reqId: int, contractDetails: ContractDetails):
+        self.client.publish(reqId, "bondContractDetails", (contractDetails,))
+        self.wrapper.bondContractDetails(reqId, contractDetails)
+
+    def contractDetailsEnd(self, reqId: int):
+        self.client.endRequest(reqId)
+        self.wrapper.contractDetailsEnd(reqId)
+
+    def historicalData(self, reqId: int, bar):
+        self.client.publish(reqId, "historicalData", (bar,))
+        self.wrapper.historicalData(reqId, bar)
+
+    def historicalDataArray(self, reqId: int, bars):
+        self.client.publish(reqId, "historicalDataArray", (bars,))
+        self.wrapper.historicalDataArray(reqId, bars)
+
+    def historicalDataEnd(self, reqId: int, start: str, end: str):
+        self.client.endRequest(reqId)
+        self.wrapper.historicalDataEnd(reqId, start, end)
+
+    def tickPrice(self, reqId, tickType, price, attrib):
+        self.client.publish(reqId, "tickPrice", (tickType, price, attrib))
+        self.wrapper.tickPrice(reqId, tickType, price, attrib)
+
+    def tickSize(self, reqId, tickType, size):
+        self.client.publish(reqId, "tickSize", (tickType, size))
+        self.wrapper.tickSize(reqId, tickType, size)
+
+    def tickGeneric(self, reqId, tickType, value):
+        self.client.publish(reqId, "tickGeneric", (tickType, value))
+        self.wrapper.tickGeneric(reqId, tickType, value)
+
+    def tickString(self, reqId, tickType, value):
+        self.client.publish(reqId, "tickString", (tickType, value))
+        self.wrapper.tickString(reqId, tickType, value)
+
+    def tickEFP(self, reqId, *args):
+        self.client.publish(reqId, "tickEFP", args)
+        self.wrapper.tickEFP(reqId, *args)
+
+    def tickOptionComputation(self, reqId, *args):
+        self.client.publish(reqId, "tickOptionComputation", args)
+        self.wrapper.tickOptionComputation(reqId, *args)
+
+    def tickReqParams(self, reqId, *args):
+        self.client.publish(reqId, "tickReqParams", args)
+        self.wrapper.tickReqParams(reqId, *args)
+
+    def tickSnapshotEnd(self, reqId: int):
+        self.client.endRequest(reqId)
+        self.wrapper.tickSnapshotEnd(reqId)
+
+    def tickByTickAllLast(self, reqId, *args):
+        self.client.publish(reqId, "tickByTickAllLast", args)
+        self.wrapper.tickByTickAllLast(reqId, *args)
+
+    def tickByTickBidAsk(self, reqId, *args):
+        self.client.publish(reqId, "tickByTickBidAsk", args)
+        self.wrapper.tickByTickBidAsk(reqId, *args)
+
+    def tickByTickMidPoint(self, reqId, *args):
+        self.client.publish(reqId, "tickByTickMidPoint", args)
+        self.wrapper.tickByTickMidPoint(reqId, *args)
+
+
+class AsyncConnection(asyncio.BufferedProtocol):
+    """The asyncio counterpart of Connection + EReader: the event loop reads
+    straight into a comm.RecvBuffer and every complete message is passed to
+    the client."""
+
+    def __init__(self, client, recvBufSize):
+        self.client = client
+        self.buf = comm.RecvBuffer(recvBufSize)
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def get_buffer(self, sizehint):
+        return self.buf.writable()
+
+    def buffer_updated(self, nbytes):
+        self.buf.commit(nbytes)
+        for msg in self.buf.frames():
+            self.client.processMsg(msg)
+
+    def connection_lost(self, exc):
+        logger.debug("connection lost %s", exc)
+        self.transport = None
+        self.client.connectionLost()
+
+    def isConnected(self):
+        return self.transport is not None and not self.transport.is_closing()
+
+    def sendMsg(self, msg):
+        if not self.isConnected():
+            logger.debug("sendMsg attempted while not connected")
+            return 0
+        self.transport.write(msg)
+        return len(msg)
+
+    def disconnect(self):
+        if self.transport is not None:
+            self.transport.close()
+
+
+class AsyncEClient(EClient):
+    """EClient driven by an asyncio event loop, see the module doc.
+
+    client = AsyncEClient()
+    await client.connect("127.0.0.1", 7497, clientId=1)
+    details = await client.reqContractDetails(1, contract)
+    async for answer in client.reqMktData(2, contract, "", False, False, []):
+        ...
+    """
+
+    def __init__(self, wrapper=None):
+        EClient.__init__(self, AsyncWrapper(self, wrapper or EWrapper()))
+        self.requests = {}
+        self.routedReqId = None  # of the last answer routed, see processMsg()
+        self.handshake = None
+        self.closed = None
+
+    def reset(self):
+        EClient.reset(self)
+        self.asynchronous = True
+
+    async def connect(self, host, port, clientId):
+        """Coroutine counterpart of EClient.connect(), returns once the
+        handshake with TWS/IBGW is done and startApi was sent."""
+
+        loop = asyncio.get_running_loop()
+
+        self.host = host
+        self.port = port
+        self.clientId = clientId
+        logger.debug("Connecting to %s:%d w/ id:%d", self.host, self.port, self.clientId)
+
+        try:
+            (_, self.conn) = await loop.create_connection(
+                lambda: AsyncConnection(self, self.connectionOptions.recvBufSize),
+                host,
+                port,
+            )
+        except OSError:
+            self.wrapper.error(NO_VALID_ID, CONNECT_FAIL.code(), CONNECT_FAIL.msg())
+            logger.info("could not connect")
+            self.reset()
+            return
+
+        self.setConnState(EClient.CONNECTING)
+        self.handshake = loop.create_future()
+        self.closed = loop.create_future()
+
+        v100prefix = "API\0"
+        v100version = "v%d..%d" % (MIN_CLIENT_VER, MAX_CLIENT_VER)
+        if self.connectOptions:
+            v100version = v100version + " " + self.connectOptions
+        msg = str.encode(v100prefix, "ascii") + comm.make_msg(v100version)
+        logger.debug("REQUEST %s", msg)
+        self.conn.sendMsg(msg)
+
+        self.decoder = decoder.Decoder(
+            self.wrapper,
+            self.serverVersion(),
+            self.numericMode,
+            allowMsgIds=self.allowMsgIds,
+            denyMsgIds=self.denyMsgIds,
+            maskUnhandled=self.maskUnhandled,
+        )
+
+        try:
+            (server_version, conn_time) = await self.handshake
+        except ConnectionError:
+            logger.warning("Disconnected; resetting connection")
+            self.reset()
+            return
+
+        self.connTime = conn_time
+        self.serverVersion_ = int(server_version)
+        self.serverCaps = ServerCapabilities(self.serverVersion_)
+        self.decoder.serverVersion = self.serverVersion()
+        # only now, the handshake answer has no msgId
+        self.conn.buf.setIgnoredMsgIds(self.decoder.ignoredMsgIds)
+        logger.debug("ANSWER Version:%d time:%s", self.serverVersion_, conn_time)
+
+        self.setConnState(EClient.CONNECTED)
+        self.startApi()
+        self.wrapper.connectAck()
+
+    async def run(self):
+        """There is no message loop to run, the event loop dispatches the
+        answers; this waits until the connection is closed."""
+        if self.closed is not None:
+            await asyncio.shield(self.closed)
+
+    def processMsg(self, msg):
+        fields = comm.read_fields(msg)
+        logger.debug("fields %s", fields)
+
+        if self.serverVersion_ is None and len(fields) == 2:
+            self.handshake.set_result(fields)
+            return
+
+        self.routedReqId = None
+        try:
+            self.decoder.interpret(fields)
+        except BadMessage:
+            logger.info("BadMessage")
+        except Exception as exc:
+            # most likely raised by a callback of the user's wrapper, the
+            # request it answers, if still pending, fails with it
+            logger.exception("unhandled exception while decoding %s", fields)
+            request = self.requests.get(self.routedReqId, None)
+            if request is not None:
+                request.fail(exc)
+                self.requests.pop(self.routedReqId, None)
+
+    def connectionLost(self):
+        if self.handshake is not None and not self.handshake.done():
+            self.handshake.set_exception(ConnectionError("closed during handshake"))
+
+        for request in list(self.requests.values()):
+            if isinstance(request, PendingRequest):
+                request.fail(ConnectionError("connection lost"))
+            else:
+                request.finish()
+        self.requests.clear()
+
+        if self.closed is not None and not self.closed.done():
+            self.closed.set_result(None)
+
+        if self.connState != EClient.DISCONNECTED:
+            self.disconnect()
+
+    ##########################################################################
+    # routing of the answers
+    ##########################################################################
+
+    def publish(self, reqId, name, args):
+        self.routedReqId = reqId
+        request = self.requests.get(reqId, None)
+        if request is not None:
+            request.publish(name, args)
+
+    def endRequest(self, reqId):
+        request = self.requests.pop(reqId, None)
+        if request is not None:
+            request.finish()
+
+    def requestError(self, reqId, errorCode, errorString, advancedOrderRejectJson):
+        self.routedReqId = reqId
+        request = self.requests.get(reqId, None)
+        if request is None:
+            return
+        if isinstance(request, Subscription):
+            request.publish("error", (errorCode, errorString, advancedOrderRejectJson))
+        elif not isWarning(errorCode):
+            del self.requests[reqId]
+            request.fail(
+                RequestError(reqId, errorCode, errorString, advancedOrderRejectJson)
+            )
+
+    def startRequest(self, reqId):
+        if not self.isConnected():
+            raise RequestError(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
+        request = PendingRequest(asyncio.get_running_loop())
+        self.requests[reqId] = request
+        return request
+
+    def startSubscription(self, reqId, cancelMeth):
+        if not self.isConnected():
+            raise RequestError(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
+        subscription = Subscription(self, reqId, cancelMeth)
+        self.requests[reqId] = subscription
+        return subscription
+
+    ##########################################################################
+    # awaitable requests
+    ##########################################################################
+
+    async def reqContractDetails(self, reqId: int, contract: Contract):
+        """Returns the list of ContractDetails, see EClient.reqContractDetails()."""
+        request = self.startRequest(reqId)
+        EClient.reqContractDetails(self, reqId, contract)
+        return await request.future
+
+    async def reqHistoricalData(
+        self,
+        reqId: TickerId,
+        contract: Contract,
+        endDateTime: str,
+        durationStr: str,
+        barSizeSetting: str,
+        whatToShow: str,
+        useRTH: int,
+        formatDate: int,
+        keepUpToDate: bool,
+        chartOptions: TagValueList,
+    ):
+        """Returns the list of BarData, see EClient.reqHistoricalData(), or
+        the columnar.BAR_DTYPE array when the wrapper overrides
+        historicalDataArray(). With keepUpToDate the updates only go to
+        wrapper.historicalDataUpdate()."""
+        request = self.startRequest(reqId)
+        EClient.reqHistoricalData(
+            self,
+            reqId,
+            contract,
+            endDateTime,
+            durationStr,
+            barSizeSetting,
+            whatToShow,
+            useRTH,
+            formatDate,
+            keepUpToDate,
+            chartOptions,
+        )
+        return await request.future
+
+    ##########################################################################
+    # subscriptions
+    ##########################################################################
+
+    def reqMktData(
+        self,
+        reqId: TickerId,
+        contract: Contract,
+        genericTickList: str,
+        snapshot: bool,
+        regulatorySnapshot: bool,
+        mktDataOptions: TagValueList,
+    ) -> Subscription:
+        """Returns a Subscription yielding the tick* Answers, see
+        EClient.reqMktData(). A snapshot ends with tickSnapshotEnd."""
+        subscription = self.startSubscription(reqId, EClient.cancelMktData)
+        EClient.reqMktData(
+            self,
+            reqId,
+            contract,
+            genericTickList,
+            snapshot,
+            regulatorySnapshot,
+            mktDataOptions,
+        )
+        return subscription
+
+    def cancelMktData(self, reqId: TickerId):
+        EClient.cancelMktData(self, reqId)
+        self.endRequest(reqId)
+
+    def reqTickByTickData(
+        self,
+        reqId: int,
+        contract: Contract,
+        tickType: str,
+        numberOfTicks: int,
+        ignoreSize: bool,
+    ) -> Subscription:
+        """Returns a Subscription yielding the tickByTick* Answers, see
+        EClient.reqTickByTickData()."""
+        subscription = self.startSubscription(reqId, EClient.cancelTickByTickData)
+        EClient.reqTickByTickData(
+            self, reqId, contract, tickType, numberOfTicks, ignoreSize
+        )
+        return subscription
+
+    def cancelTickByTickData(self, reqId: int):
+        EClient.cancelTickByTickData(self, reqId)
+        self.endRequest(reqId)
@@ -10,15 +10,16 @@ It takes care of almost everything:
 The user just needs to override EWrapper methods to receive the answers.
 """
 
+import functools
 import logging
 import queue
 import socket
 import sys
 
-from ibapi import decoder, reader, comm
+from ibapi import columnar, decoder, reader, comm
 from ibapi.comm import make_field, make_field_handle_empty
 from ibapi.common import *  # @UnusedWildImport
-from ibapi.connection import Connection
+from ibapi.connection import Connection, ConnectionOptions
 from ibapi.const import NO_VALID_ID, MAX_MSG_LEN, UNSET_INTEGER, UNSET_DOUBLE
 from ibapi.contract import Contract
 from ibapi.errors import (
@@ -30,98 +31,19 @@ from ibapi.errors import (
     BAD_MESSAGE,
 )
 from ibapi.execution import ExecutionFilter
-from ibapi.message import OUT
+from ibapi.message import LAZY_IN, OUT
+from ibapi.msg_queue import UnboundedMsgQueue, get_batch
 from ibapi.order import Order, COMPETE_AGAINST_BEST_OFFSET_UP_TO_MID
 from ibapi.order_cancel import OrderCancel
 from ibapi.scanner import ScannerSubscription
 from ibapi.server_versions import (
-    MIN_SERVER_VER_OPTIONAL_CAPABILITIES,
     MIN_CLIENT_VER,
     MAX_CLIENT_VER,
-    MIN_SERVER_VER_DELTA_NEUTRAL,
-    MIN_SERVER_VER_REQ_MKT_DATA_CONID,
-    MIN_SERVER_VER_TRADING_CLASS,
-    MIN_SERVER_VER_REQ_SMART_COMPONENTS,
-    MIN_SERVER_VER_LINKING,
-    MIN_SERVER_VER_REQ_MARKET_DATA_TYPE,
-    MIN_SERVER_VER_MARKET_RULES,
-    MIN_SERVER_VER_TICK_BY_TICK,
-    MIN_SERVER_VER_TICK_BY_TICK_IGNORE_SIZE,
-    MIN_SERVER_VER_REQ_CALC_IMPLIED_VOLAT,
-    MIN_SERVER_VER_SCALE_ORDERS2,
-    MIN_SERVER_VER_ALGO_ORDERS,
-    MIN_SERVER_VER_NOT_HELD,
-    MIN_SERVER_VER_SEC_ID_TYPE,
-    MIN_SERVER_VER_PLACE_ORDER_CONID,
-    MIN_SERVER_VER_SSHORTX,
-    MIN_SERVER_VER_HEDGE_ORDERS,
-    MIN_SERVER_VER_OPT_OUT_SMART_ROUTING,
-    MIN_SERVER_VER_DELTA_NEUTRAL_CONID,
-    MIN_SERVER_VER_DELTA_NEUTRAL_OPEN_CLOSE,
-    MIN_SERVER_VER_SCALE_ORDERS3,
-    MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE,
-    MIN_SERVER_VER_TRAILING_PERCENT,
-    MIN_SERVER_VER_SCALE_TABLE,
-    MIN_SERVER_VER_ALGO_ID,
-    MIN_SERVER_VER_ORDER_SOLICITED,
-    MIN_SERVER_VER_MODELS_SUPPORT,
-    MIN_SERVER_VER_EXT_OPERATOR,
-    MIN_SERVER_VER_SOFT_DOLLAR_TIER,
-    MIN_SERVER_VER_CASH_QTY,
-    MIN_SERVER_VER_DECISION_MAKER,
-    MIN_SERVER_VER_MIFID_EXECUTION,
-    MIN_SERVER_VER_AUTO_PRICE_FOR_HEDGE,
-    MIN_SERVER_VER_ORDER_CONTAINER,
-    MIN_SERVER_VER_PRICE_MGMT_ALGO,
-    MIN_SERVER_VER_DURATION,
-    MIN_SERVER_VER_POST_TO_ATS,
-    MIN_SERVER_VER_AUTO_CANCEL_PARENT,
-    MIN_SERVER_VER_ADVANCED_ORDER_REJECT,
-    MIN_SERVER_VER_MANUAL_ORDER_TIME,
-    MIN_SERVER_VER_PEGBEST_PEGMID_OFFSETS,
-    MIN_SERVER_VER_FRACTIONAL_POSITIONS,
-    MIN_SERVER_VER_SSHORTX_OLD,
-    MIN_SERVER_VER_SMART_COMBO_ROUTING_PARAMS,
-    MIN_SERVER_VER_FA_PROFILE_DESUPPORT,
-    MIN_SERVER_VER_PTA_ORDERS,
-    MIN_SERVER_VER_RANDOMIZE_SIZE_AND_PRICE,
-    MIN_SERVER_VER_PEGGED_TO_BENCHMARK,
-    MIN_SERVER_VER_D_PEG_ORDERS,
-    MIN_SERVER_VER_POSITIONS,
-    MIN_SERVER_VER_PNL,
-    MIN_SERVER_VER_EXECUTION_DATA_CHAIN,
-    MIN_SERVER_VER_BOND_ISSUERID,
-    MIN_SERVER_VER_CONTRACT_DATA_CHAIN,
-    MIN_SERVER_VER_PRIMARYEXCH,
-    MIN_SERVER_VER_REQ_MKT_DEPTH_EXCHANGES,
-    MIN_SERVER_VER_SMART_DEPTH,
-    MIN_SERVER_VER_MKT_DEPTH_PRIM_EXCHANGE,
-    MIN_SERVER_VER_REPLACE_FA_END,
-    MIN_SERVER_VER_HISTORICAL_SCHEDULE,
-    MIN_SERVER_VER_SYNT_REALTIME_BARS,
-    MIN_SERVER_VER_REQ_HEAD_TIMESTAMP,
-    MIN_SERVER_VER_CANCEL_HEADTIMESTAMP,
-    MIN_SERVER_VER_REQ_HISTOGRAM,
-    MIN_SERVER_VER_HISTORICAL_TICKS,
-    MIN_SERVER_VER_SCANNER_GENERIC_OPTS,
-    MIN_SERVER_VER_FUNDAMENTAL_DATA,
-    MIN_SERVER_VER_REQ_NEWS_PROVIDERS,
-    MIN_SERVER_VER_REQ_NEWS_ARTICLE,
-    MIN_SERVER_VER_NEWS_QUERY_ORIGINS,
-    MIN_SERVER_VER_REQ_HISTORICAL_NEWS,
-    MIN_SERVER_VER_SEC_DEF_OPT_PARAMS_REQ,
-    MIN_SERVER_VER_REQ_FAMILY_CODES,
-    MIN_SERVER_VER_REQ_MATCHING_SYMBOLS,
-    MIN_SERVER_VER_WSHE_CALENDAR,
-    MIN_SERVER_VER_WSH_EVENT_DATA_FILTERS,
-    MIN_SERVER_VER_USER_INFO,
-    MIN_SERVER_VER_MANUAL_ORDER_TIME_EXERCISE_OPTIONS,
-    MIN_SERVER_VER_CUSTOMER_ACCOUNT,
-    MIN_SERVER_VER_PROFESSIONAL_CUSTOMER,
-    MIN_SERVER_VER_RFQ_FIELDS
+    ServerCapabilities,
 )
 
-from ibapi.utils import ClientException, log_
+from ibapi.utils import ClientException, NumericMode, log_
+from ibapi.wrapper import EventRecorder, overriddenCallbacks
 from ibapi.utils import (
     current_fn_name,
     BadMessage,
@@ -146,7 +68,7 @@ class EClient(object):
         # Posei Ibapi: Input validation for Posei Ibapi
         # Posei Ibapi: Error handling improvement
         logger.debug('Posei Ibapi: __init__ called')
-        self.msg_queue = queue.Queue()
+        self.msg_queue = UnboundedMsgQueue()
         self.wrapper = wrapper
         self.decoder = None
         self.nKeybIntHard = 0
@@ -156,6 +78,7 @@ class EClient(object):
         self.extraAuth = False
         self.clientId = None
         self.serverVersion_ = None
+        self.serverCaps = None  # ServerCapabilities, set at the handshake
         self.connTime = None
         self.connState = None
         self.optCapab = None
@@ -164,6 +87,15 @@ class EClient(object):
         self.decode = None
         self.setConnState(EClient.DISCONNECTED)
         self.connectOptions = None
+        self.connectionOptions = ConnectionOptions()
+        self.readerHub = None
+        self.decodeInline = False
+        self.decodeProcess = None
+        self.numericMode = NumericMode.DECIMAL
+        self.lazyMsgIds = frozenset()
+        self.allowMsgIds = frozenset()
+        self.denyMsgIds = frozenset()
+        self.maskUnhandled = False
         self.reset()
 
     def reset(self):
@@ -177,6 +109,7 @@ class EClient(object):
         self.extraAuth = False
         self.clientId = None
         self.serverVersion_ = None
+        self.serverCaps = None  # ServerCapabilities, set at the handshake
         self.connTime = None
         self.connState = None
         self.optCapab = None
@@ -193,8 +126,10 @@ class EClient(object):
         logger.debug(f"{id(self)} connState: {_connState} -> {self.connState}")
 
     def sendMsg(self, msg):
-        full_msg = comm.make_msg(msg)
-        logger.info("%s %s %s", "SENDING", current_fn_name(1), full_msg)
+        # the messages of a comm.FieldWriter come already framed
+        full_msg = msg if type(msg) is bytes else comm.make_msg(msg)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s %s %s", "SENDING", current_fn_name(1), full_msg)
         self.conn.sendMsg(full_msg)
 
     def logRequest(self, fnName, fnParams):
@@ -240,7 +175,7 @@ class EClient(object):
 
             msg = f"{make_field(OUT.START_API)}{make_field(VERSION)}{make_field(self.clientId)}"
 
-            if self.serverVersion() >= MIN_SERVER_VER_OPTIONAL_CAPABILITIES:
+            if self.serverCaps.OPTIONAL_CAPABILITIES:
                 msg += make_field(self.optCapab if self.optCapab is not None else "")
 
         except ClientException as ex:
@@ -278,12 +213,12 @@ class EClient(object):
                 "Connecting to %s:%d w/ id:%d", self.host, self.port, self.clientId
             )
 
-            self.conn = Connection(self.host, self.port)
+            self.conn = Connection(self.host, self.port, self.connectionOptions)
 
             self.conn.connect()
             self.setConnState(EClient.CONNECTING)
 
-            # TODO: support async mode
+            # see AsyncEClient for the asyncio mode
 
             v100prefix = "API\0"
             v100version = "v%d..%d" % (MIN_CLIENT_VER, MAX_CLIENT_VER)
@@ -298,7 +233,15 @@ class EClient(object):
             logger.debug("REQUEST %s", msg2)
             self.conn.sendMsg(msg2)
 
-            self.decoder = decoder.Decoder(self.wrapper, self.serverVersion())
+            self.decoder = decoder.Decoder(
+                self.wrapper,
+                self.serverVersion(),
+                self.numericMode,
+                self.lazyMsgIds,
+                self.allowMsgIds,
+                self.denyMsgIds,
+                self.maskUnhandled,
+            )
             fields = []
 
             # sometimes I get news before the server version, thus the loop
@@ -325,12 +268,34 @@ class EClient(object):
             logger.debug("ANSWER Version:%d time:%s", server_version, conn_time)
             self.connTime = conn_time
             self.serverVersion_ = server_version
+            self.serverCaps = ServerCapabilities(server_version)
             self.decoder.serverVersion = self.serverVersion()
 
             self.setConnState(EClient.CONNECTED)
 
-            self.reader = reader.EReader(self.conn, self.msg_queue)
-            self.reader.start()  # start thread
+            if self.decodeInline:
+                msg_queue = reader.InlineDecoder(self)
+            else:
+                msg_queue = self.msg_queue
+            if self.decodeProcess is not None:
+                self.decodeProcess.start(
+                    self.conn,
+                    self.serverVersion(),
+                    self.numericMode,
+                    self.decoder.ignoredMsgIds,
+                )
+            elif self.readerHub is not None:
+                registered = self.readerHub.register(
+                    self.conn, msg_queue, self.decoder.ignoredMsgIds
+                )
+                registered.add_done_callback(
+                    functools.partial(self._hubRegistered, self.conn)
+                )
+            else:
+                self.reader = reader.EReader(
+                    self.conn, msg_queue, self.decoder.ignoredMsgIds
+                )
+                self.reader.start()  # start thread
             logger.info("sent startApi")
             self.startApi()
             self.wrapper.connectAck()
@@ -348,6 +313,10 @@ class EClient(object):
         self.setConnState(EClient.DISCONNECTED)
         if self.conn is not None:
             logger.info("disconnecting")
+            if self.readerHub is not None:
+                self.readerHub.unregister(self.conn)
+            if self.decodeProcess is not None:
+                self.decodeProcess.stop(self.conn)
             self.conn.disconnect()
             self.wrapper.connectionClosed()
             self.reset()
@@ -373,6 +342,85 @@ class EClient(object):
     def setConnectOptions(self, opts):
         self.connectOptions = opts
 
+    def setConnectionOptions(self, options: ConnectionOptions):
+        """Socket level settings (receive buffer size, SO_RCVBUF,
+        TCP_NODELAY, ...) used by the next connect(). Unlike
+        setConnectOptions() they are kept across reconnects."""
+        self.connectionOptions = options
+
+    def setMsgQueue(self, msg_queue):
+        """Replaces the UnboundedMsgQueue between the reader and run(),
+        eg: with a msg_queue.BoundedMsgQueue, ConflatingMsgQueue or
+        PriorityMsgQueue. Must be called before connect()."""
+        self.msg_queue = msg_queue
+
+    def setReaderHub(self, hub: reader.EReaderHub):
+        """Reads the incoming messages with the given (started) EReaderHub,
+        shared with other clients, instead of a dedicated EReader thread.
+        Must be called before connect()."""
+        self.readerHub = hub
+
+    def _hubRegistered(self, conn, registered):
+        """called once the EReaderHub has registered conn, or failed to or
+        was stopped before, in which case nothing would ever be read"""
+        if registered.cancelled():
+            reason = "EReaderHub stopped"
+        elif registered.exception() is not None:
+            reason = f"EReaderHub failed: {registered.exception()!r}"
+        else:
+            return
+        if conn is not self.conn:
+            return
+        self.wrapper.error(NO_VALID_ID, CONNECT_FAIL.code(), reason)
+        self.disconnect()
+
+    def setDecodeInline(self, decodeInline: bool = True):
+        """Decodes the incoming messages and calls the EWrapper right in the
+        reader thread, skipping the queue and run(); see the threading
+        contract in reader.InlineDecoder. Must be called before connect()."""
+        self.decodeInline = decodeInline
+
+    def setNumericMode(self, numericMode: str):
+        """Decodes the sizes, quantities, volumes, etc: as Decimal, float or
+        int, see utils.NumericMode. Must be called before connect()."""
+        self.numericMode = numericMode
+
+    def setLazyMsgs(self, msgIds=frozenset(LAZY_IN)):
+        """Delivers the given market data messages, some of message.LAZY_IN,
+        to EWrapper.onLazyMsg() as a wrapper.LazyMsg whose body is only
+        decoded if used; for the wrappers dropping most of them, eg: by
+        reqId. Not used with setDecodeProcess(). Must be called before
+        connect()."""
+        self.lazyMsgIds = frozenset(msgIds)
+
+    def setMsgIdMask(
+        self, allowMsgIds=frozenset(), denyMsgIds=frozenset(), maskUnhandled=True
+    ):
+        """Opts in dropping incoming messages (message.IN ids) in the reader,
+        undecoded: with maskUnhandled, the ones whose callbacks the wrapper
+        does not override, which EWrapper then no longer logs; allowMsgIds
+        are always decoded, eg: for a wrapper handling them another way,
+        and denyMsgIds never are. Off by default, must be called before
+        connect()."""
+        self.allowMsgIds = frozenset(allowMsgIds)
+        self.denyMsgIds = frozenset(denyMsgIds)
+        self.maskUnhandled = maskUnhandled
+
+    def setDecodeProcess(self, decodeProcess):
+        """Reads and decodes the incoming messages in a child process, given
+        as a decode_process.DecodeProcess, run() then only dispatches the
+        decoded events to the EWrapper. Must be called before connect().
+        Not for a wrapper taking the historical answers as arrays (see
+        columnar.ARRAY_CALLBACKS), the child process decodes them per row."""
+        callbacks = overriddenCallbacks(self.wrapper) or frozenset()
+        arrayCallbacks = columnar.ARRAY_CALLBACKS.intersection(callbacks)
+        if decodeProcess is not None and arrayCallbacks:
+            raise ValueError(
+                "the decode process does not support "
+                + ", ".join(f"EWrapper.{name}()" for name in sorted(arrayCallbacks))
+            )
+        self.decodeProcess = decodeProcess
+
     def setOptionalCapabilities(self, optCapab):
         self.optCapab = optCapab
 
@@ -387,6 +435,10 @@ class EClient(object):
     def run(self):
         """This is the function that has the message loop."""
 
+        if self.decodeProcess is not None:
+            self.runDecodeProcess()
+            return
+
         try:
             while self.isConnected() or not self.msg_queue.empty():
                 try:
@@ -420,6 +472,85 @@ class EClient(object):
         finally:
             self.disconnect()
 
+    def runDecodeProcess(self):
+        """The message loop of run() when the messages are decoded in a
+        child process (see setDecodeProcess()): the decoded events are
+        dispatched to the EWrapper, in batches."""
+
+        decodeProcess = self.decodeProcess
+        try:
+            while self.isConnected() and not decodeProcess.finished:
+                try:
+                    events = decodeProcess.getEvents(timeout=0.2)
+                    if not events:
+                        self.msgLoopTmo()
+                    for name, args in events:
+                        getattr(self.wrapper, name)(*args)
+                        self.msgLoopRec()
+                except (KeyboardInterrupt, SystemExit):
+                    logger.info("detected KeyboardInterrupt, SystemExit")
+                    self.keyboardInterrupt()
+                    self.keyboardInterruptHard()
+        finally:
+            self.disconnect()
+
+    def runBatched(self, deliverBatch=False):
+        """Same message loop as run() but each wakeup takes all the pending
+        messages at once (see msg_queue.get_batch()), so the queue lock is
+        taken once per batch instead of once per message (once per message
+        with a msg_queue which is a plain queue.Queue, see setMsgQueue()).
+        With deliverBatch the callbacks of a batch are not called one by one
+        but given all together to EWrapper.onBatch() once it is decoded."""
+
+        recorder = EventRecorder() if deliverBatch else None
+        msgs = []
+        try:
+            while self.isConnected() or not self.msg_queue.empty():
+                try:
+                    try:
+                        msgs = get_batch(self.msg_queue, block=True, timeout=0.2)
+                    except queue.Empty:
+                        logger.debug("queue.get: empty")
+                        self.msgLoopTmo()
+                        continue
+
+                    if recorder is not None:
+                        recorder.events = []
+                        self.decoder.wrapper = recorder
+                    try:
+                        for text in msgs:
+                            if len(text) > MAX_MSG_LEN:
+                                self.wrapper.error(
+                                    NO_VALID_ID,
+                                    BAD_LENGTH.code(),
+                                    f"{BAD_LENGTH.msg()}:{len(text)}:{text}",
+                                )
+                                return
+                            try:
+                                self.decoder.interpret(comm.read_fields(text))
+                            except BadMessage:
+                                logger.info("BadMessage")
+                            self.msgLoopRec()
+                    finally:
+                        if recorder is not None:
+                            self.decoder.wrapper = self.wrapper
+
+                    if recorder is not None and recorder.events:
+                        self.wrapper.onBatch(recorder.events)
+                except (KeyboardInterrupt, SystemExit):
+                    logger.info("detected KeyboardInterrupt, SystemExit")
+                    self.keyboardInterrupt()
+                    self.keyboardInterruptHard()
+
+                logger.debug(
+                    "conn:%d batch.sz:%d queue.sz:%d",
+                    self.isConnected(),
+                    len(msgs),
+                    self.msg_queue.qsize(),
+                )
+        finally:
+            self.disconnect()
+
     def reqCurrentTime(self):
         """Asks the current system time on the server side."""
 
@@ -501,7 +632,7 @@ class EClient(object):
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_DELTA_NEUTRAL:
+        if not self.serverCaps.DELTA_NEUTRAL:
             if contract.deltaNeutralContract:
                 self.wrapper.error(
                     reqId,
@@ -510,7 +641,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_MKT_DATA_CONID:
+        if not self.serverCaps.REQ_MKT_DATA_CONID:
             if contract.conId > 0:
                 self.wrapper.error(
                     reqId,
@@ -519,7 +650,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_TRADING_CLASS:
+        if not self.serverCaps.TRADING_CLASS:
             if contract.tradingClass:
                 self.wrapper.error(
                     reqId,
@@ -533,85 +664,70 @@ class EClient(object):
             VERSION = 11
 
             # send req mkt data msg
-            flds = []
-            flds += [
-                make_field(OUT.REQ_MKT_DATA),
-                make_field(VERSION),
-                make_field(reqId),
-            ]
+            w = comm.fieldWriter()
+            w.start(OUT.REQ_MKT_DATA)
+            w.field(VERSION, reqId)
 
             # send contract fields
-            if self.serverVersion() >= MIN_SERVER_VER_REQ_MKT_DATA_CONID:
-                flds += [
-                    make_field(contract.conId),
-                ]
-
-            flds += [
-                make_field(contract.symbol),
-                make_field(contract.secType),
-                make_field(contract.lastTradeDateOrContractMonth),
-                make_field(contract.strike),
-                make_field(contract.right),
-                make_field(contract.multiplier),  # srv v15 and above
-                make_field(contract.exchange),
-                make_field(contract.primaryExchange),  # srv v14 and above
-                make_field(contract.currency),
-                make_field(contract.localSymbol),
-            ]  # srv v2 and above
+            if self.serverCaps.REQ_MKT_DATA_CONID:
+                w.field(contract.conId)
+
+            w.field(
+                contract.symbol,
+                contract.secType,
+                contract.lastTradeDateOrContractMonth,
+                contract.strike,
+                contract.right,
+                contract.multiplier,  # srv v15 and above
+                contract.exchange,
+                contract.primaryExchange,  # srv v14 and above
+                contract.currency,
+                contract.localSymbol,  # srv v2 and above
+            )
 
-            if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
-                flds += [
-                    make_field(contract.tradingClass),
-                ]
+            if self.serverCaps.TRADING_CLASS:
+                w.field(contract.tradingClass)
 
             # Send combo legs for BAG requests (srv v8 and above)
             if contract.secType == "BAG":
                 comboLegsCount = len(contract.comboLegs) if contract.comboLegs else 0
-                flds += [
-                    make_field(comboLegsCount),
-                ]
+                w.field(comboLegsCount)
                 for comboLeg in contract.comboLegs:
-                    flds += [
-                        make_field(comboLeg.conId),
-                        make_field(comboLeg.ratio),
-                        make_field(comboLeg.action),
-                        make_field(comboLeg.exchange),
-                    ]
+                    w.field(
+                        comboLeg.conId,
+                        comboLeg.ratio,
+                        comboLeg.action,
+                        comboLeg.exchange,
+                    )
 
-            if self.serverVersion() >= MIN_SERVER_VER_DELTA_NEUTRAL:
+            if self.serverCaps.DELTA_NEUTRAL:
                 if contract.deltaNeutralContract:
-                    flds += [
-                        make_field(True),
-                        make_field(contract.deltaNeutralContract.conId),
-                        make_field(contract.deltaNeutralContract.delta),
-                        make_field(contract.deltaNeutralContract.price),
-                    ]
+                    w.field(
+                        True,
+                        contract.deltaNeutralContract.conId,
+                        contract.deltaNeutralContract.delta,
+                        contract.deltaNeutralContract.price,
+                    )
                 else:
-                    flds += [
-                        make_field(False),
-                    ]
+                    w.field(False)
 
-            flds += [
-                make_field(genericTickList),  # srv v31 and above
-                make_field(snapshot),
-            ]  # srv v35 and above
+            w.field(
+                genericTickList,  # srv v31 and above
+                snapshot,  # srv v35 and above
+            )
 
-            if self.serverVersion() >= MIN_SERVER_VER_REQ_SMART_COMPONENTS:
-                flds += [
-                    make_field(regulatorySnapshot),
-                ]
+            if self.serverCaps.REQ_SMART_COMPONENTS:
+                w.field(regulatorySnapshot)
 
             # send mktDataOptions parameter
-            if self.serverVersion() >= MIN_SERVER_VER_LINKING:
+            if self.serverCaps.LINKING:
                 # current doc says this part if for "internal use only" -> won't support it
                 if mktDataOptions:
                     raise NotImplementedError("not supported")
                 mktDataOptionsStr = ""
-                flds += [
-                    make_field(mktDataOptionsStr),
-                ]
+                w.field(mktDataOptionsStr)
 
-            msg = "".join(flds)
+            msg = w.msg()
 
         except ClientException as ex:
             self.wrapper.error(reqId, ex.code, ex.msg + ex.text)
@@ -663,7 +779,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_MARKET_DATA_TYPE:
+        if not self.serverCaps.REQ_MARKET_DATA_TYPE:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -691,7 +807,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_SMART_COMPONENTS:
+        if not self.serverCaps.REQ_SMART_COMPONENTS:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -719,7 +835,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_MARKET_RULES:
+        if not self.serverCaps.MARKET_RULES:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -745,7 +861,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_TICK_BY_TICK:
+        if not self.serverCaps.TICK_BY_TICK:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -753,7 +869,7 @@ class EClient(object):
             )
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_TICK_BY_TICK_IGNORE_SIZE:
+        if not self.serverCaps.TICK_BY_TICK_IGNORE_SIZE:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -782,7 +898,7 @@ class EClient(object):
                 + make_field(tickType)
             )
 
-            if self.serverVersion() >= MIN_SERVER_VER_TICK_BY_TICK_IGNORE_SIZE:
+            if self.serverCaps.TICK_BY_TICK_IGNORE_SIZE:
                 msg += make_field(numberOfTicks) + make_field(ignoreSize)
 
         except ClientException as ex:
@@ -798,7 +914,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_TICK_BY_TICK:
+        if not self.serverCaps.TICK_BY_TICK:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -837,7 +953,7 @@ class EClient(object):
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_CALC_IMPLIED_VOLAT:
+        if not self.serverCaps.REQ_CALC_IMPLIED_VOLAT:
             self.wrapper.error(
                 reqId,
                 UPDATE_TWS.code(),
@@ -846,7 +962,7 @@ class EClient(object):
             )
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_TRADING_CLASS:
+        if not self.serverCaps.TRADING_CLASS:
             if contract.tradingClass:
                 self.wrapper.error(
                     reqId,
@@ -878,13 +994,13 @@ class EClient(object):
                 make_field(contract.currency),
                 make_field(contract.localSymbol),
             ]
-            if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
+            if self.serverCaps.TRADING_CLASS:
                 flds += [
                     make_field(contract.tradingClass),
                 ]
             flds += [make_field(optionPrice), make_field(underPrice)]
 
-            if self.serverVersion() >= MIN_SERVER_VER_LINKING:
+            if self.serverCaps.LINKING:
                 implVolOptStr = ""
                 tagValuesCount = len(implVolOptions) if implVolOptions else 0
                 if implVolOptions:
@@ -912,7 +1028,7 @@ class EClient(object):
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_CALC_IMPLIED_VOLAT:
+        if not self.serverCaps.REQ_CALC_IMPLIED_VOLAT:
             self.wrapper.error(
                 reqId,
                 UPDATE_TWS.code(),
@@ -953,7 +1069,7 @@ class EClient(object):
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_CALC_IMPLIED_VOLAT:
+        if not self.serverCaps.REQ_CALC_IMPLIED_VOLAT:
             self.wrapper.error(
                 reqId,
                 UPDATE_TWS.code(),
@@ -962,7 +1078,7 @@ class EClient(object):
             )
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_TRADING_CLASS:
+        if not self.serverCaps.TRADING_CLASS:
             if contract.tradingClass:
                 self.wrapper.error(
                     reqId,
@@ -994,13 +1110,13 @@ class EClient(object):
                 make_field(contract.currency),
                 make_field(contract.localSymbol),
             ]
-            if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
+            if self.serverCaps.TRADING_CLASS:
                 flds += [
                     make_field(contract.tradingClass),
                 ]
             flds += [make_field(volatility), make_field(underPrice)]
 
-            if self.serverVersion() >= MIN_SERVER_VER_LINKING:
+            if self.serverCaps.LINKING:
                 optPrcOptStr = ""
                 tagValuesCount = len(optPrcOptions) if optPrcOptions else 0
                 if optPrcOptions:
@@ -1028,7 +1144,7 @@ class EClient(object):
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_CALC_IMPLIED_VOLAT:
+        if not self.serverCaps.REQ_CALC_IMPLIED_VOLAT:
             self.wrapper.error(
                 reqId,
                 UPDATE_TWS.code(),
@@ -1083,7 +1199,7 @@ class EClient(object):
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_TRADING_CLASS:
+        if not self.serverCaps.TRADING_CLASS:
             if contract.tradingClass or contract.conId > 0:
                 self.wrapper.error(
                     reqId,
@@ -1093,7 +1209,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_MANUAL_ORDER_TIME_EXERCISE_OPTIONS and manualOrderTime:
+        if not self.serverCaps.MANUAL_ORDER_TIME_EXERCISE_OPTIONS and manualOrderTime:
             self.wrapper.error(
                 reqId,
                 UPDATE_TWS.code(),
@@ -1102,10 +1218,7 @@ class EClient(object):
             )
             return
 
-        if (
-            self.serverVersion() < MIN_SERVER_VER_CUSTOMER_ACCOUNT
-            and customerAccount
-        ):
+        if not self.serverCaps.CUSTOMER_ACCOUNT and customerAccount:
             self.wrapper.error(
                 reqId,
                 UPDATE_TWS.code(),
@@ -1113,10 +1226,7 @@ class EClient(object):
             )
             return
 
-        if (
-            self.serverVersion() < MIN_SERVER_VER_PROFESSIONAL_CUSTOMER
-            and professionalCustomer
-        ):
+        if not self.serverCaps.PROFESSIONAL_CUSTOMER and professionalCustomer:
             self.wrapper.error(
                 reqId,
                 UPDATE_TWS.code(),
@@ -1135,7 +1245,7 @@ class EClient(object):
                 make_field(reqId),
             ]
             # send contract fields
-            if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
+            if self.serverCaps.TRADING_CLASS:
                 fields += [
                     make_field(contract.conId),
                 ]
@@ -1150,7 +1260,7 @@ class EClient(object):
                 make_field(contract.currency),
                 make_field(contract.localSymbol),
             ]
-            if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
+            if self.serverCaps.TRADING_CLASS:
                 fields += [
                     make_field(contract.tradingClass),
                 ]
@@ -1160,15 +1270,15 @@ class EClient(object):
                 make_field(account),
                 make_field(override),
             ]
-            if self.serverVersion() >= MIN_SERVER_VER_MANUAL_ORDER_TIME_EXERCISE_OPTIONS:
+            if self.serverCaps.MANUAL_ORDER_TIME_EXERCISE_OPTIONS:
                 fields += [
                     make_field(manualOrderTime),
                 ]
-            if self.serverVersion() >= MIN_SERVER_VER_CUSTOMER_ACCOUNT:
+            if self.serverCaps.CUSTOMER_ACCOUNT:
                 fields += [
                     make_field(customerAccount),
                 ]
-            if self.serverVersion() >= MIN_SERVER_VER_PROFESSIONAL_CUSTOMER:
+            if self.serverCaps.PROFESSIONAL_CUSTOMER:
                 fields += [
                     make_field(professionalCustomer),
                 ]
@@ -1203,7 +1313,9 @@ class EClient(object):
             self.wrapper.error(orderId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_DELTA_NEUTRAL:
+        caps = self.serverCaps
+
+        if not caps.DELTA_NEUTRAL:
             if contract.deltaNeutralContract:
                 self.wrapper.error(
                     orderId,
@@ -1212,7 +1324,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_SCALE_ORDERS2:
+        if not caps.SCALE_ORDERS2:
             if order.scaleSubsLevelSize != UNSET_INTEGER:
                 self.wrapper.error(
                     orderId,
@@ -1222,7 +1334,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_ALGO_ORDERS:
+        if not caps.ALGO_ORDERS:
             if order.algoStrategy:
                 self.wrapper.error(
                     orderId,
@@ -1231,7 +1343,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_NOT_HELD:
+        if not caps.NOT_HELD:
             if order.notHeld:
                 self.wrapper.error(
                     orderId,
@@ -1240,7 +1352,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_SEC_ID_TYPE:
+        if not caps.SEC_ID_TYPE:
             if contract.secIdType or contract.secId:
                 self.wrapper.error(
                     orderId,
@@ -1250,7 +1362,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_PLACE_ORDER_CONID:
+        if not caps.PLACE_ORDER_CONID:
             if contract.conId and contract.conId > 0:
                 self.wrapper.error(
                     orderId,
@@ -1259,7 +1371,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_SSHORTX:
+        if not caps.SSHORTX:
             if order.exemptCode != -1:
                 self.wrapper.error(
                     orderId,
@@ -1268,7 +1380,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_SSHORTX:
+        if not caps.SSHORTX:
             if contract.comboLegs:
                 for comboLeg in contract.comboLegs:
                     if comboLeg.exemptCode != -1:
@@ -1280,7 +1392,7 @@ class EClient(object):
                         )
                         return
 
-        if self.serverVersion() < MIN_SERVER_VER_HEDGE_ORDERS:
+        if not caps.HEDGE_ORDERS:
             if order.hedgeType:
                 self.wrapper.error(
                     orderId,
@@ -1289,7 +1401,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_OPT_OUT_SMART_ROUTING:
+        if not caps.OPT_OUT_SMART_ROUTING:
             if order.optOutSmartRouting:
                 self.wrapper.error(
                     orderId,
@@ -1299,7 +1411,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_DELTA_NEUTRAL_CONID:
+        if not caps.DELTA_NEUTRAL_CONID:
             if (
                 order.deltaNeutralConId > 0
                 or order.deltaNeutralSettlingFirm
@@ -1315,7 +1427,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_DELTA_NEUTRAL_OPEN_CLOSE:
+        if not caps.DELTA_NEUTRAL_OPEN_CLOSE:
             if (
                 order.deltaNeutralOpenClose
                 or order.deltaNeutralShortSale
@@ -1330,7 +1442,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_SCALE_ORDERS3:
+        if not caps.SCALE_ORDERS3:
             if (
                 order.scalePriceIncrement > 0
                 and order.scalePriceIncrement != UNSET_DOUBLE
@@ -1353,10 +1465,7 @@ class EClient(object):
                     )
                     return
 
-        if (
-            self.serverVersion() < MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE
-            and contract.secType == "BAG"
-        ):
+        if not caps.ORDER_COMBO_LEGS_PRICE and contract.secType == "BAG":
             if order.orderComboLegs:
                 for orderComboLeg in order.orderComboLegs:
                     if orderComboLeg.price != UNSET_DOUBLE:
@@ -1368,7 +1477,7 @@ class EClient(object):
                         )
                         return
 
-        if self.serverVersion() < MIN_SERVER_VER_TRAILING_PERCENT:
+        if not caps.TRAILING_PERCENT:
             if order.trailingPercent != UNSET_DOUBLE:
                 self.wrapper.error(
                     orderId,
@@ -1378,7 +1487,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_TRADING_CLASS:
+        if not caps.TRADING_CLASS:
             if contract.tradingClass:
                 self.wrapper.error(
                     orderId,
@@ -1388,7 +1497,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_SCALE_TABLE:
+        if not caps.SCALE_TABLE:
             if order.scaleTable or order.activeStartTime or order.activeStopTime:
                 self.wrapper.error(
                     orderId,
@@ -1398,7 +1507,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_ALGO_ID:
+        if not caps.ALGO_ID:
             if order.algoId:
                 self.wrapper.error(
                     orderId,
@@ -1407,7 +1516,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_ORDER_SOLICITED:
+        if not caps.ORDER_SOLICITED:
             if order.solicited:
                 self.wrapper.error(
                     orderId,
@@ -1417,7 +1526,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_MODELS_SUPPORT:
+        if not caps.MODELS_SUPPORT:
             if order.modelCode:
                 self.wrapper.error(
                     orderId,
@@ -1426,7 +1535,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_EXT_OPERATOR:
+        if not caps.EXT_OPERATOR:
             if order.extOperator:
                 self.wrapper.error(
                     orderId,
@@ -1435,7 +1544,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_SOFT_DOLLAR_TIER:
+        if not caps.SOFT_DOLLAR_TIER:
             if order.softDollarTier.name or order.softDollarTier.val:
                 self.wrapper.error(
                     orderId,
@@ -1444,7 +1553,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_CASH_QTY:
+        if not caps.CASH_QTY:
             if order.cashQty:
                 self.wrapper.error(
                     orderId,
@@ -1453,7 +1562,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_DECISION_MAKER and (
+        if not caps.DECISION_MAKER and (
             order.mifid2DecisionMaker != "" or order.mifid2DecisionAlgo != ""
         ):
             self.wrapper.error(
@@ -1464,7 +1573,7 @@ class EClient(object):
             )
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_MIFID_EXECUTION and (
+        if not caps.MIFID_EXECUTION and (
             order.mifid2ExecutionTrader != "" or order.mifid2ExecutionAlgo != ""
         ):
             self.wrapper.error(
@@ -1474,10 +1583,7 @@ class EClient(object):
             )
             return
 
-        if (
-            self.serverVersion() < MIN_SERVER_VER_AUTO_PRICE_FOR_HEDGE
-            and order.dontUseAutoPriceForHedge
-        ):
+        if not caps.AUTO_PRICE_FOR_HEDGE and order.dontUseAutoPriceForHedge:
             self.wrapper.error(
                 orderId,
                 UPDATE_TWS.code(),
@@ -1486,10 +1592,7 @@ class EClient(object):
             )
             return
 
-        if (
-            self.serverVersion() < MIN_SERVER_VER_ORDER_CONTAINER
-            and order.isOmsContainer
-        ):
+        if not caps.ORDER_CONTAINER and order.isOmsContainer:
             self.wrapper.error(
                 orderId,
                 UPDATE_TWS.code(),
@@ -1497,10 +1600,7 @@ class EClient(object):
             )
             return
 
-        if (
-            self.serverVersion() < MIN_SERVER_VER_PRICE_MGMT_ALGO
-            and order.usePriceMgmtAlgo
-        ):
+        if not caps.PRICE_MGMT_ALGO and order.usePriceMgmtAlgo:
             self.wrapper.error(
                 orderId,
                 UPDATE_TWS.code(),
@@ -1509,10 +1609,7 @@ class EClient(object):
             )
             return
 
-        if (
-            self.serverVersion() < MIN_SERVER_VER_DURATION
-            and order.duration != UNSET_INTEGER
-        ):
+        if not caps.DURATION and order.duration != UNSET_INTEGER:
             self.wrapper.error(
                 orderId,
                 UPDATE_TWS.code(),
@@ -1520,10 +1617,7 @@ class EClient(object):
             )
             return
 
-        if (
-            self.serverVersion() < MIN_SERVER_VER_POST_TO_ATS
-            and order.postToAts != UNSET_INTEGER
-        ):
+        if not caps.POST_TO_ATS and order.postToAts != UNSET_INTEGER:
             self.wrapper.error(
                 orderId,
                 UPDATE_TWS.code(),
@@ -1531,10 +1625,7 @@ class EClient(object):
             )
             return
 
-        if (
-            self.serverVersion() < MIN_SERVER_VER_AUTO_CANCEL_PARENT
-            and order.autoCancelParent
-        ):
+        if not caps.AUTO_CANCEL_PARENT and order.autoCancelParent:
             self.wrapper.error(
                 orderId,
                 UPDATE_TWS.code(),
@@ -1542,10 +1633,7 @@ class EClient(object):
             )
             return
 
-        if (
-            self.serverVersion() < MIN_SERVER_VER_ADVANCED_ORDER_REJECT
-            and order.advancedErrorOverride
-        ):
+        if not caps.ADVANCED_ORDER_REJECT and order.advancedErrorOverride:
             self.wrapper.error(
                 orderId,
                 UPDATE_TWS.code(),
@@ -1554,10 +1642,7 @@ class EClient(object):
             )
             return
 
-        if (
-            self.serverVersion() < MIN_SERVER_VER_MANUAL_ORDER_TIME
-            and order.manualOrderTime
-        ):
+        if not caps.MANUAL_ORDER_TIME and order.manualOrderTime:
             self.wrapper.error(
                 orderId,
                 UPDATE_TWS.code(),
@@ -1565,7 +1650,7 @@ class EClient(object):
             )
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_PEGBEST_PEGMID_OFFSETS:
+        if not caps.PEGBEST_PEGMID_OFFSETS:
             if (
                 order.minTradeQty != UNSET_INTEGER
                 or order.minCompeteSize != UNSET_INTEGER
@@ -1582,10 +1667,7 @@ class EClient(object):
                 )
                 return
 
-        if (
-            self.serverVersion() < MIN_SERVER_VER_CUSTOMER_ACCOUNT
-            and order.customerAccount
-        ):
+        if not caps.CUSTOMER_ACCOUNT and order.customerAccount:
             self.wrapper.error(
                 orderId,
                 UPDATE_TWS.code(),
@@ -1593,10 +1675,7 @@ class EClient(object):
             )
             return
 
-        if (
-            self.serverVersion() < MIN_SERVER_VER_PROFESSIONAL_CUSTOMER
-            and order.professionalCustomer
-        ):
+        if not caps.PROFESSIONAL_CUSTOMER and order.professionalCustomer:
             self.wrapper.error(
                 orderId,
                 UPDATE_TWS.code(),
@@ -1605,7 +1684,7 @@ class EClient(object):
             return
 
         if (
-            self.serverVersion() < MIN_SERVER_VER_RFQ_FIELDS
+            not caps.RFQ_FIELDS
             and (order.externalUserId or order.manualOrderIndicator != UNSET_INTEGER)
         ):
             self.wrapper.error(
@@ -1616,124 +1695,114 @@ class EClient(object):
             return
 
         try:
-            VERSION = 27 if (self.serverVersion() < MIN_SERVER_VER_NOT_HELD) else 45
+            VERSION = 27 if (not caps.NOT_HELD) else 45
 
             # send place order msg
-            flds = []
-            flds += [make_field(OUT.PLACE_ORDER)]
+            w = comm.fieldWriter()
+            w.start(OUT.PLACE_ORDER)
 
-            if self.serverVersion() < MIN_SERVER_VER_ORDER_CONTAINER:
-                flds += [make_field(VERSION)]
+            if not caps.ORDER_CONTAINER:
+                w.field(VERSION)
 
-            flds += [make_field(orderId)]
+            w.field(orderId)
 
             # send contract fields
-            if self.serverVersion() >= MIN_SERVER_VER_PLACE_ORDER_CONID:
-                flds.append(make_field(contract.conId))
-            flds += [
-                make_field(contract.symbol),
-                make_field(contract.secType),
-                make_field(contract.lastTradeDateOrContractMonth),
-                make_field(contract.strike),
-                make_field(contract.right),
-                make_field(contract.multiplier),  # srv v15 and above
-                make_field(contract.exchange),
-                make_field(contract.primaryExchange),  # srv v14 and above
-                make_field(contract.currency),
-                make_field(contract.localSymbol),
-            ]  # srv v2 and above
-            if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
-                flds.append(make_field(contract.tradingClass))
+            if caps.PLACE_ORDER_CONID:
+                w.field(contract.conId)
+            w.field(
+                contract.symbol,
+                contract.secType,
+                contract.lastTradeDateOrContractMonth,
+                contract.strike,
+                contract.right,
+                contract.multiplier,  # srv v15 and above
+                contract.exchange,
+                contract.primaryExchange,  # srv v14 and above
+                contract.currency,
+                contract.localSymbol,  # srv v2 and above
+            )
+            if caps.TRADING_CLASS:
+                w.field(contract.tradingClass)
 
-            if self.serverVersion() >= MIN_SERVER_VER_SEC_ID_TYPE:
-                flds += [make_field(contract.secIdType), make_field(contract.secId)]
+            if caps.SEC_ID_TYPE:
+                w.field(contract.secIdType, contract.secId)
 
             # send main order fields
-            flds.append(make_field(order.action))
+            w.field(order.action)
 
-            if self.serverVersion() >= MIN_SERVER_VER_FRACTIONAL_POSITIONS:
-                flds.append(make_field(order.totalQuantity))
+            if caps.FRACTIONAL_POSITIONS:
+                w.field(order.totalQuantity)
             else:
-                flds.append(make_field(int(order.totalQuantity)))
+                w.field(int(order.totalQuantity))
 
-            flds.append(make_field(order.orderType))
-            if self.serverVersion() < MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE:
-                flds.append(
-                    make_field(order.lmtPrice if order.lmtPrice != UNSET_DOUBLE else 0)
-                )
+            w.field(order.orderType)
+            if not caps.ORDER_COMBO_LEGS_PRICE:
+                w.field(order.lmtPrice if order.lmtPrice != UNSET_DOUBLE else 0)
             else:
-                flds.append(make_field_handle_empty(order.lmtPrice))
-            if self.serverVersion() < MIN_SERVER_VER_TRAILING_PERCENT:
-                flds.append(
-                    make_field(order.auxPrice if order.auxPrice != UNSET_DOUBLE else 0)
-                )
+                w.fieldHandleEmpty(order.lmtPrice)
+            if not caps.TRAILING_PERCENT:
+                w.field(order.auxPrice if order.auxPrice != UNSET_DOUBLE else 0)
             else:
-                flds.append(make_field_handle_empty(order.auxPrice))
+                w.fieldHandleEmpty(order.auxPrice)
 
                 # send extended order fields
-                flds += [
-                    make_field(order.tif),
-                    make_field(order.ocaGroup),
-                    make_field(order.account),
-                    make_field(order.openClose),
-                    make_field(order.origin),
-                    make_field(order.orderRef),
-                    make_field(order.transmit),
-                    make_field(order.parentId),  # srv v4 and above
-                    make_field(order.blockOrder),  # srv v5 and above
-                    make_field(order.sweepToFill),  # srv v5 and above
-                    make_field(order.displaySize),  # srv v5 and above
-                    make_field(order.triggerMethod),  # srv v5 and above
-                    make_field(order.outsideRth),  # srv v5 and above
-                    make_field(order.hidden),
-                ]  # srv v7 and above
+                w.field(
+                    order.tif,
+                    order.ocaGroup,
+                    order.account,
+                    order.openClose,
+                    order.origin,
+                    order.orderRef,
+                    order.transmit,
+                    order.parentId,  # srv v4 and above
+                    order.blockOrder,  # srv v5 and above
+                    order.sweepToFill,  # srv v5 and above
+                    order.displaySize,  # srv v5 and above
+                    order.triggerMethod,  # srv v5 and above
+                    order.outsideRth,  # srv v5 and above
+                    order.hidden,  # srv v7 and above
+                )
 
             # Send combo legs for BAG requests (srv v8 and above)
             if contract.secType == "BAG":
                 comboLegsCount = len(contract.comboLegs) if contract.comboLegs else 0
-                flds.append(make_field(comboLegsCount))
+                w.field(comboLegsCount)
                 if comboLegsCount > 0:
                     for comboLeg in contract.comboLegs:
                         assert comboLeg
-                        flds += [
-                            make_field(comboLeg.conId),
-                            make_field(comboLeg.ratio),
-                            make_field(comboLeg.action),
-                            make_field(comboLeg.exchange),
-                            make_field(comboLeg.openClose),
-                            make_field(comboLeg.shortSaleSlot),  # srv v35 and above
-                            make_field(comboLeg.designatedLocation),
-                        ]  # srv v35 and above
-                        if self.serverVersion() >= MIN_SERVER_VER_SSHORTX_OLD:
-                            flds.append(make_field(comboLeg.exemptCode))
+                        w.field(
+                            comboLeg.conId,
+                            comboLeg.ratio,
+                            comboLeg.action,
+                            comboLeg.exchange,
+                            comboLeg.openClose,
+                            comboLeg.shortSaleSlot,  # srv v35 and above
+                            comboLeg.designatedLocation,  # srv v35 and above
+                        )
+                        if caps.SSHORTX_OLD:
+                            w.field(comboLeg.exemptCode)
 
             # Send order combo legs for BAG requests
-            if (
-                self.serverVersion() >= MIN_SERVER_VER_ORDER_COMBO_LEGS_PRICE
-                and contract.secType == "BAG"
-            ):
+            if caps.ORDER_COMBO_LEGS_PRICE and contract.secType == "BAG":
                 orderComboLegsCount = (
                     len(order.orderComboLegs) if order.orderComboLegs else 0
                 )
-                flds.append(make_field(orderComboLegsCount))
+                w.field(orderComboLegsCount)
                 if orderComboLegsCount:
                     for orderComboLeg in order.orderComboLegs:
                         assert orderComboLeg
-                        flds.append(make_field_handle_empty(orderComboLeg.price))
+                        w.fieldHandleEmpty(orderComboLeg.price)
 
-            if (
-                self.serverVersion() >= MIN_SERVER_VER_SMART_COMBO_ROUTING_PARAMS
-                and contract.secType == "BAG"
-            ):
+            if caps.SMART_COMBO_ROUTING_PARAMS and contract.secType == "BAG":
                 smartComboRoutingParamsCount = (
                     len(order.smartComboRoutingParams)
                     if order.smartComboRoutingParams
                     else 0
                 )
-                flds.append(make_field(smartComboRoutingParamsCount))
+                w.field(smartComboRoutingParamsCount)
                 if smartComboRoutingParamsCount > 0:
                     for tagValue in order.smartComboRoutingParams:
-                        flds += [make_field(tagValue.tag), make_field(tagValue.value)]
+                        w.field(tagValue.tag, tagValue.value)
 
             ######################################################################
             # Send the shares allocation.
@@ -1748,287 +1817,242 @@ class EClient(object):
             #          U101/20,U203/80
             #####################################################################
             # send deprecated sharesAllocation field
-            flds += [
-                make_field(""),  # srv v9 and above
-                make_field(order.discretionaryAmt),  # srv v10 and above
-                make_field(order.goodAfterTime),  # srv v11 and above
-                make_field(order.goodTillDate),  # srv v12 and above
-                make_field(order.faGroup),  # srv v13 and above
-                make_field(order.faMethod),  # srv v13 and above
-                make_field(order.faPercentage),
-            ]  # srv v13 and above
-            if self.serverVersion() < MIN_SERVER_VER_FA_PROFILE_DESUPPORT:
-                flds.append(make_field(""))  # send deprecated faProfile field
-
-            if self.serverVersion() >= MIN_SERVER_VER_MODELS_SUPPORT:
-                flds.append(make_field(order.modelCode))
+            w.field(
+                "",  # srv v9 and above
+                order.discretionaryAmt,  # srv v10 and above
+                order.goodAfterTime,  # srv v11 and above
+                order.goodTillDate,  # srv v12 and above
+                order.faGroup,  # srv v13 and above
+                order.faMethod,  # srv v13 and above
+                order.faPercentage,  # srv v13 and above
+            )
+            if not caps.FA_PROFILE_DESUPPORT:
+                w.field("")  # send deprecated faProfile field
+
+            if caps.MODELS_SUPPORT:
+                w.field(order.modelCode)
 
             # institutional short saleslot data (srv v18 and above)
-            flds += [
-                make_field(
-                    order.shortSaleSlot
-                ),  # 0 for retail, 1 or 2 for institutions
-                make_field(order.designatedLocation),
-            ]  # populate only when shortSaleSlot = 2.
-            if self.serverVersion() >= MIN_SERVER_VER_SSHORTX_OLD:
-                flds.append(make_field(order.exemptCode))
+            w.field(
+                order.shortSaleSlot,  # 0 for retail, 1 or 2 for institutions
+                order.designatedLocation,  # populate only when shortSaleSlot = 2.
+            )
+            if caps.SSHORTX_OLD:
+                w.field(order.exemptCode)
 
             # srv v19 and above fields
-            flds.append(make_field(order.ocaType))
+            w.field(order.ocaType)
             # if( self.serverVersion() < 38) {
             # will never happen
             #      send( /* order.rthOnly */ false)
             # }
-            flds += [
-                make_field(order.rule80A),
-                make_field(order.settlingFirm),
-                make_field(order.allOrNone),
-                make_field_handle_empty(order.minQty),
-                make_field_handle_empty(order.percentOffset),
-                make_field(False),
-                make_field(False),
-                make_field_handle_empty(UNSET_DOUBLE),
-                make_field(
-                    order.auctionStrategy
-                ),  # AUCTION_MATCH, AUCTION_IMPROVEMENT, AUCTION_TRANSPARENT
-                make_field_handle_empty(order.startingPrice),
-                make_field_handle_empty(order.stockRefPrice),
-                make_field_handle_empty(order.delta),
-                make_field_handle_empty(order.stockRangeLower),
-                make_field_handle_empty(order.stockRangeUpper),
-                make_field(order.overridePercentageConstraints),  # srv v22 and above
-                # Volatility orders (srv v26 and above)
-                make_field_handle_empty(order.volatility),
-                make_field_handle_empty(order.volatilityType),
-                make_field(order.deltaNeutralOrderType),  # srv v28 and above
-                make_field_handle_empty(order.deltaNeutralAuxPrice),
-            ]  # srv v28 and above
-
-            if (
-                self.serverVersion() >= MIN_SERVER_VER_DELTA_NEUTRAL_CONID
-                and order.deltaNeutralOrderType
-            ):
-                flds += [
-                    make_field(order.deltaNeutralConId),
-                    make_field(order.deltaNeutralSettlingFirm),
-                    make_field(order.deltaNeutralClearingAccount),
-                    make_field(order.deltaNeutralClearingIntent),
-                ]
+            w.field(order.rule80A, order.settlingFirm, order.allOrNone)
+            w.fieldHandleEmpty(order.minQty)
+            w.fieldHandleEmpty(order.percentOffset)
+            w.field(False, False)
+            w.fieldHandleEmpty(UNSET_DOUBLE)
+            # AUCTION_MATCH, AUCTION_IMPROVEMENT, AUCTION_TRANSPARENT
+            w.field(order.auctionStrategy)
+            w.fieldHandleEmpty(order.startingPrice)
+            w.fieldHandleEmpty(order.stockRefPrice)
+            w.fieldHandleEmpty(order.delta)
+            w.fieldHandleEmpty(order.stockRangeLower)
+            w.fieldHandleEmpty(order.stockRangeUpper)
+            w.field(order.overridePercentageConstraints)  # srv v22 and above
+            # Volatility orders (srv v26 and above)
+            w.fieldHandleEmpty(order.volatility)
+            w.fieldHandleEmpty(order.volatilityType)
+            w.field(order.deltaNeutralOrderType)  # srv v28 and above
+            w.fieldHandleEmpty(order.deltaNeutralAuxPrice)  # srv v28 and above
+
+            if caps.DELTA_NEUTRAL_CONID and order.deltaNeutralOrderType:
+                w.field(
+                    order.deltaNeutralConId,
+                    order.deltaNeutralSettlingFirm,
+                    order.deltaNeutralClearingAccount,
+                    order.deltaNeutralClearingIntent,
+                )
 
-            if (
-                self.serverVersion() >= MIN_SERVER_VER_DELTA_NEUTRAL_OPEN_CLOSE
-                and order.deltaNeutralOrderType
-            ):
-                flds += [
-                    make_field(order.deltaNeutralOpenClose),
-                    make_field(order.deltaNeutralShortSale),
-                    make_field(order.deltaNeutralShortSaleSlot),
-                    make_field(order.deltaNeutralDesignatedLocation),
-                ]
+            if caps.DELTA_NEUTRAL_OPEN_CLOSE and order.deltaNeutralOrderType:
+                w.field(
+                    order.deltaNeutralOpenClose,
+                    order.deltaNeutralShortSale,
+                    order.deltaNeutralShortSaleSlot,
+                    order.deltaNeutralDesignatedLocation,
+                )
 
-            flds += [
-                make_field(order.continuousUpdate),
-                make_field_handle_empty(order.referencePriceType),
-                make_field_handle_empty(order.trailStopPrice),
-            ]  # srv v30 and above
+            w.field(order.continuousUpdate)
+            w.fieldHandleEmpty(order.referencePriceType)
+            w.fieldHandleEmpty(order.trailStopPrice)  # srv v30 and above
 
-            if self.serverVersion() >= MIN_SERVER_VER_TRAILING_PERCENT:
-                flds.append(make_field_handle_empty(order.trailingPercent))
+            if caps.TRAILING_PERCENT:
+                w.fieldHandleEmpty(order.trailingPercent)
 
             # SCALE orders
-            if self.serverVersion() >= MIN_SERVER_VER_SCALE_ORDERS2:
-                flds += [
-                    make_field_handle_empty(order.scaleInitLevelSize),
-                    make_field_handle_empty(order.scaleSubsLevelSize),
-                ]
+            if caps.SCALE_ORDERS2:
+                w.fieldHandleEmpty(order.scaleInitLevelSize)
+                w.fieldHandleEmpty(order.scaleSubsLevelSize)
             else:
                 # srv v35 and above)
-                flds += [
-                    make_field(""),  # for not supported scaleNumComponents
-                    make_field_handle_empty(order.scaleInitLevelSize),
-                ]  # for scaleComponentSize
+                w.field("")  # for not supported scaleNumComponents
+                w.fieldHandleEmpty(order.scaleInitLevelSize)  # for scaleComponentSize
 
-            flds.append(make_field_handle_empty(order.scalePriceIncrement))
+            w.fieldHandleEmpty(order.scalePriceIncrement)
 
             if (
-                self.serverVersion() >= MIN_SERVER_VER_SCALE_ORDERS3
+                caps.SCALE_ORDERS3
                 and order.scalePriceIncrement != UNSET_DOUBLE
                 and order.scalePriceIncrement > 0.0
             ):
-                flds += [
-                    make_field_handle_empty(order.scalePriceAdjustValue),
-                    make_field_handle_empty(order.scalePriceAdjustInterval),
-                    make_field_handle_empty(order.scaleProfitOffset),
-                    make_field(order.scaleAutoReset),
-                    make_field_handle_empty(order.scaleInitPosition),
-                    make_field_handle_empty(order.scaleInitFillQty),
-                    make_field(order.scaleRandomPercent),
-                ]
+                w.fieldHandleEmpty(order.scalePriceAdjustValue)
+                w.fieldHandleEmpty(order.scalePriceAdjustInterval)
+                w.fieldHandleEmpty(order.scaleProfitOffset)
+                w.field(order.scaleAutoReset)
+                w.fieldHandleEmpty(order.scaleInitPosition)
+                w.fieldHandleEmpty(order.scaleInitFillQty)
+                w.field(order.scaleRandomPercent)
 
-            if self.serverVersion() >= MIN_SERVER_VER_SCALE_TABLE:
-                flds += [
-                    make_field(order.scaleTable),
-                    make_field(order.activeStartTime),
-                    make_field(order.activeStopTime),
-                ]
+            if caps.SCALE_TABLE:
+                w.field(order.scaleTable, order.activeStartTime, order.activeStopTime)
 
             # HEDGE orders
-            if self.serverVersion() >= MIN_SERVER_VER_HEDGE_ORDERS:
-                flds.append(make_field(order.hedgeType))
+            if caps.HEDGE_ORDERS:
+                w.field(order.hedgeType)
                 if order.hedgeType:
-                    flds.append(make_field(order.hedgeParam))
+                    w.field(order.hedgeParam)
 
-            if self.serverVersion() >= MIN_SERVER_VER_OPT_OUT_SMART_ROUTING:
-                flds.append(make_field(order.optOutSmartRouting))
+            if caps.OPT_OUT_SMART_ROUTING:
+                w.field(order.optOutSmartRouting)
 
-            if self.serverVersion() >= MIN_SERVER_VER_PTA_ORDERS:
-                flds += [
-                    make_field(order.clearingAccount),
-                    make_field(order.clearingIntent),
-                ]
+            if caps.PTA_ORDERS:
+                w.field(order.clearingAccount, order.clearingIntent)
 
-            if self.serverVersion() >= MIN_SERVER_VER_NOT_HELD:
-                flds.append(make_field(order.notHeld))
+            if caps.NOT_HELD:
+                w.field(order.notHeld)
 
-            if self.serverVersion() >= MIN_SERVER_VER_DELTA_NEUTRAL:
+            if caps.DELTA_NEUTRAL:
                 if contract.deltaNeutralContract:
-                    flds += [
-                        make_field(True),
-                        make_field(contract.deltaNeutralContract.conId),
-                        make_field(contract.deltaNeutralContract.delta),
-                        make_field(contract.deltaNeutralContract.price),
-                    ]
+                    w.field(
+                        True,
+                        contract.deltaNeutralContract.conId,
+                        contract.deltaNeutralContract.delta,
+                        contract.deltaNeutralContract.price,
+                    )
                 else:
-                    flds.append(make_field(False))
+                    w.field(False)
 
-            if self.serverVersion() >= MIN_SERVER_VER_ALGO_ORDERS:
-                flds.append(make_field(order.algoStrategy))
+            if caps.ALGO_ORDERS:
+                w.field(order.algoStrategy)
                 if order.algoStrategy:
                     algoParamsCount = len(order.algoParams) if order.algoParams else 0
-                    flds.append(make_field(algoParamsCount))
+                    w.field(algoParamsCount)
                     if algoParamsCount > 0:
                         for algoParam in order.algoParams:
-                            flds += [
-                                make_field(algoParam.tag),
-                                make_field(algoParam.value),
-                            ]
+                            w.field(algoParam.tag, algoParam.value)
 
-            if self.serverVersion() >= MIN_SERVER_VER_ALGO_ID:
-                flds.append(make_field(order.algoId))
+            if caps.ALGO_ID:
+                w.field(order.algoId)
 
-            flds.append(make_field(order.whatIf))  # srv v36 and above
+            w.field(order.whatIf)  # srv v36 and above
 
             # send miscOptions parameter
-            if self.serverVersion() >= MIN_SERVER_VER_LINKING:
+            if caps.LINKING:
                 miscOptionsStr = ""
                 if order.orderMiscOptions:
                     for tagValue in order.orderMiscOptions:
                         miscOptionsStr += str(tagValue)
-                flds.append(make_field(miscOptionsStr))
+                w.field(miscOptionsStr)
 
-            if self.serverVersion() >= MIN_SERVER_VER_ORDER_SOLICITED:
-                flds.append(make_field(order.solicited))
+            if caps.ORDER_SOLICITED:
+                w.field(order.solicited)
 
-            if self.serverVersion() >= MIN_SERVER_VER_RANDOMIZE_SIZE_AND_PRICE:
-                flds += [
-                    make_field(order.randomizeSize),
-                    make_field(order.randomizePrice),
-                ]
+            if caps.RANDOMIZE_SIZE_AND_PRICE:
+                w.field(order.randomizeSize, order.randomizePrice)
 
-            if self.serverVersion() >= MIN_SERVER_VER_PEGGED_TO_BENCHMARK:
+            if caps.PEGGED_TO_BENCHMARK:
                 if isPegBenchOrder(order.orderType):
-                    flds += [
-                        make_field(order.referenceContractId),
-                        make_field(order.isPeggedChangeAmountDecrease),
-                        make_field(order.peggedChangeAmount),
-                        make_field(order.referenceChangeAmount),
-                        make_field(order.referenceExchangeId),
-                    ]
+                    w.field(
+                        order.referenceContractId,
+                        order.isPeggedChangeAmountDecrease,
+                        order.peggedChangeAmount,
+                        order.referenceChangeAmount,
+                        order.referenceExchangeId,
+                    )
 
-                flds.append(make_field(len(order.conditions)))
+                w.field(len(order.conditions))
 
                 if len(order.conditions) > 0:
                     for cond in order.conditions:
-                        flds.append(make_field(cond.type()))
-                        flds += cond.make_fields()
-
-                    flds += [
-                        make_field(order.conditionsIgnoreRth),
-                        make_field(order.conditionsCancelOrder),
-                    ]
-
-                flds += [
-                    make_field(order.adjustedOrderType),
-                    make_field(order.triggerPrice),
-                    make_field(order.lmtPriceOffset),
-                    make_field(order.adjustedStopPrice),
-                    make_field(order.adjustedStopLimitPrice),
-                    make_field(order.adjustedTrailingAmount),
-                    make_field(order.adjustableTrailingUnit),
-                ]
+                        w.field(cond.type())
+                        w.text("".join(cond.make_fields()))
+
+                    w.field(order.conditionsIgnoreRth, order.conditionsCancelOrder)
+
+                w.field(
+                    order.adjustedOrderType,
+                    order.triggerPrice,
+                    order.lmtPriceOffset,
+                    order.adjustedStopPrice,
+                    order.adjustedStopLimitPrice,
+                    order.adjustedTrailingAmount,
+                    order.adjustableTrailingUnit,
+                )
 
-            if self.serverVersion() >= MIN_SERVER_VER_EXT_OPERATOR:
-                flds.append(make_field(order.extOperator))
+            if caps.EXT_OPERATOR:
+                w.field(order.extOperator)
 
-            if self.serverVersion() >= MIN_SERVER_VER_SOFT_DOLLAR_TIER:
-                flds += [
-                    make_field(order.softDollarTier.name),
-                    make_field(order.softDollarTier.val),
-                ]
+            if caps.SOFT_DOLLAR_TIER:
+                w.field(order.softDollarTier.name, order.softDollarTier.val)
 
-            if self.serverVersion() >= MIN_SERVER_VER_CASH_QTY:
-                flds.append(make_field(order.cashQty))
+            if caps.CASH_QTY:
+                w.field(order.cashQty)
 
-            if self.serverVersion() >= MIN_SERVER_VER_DECISION_MAKER:
-                flds.append(make_field(order.mifid2DecisionMaker))
-                flds.append(make_field(order.mifid2DecisionAlgo))
+            if caps.DECISION_MAKER:
+                w.field(order.mifid2DecisionMaker, order.mifid2DecisionAlgo)
 
-            if self.serverVersion() >= MIN_SERVER_VER_MIFID_EXECUTION:
-                flds.append(make_field(order.mifid2ExecutionTrader))
-                flds.append(make_field(order.mifid2ExecutionAlgo))
+            if caps.MIFID_EXECUTION:
+                w.field(order.mifid2ExecutionTrader, order.mifid2ExecutionAlgo)
 
-            if self.serverVersion() >= MIN_SERVER_VER_AUTO_PRICE_FOR_HEDGE:
-                flds.append(make_field(order.dontUseAutoPriceForHedge))
+            if caps.AUTO_PRICE_FOR_HEDGE:
+                w.field(order.dontUseAutoPriceForHedge)
 
-            if self.serverVersion() >= MIN_SERVER_VER_ORDER_CONTAINER:
-                flds.append(make_field(order.isOmsContainer))
+            if caps.ORDER_CONTAINER:
+                w.field(order.isOmsContainer)
 
-            if self.serverVersion() >= MIN_SERVER_VER_D_PEG_ORDERS:
-                flds.append(make_field(order.discretionaryUpToLimitPrice))
+            if caps.D_PEG_ORDERS:
+                w.field(order.discretionaryUpToLimitPrice)
 
-            if self.serverVersion() >= MIN_SERVER_VER_PRICE_MGMT_ALGO:
-                flds.append(
-                    make_field_handle_empty(
-                        UNSET_INTEGER
-                        if order.usePriceMgmtAlgo is None
-                        else 1
-                        if order.usePriceMgmtAlgo
-                        else 0
-                    )
+            if caps.PRICE_MGMT_ALGO:
+                w.fieldHandleEmpty(
+                    UNSET_INTEGER
+                    if order.usePriceMgmtAlgo is None
+                    else 1
+                    if order.usePriceMgmtAlgo
+                    else 0
                 )
 
-            if self.serverVersion() >= MIN_SERVER_VER_DURATION:
-                flds.append(make_field(order.duration))
+            if caps.DURATION:
+                w.field(order.duration)
 
-            if self.serverVersion() >= MIN_SERVER_VER_POST_TO_ATS:
-                flds.append(make_field(order.postToAts))
+            if caps.POST_TO_ATS:
+                w.field(order.postToAts)
 
-            if self.serverVersion() >= MIN_SERVER_VER_AUTO_CANCEL_PARENT:
-                flds.append(make_field(order.autoCancelParent))
+            if caps.AUTO_CANCEL_PARENT:
+                w.field(order.autoCancelParent)
 
-            if self.serverVersion() >= MIN_SERVER_VER_ADVANCED_ORDER_REJECT:
-                flds.append(make_field(order.advancedErrorOverride))
+            if caps.ADVANCED_ORDER_REJECT:
+                w.field(order.advancedErrorOverride)
 
-            if self.serverVersion() >= MIN_SERVER_VER_MANUAL_ORDER_TIME:
-                flds.append(make_field(order.manualOrderTime))
+            if caps.MANUAL_ORDER_TIME:
+                w.field(order.manualOrderTime)
 
-            if self.serverVersion() >= MIN_SERVER_VER_PEGBEST_PEGMID_OFFSETS:
+            if caps.PEGBEST_PEGMID_OFFSETS:
                 sendMidOffsets = False
                 if contract.exchange == "IBKRATS":
-                    flds.append(make_field_handle_empty(order.minTradeQty))
+                    w.fieldHandleEmpty(order.minTradeQty)
                 if isPegBestOrder(order.orderType):
-                    flds.append(make_field_handle_empty(order.minCompeteSize))
-                    flds.append(make_field_handle_empty(order.competeAgainstBestOffset))
+                    w.fieldHandleEmpty(order.minCompeteSize)
+                    w.fieldHandleEmpty(order.competeAgainstBestOffset)
                     if (
                         order.competeAgainstBestOffset
                         == COMPETE_AGAINST_BEST_OFFSET_UP_TO_MID
@@ -2037,20 +2061,19 @@ class EClient(object):
                 elif isPegMidOrder(order.orderType):
                     sendMidOffsets = True
                 if sendMidOffsets:
-                    flds.append(make_field_handle_empty(order.midOffsetAtWhole))
-                    flds.append(make_field_handle_empty(order.midOffsetAtHalf))
+                    w.fieldHandleEmpty(order.midOffsetAtWhole)
+                    w.fieldHandleEmpty(order.midOffsetAtHalf)
 
-            if self.serverVersion() >= MIN_SERVER_VER_CUSTOMER_ACCOUNT:
-                flds.append(make_field(order.customerAccount))
+            if caps.CUSTOMER_ACCOUNT:
+                w.field(order.customerAccount)
 
-            if self.serverVersion() >= MIN_SERVER_VER_PROFESSIONAL_CUSTOMER:
-                flds.append(make_field(order.professionalCustomer))
+            if caps.PROFESSIONAL_CUSTOMER:
+                w.field(order.professionalCustomer)
 
-            if self.serverVersion() >= MIN_SERVER_VER_RFQ_FIELDS:
-                flds.append(make_field(order.externalUserId))
-                flds.append(make_field(order.manualOrderIndicator))
+            if caps.RFQ_FIELDS:
+                w.field(order.externalUserId, order.manualOrderIndicator)
 
-            msg = "".join(flds)
+            msg = w.msg()
 
         except ClientException as ex:
             self.wrapper.error(orderId, ex.code, ex.msg + ex.text)
@@ -2070,10 +2093,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if (
-            self.serverVersion() < MIN_SERVER_VER_MANUAL_ORDER_TIME
-            and orderCancel.manualOrderCancelTime
-        ):
+        if not self.serverCaps.MANUAL_ORDER_TIME and orderCancel.manualOrderCancelTime:
             self.wrapper.error(
                 orderId,
                 UPDATE_TWS.code(),
@@ -2083,7 +2103,7 @@ class EClient(object):
             return
 
         if (
-            self.serverVersion() < MIN_SERVER_VER_RFQ_FIELDS
+            not self.serverCaps.RFQ_FIELDS
             and (orderCancel.extOperator or orderCancel.externalUserId or orderCancel.manualOrderIndicator != UNSET_INTEGER) 
         ):
             self.wrapper.error(
@@ -2096,20 +2116,21 @@ class EClient(object):
         try:
             VERSION = 1
 
-            flds = []
-            flds += [make_field(OUT.CANCEL_ORDER)]
-            flds += [make_field(VERSION)]
-            flds += [make_field(orderId)]
+            w = comm.fieldWriter()
+            w.start(OUT.CANCEL_ORDER)
+            w.field(VERSION, orderId)
 
-            if self.serverVersion() >= MIN_SERVER_VER_MANUAL_ORDER_TIME:
-                flds += [make_field(orderCancel.manualOrderCancelTime)]
+            if self.serverCaps.MANUAL_ORDER_TIME:
+                w.field(orderCancel.manualOrderCancelTime)
 
-            if self.serverVersion() >= MIN_SERVER_VER_RFQ_FIELDS:
-                flds += [make_field(orderCancel.extOperator)]
-                flds += [make_field(orderCancel.externalUserId)]
-                flds += [make_field(orderCancel.manualOrderIndicator)]
+            if self.serverCaps.RFQ_FIELDS:
+                w.field(
+                    orderCancel.extOperator,
+                    orderCancel.externalUserId,
+                    orderCancel.manualOrderIndicator,
+                )
 
-            msg = "".join(flds)
+            msg = w.msg()
 
         except ClientException as ex:
             self.wrapper.error(orderId, ex.code, ex.msg + ex.text)
@@ -2375,7 +2396,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_POSITIONS:
+        if not self.serverCaps.POSITIONS:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -2398,7 +2419,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_POSITIONS:
+        if not self.serverCaps.POSITIONS:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -2423,7 +2444,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_MODELS_SUPPORT:
+        if not self.serverCaps.MODELS_SUPPORT:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -2455,7 +2476,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_MODELS_SUPPORT:
+        if not self.serverCaps.MODELS_SUPPORT:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -2484,7 +2505,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_MODELS_SUPPORT:
+        if not self.serverCaps.MODELS_SUPPORT:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -2518,7 +2539,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_MODELS_SUPPORT:
+        if not self.serverCaps.MODELS_SUPPORT:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -2547,7 +2568,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_PNL:
+        if not self.serverCaps.PNL:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -2576,7 +2597,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_PNL:
+        if not self.serverCaps.PNL:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -2595,7 +2616,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_PNL:
+        if not self.serverCaps.PNL:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -2625,7 +2646,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_PNL:
+        if not self.serverCaps.PNL:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -2669,7 +2690,7 @@ class EClient(object):
             flds = []
             flds += [make_field(OUT.REQ_EXECUTIONS), make_field(VERSION)]
 
-            if self.serverVersion() >= MIN_SERVER_VER_EXECUTION_DATA_CHAIN:
+            if self.serverCaps.EXECUTION_DATA_CHAIN:
                 flds += [
                     make_field(reqId),
                 ]
@@ -2713,7 +2734,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_SEC_ID_TYPE:
+        if not self.serverCaps.SEC_ID_TYPE:
             if contract.secIdType or contract.secId:
                 self.wrapper.error(
                     reqId,
@@ -2723,7 +2744,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_TRADING_CLASS:
+        if not self.serverCaps.TRADING_CLASS:
             if contract.tradingClass:
                 self.wrapper.error(
                     reqId,
@@ -2733,7 +2754,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_LINKING:
+        if not self.serverCaps.LINKING:
             if contract.primaryExchange:
                 self.wrapper.error(
                     reqId,
@@ -2743,7 +2764,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_BOND_ISSUERID:
+        if not self.serverCaps.BOND_ISSUERID:
             if contract.issuerId:
                 self.wrapper.error(
                     reqId,
@@ -2760,7 +2781,7 @@ class EClient(object):
             flds = []
             flds += [make_field(OUT.REQ_CONTRACT_DATA), make_field(VERSION)]
 
-            if self.serverVersion() >= MIN_SERVER_VER_CONTRACT_DATA_CHAIN:
+            if self.serverCaps.CONTRACT_DATA_CHAIN:
                 flds += [
                     make_field(reqId),
                 ]
@@ -2776,12 +2797,12 @@ class EClient(object):
                 make_field(contract.multiplier),
             ]  # srv v15 and above
 
-            if self.serverVersion() >= MIN_SERVER_VER_PRIMARYEXCH:
+            if self.serverCaps.PRIMARYEXCH:
                 flds += [
                     make_field(contract.exchange),
                     make_field(contract.primaryExchange),
                 ]
-            elif self.serverVersion() >= MIN_SERVER_VER_LINKING:
+            elif self.serverCaps.LINKING:
                 if contract.primaryExchange and (
                     contract.exchange == "BEST" or contract.exchange == "SMART"
                 ):
@@ -2794,7 +2815,7 @@ class EClient(object):
                     ]
 
             flds += [make_field(contract.currency), make_field(contract.localSymbol)]
-            if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
+            if self.serverCaps.TRADING_CLASS:
                 flds += [
                     make_field(contract.tradingClass),
                 ]
@@ -2802,10 +2823,10 @@ class EClient(object):
                 make_field(contract.includeExpired),
             ]  # srv v31 and above
 
-            if self.serverVersion() >= MIN_SERVER_VER_SEC_ID_TYPE:
+            if self.serverCaps.SEC_ID_TYPE:
                 flds += [make_field(contract.secIdType), make_field(contract.secId)]
 
-            if self.serverVersion() >= MIN_SERVER_VER_BOND_ISSUERID:
+            if self.serverCaps.BOND_ISSUERID:
                 flds += [
                     make_field(contract.issuerId),
                 ]
@@ -2829,7 +2850,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_MKT_DEPTH_EXCHANGES:
+        if not self.serverCaps.REQ_MKT_DEPTH_EXCHANGES:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -2875,7 +2896,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_TRADING_CLASS:
+        if not self.serverCaps.TRADING_CLASS:
             if contract.tradingClass or contract.conId > 0:
                 self.wrapper.error(
                     reqId,
@@ -2885,7 +2906,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_SMART_DEPTH and isSmartDepth:
+        if not self.serverCaps.SMART_DEPTH and isSmartDepth:
             self.wrapper.error(
                 reqId,
                 UPDATE_TWS.code(),
@@ -2893,10 +2914,7 @@ class EClient(object):
             )
             return
 
-        if (
-            self.serverVersion() < MIN_SERVER_VER_MKT_DEPTH_PRIM_EXCHANGE
-            and contract.primaryExchange
-        ):
+        if not self.serverCaps.MKT_DEPTH_PRIM_EXCHANGE and contract.primaryExchange:
             self.wrapper.error(
                 reqId,
                 UPDATE_TWS.code(),
@@ -2917,7 +2935,7 @@ class EClient(object):
             ]
 
             # send contract fields
-            if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
+            if self.serverCaps.TRADING_CLASS:
                 flds += [
                     make_field(contract.conId),
                 ]
@@ -2930,12 +2948,12 @@ class EClient(object):
                 make_field(contract.multiplier),  # srv v15 and above
                 make_field(contract.exchange),
             ]
-            if self.serverVersion() >= MIN_SERVER_VER_MKT_DEPTH_PRIM_EXCHANGE:
+            if self.serverCaps.MKT_DEPTH_PRIM_EXCHANGE:
                 flds += [
                     make_field(contract.primaryExchange),
                 ]
             flds += [make_field(contract.currency), make_field(contract.localSymbol)]
-            if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
+            if self.serverCaps.TRADING_CLASS:
                 flds += [
                     make_field(contract.tradingClass),
                 ]
@@ -2944,13 +2962,13 @@ class EClient(object):
                 make_field(numRows),
             ]  # srv v19 and above
 
-            if self.serverVersion() >= MIN_SERVER_VER_SMART_DEPTH:
+            if self.serverCaps.SMART_DEPTH:
                 flds += [
                     make_field(isSmartDepth),
                 ]
 
             # send mktDepthOptions parameter
-            if self.serverVersion() >= MIN_SERVER_VER_LINKING:
+            if self.serverCaps.LINKING:
                 # current doc says this part if for "internal use only" -> won't support it
                 if mktDepthOptions:
                     raise NotImplementedError("not supported")
@@ -2981,7 +2999,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_SMART_DEPTH and isSmartDepth:
+        if not self.serverCaps.SMART_DEPTH and isSmartDepth:
             self.wrapper.error(
                 reqId,
                 UPDATE_TWS.code(),
@@ -2999,7 +3017,7 @@ class EClient(object):
             make_field(reqId),
         ]
 
-        if self.serverVersion() >= MIN_SERVER_VER_SMART_DEPTH:
+        if self.serverCaps.SMART_DEPTH:
             flds += [make_field(isSmartDepth)]
 
         msg = "".join(flds)
@@ -3086,7 +3104,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() >= MIN_SERVER_VER_FA_PROFILE_DESUPPORT and faData == 2:
+        if self.serverCaps.FA_PROFILE_DESUPPORT and faData == 2:
             self.wrapper.error(
                 NO_VALID_ID,
                 FA_PROFILE_NOT_SUPPORTED.code(),
@@ -3118,7 +3136,7 @@ class EClient(object):
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() >= MIN_SERVER_VER_FA_PROFILE_DESUPPORT and faData == 2:
+        if self.serverCaps.FA_PROFILE_DESUPPORT and faData == 2:
             self.wrapper.error(
                 reqId, FA_PROFILE_NOT_SUPPORTED.code(), FA_PROFILE_NOT_SUPPORTED.msg()
             )
@@ -3134,7 +3152,7 @@ class EClient(object):
                 + make_field(cxml)
             )
 
-            if self.serverVersion() >= MIN_SERVER_VER_REPLACE_FA_END:
+            if self.serverCaps.REPLACE_FA_END:
                 msg += make_field(reqId)
 
         except ClientException as ex:
@@ -3221,7 +3239,7 @@ class EClient(object):
             self.wrapper.error(reqId, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_TRADING_CLASS:
+        if not self.serverCaps.TRADING_CLASS:
             if contract.tradingClass or contract.conId > 0:
                 self.wrapper.error(
                     reqId,
@@ -3231,7 +3249,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_HISTORICAL_SCHEDULE:
+        if not self.serverCaps.HISTORICAL_SCHEDULE:
             if whatToShow == "SCHEDULE":
                 self.wrapper.error(
                     reqId,
@@ -3245,80 +3263,64 @@ class EClient(object):
             VERSION = 6
 
             # send req mkt data msg
-            flds = []
-            flds += [
-                make_field(OUT.REQ_HISTORICAL_DATA),
-            ]
+            w = comm.fieldWriter()
+            w.start(OUT.REQ_HISTORICAL_DATA)
 
-            if self.serverVersion() < MIN_SERVER_VER_SYNT_REALTIME_BARS:
-                flds += [
-                    make_field(VERSION),
-                ]
+            if not self.serverCaps.SYNT_REALTIME_BARS:
+                w.field(VERSION)
 
-            flds += [
-                make_field(reqId),
-            ]
+            w.field(reqId)
 
             # send contract fields
-            if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
-                flds += [
-                    make_field(contract.conId),
-                ]
-            flds += [
-                make_field(contract.symbol),
-                make_field(contract.secType),
-                make_field(contract.lastTradeDateOrContractMonth),
-                make_field(contract.strike),
-                make_field(contract.right),
-                make_field(contract.multiplier),
-                make_field(contract.exchange),
-                make_field(contract.primaryExchange),
-                make_field(contract.currency),
-                make_field(contract.localSymbol),
-            ]
-            if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
-                flds += [
-                    make_field(contract.tradingClass),
-                ]
-            flds += [
-                make_field(contract.includeExpired),  # srv v31 and above
-                make_field(endDateTime),  # srv v20 and above
-                make_field(barSizeSetting),  # srv v20 and above
-                make_field(durationStr),
-                make_field(useRTH),
-                make_field(whatToShow),
-                make_field(formatDate),
-            ]  # srv v16 and above
+            if self.serverCaps.TRADING_CLASS:
+                w.field(contract.conId)
+            w.field(
+                contract.symbol,
+                contract.secType,
+                contract.lastTradeDateOrContractMonth,
+                contract.strike,
+                contract.right,
+                contract.multiplier,
+                contract.exchange,
+                contract.primaryExchange,
+                contract.currency,
+                contract.localSymbol,
+            )
+            if self.serverCaps.TRADING_CLASS:
+                w.field(contract.tradingClass)
+            w.field(
+                contract.includeExpired,  # srv v31 and above
+                endDateTime,  # srv v20 and above
+                barSizeSetting,  # srv v20 and above
+                durationStr,
+                useRTH,
+                whatToShow,
+                formatDate,  # srv v16 and above
+            )
 
             # Send combo legs for BAG requests
             if contract.secType == "BAG":
-                flds += [
-                    make_field(len(contract.comboLegs)),
-                ]
+                w.field(len(contract.comboLegs))
                 for comboLeg in contract.comboLegs:
-                    flds += [
-                        make_field(comboLeg.conId),
-                        make_field(comboLeg.ratio),
-                        make_field(comboLeg.action),
-                        make_field(comboLeg.exchange),
-                    ]
+                    w.field(
+                        comboLeg.conId,
+                        comboLeg.ratio,
+                        comboLeg.action,
+                        comboLeg.exchange,
+                    )
 
-            if self.serverVersion() >= MIN_SERVER_VER_SYNT_REALTIME_BARS:
-                flds += [
-                    make_field(keepUpToDate),
-                ]
+            if self.serverCaps.SYNT_REALTIME_BARS:
+                w.field(keepUpToDate)
 
             # send chartOptions parameter
-            if self.serverVersion() >= MIN_SERVER_VER_LINKING:
+            if self.serverCaps.LINKING:
                 chartOptionsStr = ""
                 if chartOptions:
                     for tagValue in chartOptions:
                         chartOptionsStr += str(tagValue)
-                flds += [
-                    make_field(chartOptionsStr),
-                ]
+                w.field(chartOptionsStr)
 
-            msg = "".join(flds)
+            msg = w.msg()
 
         except ClientException as ex:
             self.wrapper.error(reqId, ex.code, ex.msg + ex.text)
@@ -3366,7 +3368,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_HEAD_TIMESTAMP:
+        if not self.serverCaps.REQ_HEAD_TIMESTAMP:
             self.wrapper.error(
                 reqId,
                 UPDATE_TWS.code(),
@@ -3412,7 +3414,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_CANCEL_HEADTIMESTAMP:
+        if not self.serverCaps.CANCEL_HEADTIMESTAMP:
             self.wrapper.error(
                 reqId,
                 UPDATE_TWS.code(),
@@ -3435,7 +3437,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_HISTOGRAM:
+        if not self.serverCaps.REQ_HISTOGRAM:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -3480,7 +3482,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_HISTOGRAM:
+        if not self.serverCaps.REQ_HISTOGRAM:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -3510,7 +3512,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_HISTORICAL_TICKS:
+        if not self.serverCaps.HISTORICAL_TICKS:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -3599,7 +3601,7 @@ class EClient(object):
             return
 
         if (
-            self.serverVersion() < MIN_SERVER_VER_SCANNER_GENERIC_OPTS
+            not self.serverCaps.SCANNER_GENERIC_OPTS
             and scannerSubscriptionFilterOptions is not None
         ):
             self.wrapper.error(
@@ -3616,7 +3618,7 @@ class EClient(object):
             flds = []
             flds += [make_field(OUT.REQ_SCANNER_SUBSCRIPTION)]
 
-            if self.serverVersion() < MIN_SERVER_VER_SCANNER_GENERIC_OPTS:
+            if not self.serverCaps.SCANNER_GENERIC_OPTS:
                 flds += [make_field(VERSION)]
 
             flds += [
@@ -3647,7 +3649,7 @@ class EClient(object):
             ]  # srv v27 and above
 
             # send scannerSubscriptionFilterOptions parameter
-            if self.serverVersion() >= MIN_SERVER_VER_SCANNER_GENERIC_OPTS:
+            if self.serverCaps.SCANNER_GENERIC_OPTS:
                 scannerSubscriptionFilterOptionsStr = ""
                 if scannerSubscriptionFilterOptions:
                     for tagValueOpt in scannerSubscriptionFilterOptions:
@@ -3655,7 +3657,7 @@ class EClient(object):
                 flds += [make_field(scannerSubscriptionFilterOptionsStr)]
 
             # send scannerSubscriptionOptions parameter
-            if self.serverVersion() >= MIN_SERVER_VER_LINKING:
+            if self.serverCaps.LINKING:
                 scannerSubscriptionOptionsStr = ""
                 if scannerSubscriptionOptions:
                     for tagValueOpt in scannerSubscriptionOptions:
@@ -3736,7 +3738,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_TRADING_CLASS:
+        if not self.serverCaps.TRADING_CLASS:
             if contract.tradingClass:
                 self.wrapper.error(
                     reqId,
@@ -3757,7 +3759,7 @@ class EClient(object):
             ]
 
             # send contract fields
-            if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
+            if self.serverCaps.TRADING_CLASS:
                 flds += [
                     make_field(contract.conId),
                 ]
@@ -3773,14 +3775,14 @@ class EClient(object):
                 make_field(contract.currency),
                 make_field(contract.localSymbol),
             ]
-            if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
+            if self.serverCaps.TRADING_CLASS:
                 flds += [
                     make_field(contract.tradingClass),
                 ]
             flds += [make_field(barSize), make_field(whatToShow), make_field(useRTH)]
 
             # send realTimeBarsOptions parameter
-            if self.serverVersion() >= MIN_SERVER_VER_LINKING:
+            if self.serverCaps.LINKING:
                 realTimeBarsOptionsStr = ""
                 if realTimeBarsOptions:
                     for tagValueOpt in realTimeBarsOptions:
@@ -3862,7 +3864,7 @@ class EClient(object):
         try:
             VERSION = 2
 
-            if self.serverVersion() < MIN_SERVER_VER_FUNDAMENTAL_DATA:
+            if not self.serverCaps.FUNDAMENTAL_DATA:
                 self.wrapper.error(
                     NO_VALID_ID,
                     UPDATE_TWS.code(),
@@ -3871,7 +3873,7 @@ class EClient(object):
                 )
                 return
 
-            if self.serverVersion() < MIN_SERVER_VER_TRADING_CLASS:
+            if not self.serverCaps.TRADING_CLASS:
                 self.wrapper.error(
                     NO_VALID_ID,
                     UPDATE_TWS.code(),
@@ -3888,7 +3890,7 @@ class EClient(object):
             ]
 
             # send contract fields
-            if self.serverVersion() >= MIN_SERVER_VER_TRADING_CLASS:
+            if self.serverCaps.TRADING_CLASS:
                 flds += [
                     make_field(contract.conId),
                 ]
@@ -3902,7 +3904,7 @@ class EClient(object):
                 make_field(reportType),
             ]
 
-            if self.serverVersion() >= MIN_SERVER_VER_LINKING:
+            if self.serverCaps.LINKING:
                 fundDataOptStr = ""
                 tagValuesCount = (
                     len(fundamentalDataOptions) if fundamentalDataOptions else 0
@@ -3931,7 +3933,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_FUNDAMENTAL_DATA:
+        if not self.serverCaps.FUNDAMENTAL_DATA:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -3960,7 +3962,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_NEWS_PROVIDERS:
+        if not self.serverCaps.REQ_NEWS_PROVIDERS:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -3985,7 +3987,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_NEWS_ARTICLE:
+        if not self.serverCaps.REQ_NEWS_ARTICLE:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4004,7 +4006,7 @@ class EClient(object):
             ]
 
             # send newsArticleOptions parameter
-            if self.serverVersion() >= MIN_SERVER_VER_NEWS_QUERY_ORIGINS:
+            if self.serverCaps.NEWS_QUERY_ORIGINS:
                 newsArticleOptionsStr = ""
                 if newsArticleOptions:
                     for tagValue in newsArticleOptions:
@@ -4037,7 +4039,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_HISTORICAL_NEWS:
+        if not self.serverCaps.REQ_HISTORICAL_NEWS:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4059,7 +4061,7 @@ class EClient(object):
             ]
 
             # send historicalNewsOptions parameter
-            if self.serverVersion() >= MIN_SERVER_VER_NEWS_QUERY_ORIGINS:
+            if self.serverCaps.NEWS_QUERY_ORIGINS:
                 historicalNewsOptionsStr = ""
                 if historicalNewsOptions:
                     for tagValue in historicalNewsOptionsStr:
@@ -4095,7 +4097,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_LINKING:
+        if not self.serverCaps.LINKING:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4124,7 +4126,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_LINKING:
+        if not self.serverCaps.LINKING:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4160,7 +4162,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_LINKING:
+        if not self.serverCaps.LINKING:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4193,7 +4195,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_LINKING:
+        if not self.serverCaps.LINKING:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4222,7 +4224,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_LINKING:
+        if not self.serverCaps.LINKING:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4265,7 +4267,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_LINKING:
+        if not self.serverCaps.LINKING:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4298,7 +4300,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_LINKING:
+        if not self.serverCaps.LINKING:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4342,7 +4344,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_LINKING:
+        if not self.serverCaps.LINKING:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4388,7 +4390,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_SEC_DEF_OPT_PARAMS_REQ:
+        if not self.serverCaps.SEC_DEF_OPT_PARAMS_REQ:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4438,7 +4440,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_FAMILY_CODES:
+        if not self.serverCaps.REQ_FAMILY_CODES:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4457,7 +4459,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_REQ_MATCHING_SYMBOLS:
+        if not self.serverCaps.REQ_MATCHING_SYMBOLS:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4501,7 +4503,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_WSHE_CALENDAR:
+        if not self.serverCaps.WSHE_CALENDAR:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4525,7 +4527,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_WSHE_CALENDAR:
+        if not self.serverCaps.WSHE_CALENDAR:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4541,7 +4543,7 @@ class EClient(object):
         self,
         reqId: int,
         wshEventData: WshEventData,
-        MIN_SERVER_VER_WSH_EVENT_DATA_FILTERS_DATE=None,
+        MIN_SERVER_VER_WSH_EVENT_DATA_FILTERS_DATE=None,  # unused
     ):
         self.logRequest(current_fn_name(), vars())
 
@@ -4549,7 +4551,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_WSHE_CALENDAR:
+        if not self.serverCaps.WSHE_CALENDAR:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4557,7 +4559,7 @@ class EClient(object):
             )
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_WSH_EVENT_DATA_FILTERS:
+        if not self.serverCaps.WSH_EVENT_DATA_FILTERS:
             if (
                 wshEventData.filter != ""
                 or wshEventData.fillWatchlist
@@ -4571,7 +4573,7 @@ class EClient(object):
                 )
                 return
 
-        if self.serverVersion() < MIN_SERVER_VER_WSH_EVENT_DATA_FILTERS_DATE:
+        if not self.serverCaps.WSH_EVENT_DATA_FILTERS_DATE:
             if (
                 wshEventData.startDate != ""
                 or wshEventData.endDate != ""
@@ -4592,13 +4594,13 @@ class EClient(object):
                 make_field(wshEventData.conId),
             ]
 
-            if self.serverVersion() >= MIN_SERVER_VER_WSH_EVENT_DATA_FILTERS:
+            if self.serverCaps.WSH_EVENT_DATA_FILTERS:
                 flds.append(make_field(wshEventData.filter))
                 flds.append(make_field(wshEventData.fillWatchlist))
                 flds.append(make_field(wshEventData.fillPortfolio))
                 flds.append(make_field(wshEventData.fillCompetitors))
 
-            if self.serverVersion() >= MIN_SERVER_VER_WSH_EVENT_DATA_FILTERS_DATE:
+            if self.serverCaps.WSH_EVENT_DATA_FILTERS_DATE:
                 flds.append(make_field(wshEventData.startDate))
                 flds.append(make_field(wshEventData.endDate))
                 flds.append(make_field(wshEventData.totalLimit))
@@ -4618,7 +4620,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_WSHE_CALENDAR:
+        if not self.serverCaps.WSHE_CALENDAR:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
@@ -4637,7 +4639,7 @@ class EClient(object):
             self.wrapper.error(NO_VALID_ID, NOT_CONNECTED.code(), NOT_CONNECTED.msg())
             return
 
-        if self.serverVersion() < MIN_SERVER_VER_USER_INFO:
+        if not self.serverCaps.USER_INFO:
             self.wrapper.error(
                 NO_VALID_ID,
                 UPDATE_TWS.code(),
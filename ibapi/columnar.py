@@ -0,0 +1,246 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Columnar decoding of the bulk historical answers into NumPy structured
+arrays, for the wrappers overriding the ARRAY_CALLBACKS of EWrapper: the
+fields of all the rows are sliced into columns and each column is
+converted at once instead of building one object (or two) per row.
+NumPy is an optional dependency (the "numpy" extra), numpy is None here
+without it.
+"""
+
+import logging
+
+from ibapi.server_versions import MIN_SERVER_VER_SYNT_REALTIME_BARS
+from ibapi.object_implem import Object
+from ibapi.utils import UNSET_DECIMAL_FIELDS, BadMessage
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+# the non empty UNSET_DECIMAL_FIELDS once parsed
+UNSET_DECIMAL_FLOATS = [float(field) for field in UNSET_DECIMAL_FIELDS if field]
+
+DATE_LEN = 64  # "yyyymmdd hh:mm:ss" and the longest time zone names
+
+# the bars of a HISTORICAL_DATA message: date is the raw date string, epoch
+# the date in seconds when the bars were requested with formatDate=2 (0
+# otherwise); volume and wap are NaN when unset
+BAR_DTYPE = [
+    ("date", f"S{DATE_LEN}"),
+    ("epoch", "i8"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "f8"),
+    ("wap", "f8"),
+    ("barCount", "i8"),
+]
+
+# the ticks of the HISTORICAL_TICKS* messages; mask is the raw attribute bit
+# field (TickAttribBidAsk: askPastHigh 1, bidPastLow 2, TickAttribLast:
+# pastLimit 1, unreported 2), exchange and specialConditions are codes in
+# the StringTable passed along; sizes are NaN when unset
+TICK_DTYPE = [
+    ("time", "i8"),
+    ("price", "f8"),
+    ("size", "f8"),
+]
+
+TICK_BID_ASK_DTYPE = [
+    ("time", "i8"),
+    ("mask", "u4"),
+    ("priceBid", "f8"),
+    ("priceAsk", "f8"),
+    ("sizeBid", "f8"),
+    ("sizeAsk", "f8"),
+]
+
+TICK_LAST_DTYPE = [
+    ("time", "i8"),
+    ("mask", "u4"),
+    ("price", "f8"),
+    ("size", "f8"),
+    ("exchange", "i4"),
+    ("specialConditions", "i4"),
+]
+
+# the EWrapper callbacks opting in the arrays
+ARRAY_CALLBACKS = frozenset(
+    (
+        "historicalDataArray",
+        "historicalTicksArray",
+        "historicalTicksBidAskArray",
+        "historicalTicksLastArray",
+    )
+)
+
+
+class StringTable(Object):
+    """Dictionary encoding of the repeated strings of the arrays: code i of
+    a column is the string strings[i]. The codes are given in the order the
+    strings first appear and only ever get appended to, so they stay valid
+    across the pages of a request; the decoder uses one table per reqId."""
+
+    def __init__(self):
+        self.strings = []
+        self.codes = {}  # raw field -> code
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __getitem__(self, code):
+        return self.strings[code]
+
+    def encode(self, column):
+        """the codes of the raw fields of column, as an int32 array"""
+        codes = self.codes
+        for field in dict.fromkeys(column):
+            if field not in codes:
+                codes[field] = len(self.strings)
+                self.strings.append(field.decode(errors="backslashreplace"))
+        return numpy.fromiter(map(codes.__getitem__, column), numpy.int32, len(column))
+
+    def decode(self, codes):
+        """the strings of the codes, as a list"""
+        strings = self.strings
+        return [strings[code] for code in codes.tolist()]
+
+
+def requireNumpy(what):
+    if numpy is None:
+        raise ImportError(
+            f"{what} needs numpy, install nautilus_ibapi[numpy] or numpy itself"
+        )
+
+
+def readColumns(fields, nRows, nCols):
+    """the next nRows rows of nCols raw fields of the cursor fields, as
+    nCols columns"""
+    pos = fields.pos
+    end = pos + nRows * nCols
+    if end > len(fields.fields):
+        raise BadMessage("no more fields")
+    block = fields.fields[pos:end]
+    fields.pos = end
+    return [block[col::nCols] for col in range(nCols)]
+
+
+def floatColumn(column, emptyValue=0.0):
+    """converts like FieldCursor.read_float()"""
+    try:
+        # the common case, much faster than parsing a bytes array
+        return numpy.fromiter(map(float, column), numpy.float64, len(column))
+    except ValueError:
+        return parseColumn(column, [b""], numpy.float64, emptyValue)
+
+
+def decimalColumn(column):
+    """converts like FieldCursor.read_decimal(), NaN when unset"""
+    try:
+        values = numpy.fromiter(map(float, column), numpy.float64, len(column))
+    except ValueError:
+        return parseColumn(column, list(UNSET_DECIMAL_FIELDS), numpy.float64, numpy.nan)
+    values[numpy.isin(values, UNSET_DECIMAL_FLOATS)] = numpy.nan
+    return values
+
+
+def intColumn(column, emptyValue=0):
+    """converts like FieldCursor.read_int()"""
+    try:
+        return numpy.fromiter(map(int, column), numpy.int64, len(column))
+    except ValueError:
+        return parseColumn(column, [b""], numpy.int64, emptyValue)
+
+
+def parseColumn(column, unsetFields, dtype, unsetValue):
+    """converts column to dtype, unsetValue for the unsetFields"""
+    raw = numpy.array(column, dtype=numpy.bytes_)
+    unset = numpy.isin(raw, unsetFields)
+    raw[unset] = b"0"
+    values = raw.astype(dtype)
+    values[unset] = unsetValue
+    return values
+
+
+def epochColumn(dates):
+    """the dates in seconds, 0 for the formatted ones (yyyymmdd included)"""
+    epochs = numpy.zeros(len(dates), dtype=numpy.int64)
+    isEpoch = numpy.char.isdigit(dates) & (numpy.char.str_len(dates) > 8)
+    epochs[isEpoch] = dates[isEpoch].astype(numpy.int64)
+    return epochs
+
+
+def barsArray(fields, itemCount, serverVersion):
+    """the itemCount bars of a HISTORICAL_DATA message, as a BAR_DTYPE
+    array, read from the cursor fields"""
+
+    nCols = 8
+    if serverVersion < MIN_SERVER_VER_SYNT_REALTIME_BARS:
+        nCols += 1  # a deprecated field before barCount
+    columns = readColumns(fields, itemCount, nCols)
+
+    bars = numpy.empty(itemCount, dtype=BAR_DTYPE)
+    dates = numpy.array(columns[0], dtype=f"S{DATE_LEN}")
+    bars["date"] = dates
+    bars["epoch"] = epochColumn(dates)
+    bars["open"] = floatColumn(columns[1])
+    bars["high"] = floatColumn(columns[2])
+    bars["low"] = floatColumn(columns[3])
+    bars["close"] = floatColumn(columns[4])
+    bars["volume"] = decimalColumn(columns[5])
+    bars["wap"] = decimalColumn(columns[6])
+    bars["barCount"] = intColumn(columns[-1])
+    return bars
+
+
+def ticksArray(fields, tickCount):
+    """the tickCount ticks of a HISTORICAL_TICKS message, as a TICK_DTYPE
+    array, read from the cursor fields"""
+
+    columns = readColumns(fields, tickCount, 4)  # a skipped field 2nd
+
+    ticks = numpy.empty(tickCount, dtype=TICK_DTYPE)
+    ticks["time"] = intColumn(columns[0])
+    ticks["price"] = floatColumn(columns[2])
+    ticks["size"] = decimalColumn(columns[3])
+    return ticks
+
+
+def ticksBidAskArray(fields, tickCount):
+    """the tickCount ticks of a HISTORICAL_TICKS_BID_ASK message, as a
+    TICK_BID_ASK_DTYPE array, read from the cursor fields"""
+
+    columns = readColumns(fields, tickCount, 6)
+
+    ticks = numpy.empty(tickCount, dtype=TICK_BID_ASK_DTYPE)
+    ticks["time"] = intColumn(columns[0])
+    ticks["mask"] = intColumn(columns[1])
+    ticks["priceBid"] = floatColumn(columns[2])
+    ticks["priceAsk"] = floatColumn(columns[3])
+    ticks["sizeBid"] = decimalColumn(columns[4])
+    ticks["sizeAsk"] = decimalColumn(columns[5])
+    return ticks
+
+
+def ticksLastArray(fields, tickCount, strings):
+    """the tickCount ticks of a HISTORICAL_TICKS_LAST message, as a
+    TICK_LAST_DTYPE array encoding its strings in the StringTable strings,
+    read from the cursor fields"""
+
+    columns = readColumns(fields, tickCount, 6)
+
+    ticks = numpy.empty(tickCount, dtype=TICK_LAST_DTYPE)
+    ticks["time"] = intColumn(columns[0])
+    ticks["mask"] = intColumn(columns[1])
+    ticks["price"] = floatColumn(columns[2])
+    ticks["size"] = decimalColumn(columns[3])
+    ticks["exchange"] = strings.encode(columns[4])
+    ticks["specialConditions"] = strings.encode(columns[5])
+    return ticks
@@ -9,14 +9,18 @@ This module has tools for implementing the IB low level messaging.
 import struct
 import logging
 import sys
+import threading
 
 from ibapi.const import UNSET_INTEGER, UNSET_DOUBLE, DOUBLE_INFINITY, INFINITY_STR
+from ibapi.const import RECV_BUF_SIZE
 from ibapi.utils import ClientException
 from ibapi.utils import isAsciiPrintable
 from ibapi.errors import INVALID_SYMBOL
 
 logger = logging.getLogger(__name__)
 
+SIZE_PREFIX = struct.Struct("!I")
+
 
 def make_msg(text) -> bytes:
     # Posei Ibapi: Input validation for Posei Ibapi
@@ -64,6 +68,79 @@ def make_field_handle_empty(val) -> str:
     return make_field(val)
 
 
+class FieldWriter:
+    """Builds an outgoing message right as bytes: the same fields as
+    make_field() and make_field_handle_empty(), written one after the other
+    after a reserved length prefix, instead of joining strings encoded at
+    the end by make_msg(). Reusable, see fieldWriter(); not thread safe."""
+
+    def __init__(self):
+        self.buf = bytearray()
+
+    def start(self, msgId):
+        """starts a new message with its id field, dropping any other"""
+        buf = self.buf
+        del buf[:]
+        buf += b"\0\0\0\0"
+        buf += b"%d\0" % msgId
+
+    def field(self, *vals):
+        """like make_field(), for each of vals"""
+        buf = self.buf
+        for val in vals:
+            t = type(val)
+            if t is str:
+                if not val:
+                    buf += b"\0"  # most of the fields of a request
+                    continue
+                if not (val.isascii() and val.isprintable()):
+                    if not isAsciiPrintable(val):
+                        make_field(val)  # raises the ClientException
+                buf += val.encode()
+                buf += b"\0"
+            elif t is int:
+                buf += b"%d\0" % val
+            elif t is bool:
+                buf += b"1\0" if val else b"0\0"
+            elif val is None:
+                raise ValueError("Cannot send None to TWS")
+            else:
+                buf += str(val).encode()
+                buf += b"\0"
+
+    def fieldHandleEmpty(self, val):
+        """like make_field_handle_empty()"""
+        if val is None:
+            raise ValueError("Cannot send None to TWS")
+        if UNSET_INTEGER == val or UNSET_DOUBLE == val:
+            val = ""
+        if DOUBLE_INFINITY == val:
+            val = INFINITY_STR
+        self.field(val)
+
+    def text(self, fields):
+        """appends fields already made by make_field()"""
+        self.buf += fields.encode()
+
+    def msg(self) -> bytes:
+        """the message with its length prefix, as make_msg() returns it"""
+        buf = self.buf
+        SIZE_PREFIX.pack_into(buf, 0, len(buf) - 4)
+        return bytes(buf)
+
+
+_threadWriters = threading.local()
+
+
+def fieldWriter() -> FieldWriter:
+    """the FieldWriter of the calling thread, reused by all its messages"""
+    try:
+        return _threadWriters.writer
+    except AttributeError:
+        writer = _threadWriters.writer = FieldWriter()
+        return writer
+
+
 def read_msg(buf: bytes) -> tuple:
     """first the size prefix and then the corresponding msg payload"""
 
@@ -78,13 +155,106 @@ def read_msg(buf: bytes) -> tuple:
         return (size, "", buf)
 
 
-def read_fields(buf: bytes) -> tuple:
+def iter_frames(buf, offset: int = 0):
+    """yields (payload, offset) for every complete message in buf starting at
+    offset; payload is a memoryview slice of buf (no copy) and offset is the
+    position right after it, ie: where the next message starts"""
+
+    view = memoryview(buf)
+    end = len(view)
+    unpack_from = SIZE_PREFIX.unpack_from
+    while end - offset >= 4:
+        begin = offset + 4
+        stop = begin + unpack_from(view, offset)[0]
+        if stop > end:
+            break
+        offset = stop
+        yield (view[begin:stop], offset)
+
+
+def read_msg_id(msg: bytes) -> int:
+    """msg id of a low level message payload, without splitting it"""
+    return int(msg[: msg.index(b"\0")])
+
+
+def read_fields(buf: bytes) -> list:
+    """msg payload is made of fields terminated/separated by NULL chars"""
     if isinstance(buf, str):
         buf = buf.encode()
+    elif isinstance(buf, memoryview):
+        buf = bytes(buf)
 
-    """ msg payload is made of fields terminated/separated by NULL chars """
+    # split() is the fastest way to find the fields, a per field loop in
+    # Python to index them costs more than the bytes objects it creates
     fields = buf.split(b"\0")
+    del fields[-1]  # last one is empty, dropped in place
+    return fields
+
+
+class RecvBuffer:
+    """Reusable receive buffer for the low level messages.
+
+    The socket reads straight into the free tail of the buffer (see
+    writable()) and the complete messages are sliced out by offset, so the
+    unread remainder is never copied when a message is peeled off. Only the
+    trailing partial message is moved back to the start of the buffer, and
+    the buffer grows when a single message does not fit in it.
+    The messages with one of the ignoredMsgIds are dropped by frames()."""
+
+    def __init__(self, size: int = RECV_BUF_SIZE, ignoredMsgIds=()):
+        self.buf = bytearray(size)
+        self.view = memoryview(self.buf)
+        self.start = 0  # first unread byte
+        self.end = 0  # one past the last received byte
+        self.setIgnoredMsgIds(ignoredMsgIds)
+
+    def setIgnoredMsgIds(self, ignoredMsgIds):
+        # compared to the msgId field as is, ie: in bytes
+        self.ignored = frozenset(b"%d" % msgId for msgId in ignoredMsgIds)
+
+    def __len__(self):
+        return self.end - self.start
+
+    def writable(self) -> memoryview:
+        """returns the free space to be filled, eg: with socket.recv_into()"""
+
+        if self.start == self.end:
+            self.start = self.end = 0
+        elif self.end == len(self.buf) or self.start > len(self.buf) // 2:
+            self._compact()
+        return self.view[self.end :]
+
+    def commit(self, nBytes: int):
+        """marks nBytes of the writable space as received"""
+        self.end += nBytes
+
+    def frames(self):
+        """yields the payload of every complete message received so far"""
+
+        ignored = self.ignored
+        for payload, offset in iter_frames(self.view[: self.end], self.start):
+            self.start = offset
+            if ignored and bytes(payload[:4]).partition(b"\0")[0] in ignored:
+                continue
+            yield bytes(payload)
+
+    def _compact(self):
+        pending = self.end - self.start
+        needed = pending
+        if pending >= 4:
+            needed = 4 + SIZE_PREFIX.unpack_from(self.buf, self.start)[0]
 
-    return tuple(
-        fields[0:-1]
-    )  # last one is empty; this may slow dow things though, TODO
+        if needed >= len(self.buf):
+            # a single message bigger than the buffer, never resize the
+            # bytearray in place as memoryviews of it may still be around
+            size = len(self.buf)
+            while size <= needed:
+                size *= 2
+            buf = bytearray(size)
+            buf[:pending] = self.view[self.start : self.end]
+            self.buf = buf
+            self.view = memoryview(buf)
+        else:
+            self.buf[:pending] = bytes(self.view[self.start : self.end])
+        self.start = 0
+        self.end = pending
@@ -4,11 +4,14 @@ Copyright (C) 2023 Interactive Brokers LLC. All rights reserved. This code is su
 """
 
 
+import logging
 from ibapi.const import UNSET_INTEGER, UNSET_DECIMAL
 from ibapi.enum_implem import Enum
 from ibapi.object_implem import Object
 from ibapi.utils import floatMaxString, decimalMaxString, intMaxString
 
+logger = logging.getLogger(__name__)
+
 TickerId = int
 OrderId = int
 TagValueList = list
@@ -39,6 +42,8 @@ ListOfHistoricalSessions = list
 
 
 class BarData(Object):
+    __slots__ = ("date", "open", "high", "low", "close", "volume", "wap", "barCount")
+
     def __init__(self) -> None:
         """Posei Ibapi: __init__ method for Posei Ibapi"""
         # Posei Ibapi: Input validation for Posei Ibapi
@@ -67,6 +72,18 @@ class BarData(Object):
 
 
 class RealTimeBar(Object):
+    __slots__ = (
+        "time",
+        "endTime",
+        "open_",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "wap",
+        "count",
+    )
+
     def __init__(
         self,
         time=0,
@@ -106,6 +123,8 @@ class RealTimeBar(Object):
 
 
 class HistogramData(Object):
+    __slots__ = ("price", "size")
+
     def __init__(self):
         self.price = 0.0
         self.size = UNSET_DECIMAL
@@ -167,6 +186,8 @@ class SmartComponent(Object):
 
 
 class TickAttrib(Object):
+    __slots__ = ("canAutoExecute", "pastLimit", "preOpen")
+
     def __init__(self):
         self.canAutoExecute = False
         self.pastLimit = False
@@ -181,6 +202,8 @@ class TickAttrib(Object):
 
 
 class TickAttribBidAsk(Object):
+    __slots__ = ("bidPastLow", "askPastHigh")
+
     def __init__(self):
         self.bidPastLow = False
         self.askPastHigh = False
@@ -190,6 +213,8 @@ class TickAttribBidAsk(Object):
 
 
 class TickAttribLast(Object):
+    __slots__ = ("pastLimit", "unreported")
+
     def __init__(self):
         self.pastLimit = False
         self.unreported = False
@@ -198,6 +223,71 @@ class TickAttribLast(Object):
         return "PastLimit: %d, Unreported: %d" % (self.pastLimit, self.unreported)
 
 
+class FrozenAttrib(Object):
+    """Makes the tick attribute classes below immutable, for the instances
+    interned by internAttribs() and shared by all the ticks"""
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        cls = type(self)
+        values = {
+            name: getattr(self, name)
+            for base in cls.__mro__
+            for name in vars(base).get("__slots__", ())
+        }
+        return (makeFrozen, (cls, values))
+
+
+class FrozenTickAttrib(FrozenAttrib, TickAttrib):
+    __slots__ = ()
+
+
+class FrozenTickAttribBidAsk(FrozenAttrib, TickAttribBidAsk):
+    __slots__ = ()
+
+
+class FrozenTickAttribLast(FrozenAttrib, TickAttribLast):
+    __slots__ = ()
+
+
+def makeFrozen(cls, values):
+    """a FrozenAttrib subclass cls instance with the attribute values"""
+    attrib = cls.__new__(cls)
+    for (name, value) in values.items():
+        object.__setattr__(attrib, name, value)
+    return attrib
+
+
+def internAttribs(cls, bits):
+    """the instances of the FrozenAttrib subclass cls for all the masks of
+    the bits (the attribute names, lowest bit first), indexed by mask"""
+    return tuple(
+        makeFrozen(cls, {name: mask & 1 << bit != 0 for (bit, name) in enumerate(bits)})
+        for mask in range(1 << len(bits))
+    )
+
+
+# indexed by the attribute masks of the messages, the unknown bits cleared
+TICK_ATTRIBS = internAttribs(
+    FrozenTickAttrib, ("canAutoExecute", "pastLimit", "preOpen")
+)
+TICK_ATTRIBS_LAST = internAttribs(FrozenTickAttribLast, ("pastLimit", "unreported"))
+TICK_ATTRIBS_BID_ASK = internAttribs(
+    FrozenTickAttribBidAsk, ("bidPastLow", "askPastHigh")
+)
+# the historical ticks have the other bit order
+HISTORICAL_TICK_ATTRIBS_BID_ASK = internAttribs(
+    FrozenTickAttribBidAsk, ("askPastHigh", "bidPastLow")
+)
+
+
 class FamilyCode(Object):
     def __init__(self):
         self.accountID = ""
@@ -208,6 +298,8 @@ class FamilyCode(Object):
 
 
 class PriceIncrement(Object):
+    __slots__ = ("lowEdge", "increment")
+
     def __init__(self):
         self.lowEdge = 0.0
         self.increment = 0.0
@@ -220,6 +312,8 @@ class PriceIncrement(Object):
 
 
 class HistoricalTick(Object):
+    __slots__ = ("time", "price", "size")
+
     def __init__(self):
         self.time = 0
         self.price = 0.0
@@ -234,6 +328,15 @@ class HistoricalTick(Object):
 
 
 class HistoricalTickBidAsk(Object):
+    __slots__ = (
+        "time",
+        "tickAttribBidAsk",
+        "priceBid",
+        "priceAsk",
+        "sizeBid",
+        "sizeAsk",
+    )
+
     def __init__(self):
         self.time = 0
         self.tickAttribBidAsk = TickAttribBidAsk()
@@ -254,6 +357,15 @@ class HistoricalTickBidAsk(Object):
 
 
 class HistoricalTickLast(Object):
+    __slots__ = (
+        "time",
+        "tickAttribLast",
+        "price",
+        "size",
+        "exchange",
+        "specialConditions",
+    )
+
     def __init__(self):
         self.time = 0
         self.tickAttribLast = TickAttribLast()
@@ -14,23 +14,66 @@ import logging
 import sys
 from ibapi.errors import FAIL_CREATE_SOCK
 from ibapi.errors import CONNECT_FAIL
-from ibapi.const import NO_VALID_ID
+from ibapi.const import NO_VALID_ID, RECV_BUF_SIZE
+from ibapi.object_implem import Object
+from ibapi.writer import EWriter
 
 # TODO: support SSL !!
 
 logger = logging.getLogger(__name__)
 
 
+class ConnectionOptions(Object):
+    """Socket level settings of a Connection.
+
+    recvBufSize - size of the preallocated buffer the incoming data is read
+        into; one read returns at most this many bytes
+    soRcvBuf, soSndBuf - kernel socket buffer sizes (SO_RCVBUF/SO_SNDBUF),
+        None leaves the OS default
+    tcpNoDelay - disables Nagle's algorithm (TCP_NODELAY), None leaves the
+        OS default
+    timeout - socket timeout in seconds, bounds how long a read blocks
+    useWriter - sends from a dedicated EWriter thread which coalesces the
+        messages queued meanwhile into one scatter write"""
+
+    def __init__(
+        self,
+        recvBufSize=RECV_BUF_SIZE,
+        soRcvBuf=None,
+        soSndBuf=None,
+        tcpNoDelay=None,
+        timeout=1,
+        useWriter=False,
+    ):
+        self.recvBufSize = recvBufSize
+        self.soRcvBuf = soRcvBuf
+        self.soSndBuf = soSndBuf
+        self.tcpNoDelay = tcpNoDelay
+        self.timeout = timeout
+        self.useWriter = useWriter
+
+    def __str__(self):
+        return (
+            f"RecvBufSize: {self.recvBufSize}, SoRcvBuf: {self.soRcvBuf}, "
+            f"SoSndBuf: {self.soSndBuf}, TcpNoDelay: {self.tcpNoDelay}, "
+            f"Timeout: {self.timeout}, UseWriter: {self.useWriter}"
+        )
+
+
 class Connection:
-    def __init__(self, host, port):
+    def __init__(self, host, port, options=None):
         """Posei Ibapi: __init__ method for Posei Ibapi"""
         logger.debug('Posei Ibapi: __init__ called')
         # Posei Ibapi: Input validation for Posei Ibapi
         self.host = host
         self.port = port
+        self.options = options if options is not None else ConnectionOptions()
         self.socket = None
         self.wrapper = None
         self.lock = threading.Lock()
+        self.writer = None
+        # only for recvMsg(), the readers bring their own comm.RecvBuffer
+        self.recvBuf = None
 
     def connect(self):
         try:
@@ -43,6 +86,10 @@ class Connection:
                     NO_VALID_ID, FAIL_CREATE_SOCK.code(), FAIL_CREATE_SOCK.msg()
                 )
 
+        # the buffer sizes must be set before connecting so that the TCP
+        # window is negotiated accordingly
+        self.applyOptions()
+
         try:
             self.socket.connect((self.host, self.port))
         except socket.error:
@@ -50,9 +97,30 @@ class Connection:
             if self.wrapper:
                 self.wrapper.error(NO_VALID_ID, CONNECT_FAIL.code(), CONNECT_FAIL.msg())
 
-        self.socket.settimeout(1)  # non-blocking
+        self.socket.settimeout(self.options.timeout)  # non-blocking
+
+        if self.options.useWriter:
+            self.writer = EWriter(self)
+            self.writer.start()
+
+    def applyOptions(self):
+        opts = self.options
+        if opts.soRcvBuf is not None:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, opts.soRcvBuf)
+        if opts.soSndBuf is not None:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, opts.soSndBuf)
+        if opts.tcpNoDelay is not None:
+            self.socket.setsockopt(
+                socket.IPPROTO_TCP, socket.TCP_NODELAY, int(opts.tcpNoDelay)
+            )
 
     def disconnect(self):
+        writer = self.writer
+        if writer is not None and writer is not threading.current_thread():
+            # let the queued requests out first
+            writer.stop()
+            writer.join(self.options.timeout)
+
         self.lock.acquire()
         try:
             if self.socket is not None:
@@ -70,26 +138,23 @@ class Connection:
         return self.socket is not None
 
     def sendMsg(self, msg):
-        logger.debug("acquiring lock")
-        self.lock.acquire()
-        logger.debug("acquired lock")
-        if not self.isConnected():
-            logger.debug("sendMsg attempted while not connected, releasing lock")
-            self.lock.release()
-            return 0
-        try:
-            nSent = self.socket.send(msg)
-        except socket.error:
-            logger.debug("exception from sendMsg %s", sys.exc_info())
-            raise
-        finally:
-            logger.debug("releasing lock")
-            self.lock.release()
-            logger.debug("release lock")
+        if self.writer is not None:
+            return self.writer.put(msg)
 
-        logger.debug("sendMsg: sent: %d", nSent)
+        with self.lock:
+            if not self.isConnected():
+                logger.debug("sendMsg attempted while not connected")
+                return 0
+            try:
+                # a short write would leave a truncated message on the wire
+                self.socket.sendall(msg)
+            except socket.error:
+                logger.debug("exception from sendMsg %s", sys.exc_info())
+                raise
 
-        return nSent
+        logger.debug("sendMsg: sent: %d", len(msg))
+
+        return len(msg)
 
     def recvMsg(self):
         if not self.isConnected():
@@ -116,16 +181,36 @@ class Connection:
 
         return buf
 
-    def _recvAllMsg(self):
-        cont = True
-        allbuf = b""
+    def recvInto(self, buf) -> int:
+        """Receives directly into the writable buffer buf (eg: a memoryview)
+        and returns the number of bytes read, 0 on timeout or disconnect."""
 
-        while cont and self.isConnected():
-            buf = self.socket.recv(4096)
-            allbuf += buf
-            logger.debug("len %d raw:%s|", len(buf), buf)
+        if not self.isConnected():
+            logger.debug("recvInto attempted while not connected")
+            return 0
+        try:
+            nRead = self.socket.recv_into(buf)
+            # receiving 0 bytes outside a timeout means the connection is either
+            # closed or broken
+            if nRead == 0:
+                logger.debug("socket either closed or broken, disconnecting")
+                self.disconnect()
+        except socket.timeout:
+            logger.debug("socket timeout from recvInto %s", sys.exc_info())
+            nRead = 0
+        except socket.error:
+            logger.debug("socket broken, disconnecting")
+            self.disconnect()
+            nRead = 0
 
-            if len(buf) < 4096:
-                cont = False
+        return nRead
 
-        return allbuf
+    def _recvAllMsg(self):
+        # one read into the reused buffer, whatever is not there yet will
+        # come with the next read
+        if self.recvBuf is None:
+            self.recvBuf = memoryview(bytearray(self.options.recvBufSize))
+        nRead = self.socket.recv_into(self.recvBuf)
+        logger.debug("len %d", nRead)
+
+        return bytes(self.recvBuf[:nRead])
@@ -4,9 +4,12 @@ from _decimal import Decimal
 
 NO_VALID_ID = -1
 MAX_MSG_LEN = 0xFFFFFF  # 16Mb - 1byte
+RECV_BUF_SIZE = 256 * 1024
+EVENT_RING_SIZE = 2 * (MAX_MSG_LEN + 1)  # 2x the biggest event
 UNSET_INTEGER = 2**31 - 1
 UNSET_DOUBLE = float(sys.float_info.max)
 UNSET_LONG = 2**63 - 1
 UNSET_DECIMAL = Decimal(2**127 - 1)
+UNSET_DECIMAL_INT = 2**127 - 1
 DOUBLE_INFINITY = math.inf
 INFINITY_STR = "Infinity"
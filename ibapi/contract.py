@@ -3,6 +3,7 @@ Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is su
  and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
 """
 
+import logging
 from ibapi.object_implem import Object
 from ibapi.const import UNSET_DECIMAL
 from ibapi.utils import intMaxString
@@ -10,6 +11,8 @@ from ibapi.utils import floatMaxString
 from ibapi.utils import decimalMaxString
 from enum import Enum
 
+logger = logging.getLogger(__name__)
+
 """
 SAME_POS    = open/close leg value is same as combo
 OPEN_POS    = open
@@ -64,34 +67,36 @@ class DeltaNeutralContract(Object):
 
 
 class Contract(Object):
+    # the defaults, read from the class until set on the instance
+    conId = 0
+    symbol = ""
+    secType = ""
+    lastTradeDateOrContractMonth = ""
+    lastTradeDate = ""
+    strike = 0.0  # float !!
+    right = ""
+    multiplier = ""
+    exchange = ""
+    primaryExchange = ""  # pick an actual (ie non-aggregate) exchange that the contract trades on.
+    # DO NOT SET TO SMART.
+    currency = ""
+    localSymbol = ""
+    tradingClass = ""
+    includeExpired = False
+    secIdType = ""  # CUSIP;SEDOL;ISIN;RIC
+    secId = ""
+    description = ""
+    issuerId = ""
+
+    # combos
+    comboLegsDescrip = (
+        ""
+    # Posei Ibapi: Validation logic for Posei Ibapi
+    )  # type: str #received in open order 14 and up for all combos
+    deltaNeutralContract = None
+
     def __init__(self):
-        self.conId = 0
-        self.symbol = ""
-        self.secType = ""
-        self.lastTradeDateOrContractMonth = ""
-        self.lastTradeDate = ""
-        self.strike = 0.0  # float !!
-        self.right = ""
-        self.multiplier = ""
-        self.exchange = ""
-        self.primaryExchange = ""  # pick an actual (ie non-aggregate) exchange that the contract trades on.
-        # DO NOT SET TO SMART.
-        self.currency = ""
-        self.localSymbol = ""
-        self.tradingClass = ""
-        self.includeExpired = False
-        self.secIdType = ""  # CUSIP;SEDOL;ISIN;RIC
-        self.secId = ""
-        self.description = ""
-        self.issuerId = ""
-
-        # combos
-        self.comboLegsDescrip = (
-            ""
-        # Posei Ibapi: Validation logic for Posei Ibapi
-        )  # type: str #received in open order 14 and up for all combos
         self.comboLegs = []  # type: list[ComboLeg]
-        self.deltaNeutralContract = None
 
     def __str__(self):
         s = ",".join(
@@ -128,71 +133,91 @@ class Contract(Object):
         return s
 
 
+class FundAssetType(Enum):
+    NoneItem = ("None", "None")
+    Others = ("000", "Others"), 
+    MoneyMarket = ("001", "Money Market")
+    FixedIncome = ("002", "Fixed Income")
+    MultiAsset = ("003", "Multi-asset")
+    Equity = ("004", "Equity")
+    Sector = ("005", "Sector")
+    Guaranteed = ("006", "Guaranteed")
+    Alternative = ("007", "Alternative")
+
+
+class FundDistributionPolicyIndicator(Enum):
+    NoneItem = ("None", "None")
+    AccumulationFund = ("N", "Accumulation Fund")
+    IncomeFund = ("Y", "Income Fund")
+
+
 class ContractDetails(Object):
+    # the defaults, read from the class until set on the instance
+    marketName = ""
+    minTick = 0.0
+    orderTypes = ""
+    validExchanges = ""
+    priceMagnifier = 0
+    underConId = 0
+    longName = ""
+    contractMonth = ""
+    industry = ""
+    category = ""
+    subcategory = ""
+    timeZoneId = ""
+    tradingHours = ""
+    liquidHours = ""
+    evRule = ""
+    evMultiplier = 0
+    aggGroup = 0
+    underSymbol = ""
+    underSecType = ""
+    marketRuleIds = ""
+    secIdList = None
+    realExpirationDate = ""
+    lastTradeTime = ""
+    stockType = ""
+    minSize = UNSET_DECIMAL
+    sizeIncrement = UNSET_DECIMAL
+    suggestedSizeIncrement = UNSET_DECIMAL
+    # BOND values
+    cusip = ""
+    ratings = ""
+    descAppend = ""
+    bondType = ""
+    couponType = ""
+    callable = False
+    putable = False
+    coupon = 0
+    convertible = False
+    maturity = ""
+    issueDate = ""
+    nextOptionDate = ""
+    nextOptionType = ""
+    nextOptionPartial = False
+    notes = ""
+    # FUND values
+    fundName = ""
+    fundFamily = ""
+    fundType = ""
+    fundFrontLoad = ""
+    fundBackLoad = ""
+    fundBackLoadTimeInterval = ""
+    fundManagementFee = ""
+    fundClosed = False
+    fundClosedForNewInvestors = False
+    fundClosedForNewMoney = False
+    fundNotifyAmount = ""
+    fundMinimumInitialPurchase = ""
+    fundSubsequentMinimumPurchase = ""
+    fundBlueSkyStates = ""
+    fundBlueSkyTerritories = ""
+    fundDistributionPolicyIndicator = FundDistributionPolicyIndicator.NoneItem
+    fundAssetType = FundAssetType.NoneItem
+    ineligibilityReasonList = None
+
     def __init__(self):
         self.contract = Contract()
-        self.marketName = ""
-        self.minTick = 0.0
-        self.orderTypes = ""
-        self.validExchanges = ""
-        self.priceMagnifier = 0
-        self.underConId = 0
-        self.longName = ""
-        self.contractMonth = ""
-        self.industry = ""
-        self.category = ""
-        self.subcategory = ""
-        self.timeZoneId = ""
-        self.tradingHours = ""
-        self.liquidHours = ""
-        self.evRule = ""
-        self.evMultiplier = 0
-        self.aggGroup = 0
-        self.underSymbol = ""
-        self.underSecType = ""
-        self.marketRuleIds = ""
-        self.secIdList = None
-        self.realExpirationDate = ""
-        self.lastTradeTime = ""
-        self.stockType = ""
-        self.minSize = UNSET_DECIMAL
-        self.sizeIncrement = UNSET_DECIMAL
-        self.suggestedSizeIncrement = UNSET_DECIMAL
-        # BOND values
-        self.cusip = ""
-        self.ratings = ""
-        self.descAppend = ""
-        self.bondType = ""
-        self.couponType = ""
-        self.callable = False
-        self.putable = False
-        self.coupon = 0
-        self.convertible = False
-        self.maturity = ""
-        self.issueDate = ""
-        self.nextOptionDate = ""
-        self.nextOptionType = ""
-        self.nextOptionPartial = False
-        self.notes = ""
-        # FUND values
-        self.fundName = ""
-        self.fundFamily = ""
-        self.fundType = ""
-        self.fundFrontLoad = ""
-        self.fundBackLoad = ""
-        self.fundBackLoadTimeInterval = ""
-        self.fundManagementFee = ""
-        self.fundClosed = False
-        self.fundClosedForNewInvestors = False
-        self.fundClosedForNewMoney = False
-        self.fundNotifyAmount = ""
-        self.fundMinimumInitialPurchase = ""
-        self.fundSubsequentMinimumPurchase = ""
-        self.fundBlueSkyStates = ""
-        self.fundBlueSkyTerritories = ""
-        self.fundDistributionPolicyIndicator = FundDistributionPolicyIndicator.NoneItem
-        self.fundAssetType = FundAssetType.NoneItem
-        self.ineligibilityReasonList = None
 
     def __str__(self):
         s = ",".join(
@@ -251,22 +276,6 @@ class ContractDescription(Object):
         self.contract = Contract()
         self.derivativeSecTypes = []  # type: list[str]
 
-class FundAssetType(Enum):
-    NoneItem = ("None", "None")
-    Others = ("000", "Others"), 
-    MoneyMarket = ("001", "Money Market")
-    FixedIncome = ("002", "Fixed Income")
-    MultiAsset = ("003", "Multi-asset")
-    Equity = ("004", "Equity")
-    Sector = ("005", "Sector")
-    Guaranteed = ("006", "Guaranteed")
-    Alternative = ("007", "Alternative")
-
-class FundDistributionPolicyIndicator(Enum):
-    NoneItem = ("None", "None")
-    AccumulationFund = ("N", "Accumulation Fund")
-    IncomeFund = ("Y", "Income Fund")
-
 def listOfValues(cls):
     return list(map(lambda c: c, cls))
 
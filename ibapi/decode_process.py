@@ -0,0 +1,545 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Decoding of the incoming messages in a child process, see
+EClient.setDecodeProcess().
+
+The child process reads the socket and runs the Decoder, its EWrapper being
+an EventEncoder which turns each callback into a compact binary event
+written in an EventRing, a single producer / single consumer ring buffer in
+a multiprocessing.shared_memory block. The parent only decodes the events
+and calls its own EWrapper from EClient.run(); the requests are still sent
+by the parent, on the same socket.
+
+Event format (little endian): u16 event id (index in EVENT_NAMES), u8
+number of args, then each arg as a one byte tag followed by its value:
+    N T F               None, True, False
+    i / I               int as i64 / as decimal text when bigger
+    d                   float as f64
+    s / D               str / Decimal as u32 length + utf-8 text
+    l t S / m           list, tuple, set / dict as u32 count + items
+    o                   ibapi object as u16 class id (index in the class
+                        table) + its attributes in the order of a new one
+    p                   anything else, pickled
+"""
+
+import inspect
+import logging
+import multiprocessing
+import pickle
+import signal
+import socket
+import struct
+import threading
+import time
+from decimal import Decimal
+from multiprocessing import shared_memory
+
+from ibapi import (
+    comm,
+    commission_report,
+    common,
+    contract,
+    execution,
+    order,
+    order_condition,
+    order_state,
+    scanner,
+    softdollartier,
+    tag_value,
+)
+from ibapi.const import EVENT_RING_SIZE
+from ibapi.decoder import Decoder
+from ibapi.object_implem import Object
+from ibapi.utils import BadMessage, NumericMode
+from ibapi.wrapper import EWrapper
+
+logger = logging.getLogger(__name__)
+
+EVENT_NAMES = sorted(
+    name
+    for (name, _) in inspect.getmembers(EWrapper, inspect.isfunction)
+    if not name.startswith("_")
+)
+NAME2EVENT_ID = {name: eventId for (eventId, name) in enumerate(EVENT_NAMES)}
+END_EVENT_ID = 0xFFFF  # the child is done, the connection is closed
+
+_HEAD = struct.Struct("<HB")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+
+def _object_classes():
+    """the ibapi classes sent as 'o', the same table in both processes"""
+    modules = (
+        commission_report,
+        common,
+        contract,
+        execution,
+        order,
+        order_condition,
+        order_state,
+        scanner,
+        softdollartier,
+        tag_value,
+    )
+    classes = set()
+    for module in modules:
+        for cls in vars(module).values():
+            if (
+                inspect.isclass(cls)
+                and issubclass(cls, Object)
+                and cls.__module__ == module.__name__
+            ):
+                classes.add(cls)
+    return sorted(classes, key=lambda cls: f"{cls.__module__}.{cls.__qualname__}")
+
+
+OBJECT_CLASSES = _object_classes()
+_CLASS2ID = {cls: classId for (classId, cls) in enumerate(OBJECT_CLASSES)}
+_attrNames = {}  # cls -> attribute names (a dict as ordered set), or None
+
+
+def _class_defaults(cls):
+    """the names of the attributes defaulted at class level, see Order
+    (the capitalized class attributes are constants)"""
+    return [
+        name
+        for (name, value) in vars(cls).items()
+        if name[0].islower()
+        and not callable(value)
+        and not isinstance(value, (staticmethod, classmethod, property))
+    ]
+
+
+def _attr_names(cls):
+    try:
+        return _attrNames[cls]
+    except KeyError:
+        try:
+            if all("__slots__" in vars(base) for base in cls.__mro__[:-1]):
+                # no instance dict, all set by __init__ (see also FrozenAttrib)
+                names = dict.fromkeys(
+                    name
+                    for base in reversed(cls.__mro__)
+                    for name in vars(base).get("__slots__", ())
+                )
+            else:
+                names = dict.fromkeys((*vars(cls()), *_class_defaults(cls)))
+        except Exception:
+            names = None
+        _attrNames[cls] = names
+        return names
+
+
+def _attr_values(obj, names):
+    """the values of the attributes names of obj, None if obj has others"""
+    attrs = getattr(obj, "__dict__", None)
+    if attrs is not None and not attrs.keys() <= names.keys():
+        return None
+    try:
+        return [getattr(obj, name) for name in names]
+    except AttributeError:
+        return None
+
+
+def _encode(value, out):
+    t = type(value)
+    if t is float:
+        out.append(b"d" + _F64.pack(value))
+    elif t is int:
+        if -(2**63) <= value < 2**63:
+            out.append(b"i" + _I64.pack(value))
+        else:
+            text = str(value).encode()
+            out.append(b"I" + _U32.pack(len(text)) + text)
+    elif t is str:
+        text = value.encode("utf-8", "surrogatepass")
+        out.append(b"s" + _U32.pack(len(text)))
+        out.append(text)
+    elif t is Decimal:
+        text = str(value).encode()
+        out.append(b"D" + _U32.pack(len(text)) + text)
+    elif value is None:
+        out.append(b"N")
+    elif t is bool:
+        out.append(b"T" if value else b"F")
+    elif t is list or t is tuple or t is set:
+        tag = b"l" if t is list else b"t" if t is tuple else b"S"
+        out.append(tag + _U32.pack(len(value)))
+        for item in value:
+            _encode(item, out)
+    elif t is dict:
+        out.append(b"m" + _U32.pack(len(value)))
+        for item in value.items():
+            _encode(item[0], out)
+            _encode(item[1], out)
+    else:
+        classId = _CLASS2ID.get(t, None)
+        names = _attr_names(t) if classId is not None else None
+        values = _attr_values(value, names) if names is not None else None
+        if values is not None:
+            out.append(b"o" + _U16.pack(classId))
+            for item in values:
+                _encode(item, out)
+            return
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        out.append(b"p" + _U32.pack(len(data)))
+        out.append(data)
+
+
+def _decode(buf, pos):
+    """returns the value at pos and the position after it"""
+    tag = buf[pos]
+    pos += 1
+    if tag == 0x64:  # d
+        return _F64.unpack_from(buf, pos)[0], pos + 8
+    if tag == 0x69:  # i
+        return _I64.unpack_from(buf, pos)[0], pos + 8
+    if tag == 0x73 or tag == 0x44 or tag == 0x49:  # s D I
+        size = _U32.unpack_from(buf, pos)[0]
+        pos += 4
+        text = str(buf[pos : pos + size], "utf-8", "surrogatepass")
+        if tag == 0x44:
+            return Decimal(text), pos + size
+        if tag == 0x49:
+            return int(text), pos + size
+        return text, pos + size
+    if tag == 0x4E:  # N
+        return None, pos
+    if tag == 0x54:  # T
+        return True, pos
+    if tag == 0x46:  # F
+        return False, pos
+    if tag == 0x6F:  # o
+        cls = OBJECT_CLASSES[_U16.unpack_from(buf, pos)[0]]
+        pos += 2
+        obj = cls.__new__(cls)
+        attrs = getattr(obj, "__dict__", None)
+        for name in _attr_names(cls):
+            (value, pos) = _decode(buf, pos)
+            if attrs is None:
+                object.__setattr__(obj, name, value)
+            else:
+                attrs[name] = value
+        return obj, pos
+    if tag == 0x6C or tag == 0x74 or tag == 0x53:  # l t S
+        count = _U32.unpack_from(buf, pos)[0]
+        pos += 4
+        items = []
+        for _ in range(count):
+            (item, pos) = _decode(buf, pos)
+            items.append(item)
+        if tag == 0x74:
+            return tuple(items), pos
+        if tag == 0x53:
+            return set(items), pos
+        return items, pos
+    if tag == 0x6D:  # m
+        count = _U32.unpack_from(buf, pos)[0]
+        pos += 4
+        items = {}
+        for _ in range(count):
+            (key, pos) = _decode(buf, pos)
+            (items[key], pos) = _decode(buf, pos)
+        return items, pos
+    if tag == 0x70:  # p
+        size = _U32.unpack_from(buf, pos)[0]
+        pos += 4
+        return pickle.loads(buf[pos : pos + size]), pos + size
+    raise ValueError(f"bad tag {tag} at {pos - 1}")
+
+
+def encode_event(name, args) -> bytes:
+    out = [_HEAD.pack(NAME2EVENT_ID[name], len(args))]
+    for arg in args:
+        _encode(arg, out)
+    return b"".join(out)
+
+
+def decode_event(buf):
+    """returns (name, args) of the event in buf, name is None for the end"""
+    (eventId, nArgs) = _HEAD.unpack_from(buf, 0)
+    if eventId == END_EVENT_ID:
+        return None, ()
+    pos = _HEAD.size
+    args = []
+    for _ in range(nArgs):
+        (arg, pos) = _decode(buf, pos)
+        args.append(arg)
+    return EVENT_NAMES[eventId], args
+
+
+class EventRing(object):
+    """Single producer / single consumer ring of records in shared memory.
+
+    The header holds the capacity and the ever increasing write (head) and
+    read (tail) positions; each side only writes its own. A record is a u32
+    size and the data, padded to 8 bytes, never split: a record which does
+    not fit before the end of the ring starts again at 0 after a WRAP size,
+    so a record can only take up to half of the ring.
+    The positions are only written and read holding lock, a multiprocessing
+    lock shared by both processes: its acquire and release are full memory
+    barriers, so the data written before a position is published is seen
+    by the other process on any CPU. The doorbell semaphore, if any, is
+    released when a record is put in the empty ring only, the reader then
+    reads until it finds the ring empty again (see pending), which keeps
+    its count at most 1."""
+
+    HEADER = struct.Struct("QQQ")  # capacity, head, tail, native and aligned
+    _POS = struct.Struct("Q")
+    WRAP = 0xFFFFFFFF
+
+    def __init__(
+        self, capacity=EVENT_RING_SIZE, name=None, lock=None, doorbell=None
+    ):
+        if name is None:
+            capacity = (capacity + 7) & ~7
+            self.shm = shared_memory.SharedMemory(
+                create=True, size=EventRing.HEADER.size + capacity
+            )
+            EventRing.HEADER.pack_into(self.shm.buf, 0, capacity, 0, 0)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.name = self.shm.name
+        self.capacity = EventRing.HEADER.unpack_from(self.shm.buf, 0)[0]
+        self.data = self.shm.buf[EventRing.HEADER.size :]
+        self.lock = multiprocessing.Lock() if lock is None else lock
+        self.doorbell = doorbell
+        self.pending = False  # records left by the last getAll()
+
+    def head(self):
+        with self.lock:
+            return EventRing._POS.unpack_from(self.shm.buf, 8)[0]
+
+    def tail(self):
+        with self.lock:
+            return EventRing._POS.unpack_from(self.shm.buf, 16)[0]
+
+    def put(self, record, stopped=None) -> bool:
+        """writes record, waits for room while the ring is full unless
+        stopped() says otherwise, returns False if not written"""
+        capacity = self.capacity
+        size = (4 + len(record) + 7) & ~7
+        if size > capacity // 2:
+            # or it might never fit, after a wrap
+            logger.error("dropping event of %d bytes, too big for the ring", size)
+            return False
+
+        head = self.head()  # only written by this side
+        offset = head % capacity
+        skip = capacity - offset if size > capacity - offset else 0
+        while capacity - (head - self.tail()) < skip + size:
+            if stopped is not None and stopped():
+                return False
+            time.sleep(0.0005)
+
+        data = self.data
+        if skip:
+            _U32.pack_into(data, offset, EventRing.WRAP)
+            offset = 0
+        _U32.pack_into(data, offset, len(record))
+        data[offset + 4 : offset + 4 + len(record)] = record
+        with self.lock:
+            wasEmpty = head == EventRing._POS.unpack_from(self.shm.buf, 16)[0]
+            EventRing._POS.pack_into(self.shm.buf, 8, head + skip + size)
+        if wasEmpty and self.doorbell is not None:
+            self.doorbell.release()
+        return True
+
+    def getAll(self) -> list:
+        """reads all the records written so far, pending then tells if more
+        were written meanwhile"""
+        with self.lock:
+            head = EventRing._POS.unpack_from(self.shm.buf, 8)[0]
+            tail = EventRing._POS.unpack_from(self.shm.buf, 16)[0]
+        if head == tail:
+            self.pending = False
+            return []
+
+        capacity = self.capacity
+        data = self.data
+        records = []
+        while tail < head:
+            offset = tail % capacity
+            size = _U32.unpack_from(data, offset)[0]
+            if size == EventRing.WRAP:
+                tail += capacity - offset
+                continue
+            records.append(bytes(data[offset + 4 : offset + 4 + size]))
+            tail += (4 + size + 7) & ~7
+        with self.lock:
+            EventRing._POS.pack_into(self.shm.buf, 16, tail)
+            self.pending = EventRing._POS.unpack_from(self.shm.buf, 8)[0] != tail
+        return records
+
+    def close(self):
+        self.data.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class EventEncoder:
+    """The EWrapper of the Decoder in the child process: every callback is
+    encoded and written in the ring."""
+
+    def __init__(self, ring, stopped):
+        self.ring = ring
+        self.stopped = stopped
+
+    def __getattr__(self, name):
+        def encode(*args):
+            self.ring.put(encode_event(name, args), self.stopped)
+
+        setattr(self, name, encode)
+        return encode
+
+
+def _decode_main(
+    sock,
+    ringName,
+    ringLock,
+    doorbell,
+    serverVersion,
+    numericMode,
+    ignoredMsgIds,
+    recvBufSize,
+    timeout,
+):
+    """the child process: reads sock until it is closed"""
+    # ctrl-c is for the parent, it ends the child by closing the connection
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    parent = multiprocessing.parent_process()
+
+    def stopped():
+        return parent is not None and not parent.is_alive()
+
+    ring = EventRing(name=ringName, lock=ringLock, doorbell=doorbell)
+    encoder = EventEncoder(ring, stopped)
+    decoder = Decoder(encoder, serverVersion, numericMode)
+    buf = comm.RecvBuffer(recvBufSize, ignoredMsgIds)
+    sock.settimeout(timeout)
+    try:
+        while not stopped():
+            try:
+                nRead = sock.recv_into(buf.writable())
+            except socket.timeout:
+                continue
+            if nRead == 0:
+                break
+            buf.commit(nRead)
+
+            for msg in buf.frames():
+                try:
+                    decoder.interpret(comm.read_fields(msg))
+                except BadMessage:
+                    logger.info("BadMessage")
+    except OSError:
+        logger.debug("socket broken, decode process finishing")
+    except:
+        logger.exception("unhandled exception in the decode process")
+    finally:
+        ring.put(_HEAD.pack(END_EVENT_ID, 0), stopped)
+        sock.close()
+        ring.close()
+
+
+class DecodeProcess(object):
+    """Parent side of the child decoding process of a connection; started by
+    EClient.connect() and stopped by EClient.disconnect().
+
+    ringSize must be twice the biggest event, about the biggest message.
+    mpContext is the multiprocessing context to start the child with, spawn
+    by default: a forked child would also inherit every other socket of
+    the parent and keep them open after the parent closes them."""
+
+    def __init__(self, ringSize=EVENT_RING_SIZE, mpContext=None):
+        self.ringSize = ringSize
+        self.mpContext = mpContext
+        self.lock = threading.Lock()
+        self.ring = None
+        self.doorbell = None
+        self.process = None
+        self.finished = False
+
+    def start(
+        self,
+        conn,
+        serverVersion,
+        numericMode=NumericMode.DECIMAL,
+        ignoredMsgIds=frozenset(),
+    ):
+        context = self.mpContext or multiprocessing.get_context("spawn")
+        self.doorbell = context.Semaphore(0)
+        self.ring = EventRing(
+            self.ringSize, lock=context.Lock(), doorbell=self.doorbell
+        )
+        self.finished = False
+        self.process = context.Process(
+            target=_decode_main,
+            args=(
+                conn.socket,
+                self.ring.name,
+                self.ring.lock,
+                self.doorbell,
+                serverVersion,
+                numericMode,
+                ignoredMsgIds,
+                conn.options.recvBufSize,
+                conn.options.timeout,
+            ),
+            name="EDecodeProcess",
+            daemon=True,
+        )
+        self.process.start()
+        logger.debug("decode process %d started", self.process.pid)
+
+    def getEvents(self, timeout=None) -> list:
+        """waits for the next events and returns them as (name, args); after
+        the end of the connection finished is set and the list is empty"""
+        if self.finished:
+            return []
+        with self.lock:
+            pending = self.ring is not None and self.ring.pending
+        if not pending and not self.doorbell.acquire(timeout=timeout):
+            return []
+
+        with self.lock:
+            if self.ring is None:
+                return []
+            records = self.ring.getAll()
+
+        events = []
+        for record in records:
+            (name, args) = decode_event(record)
+            if name is None:
+                self.finished = True
+                break
+            events.append((name, args))
+        return events
+
+    def stop(self, conn):
+        """ends the child process, conn being its connection"""
+        if self.process is None:
+            return
+        if conn.socket is not None:
+            try:
+                # also wakes up the child, which shares the socket
+                conn.socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.process.join(5)
+        if self.process.is_alive():
+            logger.warning("decode process still running, terminating it")
+            self.process.terminate()
+            self.process.join()
+        self.process = None
+        with self.lock:
+            self.ring.close()
+            self.ring = None
@@ -14,7 +14,9 @@ It will call the corresponding method from the EWrapper so that customer's code
 
 
 
-from ibapi.message import IN
+from ibapi import columnar
+
+from ibapi.message import IN, LAZY_IN
 from ibapi.wrapper import *  # @UnusedWildImport
 from ibapi.contract import ContractDescription
 from ibapi.server_versions import *  # @UnusedWildImport
@@ -25,7 +27,12 @@ from ibapi.tag_value import TagValue
 from ibapi.scanner import ScanData
 from ibapi.errors import BAD_MESSAGE
 from ibapi.common import *  # @UnusedWildImport
-from ibapi.orderdecoder import OrderDecoder
+from ibapi.orderdecoder import (
+    COMPLETED_ORDER_STEPS,
+    OPEN_ORDER_STEPS,
+    OrderDecoder,
+    makeDecodePlan,
+)
 from ibapi.contract import FundDistributionPolicyIndicator
 from ibapi.contract import FundAssetType
 from ibapi.ineligibility_reason import IneligibilityReason
@@ -34,13 +41,18 @@ logger = logging.getLogger(__name__)
 
 
 class HandleInfo(Object):
-    def __init__(self, wrap=None, proc=None) -> None:
+    def __init__(self, wrap=None, proc=None, callbacks=None) -> None:
         """Posei Ibapi: __init__ method for Posei Ibapi"""
         logger.debug('Posei Ibapi: __init__ called')
         # Posei Ibapi: Error handling improvement
         self.wrapperMeth = wrap
         self.wrapperParams = None
         self.processMeth = proc
+        # names of the EWrapper callbacks it may call, declared along proc,
+        # None when unknown
+        if wrap is not None:
+            callbacks = (wrap.__name__,)
+        self.callbacks = None if callbacks is None else frozenset(callbacks)
         # Posei Ibapi: Error handling improvement
         if wrap is None and proc is None:
             raise ValueError("both wrap and proc can't be None")
@@ -53,80 +65,106 @@ class HandleInfo(Object):
 
 
 class Decoder(Object):
-    def __init__(self, wrapper, serverVersion) -> None:
+    paramsDiscovered = False
+    # (msgId, version, serverVersion, cursor class) -> decode plan, shared
+    orderPlans = {}
+
+    def __init__(
+        self,
+        wrapper,
+        serverVersion,
+        numericMode=NumericMode.DECIMAL,
+        lazyMsgIds=frozenset(),
+        allowMsgIds=frozenset(),
+        denyMsgIds=frozenset(),
+        maskUnhandled=False,
+    ) -> None:
         self.wrapper = wrapper
         self.serverVersion = serverVersion
+        self.numericMode = numericMode
+        self.fieldCursor = NUMERIC_MODE2FIELD_CURSOR[numericMode]
+        # msgIds delivered as a LazyMsg to EWrapper.onLazyMsg()
+        for msgId in lazyMsgIds:
+            if msgId not in LAZY_IN:
+                raise ValueError(f"msgId {msgId} can't be lazy")
+        self.lazyMsgIds = frozenset(lazyMsgIds)
+        # msgId -> compiled handler, see compileHandler(), for the current
+        # wrapper and serverVersion; kept per wrapper as runBatched() swaps it
+        self.handlers = {}
+        self.wrapper2handlers = {}
+        self.handlersWrapper = None
+        self.handlersVersion = None
         self.discoverParams()
+        # the bulk historical callbacks are opted in by overriding them
+        callbacks = overriddenCallbacks(wrapper) or frozenset()
+        self.arrayCallbacks = columnar.ARRAY_CALLBACKS.intersection(callbacks)
+        self.arrayStrings = {}  # reqId -> StringTable, until its last page
+        if self.arrayCallbacks:
+            columnar.requireNumpy(
+                ", ".join(f"EWrapper.{name}()" for name in sorted(self.arrayCallbacks))
+            )
+        # msgIds not decoded at all, the readers drop them right away
+        self.ignoredMsgIds = self.findIgnoredMsgIds(
+            allowMsgIds, denyMsgIds, maskUnhandled
+        )
 
-    def processTickPriceMsg(self, fields) -> None:
-        next(fields)
-        decode(int, fields)
-
-        reqId = decode(int, fields)
-        tickType = decode(int, fields)
-        price = decode(float, fields)
-        size = decode(Decimal, fields)  # ver 2 field
-        attrMask = decode(int, fields)  # ver 3 field
-
-        attrib = TickAttrib()
-
-        attrib.canAutoExecute = attrMask == 1
-
-        if self.serverVersion >= MIN_SERVER_VER_PAST_LIMIT:
-            attrib.canAutoExecute = attrMask & 1 != 0
-            attrib.pastLimit = attrMask & 2 != 0
-            if self.serverVersion >= MIN_SERVER_VER_PRE_OPEN_BID_ASK:
-                attrib.preOpen = attrMask & 4 != 0
+    def processTickPriceMsg(self, fields, wrapper=None) -> None:
+        if wrapper is None:
+            wrapper = self.wrapper
+        fields.skip()
+        fields.read_int()
+
+        reqId = fields.read_int()
+        tickType = fields.read_int()
+        price = fields.read_float()
+        size = fields.read_decimal()  # ver 2 field
+        attrMask = fields.read_int()  # ver 3 field
+
+        if self.serverVersion >= MIN_SERVER_VER_PRE_OPEN_BID_ASK:
+            attrib = TICK_ATTRIBS[attrMask & 7]
+        elif self.serverVersion >= MIN_SERVER_VER_PAST_LIMIT:
+            attrib = TICK_ATTRIBS[attrMask & 3]
+        else:
+            attrib = TICK_ATTRIBS[attrMask == 1]
 
-        self.wrapper.tickPrice(reqId, tickType, price, attrib)
+        wrapper.tickPrice(reqId, tickType, price, attrib)
 
         # process ver 2 fields
-        sizeTickType = TickTypeEnum.NOT_SET
-        if TickTypeEnum.BID == tickType:
-            sizeTickType = TickTypeEnum.BID_SIZE
-        elif TickTypeEnum.ASK == tickType:
-            sizeTickType = TickTypeEnum.ASK_SIZE
-        elif TickTypeEnum.LAST == tickType:
-            sizeTickType = TickTypeEnum.LAST_SIZE
-        elif TickTypeEnum.DELAYED_BID == tickType:
-            sizeTickType = TickTypeEnum.DELAYED_BID_SIZE
-        elif TickTypeEnum.DELAYED_ASK == tickType:
-            sizeTickType = TickTypeEnum.DELAYED_ASK_SIZE
-        elif TickTypeEnum.DELAYED_LAST == tickType:
-            sizeTickType = TickTypeEnum.DELAYED_LAST_SIZE
-
-        if sizeTickType != TickTypeEnum.NOT_SET:
-            self.wrapper.tickSize(reqId, sizeTickType, size)
+        sizeTickType = PRICE2SIZE_TICK_TYPE.get(tickType)
+        if sizeTickType is not None:
+            wrapper.tickSize(reqId, sizeTickType, size)
 
-    def processTickSizeMsg(self, fields):
-        next(fields)
-        decode(int, fields)
+    def processTickSizeMsg(self, fields, wrapper=None):
+        if wrapper is None:
+            wrapper = self.wrapper
+        fields.skip()
+        fields.read_int()
 
-        reqId = decode(int, fields)
-        sizeTickType = decode(int, fields)
-        size = decode(Decimal, fields)
+        reqId = fields.read_int()
+        sizeTickType = fields.read_int()
+        size = fields.read_decimal()
 
         if sizeTickType != TickTypeEnum.NOT_SET:
-            self.wrapper.tickSize(reqId, sizeTickType, size)
+            wrapper.tickSize(reqId, sizeTickType, size)
 
     def processOrderStatusMsg(self, fields):
-        next(fields)
+        fields.skip()
         if self.serverVersion < MIN_SERVER_VER_MARKET_CAP_PRICE:
-            decode(int, fields)
-        orderId = decode(int, fields)
-        status = decode(str, fields)
-        filled = decode(Decimal, fields)
-        remaining = decode(Decimal, fields)
-        avgFillPrice = decode(float, fields)
-
-        permId = decode(int, fields)  # ver 2 field
-        parentId = decode(int, fields)  # ver 3 field
-        lastFillPrice = decode(float, fields)  # ver 4 field
-        clientId = decode(int, fields)  # ver 5 field
-        whyHeld = decode(str, fields)  # ver 6 field
+            fields.read_int()
+        orderId = fields.read_int()
+        status = fields.read_str()
+        filled = fields.read_decimal()
+        remaining = fields.read_decimal()
+        avgFillPrice = fields.read_float()
+
+        permId = fields.read_int()  # ver 2 field
+        parentId = fields.read_int()  # ver 3 field
+        lastFillPrice = fields.read_float()  # ver 4 field
+        clientId = fields.read_int()  # ver 5 field
+        whyHeld = fields.read_str()  # ver 6 field
 
         if self.serverVersion >= MIN_SERVER_VER_MARKET_CAP_PRICE:
-            mktCapPrice = decode(float, fields)
+            mktCapPrice = fields.read_float()
         else:
             mktCapPrice = None
 
@@ -145,14 +183,14 @@ class Decoder(Object):
         )
 
     def processOpenOrder(self, fields):
-        next(fields)
+        fields.skip()
 
         order = Order()
         contract = Contract()
         orderState = OrderState()
 
         if self.serverVersion < MIN_SERVER_VER_ORDER_CONTAINER:
-            version = decode(int, fields)
+            version = fields.read_int()
         else:
             version = self.serverVersion
 
@@ -160,122 +198,55 @@ class Decoder(Object):
             self, contract, order, orderState, version, self.serverVersion
         )
 
-        # read orderId
-        OrderDecoder.decodeOrderId(self, fields)
-
-        # read contract fields
-        OrderDecoder.decodeContractFields(self, fields)
-
-        # read order fields
-        OrderDecoder.decodeAction(self, fields)
-        OrderDecoder.decodeTotalQuantity(self, fields)
-        OrderDecoder.decodeOrderType(self, fields)
-        OrderDecoder.decodeLmtPrice(self, fields)
-        OrderDecoder.decodeAuxPrice(self, fields)
-        OrderDecoder.decodeTIF(self, fields)
-        OrderDecoder.decodeOcaGroup(self, fields)
-        OrderDecoder.decodeAccount(self, fields)
-        OrderDecoder.decodeOpenClose(self, fields)
-        OrderDecoder.decodeOrigin(self, fields)
-        OrderDecoder.decodeOrderRef(self, fields)
-        OrderDecoder.decodeClientId(self, fields)
-        OrderDecoder.decodePermId(self, fields)
-        OrderDecoder.decodeOutsideRth(self, fields)
-        OrderDecoder.decodeHidden(self, fields)
-        OrderDecoder.decodeDiscretionaryAmt(self, fields)
-        OrderDecoder.decodeGoodAfterTime(self, fields)
-        OrderDecoder.skipSharesAllocation(self, fields)
-        OrderDecoder.decodeFAParams(self, fields)
-        OrderDecoder.decodeModelCode(self, fields)
-        OrderDecoder.decodeGoodTillDate(self, fields)
-        OrderDecoder.decodeRule80A(self, fields)
-        OrderDecoder.decodePercentOffset(self, fields)
-        OrderDecoder.decodeSettlingFirm(self, fields)
-        OrderDecoder.decodeShortSaleParams(self, fields)
-        OrderDecoder.decodeAuctionStrategy(self, fields)
-        OrderDecoder.decodeBoxOrderParams(self, fields)
-        OrderDecoder.decodePegToStkOrVolOrderParams(self, fields)
-        OrderDecoder.decodeDisplaySize(self, fields)
-        OrderDecoder.decodeBlockOrder(self, fields)
-        OrderDecoder.decodeSweepToFill(self, fields)
-        OrderDecoder.decodeAllOrNone(self, fields)
-        OrderDecoder.decodeMinQty(self, fields)
-        OrderDecoder.decodeOcaType(self, fields)
-        OrderDecoder.skipETradeOnly(self, fields)
-        OrderDecoder.skipFirmQuoteOnly(self, fields)
-        OrderDecoder.skipNbboPriceCap(self, fields)
-        OrderDecoder.decodeParentId(self, fields)
-        OrderDecoder.decodeTriggerMethod(self, fields)
-        OrderDecoder.decodeVolOrderParams(self, fields, True)
-        OrderDecoder.decodeTrailParams(self, fields)
-        OrderDecoder.decodeBasisPoints(self, fields)
-        OrderDecoder.decodeComboLegs(self, fields)
-        OrderDecoder.decodeSmartComboRoutingParams(self, fields)
-        OrderDecoder.decodeScaleOrderParams(self, fields)
-        OrderDecoder.decodeHedgeParams(self, fields)
-        OrderDecoder.decodeOptOutSmartRouting(self, fields)
-        OrderDecoder.decodeClearingParams(self, fields)
-        OrderDecoder.decodeNotHeld(self, fields)
-        OrderDecoder.decodeDeltaNeutral(self, fields)
-        OrderDecoder.decodeAlgoParams(self, fields)
-        OrderDecoder.decodeSolicited(self, fields)
-        OrderDecoder.decodeWhatIfInfoAndCommission(self, fields)
-        OrderDecoder.decodeVolRandomizeFlags(self, fields)
-        OrderDecoder.decodePegToBenchParams(self, fields)
-        OrderDecoder.decodeConditions(self, fields)
-        OrderDecoder.decodeAdjustedOrderParams(self, fields)
-        OrderDecoder.decodeSoftDollarTier(self, fields)
-        OrderDecoder.decodeCashQty(self, fields)
-        OrderDecoder.decodeDontUseAutoPriceForHedge(self, fields)
-        OrderDecoder.decodeIsOmsContainers(self, fields)
-        OrderDecoder.decodeDiscretionaryUpToLimitPrice(self, fields)
-        OrderDecoder.decodeUsePriceMgmtAlgo(self, fields)
-        OrderDecoder.decodeDuration(self, fields)
-        OrderDecoder.decodePostToAts(self, fields)
-        OrderDecoder.decodeAutoCancelParent(
-            self, fields, MIN_SERVER_VER_AUTO_CANCEL_PARENT
-        )
-        OrderDecoder.decodePegBestPegMidOrderAttributes(self, fields)
-        OrderDecoder.decodeCustomerAccount(self, fields)
-        OrderDecoder.decodeProfessionalCustomer(self, fields)
-        OrderDecoder.decodeBondAccruedInterest(self, fields)
+        plan = self.orderPlan(IN.OPEN_ORDER, OPEN_ORDER_STEPS, version, fields)
+        OrderDecoder.runDecodePlan(self, plan, fields)
 
         self.wrapper.openOrder(order.orderId, contract, order, orderState)
 
+    def orderPlan(self, msgId, steps, version, fields):
+        """the decode plan of the order steps, made once per version,
+        serverVersion and cursor class, see orderdecoder.makeDecodePlan()"""
+        key = (msgId, version, self.serverVersion, type(fields))
+        plan = self.orderPlans.get(key, None)
+        if plan is None:
+            plan = makeDecodePlan(steps, version, self.serverVersion, type(fields))
+            self.orderPlans[key] = plan
+        return plan
+
     def processPortfolioValueMsg(self, fields):
-        next(fields)
-        version = decode(int, fields)
+        fields.skip()
+        version = fields.read_int()
 
         # read contract fields
         contract = Contract()
-        contract.conId = decode(int, fields)  # ver 6 field
-        contract.symbol = decode(str, fields)
-        contract.secType = decode(str, fields)
-        contract.lastTradeDateOrContractMonth = decode(str, fields)
-        contract.strike = decode(float, fields)
-        contract.right = decode(str, fields)
+        contract.conId = fields.read_int()  # ver 6 field
+        contract.symbol = fields.read_str()
+        contract.secType = fields.read_str()
+        contract.lastTradeDateOrContractMonth = fields.read_str()
+        contract.strike = fields.read_float()
+        contract.right = fields.read_str()
 
         if version >= 7:
-            contract.multiplier = decode(str, fields)
-            contract.primaryExchange = decode(str, fields)
+            contract.multiplier = fields.read_str()
+            contract.primaryExchange = fields.read_str()
 
-        contract.currency = decode(str, fields)
-        contract.localSymbol = decode(str, fields)  # ver 2 field
+        contract.currency = fields.read_str()
+        contract.localSymbol = fields.read_str()  # ver 2 field
         if version >= 8:
-            contract.tradingClass = decode(str, fields)
+            contract.tradingClass = fields.read_str()
 
-        position = decode(Decimal, fields)
+        position = fields.read_decimal()
 
-        marketPrice = decode(float, fields)
-        marketValue = decode(float, fields)
-        averageCost = decode(float, fields)  # ver 3 field
-        unrealizedPNL = decode(float, fields)  # ver 3 field
-        realizedPNL = decode(float, fields)  # ver 3 field
+        marketPrice = fields.read_float()
+        marketValue = fields.read_float()
+        averageCost = fields.read_float()  # ver 3 field
+        unrealizedPNL = fields.read_float()  # ver 3 field
+        realizedPNL = fields.read_float()  # ver 3 field
 
-        accountName = decode(str, fields)  # ver 4 field
+        accountName = fields.read_str()  # ver 4 field
 
         if version == 6 and self.serverVersion == 39:
-            contract.primaryExchange = decode(str, fields)
+            contract.primaryExchange = fields.read_str()
 
         self.wrapper.updatePortfolio(
             contract,
@@ -289,226 +260,226 @@ class Decoder(Object):
         )
 
     def processContractDataMsg(self, fields):
-        next(fields)
+        fields.skip()
         version = 8
         if self.serverVersion < MIN_SERVER_VER_SIZE_RULES:
-            version = decode(int, fields)
+            version = fields.read_int()
 
         reqId = -1
         if version >= 3:
-            reqId = decode(int, fields)
+            reqId = fields.read_int()
 
         contract = ContractDetails()
-        contract.contract.symbol = decode(str, fields)
-        contract.contract.secType = decode(str, fields)
+        contract.contract.symbol = fields.read_str()
+        contract.contract.secType = fields.read_str()
         self.readLastTradeDate(fields, contract, False)
         if self.serverVersion >= MIN_SERVER_VER_LAST_TRADE_DATE:
-            contract.contract.lastTradeDate = decode(str, fields)
-        contract.contract.strike = decode(float, fields)
-        contract.contract.right = decode(str, fields)
-        contract.contract.exchange = decode(str, fields)
-        contract.contract.currency = decode(str, fields)
-        contract.contract.localSymbol = decode(str, fields)
-        contract.marketName = decode(str, fields)
-        contract.contract.tradingClass = decode(str, fields)
-        contract.contract.conId = decode(int, fields)
-        contract.minTick = decode(float, fields)
+            contract.contract.lastTradeDate = fields.read_str()
+        contract.contract.strike = fields.read_float()
+        contract.contract.right = fields.read_str()
+        contract.contract.exchange = fields.read_str()
+        contract.contract.currency = fields.read_str()
+        contract.contract.localSymbol = fields.read_str()
+        contract.marketName = fields.read_str()
+        contract.contract.tradingClass = fields.read_str()
+        contract.contract.conId = fields.read_int()
+        contract.minTick = fields.read_float()
         if (
             self.serverVersion >= MIN_SERVER_VER_MD_SIZE_MULTIPLIER
             and self.serverVersion < MIN_SERVER_VER_SIZE_RULES
         ):
-            decode(int, fields)  # mdSizeMultiplier - not used anymore
-        contract.contract.multiplier = decode(str, fields)
-        contract.orderTypes = decode(str, fields)
-        contract.validExchanges = decode(str, fields)
-        contract.priceMagnifier = decode(int, fields)  # ver 2 field
+            fields.read_int()  # mdSizeMultiplier - not used anymore
+        contract.contract.multiplier = fields.read_str()
+        contract.orderTypes = fields.read_str()
+        contract.validExchanges = fields.read_str()
+        contract.priceMagnifier = fields.read_int()  # ver 2 field
         if version >= 4:
-            contract.underConId = decode(int, fields)
+            contract.underConId = fields.read_int()
         if version >= 5:
             contract.longName = (
-                decode(str, fields).encode().decode("unicode-escape")
+                fields.read_str().encode().decode("unicode-escape")
                 if self.serverVersion >= MIN_SERVER_VER_ENCODE_MSG_ASCII7
-                else decode(str, fields)
+                else fields.read_str()
             )
-            contract.contract.primaryExchange = decode(str, fields)
+            contract.contract.primaryExchange = fields.read_str()
         if version >= 6:
-            contract.contractMonth = decode(str, fields)
-            contract.industry = decode(str, fields)
-            contract.category = decode(str, fields)
-            contract.subcategory = decode(str, fields)
-            contract.timeZoneId = decode(str, fields)
-            contract.tradingHours = decode(str, fields)
-            contract.liquidHours = decode(str, fields)
+            contract.contractMonth = fields.read_str()
+            contract.industry = fields.read_str()
+            contract.category = fields.read_str()
+            contract.subcategory = fields.read_str()
+            contract.timeZoneId = fields.read_str()
+            contract.tradingHours = fields.read_str()
+            contract.liquidHours = fields.read_str()
         if version >= 8:
-            contract.evRule = decode(str, fields)
-            contract.evMultiplier = decode(int, fields)
+            contract.evRule = fields.read_str()
+            contract.evMultiplier = fields.read_int()
         if version >= 7:
-            secIdListCount = decode(int, fields)
+            secIdListCount = fields.read_int()
             if secIdListCount > 0:
                 contract.secIdList = []
                 for _ in range(secIdListCount):
                     tagValue = TagValue()
-                    tagValue.tag = decode(str, fields)
-                    tagValue.value = decode(str, fields)
+                    tagValue.tag = fields.read_str()
+                    tagValue.value = fields.read_str()
                     contract.secIdList.append(tagValue)
 
         if self.serverVersion >= MIN_SERVER_VER_AGG_GROUP:
-            contract.aggGroup = decode(int, fields)
+            contract.aggGroup = fields.read_int()
 
         if self.serverVersion >= MIN_SERVER_VER_UNDERLYING_INFO:
-            contract.underSymbol = decode(str, fields)
-            contract.underSecType = decode(str, fields)
+            contract.underSymbol = fields.read_str()
+            contract.underSecType = fields.read_str()
 
         if self.serverVersion >= MIN_SERVER_VER_MARKET_RULES:
-            contract.marketRuleIds = decode(str, fields)
+            contract.marketRuleIds = fields.read_str()
 
         if self.serverVersion >= MIN_SERVER_VER_REAL_EXPIRATION_DATE:
-            contract.realExpirationDate = decode(str, fields)
+            contract.realExpirationDate = fields.read_str()
 
         if self.serverVersion >= MIN_SERVER_VER_STOCK_TYPE:
-            contract.stockType = decode(str, fields)
+            contract.stockType = fields.read_str()
 
         if (
             self.serverVersion >= MIN_SERVER_VER_FRACTIONAL_SIZE_SUPPORT
             and self.serverVersion < MIN_SERVER_VER_SIZE_RULES
         ):
-            decode(Decimal, fields)  # sizeMinTick - not used anymore
+            fields.read_decimal()  # sizeMinTick - not used anymore
 
         if self.serverVersion >= MIN_SERVER_VER_SIZE_RULES:
-            contract.minSize = decode(Decimal, fields)
-            contract.sizeIncrement = decode(Decimal, fields)
-            contract.suggestedSizeIncrement = decode(Decimal, fields)
+            contract.minSize = fields.read_decimal()
+            contract.sizeIncrement = fields.read_decimal()
+            contract.suggestedSizeIncrement = fields.read_decimal()
 
         if (
             self.serverVersion >= MIN_SERVER_VER_FUND_DATA_FIELDS
             and contract.contract.secType == "FUND"
         ):
-            contract.fundName = decode(str, fields)
-            contract.fundFamily = decode(str, fields)
-            contract.fundType = decode(str, fields)
-            contract.fundFrontLoad = decode(str, fields)
-            contract.fundBackLoad = decode(str, fields)
-            contract.fundBackLoadTimeInterval = decode(str, fields)
-            contract.fundManagementFee = decode(str, fields)
-            contract.fundClosed = decode(bool, fields)
-            contract.fundClosedForNewInvestors = decode(bool, fields)
-            contract.fundClosedForNewMoney = decode(bool, fields)
-            contract.fundNotifyAmount = decode(str, fields)
-            contract.fundMinimumInitialPurchase = decode(str, fields)
-            contract.fundSubsequentMinimumPurchase = decode(str, fields)
-            contract.fundBlueSkyStates = decode(str, fields)
-            contract.fundBlueSkyTerritories = decode(str, fields)
-            contract.fundDistributionPolicyIndicator = getEnumTypeFromString(FundDistributionPolicyIndicator, decode(str, fields))
-            contract.fundAssetType = getEnumTypeFromString(FundAssetType, decode(str, fields))
+            contract.fundName = fields.read_str()
+            contract.fundFamily = fields.read_str()
+            contract.fundType = fields.read_str()
+            contract.fundFrontLoad = fields.read_str()
+            contract.fundBackLoad = fields.read_str()
+            contract.fundBackLoadTimeInterval = fields.read_str()
+            contract.fundManagementFee = fields.read_str()
+            contract.fundClosed = fields.read_bool()
+            contract.fundClosedForNewInvestors = fields.read_bool()
+            contract.fundClosedForNewMoney = fields.read_bool()
+            contract.fundNotifyAmount = fields.read_str()
+            contract.fundMinimumInitialPurchase = fields.read_str()
+            contract.fundSubsequentMinimumPurchase = fields.read_str()
+            contract.fundBlueSkyStates = fields.read_str()
+            contract.fundBlueSkyTerritories = fields.read_str()
+            contract.fundDistributionPolicyIndicator = getEnumTypeFromString(FundDistributionPolicyIndicator, fields.read_str())
+            contract.fundAssetType = getEnumTypeFromString(FundAssetType, fields.read_str())
 
         if self.serverVersion >= MIN_SERVER_VER_INELIGIBILITY_REASONS:
-            ineligibilityReasonListCount = decode(int, fields)
+            ineligibilityReasonListCount = fields.read_int()
             if ineligibilityReasonListCount > 0:
                 contract.ineligibilityReasonList = []
                 for _ in range(ineligibilityReasonListCount):
                     ineligibilityReason = IneligibilityReason()
-                    ineligibilityReason.id_ = decode(str, fields)
-                    ineligibilityReason.description = decode(str, fields)
+                    ineligibilityReason.id_ = fields.read_str()
+                    ineligibilityReason.description = fields.read_str()
                     contract.ineligibilityReasonList.append(ineligibilityReason)
 
         self.wrapper.contractDetails(reqId, contract)
 
     def processBondContractDataMsg(self, fields):
-        next(fields)
+        fields.skip()
         version = 6
         if self.serverVersion < MIN_SERVER_VER_SIZE_RULES:
-            version = decode(int, fields)
+            version = fields.read_int()
 
         reqId = -1
         if version >= 3:
-            reqId = decode(int, fields)
+            reqId = fields.read_int()
 
         contract = ContractDetails()
-        contract.contract.symbol = decode(str, fields)
-        contract.contract.secType = decode(str, fields)
-        contract.cusip = decode(str, fields)
-        contract.coupon = decode(float, fields)
+        contract.contract.symbol = fields.read_str()
+        contract.contract.secType = fields.read_str()
+        contract.cusip = fields.read_str()
+        contract.coupon = fields.read_float()
         self.readLastTradeDate(fields, contract, True)
-        contract.issueDate = decode(str, fields)
-        contract.ratings = decode(str, fields)
-        contract.bondType = decode(str, fields)
-        contract.couponType = decode(str, fields)
-        contract.convertible = decode(bool, fields)
-        contract.callable = decode(bool, fields)
-        contract.putable = decode(bool, fields)
-        contract.descAppend = decode(str, fields)
-        contract.contract.exchange = decode(str, fields)
-        contract.contract.currency = decode(str, fields)
-        contract.marketName = decode(str, fields)
-        contract.contract.tradingClass = decode(str, fields)
-        contract.contract.conId = decode(int, fields)
-        contract.minTick = decode(float, fields)
+        contract.issueDate = fields.read_str()
+        contract.ratings = fields.read_str()
+        contract.bondType = fields.read_str()
+        contract.couponType = fields.read_str()
+        contract.convertible = fields.read_bool()
+        contract.callable = fields.read_bool()
+        contract.putable = fields.read_bool()
+        contract.descAppend = fields.read_str()
+        contract.contract.exchange = fields.read_str()
+        contract.contract.currency = fields.read_str()
+        contract.marketName = fields.read_str()
+        contract.contract.tradingClass = fields.read_str()
+        contract.contract.conId = fields.read_int()
+        contract.minTick = fields.read_float()
         if (
             self.serverVersion >= MIN_SERVER_VER_MD_SIZE_MULTIPLIER
             and self.serverVersion < MIN_SERVER_VER_SIZE_RULES
         ):
-            decode(int, fields)  # mdSizeMultiplier - not used anymore
-        contract.orderTypes = decode(str, fields)
-        contract.validExchanges = decode(str, fields)
-        contract.nextOptionDate = decode(str, fields)  # ver 2 field
-        contract.nextOptionType = decode(str, fields)  # ver 2 field
-        contract.nextOptionPartial = decode(bool, fields)  # ver 2 field
-        contract.notes = decode(str, fields)  # ver 2 field
+            fields.read_int()  # mdSizeMultiplier - not used anymore
+        contract.orderTypes = fields.read_str()
+        contract.validExchanges = fields.read_str()
+        contract.nextOptionDate = fields.read_str()  # ver 2 field
+        contract.nextOptionType = fields.read_str()  # ver 2 field
+        contract.nextOptionPartial = fields.read_bool()  # ver 2 field
+        contract.notes = fields.read_str()  # ver 2 field
         if version >= 4:
-            contract.longName = decode(str, fields)
+            contract.longName = fields.read_str()
         if version >= 6:
-            contract.evRule = decode(str, fields)
-            contract.evMultiplier = decode(int, fields)
+            contract.evRule = fields.read_str()
+            contract.evMultiplier = fields.read_int()
         if version >= 5:
-            secIdListCount = decode(int, fields)
+            secIdListCount = fields.read_int()
             if secIdListCount > 0:
                 contract.secIdList = []
                 for _ in range(secIdListCount):
                     tagValue = TagValue()
-                    tagValue.tag = decode(str, fields)
-                    tagValue.value = decode(str, fields)
+                    tagValue.tag = fields.read_str()
+                    tagValue.value = fields.read_str()
                     contract.secIdList.append(tagValue)
 
         if self.serverVersion >= MIN_SERVER_VER_AGG_GROUP:
-            contract.aggGroup = decode(int, fields)
+            contract.aggGroup = fields.read_int()
 
         if self.serverVersion >= MIN_SERVER_VER_MARKET_RULES:
-            contract.marketRuleIds = decode(str, fields)
+            contract.marketRuleIds = fields.read_str()
 
         if self.serverVersion >= MIN_SERVER_VER_SIZE_RULES:
-            contract.minSize = decode(Decimal, fields)
-            contract.sizeIncrement = decode(Decimal, fields)
-            contract.suggestedSizeIncrement = decode(Decimal, fields)
+            contract.minSize = fields.read_decimal()
+            contract.sizeIncrement = fields.read_decimal()
+            contract.suggestedSizeIncrement = fields.read_decimal()
 
         self.wrapper.bondContractDetails(reqId, contract)
 
     def processScannerDataMsg(self, fields):
-        next(fields)
-        decode(int, fields)
-        reqId = decode(int, fields)
+        fields.skip()
+        fields.read_int()
+        reqId = fields.read_int()
 
-        numberOfElements = decode(int, fields)
+        numberOfElements = fields.read_int()
 
         for _ in range(numberOfElements):
             data = ScanData()
             data.contract = ContractDetails()
 
-            data.rank = decode(int, fields)
-            data.contract.contract.conId = decode(int, fields)  # ver 3 field
-            data.contract.contract.symbol = decode(str, fields)
-            data.contract.contract.secType = decode(str, fields)
-            data.contract.contract.lastTradeDateOrContractMonth = decode(str, fields)
-            data.contract.contract.strike = decode(float, fields)
-            data.contract.contract.right = decode(str, fields)
-            data.contract.contract.exchange = decode(str, fields)
-            data.contract.contract.currency = decode(str, fields)
-            data.contract.contract.localSymbol = decode(str, fields)
-            data.contract.marketName = decode(str, fields)
-            data.contract.contract.tradingClass = decode(str, fields)
-            data.distance = decode(str, fields)
-            data.benchmark = decode(str, fields)
-            data.projection = decode(str, fields)
-            data.legsStr = decode(str, fields)
+            data.rank = fields.read_int()
+            data.contract.contract.conId = fields.read_int()  # ver 3 field
+            data.contract.contract.symbol = fields.read_str()
+            data.contract.contract.secType = fields.read_str()
+            data.contract.contract.lastTradeDateOrContractMonth = fields.read_str()
+            data.contract.contract.strike = fields.read_float()
+            data.contract.contract.right = fields.read_str()
+            data.contract.contract.exchange = fields.read_str()
+            data.contract.contract.currency = fields.read_str()
+            data.contract.contract.localSymbol = fields.read_str()
+            data.contract.marketName = fields.read_str()
+            data.contract.contract.tradingClass = fields.read_str()
+            data.distance = fields.read_str()
+            data.benchmark = fields.read_str()
+            data.projection = fields.read_str()
+            data.legsStr = fields.read_str()
             self.wrapper.scannerData(
                 reqId,
                 data.rank,
@@ -522,132 +493,136 @@ class Decoder(Object):
         self.wrapper.scannerDataEnd(reqId)
 
     def processExecutionDataMsg(self, fields):
-        next(fields)
+        fields.skip()
         version = self.serverVersion
 
         if self.serverVersion < MIN_SERVER_VER_LAST_LIQUIDITY:
-            version = decode(int, fields)
+            version = fields.read_int()
 
         reqId = -1
         if version >= 7:
-            reqId = decode(int, fields)
+            reqId = fields.read_int()
 
-        orderId = decode(int, fields)
+        orderId = fields.read_int()
 
         # decode contract fields
         contract = Contract()
-        contract.conId = decode(int, fields)  # ver 5 field
-        contract.symbol = decode(str, fields)
-        contract.secType = decode(str, fields)
-        contract.lastTradeDateOrContractMonth = decode(str, fields)
-        contract.strike = decode(float, fields)
-        contract.right = decode(str, fields)
+        contract.conId = fields.read_int()  # ver 5 field
+        contract.symbol = fields.read_str()
+        contract.secType = fields.read_str()
+        contract.lastTradeDateOrContractMonth = fields.read_str()
+        contract.strike = fields.read_float()
+        contract.right = fields.read_str()
         if version >= 9:
-            contract.multiplier = decode(str, fields)
-        contract.exchange = decode(str, fields)
-        contract.currency = decode(str, fields)
-        contract.localSymbol = decode(str, fields)
+            contract.multiplier = fields.read_str()
+        contract.exchange = fields.read_str()
+        contract.currency = fields.read_str()
+        contract.localSymbol = fields.read_str()
         if version >= 10:
-            contract.tradingClass = decode(str, fields)
+            contract.tradingClass = fields.read_str()
 
         # decode execution fields
         execution = Execution()
         execution.orderId = orderId
-        execution.execId = decode(str, fields)
-        execution.time = decode(str, fields)
-        execution.acctNumber = decode(str, fields)
-        execution.exchange = decode(str, fields)
-        execution.side = decode(str, fields)
-        execution.shares = decode(Decimal, fields)
-        execution.price = decode(float, fields)
-        execution.permId = decode(int, fields)  # ver 2 field
-        execution.clientId = decode(int, fields)  # ver 3 field
-        execution.liquidation = decode(int, fields)  # ver 4 field
+        execution.execId = fields.read_str()
+        execution.time = fields.read_str()
+        execution.acctNumber = fields.read_str()
+        execution.exchange = fields.read_str()
+        execution.side = fields.read_str()
+        execution.shares = fields.read_decimal()
+        execution.price = fields.read_float()
+        execution.permId = fields.read_int()  # ver 2 field
+        execution.clientId = fields.read_int()  # ver 3 field
+        execution.liquidation = fields.read_int()  # ver 4 field
 
         if version >= 6:
-            execution.cumQty = decode(Decimal, fields)
-            execution.avgPrice = decode(float, fields)
+            execution.cumQty = fields.read_decimal()
+            execution.avgPrice = fields.read_float()
 
         if version >= 8:
-            execution.orderRef = decode(str, fields)
+            execution.orderRef = fields.read_str()
 
         if version >= 9:
-            execution.evRule = decode(str, fields)
-            execution.evMultiplier = decode(float, fields)
+            execution.evRule = fields.read_str()
+            execution.evMultiplier = fields.read_float()
         if self.serverVersion >= MIN_SERVER_VER_MODELS_SUPPORT:
-            execution.modelCode = decode(str, fields)
+            execution.modelCode = fields.read_str()
         if self.serverVersion >= MIN_SERVER_VER_LAST_LIQUIDITY:
-            execution.lastLiquidity = decode(int, fields)
+            execution.lastLiquidity = fields.read_int()
         if self.serverVersion >= MIN_SERVER_VER_PENDING_PRICE_REVISION:
-            execution.pendingPriceRevision = decode(bool, fields)
+            execution.pendingPriceRevision = fields.read_bool()
 
         self.wrapper.execDetails(reqId, contract, execution)
 
     def processHistoricalDataMsg(self, fields):
-        next(fields)
+        fields.skip()
 
         if self.serverVersion < MIN_SERVER_VER_SYNT_REALTIME_BARS:
-            decode(int, fields)
+            fields.read_int()
 
-        reqId = decode(int, fields)
-        startDateStr = decode(str, fields)  # ver 2 field
-        endDateStr = decode(str, fields)  # ver 2 field
+        reqId = fields.read_int()
+        startDateStr = fields.read_str()  # ver 2 field
+        endDateStr = fields.read_str()  # ver 2 field
 
-        itemCount = decode(int, fields)
+        itemCount = fields.read_int()
 
-        for _ in range(itemCount):
-            bar = BarData()
-            bar.date = decode(str, fields)
-            bar.open = decode(float, fields)
-            bar.high = decode(float, fields)
-            bar.low = decode(float, fields)
-            bar.close = decode(float, fields)
-            bar.volume = decode(Decimal, fields)
-            bar.wap = decode(Decimal, fields)
+        if "historicalDataArray" in self.arrayCallbacks:
+            bars = columnar.barsArray(fields, itemCount, self.serverVersion)
+            self.wrapper.historicalDataArray(reqId, bars)
+        else:
+            for _ in range(itemCount):
+                bar = BarData()
+                bar.date = fields.read_str()
+                bar.open = fields.read_float()
+                bar.high = fields.read_float()
+                bar.low = fields.read_float()
+                bar.close = fields.read_float()
+                bar.volume = fields.read_decimal()
+                bar.wap = fields.read_decimal()
 
-            if self.serverVersion < MIN_SERVER_VER_SYNT_REALTIME_BARS:
-                decode(str, fields)
+                if self.serverVersion < MIN_SERVER_VER_SYNT_REALTIME_BARS:
+                    fields.read_str()
 
-            bar.barCount = decode(int, fields)  # ver 3 field
+                bar.barCount = fields.read_int()  # ver 3 field
 
-            self.wrapper.historicalData(reqId, bar)
+                self.wrapper.historicalData(reqId, bar)
 
         # send end of dataset marker
         self.wrapper.historicalDataEnd(reqId, startDateStr, endDateStr)
 
     def processHistoricalDataUpdateMsg(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
+        fields.skip()
+        reqId = fields.read_int()
         bar = BarData()
-        bar.barCount = decode(int, fields)
-        bar.date = decode(str, fields)
-        bar.open = decode(float, fields)
-        bar.close = decode(float, fields)
-        bar.high = decode(float, fields)
-        bar.low = decode(float, fields)
-        bar.wap = decode(Decimal, fields)
-        bar.volume = decode(Decimal, fields)
+        bar.barCount = fields.read_int()
+        bar.date = fields.read_str()
+        bar.open = fields.read_float()
+        bar.close = fields.read_float()
+        bar.high = fields.read_float()
+        bar.low = fields.read_float()
+        bar.wap = fields.read_decimal()
+        bar.volume = fields.read_decimal()
         self.wrapper.historicalDataUpdate(reqId, bar)
 
     def processRealTimeBarMsg(self, fields):
-        next(fields)
-        decode(int, fields)
-        reqId = decode(int, fields)
+        fields.skip()
+        fields.read_int()
+        reqId = fields.read_int()
 
         bar = RealTimeBar()
-        bar.time = decode(int, fields)
-        bar.open = decode(float, fields)
-        bar.high = decode(float, fields)
-        bar.low = decode(float, fields)
-        bar.close = decode(float, fields)
-        bar.volume = decode(Decimal, fields)
-        bar.wap = decode(Decimal, fields)
-        bar.count = decode(int, fields)
+        bar.time = fields.read_int()
+        bar.open_ = fields.read_float()
+        bar.high = fields.read_float()
+        bar.low = fields.read_float()
+        bar.close = fields.read_float()
+        bar.volume = fields.read_decimal()
+        bar.wap = fields.read_decimal()
+        bar.count = fields.read_int()
 
         self.wrapper.realtimeBar(
             reqId,
             bar.time,
-            bar.open,
+            bar.open_,
             bar.high,
             bar.low,
             bar.close,
@@ -666,18 +641,18 @@ class Decoder(Object):
         theta = None
         undPrice = None
 
-        next(fields)
+        fields.skip()
         if self.serverVersion < MIN_SERVER_VER_PRICE_BASED_VOLATILITY:
-            version = decode(int, fields)
+            version = fields.read_int()
 
-        reqId = decode(int, fields)
-        tickTypeInt = decode(int, fields)
+        reqId = fields.read_int()
+        tickTypeInt = fields.read_int()
 
         if self.serverVersion >= MIN_SERVER_VER_PRICE_BASED_VOLATILITY:
-            tickAttrib = decode(int, fields)
+            tickAttrib = fields.read_int()
 
-        impliedVol = decode(float, fields)
-        delta = decode(float, fields)
+        impliedVol = fields.read_float()
+        delta = fields.read_float()
 
         if impliedVol < 0:  # -1 is the "not computed" indicator
             impliedVol = None
@@ -689,8 +664,8 @@ class Decoder(Object):
             or tickTypeInt == TickTypeEnum.MODEL_OPTION
             or tickTypeInt == TickTypeEnum.DELAYED_MODEL_OPTION
         ):
-            optPrice = decode(float, fields)
-            pvDividend = decode(float, fields)
+            optPrice = fields.read_float()
+            pvDividend = fields.read_float()
 
             if optPrice == -1:  # -1 is the "not computed" indicator
                 optPrice = None
@@ -698,10 +673,10 @@ class Decoder(Object):
                 pvDividend = None
 
         if version >= 6:
-            gamma = decode(float, fields)
-            vega = decode(float, fields)
-            theta = decode(float, fields)
-            undPrice = decode(float, fields)
+            gamma = fields.read_float()
+            vega = fields.read_float()
+            theta = fields.read_float()
+            undPrice = fields.read_float()
 
             if gamma == -2:  # -2 is the "not yet computed" indicator
                 gamma = None
@@ -727,115 +702,115 @@ class Decoder(Object):
         )
 
     def processDeltaNeutralValidationMsg(self, fields):
-        next(fields)
-        decode(int, fields)
-        reqId = decode(int, fields)
+        fields.skip()
+        fields.read_int()
+        reqId = fields.read_int()
 
         deltaNeutralContract = DeltaNeutralContract()
 
-        deltaNeutralContract.conId = decode(int, fields)
-        deltaNeutralContract.delta = decode(float, fields)
-        deltaNeutralContract.price = decode(float, fields)
+        deltaNeutralContract.conId = fields.read_int()
+        deltaNeutralContract.delta = fields.read_float()
+        deltaNeutralContract.price = fields.read_float()
 
         self.wrapper.deltaNeutralValidation(reqId, deltaNeutralContract)
 
     def processMarketDataTypeMsg(self, fields):
-        next(fields)
-        decode(int, fields)
-        reqId = decode(int, fields)
-        marketDataType = decode(int, fields)
+        fields.skip()
+        fields.read_int()
+        reqId = fields.read_int()
+        marketDataType = fields.read_int()
 
         self.wrapper.marketDataType(reqId, marketDataType)
 
     def processCommissionReportMsg(self, fields):
-        next(fields)
-        decode(int, fields)
+        fields.skip()
+        fields.read_int()
 
         commissionReport = CommissionReport()
-        commissionReport.execId = decode(str, fields)
-        commissionReport.commission = decode(float, fields)
-        commissionReport.currency = decode(str, fields)
-        commissionReport.realizedPNL = decode(float, fields)
-        commissionReport.yield_ = decode(float, fields)
-        commissionReport.yieldRedemptionDate = decode(int, fields)
+        commissionReport.execId = fields.read_str()
+        commissionReport.commission = fields.read_float()
+        commissionReport.currency = fields.read_str()
+        commissionReport.realizedPNL = fields.read_float()
+        commissionReport.yield_ = fields.read_float()
+        commissionReport.yieldRedemptionDate = fields.read_int()
 
         self.wrapper.commissionReport(commissionReport)
 
     def processPositionDataMsg(self, fields):
-        next(fields)
-        version = decode(int, fields)
+        fields.skip()
+        version = fields.read_int()
 
-        account = decode(str, fields)
+        account = fields.read_str()
 
         # decode contract fields
         contract = Contract()
-        contract.conId = decode(int, fields)
-        contract.symbol = decode(str, fields)
-        contract.secType = decode(str, fields)
-        contract.lastTradeDateOrContractMonth = decode(str, fields)
-        contract.strike = decode(float, fields)
-        contract.right = decode(str, fields)
-        contract.multiplier = decode(str, fields)
-        contract.exchange = decode(str, fields)
-        contract.currency = decode(str, fields)
-        contract.localSymbol = decode(str, fields)
+        contract.conId = fields.read_int()
+        contract.symbol = fields.read_str()
+        contract.secType = fields.read_str()
+        contract.lastTradeDateOrContractMonth = fields.read_str()
+        contract.strike = fields.read_float()
+        contract.right = fields.read_str()
+        contract.multiplier = fields.read_str()
+        contract.exchange = fields.read_str()
+        contract.currency = fields.read_str()
+        contract.localSymbol = fields.read_str()
         if version >= 2:
-            contract.tradingClass = decode(str, fields)
+            contract.tradingClass = fields.read_str()
 
-        position = decode(Decimal, fields)
+        position = fields.read_decimal()
 
         avgCost = 0.0
         if version >= 3:
-            avgCost = decode(float, fields)
+            avgCost = fields.read_float()
 
         self.wrapper.position(account, contract, position, avgCost)
 
     def processPositionMultiMsg(self, fields):
-        next(fields)
-        decode(int, fields)
-        reqId = decode(int, fields)
-        account = decode(str, fields)
+        fields.skip()
+        fields.read_int()
+        reqId = fields.read_int()
+        account = fields.read_str()
 
         # decode contract fields
         contract = Contract()
-        contract.conId = decode(int, fields)
-        contract.symbol = decode(str, fields)
-        contract.secType = decode(str, fields)
-        contract.lastTradeDateOrContractMonth = decode(str, fields)
-        contract.strike = decode(float, fields)
-        contract.right = decode(str, fields)
-        contract.multiplier = decode(str, fields)
-        contract.exchange = decode(str, fields)
-        contract.currency = decode(str, fields)
-        contract.localSymbol = decode(str, fields)
-        contract.tradingClass = decode(str, fields)
-        position = decode(Decimal, fields)
-        avgCost = decode(float, fields)
-        modelCode = decode(str, fields)
+        contract.conId = fields.read_int()
+        contract.symbol = fields.read_str()
+        contract.secType = fields.read_str()
+        contract.lastTradeDateOrContractMonth = fields.read_str()
+        contract.strike = fields.read_float()
+        contract.right = fields.read_str()
+        contract.multiplier = fields.read_str()
+        contract.exchange = fields.read_str()
+        contract.currency = fields.read_str()
+        contract.localSymbol = fields.read_str()
+        contract.tradingClass = fields.read_str()
+        position = fields.read_decimal()
+        avgCost = fields.read_float()
+        modelCode = fields.read_str()
 
         self.wrapper.positionMulti(
             reqId, account, modelCode, contract, position, avgCost
         )
 
     def processSecurityDefinitionOptionParameterMsg(self, fields):
-        next(fields)
+        fields.skip()
 
-        reqId = decode(int, fields)
-        exchange = decode(str, fields)
-        underlyingConId = decode(int, fields)
-        tradingClass = decode(str, fields)
-        multiplier = decode(str, fields)
+        reqId = fields.read_int()
+        exchange = fields.read_str()
+        underlyingConId = fields.read_int()
+        tradingClass = fields.read_str()
+        multiplier = fields.read_str()
 
-        expCount = decode(int, fields)
+        expCount = fields.read_int()
         expirations = set()
         for _ in range(expCount):
-            expiration = decode(str, fields)
+            expiration = fields.read_str()
             expirations.add(expiration)
 
-        strikeCount = decode(int, fields)
+        strikeCount = fields.read_int()
         strikes = set()
         for _ in range(strikeCount):
-            strike = decode(float, fields)
+            strike = fields.read_float()
             strikes.add(strike)
 
         self.wrapper.securityDefinitionOptionParameter(
@@ -849,333 +824,351 @@ class Decoder(Object):
         )
 
     def processSecurityDefinitionOptionParameterEndMsg(self, fields):
-        next(fields)
+        fields.skip()
 
-        reqId = decode(int, fields)
+        reqId = fields.read_int()
         self.wrapper.securityDefinitionOptionParameterEnd(reqId)
 
     def processSoftDollarTiersMsg(self, fields):
-        next(fields)
+        fields.skip()
 
-        reqId = decode(int, fields)
-        nTiers = decode(int, fields)
+        reqId = fields.read_int()
+        nTiers = fields.read_int()
 
         tiers = []
         for _ in range(nTiers):
             tier = SoftDollarTier()
-            tier.name = decode(str, fields)
-            tier.val = decode(str, fields)
-            tier.displayName = decode(str, fields)
+            tier.name = fields.read_str()
+            tier.val = fields.read_str()
+            tier.displayName = fields.read_str()
             tiers.append(tier)
 
         self.wrapper.softDollarTiers(reqId, tiers)
 
     def processFamilyCodesMsg(self, fields):
-        next(fields)
+        fields.skip()
 
-        nFamilyCodes = decode(int, fields)
+        nFamilyCodes = fields.read_int()
         familyCodes = []
         for _ in range(nFamilyCodes):
             famCode = FamilyCode()
-            famCode.accountID = decode(str, fields)
-            famCode.familyCodeStr = decode(str, fields)
+            famCode.accountID = fields.read_str()
+            famCode.familyCodeStr = fields.read_str()
             familyCodes.append(famCode)
 
         self.wrapper.familyCodes(familyCodes)
 
     def processSymbolSamplesMsg(self, fields):
-        next(fields)
+        fields.skip()
 
-        reqId = decode(int, fields)
-        nContractDescriptions = decode(int, fields)
+        reqId = fields.read_int()
+        nContractDescriptions = fields.read_int()
         contractDescriptions = []
         for _ in range(nContractDescriptions):
             conDesc = ContractDescription()
-            conDesc.contract.conId = decode(int, fields)
-            conDesc.contract.symbol = decode(str, fields)
-            conDesc.contract.secType = decode(str, fields)
-            conDesc.contract.primaryExchange = decode(str, fields)
-            conDesc.contract.currency = decode(str, fields)
+            conDesc.contract.conId = fields.read_int()
+            conDesc.contract.symbol = fields.read_str()
+            conDesc.contract.secType = fields.read_str()
+            conDesc.contract.primaryExchange = fields.read_str()
+            conDesc.contract.currency = fields.read_str()
 
-            nDerivativeSecTypes = decode(int, fields)
+            nDerivativeSecTypes = fields.read_int()
             conDesc.derivativeSecTypes = []
             for _ in range(nDerivativeSecTypes):
-                derivSecType = decode(str, fields)
+                derivSecType = fields.read_str()
                 conDesc.derivativeSecTypes.append(derivSecType)
             contractDescriptions.append(conDesc)
 
             if self.serverVersion >= MIN_SERVER_VER_BOND_ISSUERID:
-                conDesc.contract.description = decode(str, fields)
-                conDesc.contract.issuerId = decode(str, fields)
+                conDesc.contract.description = fields.read_str()
+                conDesc.contract.issuerId = fields.read_str()
 
         self.wrapper.symbolSamples(reqId, contractDescriptions)
 
     def processSmartComponents(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        n = decode(int, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        n = fields.read_int()
 
         smartComponentMap = []
         for _ in range(n):
             smartComponent = SmartComponent()
-            smartComponent.bitNumber = decode(int, fields)
-            smartComponent.exchange = decode(str, fields)
-            smartComponent.exchangeLetter = decode(str, fields)
+            smartComponent.bitNumber = fields.read_int()
+            smartComponent.exchange = fields.read_str()
+            smartComponent.exchangeLetter = fields.read_str()
             smartComponentMap.append(smartComponent)
 
         self.wrapper.smartComponents(reqId, smartComponentMap)
 
     def processTickReqParams(self, fields):
-        next(fields)
-        tickerId = decode(int, fields)
-        minTick = decode(float, fields)
-        bboExchange = decode(str, fields)
-        snapshotPermissions = decode(int, fields)
+        fields.skip()
+        tickerId = fields.read_int()
+        minTick = fields.read_float()
+        bboExchange = fields.read_str()
+        snapshotPermissions = fields.read_int()
         self.wrapper.tickReqParams(tickerId, minTick, bboExchange, snapshotPermissions)
 
     def processMktDepthExchanges(self, fields):
-        next(fields)
+        fields.skip()
         depthMktDataDescriptions = []
-        nDepthMktDataDescriptions = decode(int, fields)
+        nDepthMktDataDescriptions = fields.read_int()
 
         if nDepthMktDataDescriptions > 0:
             for _ in range(nDepthMktDataDescriptions):
                 desc = DepthMktDataDescription()
-                desc.exchange = decode(str, fields)
-                desc.secType = decode(str, fields)
+                desc.exchange = fields.read_str()
+                desc.secType = fields.read_str()
                 if self.serverVersion >= MIN_SERVER_VER_SERVICE_DATA_TYPE:
-                    desc.listingExch = decode(str, fields)
-                    desc.serviceDataType = decode(str, fields)
-                    desc.aggGroup = decode(int, fields)
+                    desc.listingExch = fields.read_str()
+                    desc.serviceDataType = fields.read_str()
+                    desc.aggGroup = fields.read_int()
                 else:
-                    decode(int, fields)  # boolean notSuppIsL2
+                    fields.read_int()  # boolean notSuppIsL2
                 depthMktDataDescriptions.append(desc)
 
         self.wrapper.mktDepthExchanges(depthMktDataDescriptions)
 
     def processHeadTimestamp(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        headTimestamp = decode(str, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        headTimestamp = fields.read_str()
         self.wrapper.headTimestamp(reqId, headTimestamp)
 
     def processTickNews(self, fields):
-        next(fields)
-        tickerId = decode(int, fields)
-        timeStamp = decode(int, fields)
-        providerCode = decode(str, fields)
-        articleId = decode(str, fields)
-        headline = decode(str, fields)
-        extraData = decode(str, fields)
+        fields.skip()
+        tickerId = fields.read_int()
+        timeStamp = fields.read_int()
+        providerCode = fields.read_str()
+        articleId = fields.read_str()
+        headline = fields.read_str()
+        extraData = fields.read_str()
         self.wrapper.tickNews(
             tickerId, timeStamp, providerCode, articleId, headline, extraData
         )
 
     def processNewsProviders(self, fields):
-        next(fields)
+        fields.skip()
         newsProviders = []
-        nNewsProviders = decode(int, fields)
+        nNewsProviders = fields.read_int()
         if nNewsProviders > 0:
             for _ in range(nNewsProviders):
                 provider = NewsProvider()
-                provider.code = decode(str, fields)
-                provider.name = decode(str, fields)
+                provider.code = fields.read_str()
+                provider.name = fields.read_str()
                 newsProviders.append(provider)
 
         self.wrapper.newsProviders(newsProviders)
 
     def processNewsArticle(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        articleType = decode(int, fields)
-        articleText = decode(str, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        articleType = fields.read_int()
+        articleText = fields.read_str()
         self.wrapper.newsArticle(reqId, articleType, articleText)
 
     def processHistoricalNews(self, fields):
-        next(fields)
-        requestId = decode(int, fields)
-        time = decode(str, fields)
-        providerCode = decode(str, fields)
-        articleId = decode(str, fields)
-        headline = decode(str, fields)
+        fields.skip()
+        requestId = fields.read_int()
+        time = fields.read_str()
+        providerCode = fields.read_str()
+        articleId = fields.read_str()
+        headline = fields.read_str()
         self.wrapper.historicalNews(requestId, time, providerCode, articleId, headline)
 
     def processHistoricalNewsEnd(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        hasMore = decode(bool, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        hasMore = fields.read_bool()
         self.wrapper.historicalNewsEnd(reqId, hasMore)
 
     def processHistogramData(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        numPoints = decode(int, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        numPoints = fields.read_int()
 
         histogram = []
         for _ in range(numPoints):
             dataPoint = HistogramData()
-            dataPoint.price = decode(float, fields)
-            dataPoint.size = decode(Decimal, fields)
+            dataPoint.price = fields.read_float()
+            dataPoint.size = fields.read_decimal()
             histogram.append(dataPoint)
 
         self.wrapper.histogramData(reqId, histogram)
 
     def processRerouteMktDataReq(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        conId = decode(int, fields)
-        exchange = decode(str, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        conId = fields.read_int()
+        exchange = fields.read_str()
 
         self.wrapper.rerouteMktDataReq(reqId, conId, exchange)
 
     def processRerouteMktDepthReq(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        conId = decode(int, fields)
-        exchange = decode(str, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        conId = fields.read_int()
+        exchange = fields.read_str()
 
         self.wrapper.rerouteMktDepthReq(reqId, conId, exchange)
 
     def processMarketRuleMsg(self, fields):
-        next(fields)
-        marketRuleId = decode(int, fields)
+        fields.skip()
+        marketRuleId = fields.read_int()
 
-        nPriceIncrements = decode(int, fields)
+        nPriceIncrements = fields.read_int()
         priceIncrements = []
 
         if nPriceIncrements > 0:
             for _ in range(nPriceIncrements):
                 prcInc = PriceIncrement()
-                prcInc.lowEdge = decode(float, fields)
-                prcInc.increment = decode(float, fields)
+                prcInc.lowEdge = fields.read_float()
+                prcInc.increment = fields.read_float()
                 priceIncrements.append(prcInc)
 
         self.wrapper.marketRule(marketRuleId, priceIncrements)
 
     def processPnLMsg(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        dailyPnL = decode(float, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        dailyPnL = fields.read_float()
         unrealizedPnL = None
         realizedPnL = None
 
         if self.serverVersion >= MIN_SERVER_VER_UNREALIZED_PNL:
-            unrealizedPnL = decode(float, fields)
+            unrealizedPnL = fields.read_float()
 
         if self.serverVersion >= MIN_SERVER_VER_REALIZED_PNL:
-            realizedPnL = decode(float, fields)
+            realizedPnL = fields.read_float()
 
         self.wrapper.pnl(reqId, dailyPnL, unrealizedPnL, realizedPnL)
 
     def processPnLSingleMsg(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        pos = decode(Decimal, fields)
-        dailyPnL = decode(float, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        pos = fields.read_decimal()
+        dailyPnL = fields.read_float()
         unrealizedPnL = None
         realizedPnL = None
 
         if self.serverVersion >= MIN_SERVER_VER_UNREALIZED_PNL:
-            unrealizedPnL = decode(float, fields)
+            unrealizedPnL = fields.read_float()
 
         if self.serverVersion >= MIN_SERVER_VER_REALIZED_PNL:
-            realizedPnL = decode(float, fields)
+            realizedPnL = fields.read_float()
 
-        value = decode(float, fields)
+        value = fields.read_float()
 
         self.wrapper.pnlSingle(reqId, pos, dailyPnL, unrealizedPnL, realizedPnL, value)
 
     def processHistoricalTicks(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        tickCount = decode(int, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        tickCount = fields.read_int()
+
+        if "historicalTicksArray" in self.arrayCallbacks:
+            ticks = columnar.ticksArray(fields, tickCount)
+            done = fields.read_bool()
+            self.wrapper.historicalTicksArray(reqId, ticks, done)
+            return
 
         ticks = []
 
         for _ in range(tickCount):
             historicalTick = HistoricalTick()
-            historicalTick.time = decode(int, fields)
-            next(fields)  # for consistency
-            historicalTick.price = decode(float, fields)
-            historicalTick.size = decode(Decimal, fields)
+            historicalTick.time = fields.read_int()
+            fields.skip()  # for consistency
+            historicalTick.price = fields.read_float()
+            historicalTick.size = fields.read_decimal()
             ticks.append(historicalTick)
 
-        done = decode(bool, fields)
+        done = fields.read_bool()
 
         self.wrapper.historicalTicks(reqId, ticks, done)
 
     def processHistoricalTicksBidAsk(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        tickCount = decode(int, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        tickCount = fields.read_int()
+
+        if "historicalTicksBidAskArray" in self.arrayCallbacks:
+            ticks = columnar.ticksBidAskArray(fields, tickCount)
+            done = fields.read_bool()
+            self.wrapper.historicalTicksBidAskArray(reqId, ticks, done)
+            return
 
         ticks = []
 
         for _ in range(tickCount):
             historicalTickBidAsk = HistoricalTickBidAsk()
-            historicalTickBidAsk.time = decode(int, fields)
-            mask = decode(int, fields)
-            tickAttribBidAsk = TickAttribBidAsk()
-            tickAttribBidAsk.askPastHigh = mask & 1 != 0
-            tickAttribBidAsk.bidPastLow = mask & 2 != 0
-            historicalTickBidAsk.tickAttribBidAsk = tickAttribBidAsk
-            historicalTickBidAsk.priceBid = decode(float, fields)
-            historicalTickBidAsk.priceAsk = decode(float, fields)
-            historicalTickBidAsk.sizeBid = decode(Decimal, fields)
-            historicalTickBidAsk.sizeAsk = decode(Decimal, fields)
+            historicalTickBidAsk.time = fields.read_int()
+            mask = fields.read_int()
+            attrib = HISTORICAL_TICK_ATTRIBS_BID_ASK[mask & 3]
+            historicalTickBidAsk.tickAttribBidAsk = attrib
+            historicalTickBidAsk.priceBid = fields.read_float()
+            historicalTickBidAsk.priceAsk = fields.read_float()
+            historicalTickBidAsk.sizeBid = fields.read_decimal()
+            historicalTickBidAsk.sizeAsk = fields.read_decimal()
             ticks.append(historicalTickBidAsk)
 
-        done = decode(bool, fields)
+        done = fields.read_bool()
 
         self.wrapper.historicalTicksBidAsk(reqId, ticks, done)
 
     def processHistoricalTicksLast(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        tickCount = decode(int, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        tickCount = fields.read_int()
+
+        if "historicalTicksLastArray" in self.arrayCallbacks:
+            strings = self.arrayStrings.get(reqId, None)
+            if strings is None:
+                strings = self.arrayStrings[reqId] = columnar.StringTable()
+            ticks = columnar.ticksLastArray(fields, tickCount, strings)
+            done = fields.read_bool()
+            if done:
+                del self.arrayStrings[reqId]
+            self.wrapper.historicalTicksLastArray(reqId, ticks, strings, done)
+            return
 
         ticks = []
 
         for _ in range(tickCount):
             historicalTickLast = HistoricalTickLast()
-            historicalTickLast.time = decode(int, fields)
-            mask = decode(int, fields)
-            tickAttribLast = TickAttribLast()
-            tickAttribLast.pastLimit = mask & 1 != 0
-            tickAttribLast.unreported = mask & 2 != 0
-            historicalTickLast.tickAttribLast = tickAttribLast
-            historicalTickLast.price = decode(float, fields)
-            historicalTickLast.size = decode(Decimal, fields)
-            historicalTickLast.exchange = decode(str, fields)
-            historicalTickLast.specialConditions = decode(str, fields)
+            historicalTickLast.time = fields.read_int()
+            mask = fields.read_int()
+            historicalTickLast.tickAttribLast = TICK_ATTRIBS_LAST[mask & 3]
+            historicalTickLast.price = fields.read_float()
+            historicalTickLast.size = fields.read_decimal()
+            historicalTickLast.exchange = fields.read_str()
+            historicalTickLast.specialConditions = fields.read_str()
             ticks.append(historicalTickLast)
 
-        done = decode(bool, fields)
+        done = fields.read_bool()
 
         self.wrapper.historicalTicksLast(reqId, ticks, done)
 
-    def processTickByTickMsg(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        tickType = decode(int, fields)
-        time = decode(int, fields)
+    def processTickByTickMsg(self, fields, wrapper=None):
+        if wrapper is None:
+            wrapper = self.wrapper
+        fields.skip()
+        reqId = fields.read_int()
+        tickType = fields.read_int()
+        time = fields.read_int()
 
         if tickType == 0:
             # None
             pass
         elif tickType == 1 or tickType == 2:
             # Last or AllLast
-            price = decode(float, fields)
-            size = decode(Decimal, fields)
-            mask = decode(int, fields)
+            price = fields.read_float()
+            size = fields.read_decimal()
+            mask = fields.read_int()
 
-            tickAttribLast = TickAttribLast()
-            tickAttribLast.pastLimit = mask & 1 != 0
-            tickAttribLast.unreported = mask & 2 != 0
-            exchange = decode(str, fields)
-            specialConditions = decode(str, fields)
+            tickAttribLast = TICK_ATTRIBS_LAST[mask & 3]
+            exchange = fields.read_str()
+            specialConditions = fields.read_str()
 
-            self.wrapper.tickByTickAllLast(
+            wrapper.tickByTickAllLast(
                 reqId,
                 tickType,
                 time,
@@ -1187,67 +1180,69 @@ class Decoder(Object):
             )
         elif tickType == 3:
             # BidAsk
-            bidPrice = decode(float, fields)
-            askPrice = decode(float, fields)
-            bidSize = decode(Decimal, fields)
-            askSize = decode(Decimal, fields)
-            mask = decode(int, fields)
-            tickAttribBidAsk = TickAttribBidAsk()
-            tickAttribBidAsk.bidPastLow = mask & 1 != 0
-            tickAttribBidAsk.askPastHigh = mask & 2 != 0
-
-            self.wrapper.tickByTickBidAsk(
+            bidPrice = fields.read_float()
+            askPrice = fields.read_float()
+            bidSize = fields.read_decimal()
+            askSize = fields.read_decimal()
+            mask = fields.read_int()
+            tickAttribBidAsk = TICK_ATTRIBS_BID_ASK[mask & 3]
+
+            wrapper.tickByTickBidAsk(
                 reqId, time, bidPrice, askPrice, bidSize, askSize, tickAttribBidAsk
             )
         elif tickType == 4:
             # MidPoint
-            midPoint = decode(float, fields)
+            midPoint = fields.read_float()
 
-            self.wrapper.tickByTickMidPoint(reqId, time, midPoint)
+            wrapper.tickByTickMidPoint(reqId, time, midPoint)
 
     def processOrderBoundMsg(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        apiClientId = decode(int, fields)
-        apiOrderId = decode(int, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        apiClientId = fields.read_int()
+        apiOrderId = fields.read_int()
 
         self.wrapper.orderBound(reqId, apiClientId, apiOrderId)
 
-    def processMarketDepthMsg(self, fields):
-        next(fields)
-        decode(int, fields)
-        reqId = decode(int, fields)
-
-        position = decode(int, fields)
-        operation = decode(int, fields)
-        side = decode(int, fields)
-        price = decode(float, fields)
-        size = decode(Decimal, fields)
-
-        self.wrapper.updateMktDepth(reqId, position, operation, side, price, size)
-
-    def processMarketDepthL2Msg(self, fields):
-        next(fields)
-        decode(int, fields)
-        reqId = decode(int, fields)
-
-        position = decode(int, fields)
-        marketMaker = decode(str, fields)
-        operation = decode(int, fields)
-        side = decode(int, fields)
-        price = decode(float, fields)
-        size = decode(Decimal, fields)
+    def processMarketDepthMsg(self, fields, wrapper=None):
+        if wrapper is None:
+            wrapper = self.wrapper
+        fields.skip()
+        fields.read_int()
+        reqId = fields.read_int()
+
+        position = fields.read_int()
+        operation = fields.read_int()
+        side = fields.read_int()
+        price = fields.read_float()
+        size = fields.read_decimal()
+
+        wrapper.updateMktDepth(reqId, position, operation, side, price, size)
+
+    def processMarketDepthL2Msg(self, fields, wrapper=None):
+        if wrapper is None:
+            wrapper = self.wrapper
+        fields.skip()
+        fields.read_int()
+        reqId = fields.read_int()
+
+        position = fields.read_int()
+        marketMaker = fields.read_str()
+        operation = fields.read_int()
+        side = fields.read_int()
+        price = fields.read_float()
+        size = fields.read_decimal()
         isSmartDepth = False
 
         if self.serverVersion >= MIN_SERVER_VER_SMART_DEPTH:
-            isSmartDepth = decode(bool, fields)
+            isSmartDepth = fields.read_bool()
 
-        self.wrapper.updateMktDepthL2(
+        wrapper.updateMktDepthL2(
             reqId, position, marketMaker, operation, side, price, size, isSmartDepth
         )
 
     def processCompletedOrderMsg(self, fields):
-        next(fields)
+        fields.skip()
 
         order = Order()
         contract = Contract()
@@ -1257,117 +1252,54 @@ class Decoder(Object):
             self, contract, order, orderState, UNSET_INTEGER, self.serverVersion
         )
 
-        # read contract fields
-        OrderDecoder.decodeContractFields(self, fields)
-
-        # read order fields
-        OrderDecoder.decodeAction(self, fields)
-        OrderDecoder.decodeTotalQuantity(self, fields)
-        OrderDecoder.decodeOrderType(self, fields)
-        OrderDecoder.decodeLmtPrice(self, fields)
-        OrderDecoder.decodeAuxPrice(self, fields)
-        OrderDecoder.decodeTIF(self, fields)
-        OrderDecoder.decodeOcaGroup(self, fields)
-        OrderDecoder.decodeAccount(self, fields)
-        OrderDecoder.decodeOpenClose(self, fields)
-        OrderDecoder.decodeOrigin(self, fields)
-        OrderDecoder.decodeOrderRef(self, fields)
-        OrderDecoder.decodePermId(self, fields)
-        OrderDecoder.decodeOutsideRth(self, fields)
-        OrderDecoder.decodeHidden(self, fields)
-        OrderDecoder.decodeDiscretionaryAmt(self, fields)
-        OrderDecoder.decodeGoodAfterTime(self, fields)
-        OrderDecoder.decodeFAParams(self, fields)
-        OrderDecoder.decodeModelCode(self, fields)
-        OrderDecoder.decodeGoodTillDate(self, fields)
-        OrderDecoder.decodeRule80A(self, fields)
-        OrderDecoder.decodePercentOffset(self, fields)
-        OrderDecoder.decodeSettlingFirm(self, fields)
-        OrderDecoder.decodeShortSaleParams(self, fields)
-        OrderDecoder.decodeBoxOrderParams(self, fields)
-        OrderDecoder.decodePegToStkOrVolOrderParams(self, fields)
-        OrderDecoder.decodeDisplaySize(self, fields)
-        OrderDecoder.decodeSweepToFill(self, fields)
-        OrderDecoder.decodeAllOrNone(self, fields)
-        OrderDecoder.decodeMinQty(self, fields)
-        OrderDecoder.decodeOcaType(self, fields)
-        OrderDecoder.decodeTriggerMethod(self, fields)
-        OrderDecoder.decodeVolOrderParams(self, fields, False)
-        OrderDecoder.decodeTrailParams(self, fields)
-        OrderDecoder.decodeComboLegs(self, fields)
-        OrderDecoder.decodeSmartComboRoutingParams(self, fields)
-        OrderDecoder.decodeScaleOrderParams(self, fields)
-        OrderDecoder.decodeHedgeParams(self, fields)
-        OrderDecoder.decodeClearingParams(self, fields)
-        OrderDecoder.decodeNotHeld(self, fields)
-        OrderDecoder.decodeDeltaNeutral(self, fields)
-        OrderDecoder.decodeAlgoParams(self, fields)
-        OrderDecoder.decodeSolicited(self, fields)
-        OrderDecoder.decodeOrderStatus(self, fields)
-        OrderDecoder.decodeVolRandomizeFlags(self, fields)
-        OrderDecoder.decodePegToBenchParams(self, fields)
-        OrderDecoder.decodeConditions(self, fields)
-        OrderDecoder.decodeStopPriceAndLmtPriceOffset(self, fields)
-        OrderDecoder.decodeCashQty(self, fields)
-        OrderDecoder.decodeDontUseAutoPriceForHedge(self, fields)
-        OrderDecoder.decodeIsOmsContainers(self, fields)
-        OrderDecoder.decodeAutoCancelDate(self, fields)
-        OrderDecoder.decodeFilledQuantity(self, fields)
-        OrderDecoder.decodeRefFuturesConId(self, fields)
-        OrderDecoder.decodeAutoCancelParent(self, fields)
-        OrderDecoder.decodeShareholder(self, fields)
-        OrderDecoder.decodeImbalanceOnly(self, fields)
-        OrderDecoder.decodeRouteMarketableToBbo(self, fields)
-        OrderDecoder.decodeParentPermId(self, fields)
-        OrderDecoder.decodeCompletedTime(self, fields)
-        OrderDecoder.decodeCompletedStatus(self, fields)
-        OrderDecoder.decodePegBestPegMidOrderAttributes(self, fields)
-        OrderDecoder.decodeCustomerAccount(self, fields)
-        OrderDecoder.decodeProfessionalCustomer(self, fields)
+        plan = self.orderPlan(
+            IN.COMPLETED_ORDER, COMPLETED_ORDER_STEPS, UNSET_INTEGER, fields
+        )
+        OrderDecoder.runDecodePlan(self, plan, fields)
 
         self.wrapper.completedOrder(contract, order, orderState)
 
     def processCompletedOrdersEndMsg(self, fields):
-        next(fields)
+        fields.skip()
 
         self.wrapper.completedOrdersEnd()
 
     def processReplaceFAEndMsg(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        text = decode(str, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        text = fields.read_str()
 
         self.wrapper.replaceFAEnd(reqId, text)
 
     def processWshMetaDataMsg(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        dataJson = decode(str, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        dataJson = fields.read_str()
 
         self.wrapper.wshMetaData(reqId, dataJson)
 
     def processWshEventDataMsg(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        dataJson = decode(str, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        dataJson = fields.read_str()
 
         self.wrapper.wshEventData(reqId, dataJson)
 
     def processHistoricalSchedule(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        startDateTime = decode(str, fields)
-        endDateTime = decode(str, fields)
-        timeZone = decode(str, fields)
-        sessionsCount = decode(int, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        startDateTime = fields.read_str()
+        endDateTime = fields.read_str()
+        timeZone = fields.read_str()
+        sessionsCount = fields.read_int()
 
         sessions = []
 
         for _ in range(sessionsCount):
             historicalSession = HistoricalSession()
-            historicalSession.startDateTime = decode(str, fields)
-            historicalSession.endDateTime = decode(str, fields)
-            historicalSession.refDate = decode(str, fields)
+            historicalSession.startDateTime = fields.read_str()
+            historicalSession.endDateTime = fields.read_str()
+            historicalSession.refDate = fields.read_str()
             sessions.append(historicalSession)
 
         self.wrapper.historicalSchedule(
@@ -1375,30 +1307,30 @@ class Decoder(Object):
         )
 
     def processUserInfo(self, fields):
-        next(fields)
-        reqId = decode(int, fields)
-        whiteBrandingId = decode(str, fields)
+        fields.skip()
+        reqId = fields.read_int()
+        whiteBrandingId = fields.read_str()
 
         self.wrapper.userInfo(reqId, whiteBrandingId)
 
     def processErrorMsg(self, fields):
-        next(fields)
-        decode(int, fields)
-        reqId = decode(TickerId, fields)
-        errorCode = decode(int, fields)
-        errorString = decode(
-            str, fields, False, self.serverVersion >= MIN_SERVER_VER_ENCODE_MSG_ASCII7
+        fields.skip()
+        fields.read_int()
+        reqId = fields.read_int()
+        errorCode = fields.read_int()
+        errorString = fields.read_str(
+            self.serverVersion >= MIN_SERVER_VER_ENCODE_MSG_ASCII7
         )
         advancedOrderRejectJson = ""
         if self.serverVersion >= MIN_SERVER_VER_ADVANCED_ORDER_REJECT:
-            advancedOrderRejectJson = decode(str, fields, False, True)
+            advancedOrderRejectJson = fields.read_str(True)
 
         self.wrapper.error(reqId, errorCode, errorString, advancedOrderRejectJson)
 
     ######################################################################
 
     def readLastTradeDate(self, fields, contract: ContractDetails, isBond: bool):
-        lastTradeDateOrContractMonth = decode(str, fields)
+        lastTradeDateOrContractMonth = fields.read_str()
         if lastTradeDateOrContractMonth is not None:
             if "-" in lastTradeDateOrContractMonth:
                 splitted = lastTradeDateOrContractMonth.split("-")
@@ -1420,6 +1352,11 @@ class Decoder(Object):
     ######################################################################
 
     def discoverParams(self):
+        # the HandleInfos are shared by all the Decoders, once is enough
+        if Decoder.paramsDiscovered:
+            return
+        Decoder.paramsDiscovered = True
+
         meth2handleInfo = {}
         for handleInfo in self.msgId2handleInfo.values():
             meth2handleInfo[handleInfo.wrapperMeth] = handleInfo
@@ -1435,6 +1372,33 @@ class Decoder(Object):
             # for (pname, param) in sig.parameters.items():
             #     logger.debug("\tparam %s %s %s", pname, param.name, param.annotation)
 
+    def findIgnoredMsgIds(self, allowMsgIds, denyMsgIds, maskUnhandled):
+        """The denied msgIds plus, with maskUnhandled and unless allowed, the
+        ones of which the wrapper overrides none of the declared callbacks:
+        the EWrapper ones do nothing but log, their answers are then no
+        longer logged. ERR_MSG is kept as EWrapper.error() logs the errors,
+        and everything when the wrapper overrides onBatch() as it may use
+        any event."""
+
+        ignored = set(denyMsgIds)
+        if not maskUnhandled:
+            return frozenset(ignored)
+        callbacks = overriddenCallbacks(self.wrapper)
+        if callbacks is None or "onBatch" in callbacks:
+            return frozenset(ignored)
+
+        for msgId, handleInfo in self.msgId2handleInfo.items():
+            if (
+                msgId in allowMsgIds
+                or msgId == IN.ERR_MSG
+                or handleInfo.callbacks is None
+                or (msgId in self.lazyMsgIds and "onLazyMsg" in callbacks)
+            ):
+                continue
+            if callbacks.isdisjoint(handleInfo.callbacks):
+                ignored.add(msgId)
+        return frozenset(ignored)
+
     def printParams(self):
         for _, handleInfo in self.msgId2handleInfo.items():
             if handleInfo.wrapperMeth is not None:
@@ -1481,9 +1445,9 @@ class Decoder(Object):
                     arg = float(arg)
                 elif param.annotation is Decimal:
                     if arg is None or len(arg) == 0:
-                        return UNSET_DECIMAL
+                        arg = UNSET_DECIMAL
                     else:
-                        return Decimal(arg)
+                        arg = Decimal(arg)
 
                 args.append(arg)
                 fieldIdx += 1
@@ -1492,6 +1456,72 @@ class Decoder(Object):
         logger.debug("calling %s with %s %s", method, self.wrapper, args)
         method(*args)
 
+    def compileHandler(self, handleInfo):
+        """Specializes interpretWithSignature() for one message, the current
+        wrapper and serverVersion: the converters of the fields and the
+        wrapper method are resolved once."""
+        wrapperParams = handleInfo.wrapperParams
+        if wrapperParams is None:
+
+            def noParams(fields):
+                logger.debug("%s: no param info in %s", fields, handleInfo)
+
+            return noParams
+
+        if self.serverVersion >= MIN_SERVER_VER_ENCODE_MSG_ASCII7:
+            encoding = "unicode-escape"
+        else:
+            encoding = "UTF-8"
+
+        def toStr(field):
+            try:
+                return field.decode(encoding)
+            except UnicodeDecodeError:
+                return field.decode("latin-1")
+
+        fieldCursor = self.fieldCursor
+
+        def toDecimal(field):
+            return fieldCursor((field,)).read_decimal()
+
+        converters = []
+        for pname, param in wrapperParams.items():
+            if pname == "self":
+                continue
+            if param.annotation is int:
+                converters.append(int)  # int() and float() take bytes
+            elif param.annotation is float:
+                converters.append(float)
+            elif param.annotation is Decimal:
+                converters.append(toDecimal)
+            else:
+                converters.append(toStr)
+        converters = tuple(converters)
+
+        nFields = len(converters) + 2  # msgId and versionId
+        method = getattr(self.wrapper, handleInfo.wrapperMeth.__name__)
+
+        def handler(fields):
+            if len(fields) != nFields:
+                logger.error(
+                    "diff len fields and params %d %d for fields: %s and handleInfo: %s",
+                    len(fields),
+                    len(wrapperParams),
+                    fields,
+                    handleInfo,
+                )
+                return
+            method(*[conv(field) for (conv, field) in zip(converters, fields[2:])])
+
+        return handler
+
+    def resetHandlers(self):
+        if self.handlersVersion != self.serverVersion:
+            self.wrapper2handlers.clear()
+            self.handlersVersion = self.serverVersion
+        self.handlers = self.wrapper2handlers.setdefault(id(self.wrapper), {})
+        self.handlersWrapper = self.wrapper
+
     def interpret(self, fields):
         if len(fields) == 0:
             logger.debug("no fields")
@@ -1500,6 +1530,9 @@ class Decoder(Object):
         sMsgId = fields[0]
         nMsgId = int(sMsgId)
 
+        if nMsgId in self.ignoredMsgIds:
+            return
+
         handleInfo = self.msgId2handleInfo.get(nMsgId, None)
 
         if handleInfo is None:
@@ -1507,58 +1540,102 @@ class Decoder(Object):
             return
 
         try:
-            if handleInfo.wrapperMeth is not None:
-                logger.debug("In interpret(), handleInfo: %s", handleInfo)
-                self.interpretWithSignature(fields, handleInfo)
+            if nMsgId in self.lazyMsgIds:
+                self.wrapper.onLazyMsg(LazyMsg(self, fields, nMsgId))
+            elif handleInfo.wrapperMeth is not None:
+                if (
+                    self.handlersWrapper is not self.wrapper
+                    or self.handlersVersion != self.serverVersion
+                ):
+                    self.resetHandlers()
+                handler = self.handlers.get(nMsgId, None)
+                if handler is None:
+                    handler = self.compileHandler(handleInfo)
+                    self.handlers[nMsgId] = handler
+                handler(fields)
             elif handleInfo.processMeth is not None:
-                handleInfo.processMeth(self, iter(fields))
+                handleInfo.processMeth(self, self.fieldCursor(fields))
         except BadMessage:
-            theBadMsg = ",".join(fields)
+            # only built when reported
+            theBadMsg = b",".join(fields).decode(errors="backslashreplace")
             self.wrapper.error(
                 NO_VALID_ID, BAD_MESSAGE.code(), BAD_MESSAGE.msg() + theBadMsg
             )
             raise
 
     msgId2handleInfo = {
-        IN.TICK_PRICE: HandleInfo(proc=processTickPriceMsg),
-        IN.TICK_SIZE: HandleInfo(proc=processTickSizeMsg),
-        IN.ORDER_STATUS: HandleInfo(proc=processOrderStatusMsg),
-        IN.ERR_MSG: HandleInfo(proc=processErrorMsg),
-        IN.OPEN_ORDER: HandleInfo(proc=processOpenOrder),
+        IN.TICK_PRICE: HandleInfo(
+            proc=processTickPriceMsg, callbacks=("tickPrice", "tickSize")
+        ),
+        IN.TICK_SIZE: HandleInfo(proc=processTickSizeMsg, callbacks=("tickSize",)),
+        IN.ORDER_STATUS: HandleInfo(
+            proc=processOrderStatusMsg, callbacks=("orderStatus",)
+        ),
+        IN.ERR_MSG: HandleInfo(proc=processErrorMsg, callbacks=("error",)),
+        IN.OPEN_ORDER: HandleInfo(proc=processOpenOrder, callbacks=("openOrder",)),
         IN.ACCT_VALUE: HandleInfo(wrap=EWrapper.updateAccountValue),
-        IN.PORTFOLIO_VALUE: HandleInfo(proc=processPortfolioValueMsg),
+        IN.PORTFOLIO_VALUE: HandleInfo(
+            proc=processPortfolioValueMsg, callbacks=("updatePortfolio",)
+        ),
         IN.ACCT_UPDATE_TIME: HandleInfo(wrap=EWrapper.updateAccountTime),
         IN.NEXT_VALID_ID: HandleInfo(
             wrap=EWrapper.nextValidId,
         ),
-        IN.CONTRACT_DATA: HandleInfo(proc=processContractDataMsg),
-        IN.EXECUTION_DATA: HandleInfo(proc=processExecutionDataMsg),
-        IN.MARKET_DEPTH: HandleInfo(proc=processMarketDepthMsg),
-        IN.MARKET_DEPTH_L2: HandleInfo(proc=processMarketDepthL2Msg),
+        IN.CONTRACT_DATA: HandleInfo(
+            proc=processContractDataMsg, callbacks=("contractDetails",)
+        ),
+        IN.EXECUTION_DATA: HandleInfo(
+            proc=processExecutionDataMsg, callbacks=("execDetails",)
+        ),
+        IN.MARKET_DEPTH: HandleInfo(
+            proc=processMarketDepthMsg, callbacks=("updateMktDepth",)
+        ),
+        IN.MARKET_DEPTH_L2: HandleInfo(
+            proc=processMarketDepthL2Msg, callbacks=("updateMktDepthL2",)
+        ),
         IN.NEWS_BULLETINS: HandleInfo(wrap=EWrapper.updateNewsBulletin),
         IN.MANAGED_ACCTS: HandleInfo(wrap=EWrapper.managedAccounts),
         IN.RECEIVE_FA: HandleInfo(wrap=EWrapper.receiveFA),
-        IN.HISTORICAL_DATA: HandleInfo(proc=processHistoricalDataMsg),
-        IN.HISTORICAL_DATA_UPDATE: HandleInfo(proc=processHistoricalDataUpdateMsg),
-        IN.BOND_CONTRACT_DATA: HandleInfo(proc=processBondContractDataMsg),
+        IN.HISTORICAL_DATA: HandleInfo(
+            proc=processHistoricalDataMsg,
+            callbacks=("historicalData", "historicalDataArray", "historicalDataEnd"),
+        ),
+        IN.HISTORICAL_DATA_UPDATE: HandleInfo(
+            proc=processHistoricalDataUpdateMsg, callbacks=("historicalDataUpdate",)
+        ),
+        IN.BOND_CONTRACT_DATA: HandleInfo(
+            proc=processBondContractDataMsg, callbacks=("bondContractDetails",)
+        ),
         IN.SCANNER_PARAMETERS: HandleInfo(wrap=EWrapper.scannerParameters),
-        IN.SCANNER_DATA: HandleInfo(proc=processScannerDataMsg),
-        IN.TICK_OPTION_COMPUTATION: HandleInfo(proc=processTickOptionComputationMsg),
+        IN.SCANNER_DATA: HandleInfo(
+            proc=processScannerDataMsg, callbacks=("scannerData", "scannerDataEnd")
+        ),
+        IN.TICK_OPTION_COMPUTATION: HandleInfo(
+            proc=processTickOptionComputationMsg, callbacks=("tickOptionComputation",)
+        ),
         IN.TICK_GENERIC: HandleInfo(wrap=EWrapper.tickGeneric),
         IN.TICK_STRING: HandleInfo(wrap=EWrapper.tickString),
         IN.TICK_EFP: HandleInfo(wrap=EWrapper.tickEFP),
         IN.CURRENT_TIME: HandleInfo(wrap=EWrapper.currentTime),
-        IN.REAL_TIME_BARS: HandleInfo(proc=processRealTimeBarMsg),
+        IN.REAL_TIME_BARS: HandleInfo(
+            proc=processRealTimeBarMsg, callbacks=("realtimeBar",)
+        ),
         IN.FUNDAMENTAL_DATA: HandleInfo(wrap=EWrapper.fundamentalData),
         IN.CONTRACT_DATA_END: HandleInfo(wrap=EWrapper.contractDetailsEnd),
         IN.OPEN_ORDER_END: HandleInfo(wrap=EWrapper.openOrderEnd),
         IN.ACCT_DOWNLOAD_END: HandleInfo(wrap=EWrapper.accountDownloadEnd),
         IN.EXECUTION_DATA_END: HandleInfo(wrap=EWrapper.execDetailsEnd),
-        IN.DELTA_NEUTRAL_VALIDATION: HandleInfo(proc=processDeltaNeutralValidationMsg),
+        IN.DELTA_NEUTRAL_VALIDATION: HandleInfo(
+            proc=processDeltaNeutralValidationMsg, callbacks=("deltaNeutralValidation",)
+        ),
         IN.TICK_SNAPSHOT_END: HandleInfo(wrap=EWrapper.tickSnapshotEnd),
         IN.MARKET_DATA_TYPE: HandleInfo(wrap=EWrapper.marketDataType),
-        IN.COMMISSION_REPORT: HandleInfo(proc=processCommissionReportMsg),
-        IN.POSITION_DATA: HandleInfo(proc=processPositionDataMsg),
+        IN.COMMISSION_REPORT: HandleInfo(
+            proc=processCommissionReportMsg, callbacks=("commissionReport",)
+        ),
+        IN.POSITION_DATA: HandleInfo(
+            proc=processPositionDataMsg, callbacks=("position",)
+        ),
         IN.POSITION_END: HandleInfo(wrap=EWrapper.positionEnd),
         IN.ACCOUNT_SUMMARY: HandleInfo(wrap=EWrapper.accountSummary),
         IN.ACCOUNT_SUMMARY_END: HandleInfo(wrap=EWrapper.accountSummaryEnd),
@@ -1570,44 +1647,104 @@ class Decoder(Object):
             wrap=EWrapper.verifyAndAuthMessageAPI
         ),
         IN.VERIFY_AND_AUTH_COMPLETED: HandleInfo(wrap=EWrapper.verifyAndAuthCompleted),
-        IN.POSITION_MULTI: HandleInfo(proc=processPositionMultiMsg),
+        IN.POSITION_MULTI: HandleInfo(
+            proc=processPositionMultiMsg, callbacks=("positionMulti",)
+        ),
         IN.POSITION_MULTI_END: HandleInfo(wrap=EWrapper.positionMultiEnd),
         IN.ACCOUNT_UPDATE_MULTI: HandleInfo(wrap=EWrapper.accountUpdateMulti),
         IN.ACCOUNT_UPDATE_MULTI_END: HandleInfo(wrap=EWrapper.accountUpdateMultiEnd),
         IN.SECURITY_DEFINITION_OPTION_PARAMETER: HandleInfo(
-            proc=processSecurityDefinitionOptionParameterMsg
+            proc=processSecurityDefinitionOptionParameterMsg,
+            callbacks=("securityDefinitionOptionParameter",),
         ),
         IN.SECURITY_DEFINITION_OPTION_PARAMETER_END: HandleInfo(
-            proc=processSecurityDefinitionOptionParameterEndMsg
+            proc=processSecurityDefinitionOptionParameterEndMsg,
+            callbacks=("securityDefinitionOptionParameterEnd",),
+        ),
+        IN.SOFT_DOLLAR_TIERS: HandleInfo(
+            proc=processSoftDollarTiersMsg, callbacks=("softDollarTiers",)
+        ),
+        IN.FAMILY_CODES: HandleInfo(
+            proc=processFamilyCodesMsg, callbacks=("familyCodes",)
+        ),
+        IN.SYMBOL_SAMPLES: HandleInfo(
+            proc=processSymbolSamplesMsg, callbacks=("symbolSamples",)
+        ),
+        IN.SMART_COMPONENTS: HandleInfo(
+            proc=processSmartComponents, callbacks=("smartComponents",)
+        ),
+        IN.TICK_REQ_PARAMS: HandleInfo(
+            proc=processTickReqParams, callbacks=("tickReqParams",)
+        ),
+        IN.MKT_DEPTH_EXCHANGES: HandleInfo(
+            proc=processMktDepthExchanges, callbacks=("mktDepthExchanges",)
+        ),
+        IN.HEAD_TIMESTAMP: HandleInfo(
+            proc=processHeadTimestamp, callbacks=("headTimestamp",)
+        ),
+        IN.TICK_NEWS: HandleInfo(proc=processTickNews, callbacks=("tickNews",)),
+        IN.NEWS_PROVIDERS: HandleInfo(
+            proc=processNewsProviders, callbacks=("newsProviders",)
+        ),
+        IN.NEWS_ARTICLE: HandleInfo(
+            proc=processNewsArticle, callbacks=("newsArticle",)
+        ),
+        IN.HISTORICAL_NEWS: HandleInfo(
+            proc=processHistoricalNews, callbacks=("historicalNews",)
+        ),
+        IN.HISTORICAL_NEWS_END: HandleInfo(
+            proc=processHistoricalNewsEnd, callbacks=("historicalNewsEnd",)
+        ),
+        IN.HISTOGRAM_DATA: HandleInfo(
+            proc=processHistogramData, callbacks=("histogramData",)
+        ),
+        IN.REROUTE_MKT_DATA_REQ: HandleInfo(
+            proc=processRerouteMktDataReq, callbacks=("rerouteMktDataReq",)
+        ),
+        IN.REROUTE_MKT_DEPTH_REQ: HandleInfo(
+            proc=processRerouteMktDepthReq, callbacks=("rerouteMktDepthReq",)
+        ),
+        IN.MARKET_RULE: HandleInfo(
+            proc=processMarketRuleMsg, callbacks=("marketRule",)
+        ),
+        IN.PNL: HandleInfo(proc=processPnLMsg, callbacks=("pnl",)),
+        IN.PNL_SINGLE: HandleInfo(proc=processPnLSingleMsg, callbacks=("pnlSingle",)),
+        IN.HISTORICAL_TICKS: HandleInfo(
+            proc=processHistoricalTicks,
+            callbacks=("historicalTicks", "historicalTicksArray"),
+        ),
+        IN.HISTORICAL_TICKS_BID_ASK: HandleInfo(
+            proc=processHistoricalTicksBidAsk,
+            callbacks=("historicalTicksBidAsk", "historicalTicksBidAskArray"),
+        ),
+        IN.HISTORICAL_TICKS_LAST: HandleInfo(
+            proc=processHistoricalTicksLast,
+            callbacks=("historicalTicksLast", "historicalTicksLastArray"),
+        ),
+        IN.TICK_BY_TICK: HandleInfo(
+            proc=processTickByTickMsg,
+            callbacks=("tickByTickAllLast", "tickByTickBidAsk", "tickByTickMidPoint"),
+        ),
+        IN.ORDER_BOUND: HandleInfo(
+            proc=processOrderBoundMsg, callbacks=("orderBound",)
+        ),
+        IN.COMPLETED_ORDER: HandleInfo(
+            proc=processCompletedOrderMsg, callbacks=("completedOrder",)
+        ),
+        IN.COMPLETED_ORDERS_END: HandleInfo(
+            proc=processCompletedOrdersEndMsg, callbacks=("completedOrdersEnd",)
+        ),
+        IN.REPLACE_FA_END: HandleInfo(
+            proc=processReplaceFAEndMsg, callbacks=("replaceFAEnd",)
+        ),
+        IN.WSH_META_DATA: HandleInfo(
+            proc=processWshMetaDataMsg, callbacks=("wshMetaData",)
+        ),
+        IN.WSH_EVENT_DATA: HandleInfo(
+            proc=processWshEventDataMsg, callbacks=("wshEventData",)
+        ),
+        IN.HISTORICAL_SCHEDULE: HandleInfo(
+            proc=processHistoricalSchedule, callbacks=("historicalSchedule",)
         ),
-        IN.SOFT_DOLLAR_TIERS: HandleInfo(proc=processSoftDollarTiersMsg),
-        IN.FAMILY_CODES: HandleInfo(proc=processFamilyCodesMsg),
-        IN.SYMBOL_SAMPLES: HandleInfo(proc=processSymbolSamplesMsg),
-        IN.SMART_COMPONENTS: HandleInfo(proc=processSmartComponents),
-        IN.TICK_REQ_PARAMS: HandleInfo(proc=processTickReqParams),
-        IN.MKT_DEPTH_EXCHANGES: HandleInfo(proc=processMktDepthExchanges),
-        IN.HEAD_TIMESTAMP: HandleInfo(proc=processHeadTimestamp),
-        IN.TICK_NEWS: HandleInfo(proc=processTickNews),
-        IN.NEWS_PROVIDERS: HandleInfo(proc=processNewsProviders),
-        IN.NEWS_ARTICLE: HandleInfo(proc=processNewsArticle),
-        IN.HISTORICAL_NEWS: HandleInfo(proc=processHistoricalNews),
-        IN.HISTORICAL_NEWS_END: HandleInfo(proc=processHistoricalNewsEnd),
-        IN.HISTOGRAM_DATA: HandleInfo(proc=processHistogramData),
-        IN.REROUTE_MKT_DATA_REQ: HandleInfo(proc=processRerouteMktDataReq),
-        IN.REROUTE_MKT_DEPTH_REQ: HandleInfo(proc=processRerouteMktDepthReq),
-        IN.MARKET_RULE: HandleInfo(proc=processMarketRuleMsg),
-        IN.PNL: HandleInfo(proc=processPnLMsg),
-        IN.PNL_SINGLE: HandleInfo(proc=processPnLSingleMsg),
-        IN.HISTORICAL_TICKS: HandleInfo(proc=processHistoricalTicks),
-        IN.HISTORICAL_TICKS_BID_ASK: HandleInfo(proc=processHistoricalTicksBidAsk),
-        IN.HISTORICAL_TICKS_LAST: HandleInfo(proc=processHistoricalTicksLast),
-        IN.TICK_BY_TICK: HandleInfo(proc=processTickByTickMsg),
-        IN.ORDER_BOUND: HandleInfo(proc=processOrderBoundMsg),
-        IN.COMPLETED_ORDER: HandleInfo(proc=processCompletedOrderMsg),
-        IN.COMPLETED_ORDERS_END: HandleInfo(proc=processCompletedOrdersEndMsg),
-        IN.REPLACE_FA_END: HandleInfo(proc=processReplaceFAEndMsg),
-        IN.WSH_META_DATA: HandleInfo(proc=processWshMetaDataMsg),
-        IN.WSH_EVENT_DATA: HandleInfo(proc=processWshEventDataMsg),
-        IN.HISTORICAL_SCHEDULE: HandleInfo(proc=processHistoricalSchedule),
-        IN.USER_INFO: HandleInfo(proc=processUserInfo),
+        IN.USER_INFO: HandleInfo(proc=processUserInfo, callbacks=("userInfo",)),
     }
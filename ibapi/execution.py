@@ -4,12 +4,15 @@ Copyright (C) 2023 Interactive Brokers LLC. All rights reserved. This code is su
 """
 
 
+import logging
 from ibapi.object_implem import Object
 from ibapi.const import UNSET_DECIMAL
 from ibapi.utils import decimalMaxString
 from ibapi.utils import intMaxString
 from ibapi.utils import floatMaxString
 
+logger = logging.getLogger(__name__)
+
 
 class Execution(Object):
     def __init__(self) -> None:
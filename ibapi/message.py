@@ -99,6 +99,54 @@ class IN:
     USER_INFO = 107
 
 
+# incoming market data carrying the current value of a field, a newer one
+# supersedes the older ones; not in it: the events (tick by tick, bars, and
+# TICK_STRING which also carries news and RT volume) and the depth updates,
+# which are deltas of the book
+MARKET_DATA_IN = frozenset(
+    (
+        IN.TICK_PRICE,
+        IN.TICK_SIZE,
+        IN.TICK_OPTION_COMPUTATION,
+        IN.TICK_GENERIC,
+        IN.TICK_EFP,
+    )
+)
+
+
+# incoming order, execution, account and error messages, the ones which
+# should not wait behind market data
+ORDER_ACCOUNT_IN = frozenset(
+    (
+        IN.ORDER_STATUS,
+        IN.ERR_MSG,
+        IN.OPEN_ORDER,
+        IN.ACCT_VALUE,
+        IN.PORTFOLIO_VALUE,
+        IN.ACCT_UPDATE_TIME,
+        IN.NEXT_VALID_ID,
+        IN.EXECUTION_DATA,
+        IN.OPEN_ORDER_END,
+        IN.ACCT_DOWNLOAD_END,
+        IN.EXECUTION_DATA_END,
+        IN.COMMISSION_REPORT,
+        IN.POSITION_DATA,
+        IN.POSITION_END,
+        IN.ACCOUNT_SUMMARY,
+        IN.ACCOUNT_SUMMARY_END,
+        IN.POSITION_MULTI,
+        IN.POSITION_MULTI_END,
+        IN.ACCOUNT_UPDATE_MULTI,
+        IN.ACCOUNT_UPDATE_MULTI_END,
+        IN.PNL,
+        IN.PNL_SINGLE,
+        IN.ORDER_BOUND,
+        IN.COMPLETED_ORDER,
+        IN.COMPLETED_ORDERS_END,
+    )
+)
+
+
 # outgoing msg id's
 class OUT:
     REQ_MKT_DATA = 1
@@ -189,3 +237,15 @@ class OUT:
 # Posei Ibapi: Update - 20260101145714
 
 # Posei Ibapi: Update - 20260101145717
+
+# high volume market data messages which can be delivered as a
+# wrapper.LazyMsg, see EClient.setLazyMsgs(): msgId -> (index of the
+# version field or None, index of the reqId field); the process method of
+# each takes the wrapper to call as an optional argument
+LAZY_IN = {
+    IN.TICK_PRICE: (1, 2),
+    IN.TICK_SIZE: (1, 2),
+    IN.TICK_BY_TICK: (None, 1),
+    IN.MARKET_DEPTH: (1, 2),
+    IN.MARKET_DEPTH_L2: (1, 2),
+}
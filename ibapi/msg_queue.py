@@ -0,0 +1,440 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+The queues between the EReader and EClient.run().
+
+UnboundedMsgQueue is the default one, a queue.Queue which can be drained at
+once.
+
+BoundedMsgQueue is capped both in number of messages and in bytes; what
+happens when a new message does not fit is decided by the overflow policy:
+- BLOCK: the reader waits for room, TWS is then throttled by TCP itself
+- DROP_OLDEST_MKT_DATA: the oldest queued market data message is dropped
+  (see message.MARKET_DATA_IN), other messages are never dropped
+- SPILL_TO_FILE: the messages go to a temporary file and are replayed, in
+  order, once the memory part has been consumed. To keep that order, once a
+  message is spilled all the following ones are spilled too, until the
+  consumer has caught up with the whole file: the latency then jumps to a
+  file write and read per message for as long as the backlog lasts, not
+  just while the memory part is full
+
+ConflatingMsgQueue keeps only the newest pending tick per (reqId, tickType),
+so a consumer falling behind gets the latest quotes instead of a backlog.
+
+PriorityMsgQueue sorts the messages in lanes by msg id and always serves
+the order/account lane first, so fills do not wait behind ticks.
+
+get_batch() takes all the pending messages of any of these queues with a
+single lock acquisition, or of another queue.Queue one get() at a time.
+"""
+
+import collections
+import heapq
+import logging
+import queue
+import tempfile
+import threading
+import time
+
+from ibapi import comm
+from ibapi.message import IN, MARKET_DATA_IN, ORDER_ACCOUNT_IN
+from ibapi.object_implem import Object
+
+logger = logging.getLogger(__name__)
+
+
+def _wait_not_empty(notEmpty, hasMsgs, block, timeout):
+    """the get() wait, to be called with the notEmpty lock held"""
+    if not block:
+        if not hasMsgs():
+            raise queue.Empty
+    elif timeout is None:
+        while not hasMsgs():
+            notEmpty.wait()
+    else:
+        deadline = time.monotonic() + timeout
+        while not hasMsgs():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0.0:
+                raise queue.Empty
+            notEmpty.wait(remaining)
+
+
+def get_batch(msg_queue, block=True, timeout=None) -> list:
+    """Waits like get() for a first message then returns it with all the
+    others pending, in the order get() would return them."""
+    getBatch = getattr(msg_queue, "getBatch", None)
+    if getBatch is not None:
+        return getBatch(block, timeout)
+
+    # a queue.Queue, through its public methods only
+    msgs = [msg_queue.get(block, timeout)]
+    try:
+        while True:
+            msgs.append(msg_queue.get_nowait())
+    except queue.Empty:
+        pass
+    return msgs
+
+
+class UnboundedMsgQueue(queue.Queue):
+    """The default EClient.msg_queue, a queue.Queue with no limit that
+    getBatch() drains through the subclassing interface of queue.Queue."""
+
+    def getBatch(self, block=True, timeout=None):
+        """see get_batch()"""
+        with self.not_empty:
+            _wait_not_empty(self.not_empty, self._qsize, block, timeout)
+            msgs = list(self.queue)
+            self.queue.clear()
+            self.not_full.notify_all()
+            return msgs
+
+
+class OverflowPolicy:
+    BLOCK = 0
+    DROP_OLDEST_MKT_DATA = 1
+    SPILL_TO_FILE = 2
+
+
+# their fields start with msgId, version, reqId, tickType and they carry
+# the current value of a field, not an event
+CONFLATED_IN = (IN.TICK_PRICE, IN.TICK_SIZE, IN.TICK_GENERIC)
+
+
+class MsgQueueStats(Object):
+    """How often each overflow policy fired, and how many ticks were
+    superseded before being consumed."""
+
+    def __init__(self):
+        self.nBlocked = 0
+        self.nDropped = 0
+        self.nSpilled = 0
+        self.nReplayed = 0
+        self.nConflated = 0
+
+    def __str__(self):
+        return (
+            f"Blocked: {self.nBlocked}, Dropped: {self.nDropped}, "
+            f"Spilled: {self.nSpilled}, Replayed: {self.nReplayed}, "
+            f"Conflated: {self.nConflated}"
+        )
+
+
+class BoundedMsgQueue(object):
+    """Drop-in for the queue.Queue used as EClient.msg_queue, see
+    EClient.setMsgQueue(). A limit of 0 means no limit."""
+
+    def __init__(
+        self, maxMsgs=100000, maxBytes=64 * 1024 * 1024, policy=OverflowPolicy.BLOCK
+    ):
+        self.maxMsgs = maxMsgs
+        self.maxBytes = maxBytes
+        self.policy = policy
+        # (seqNo, msg) pairs, the market data ones apart when they may be
+        # dropped (DROP_OLDEST_MKT_DATA), get() takes the lowest seqNo
+        self.msgs = collections.deque()
+        self.mktData = collections.deque()
+        self.nextSeqNo = 0
+        self.nMsgs = 0
+        self.nBytes = 0
+        self.mutex = threading.Lock()
+        self.notEmpty = threading.Condition(self.mutex)
+        self.notFull = threading.Condition(self.mutex)
+        self.spillFile = None
+        self.nSpillPending = 0
+        self.spillReadPos = 0
+        self.spillWritePos = 0
+        self.stats = MsgQueueStats()
+
+    def qsize(self):
+        with self.mutex:
+            return self.nMsgs + self.nSpillPending
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def put(self, msg, block=True, timeout=None):
+        with self.mutex:
+            if self.nSpillPending:
+                # keep the order, everything goes after what was spilled
+                self._spill(msg)
+                self.notEmpty.notify()
+                return
+
+            isMktData = (
+                self.policy == OverflowPolicy.DROP_OLDEST_MKT_DATA
+                and comm.read_msg_id(msg) in MARKET_DATA_IN
+            )
+            blocked = False
+            deadline = None
+            while self._isFull(len(msg)):
+                if self.policy == OverflowPolicy.SPILL_TO_FILE:
+                    self._spill(msg)
+                    self.notEmpty.notify()
+                    return
+
+                if self.policy == OverflowPolicy.DROP_OLDEST_MKT_DATA:
+                    if self._dropOldestMktData():
+                        continue
+                    if isMktData:
+                        # nothing older to drop, the new one goes then
+                        self.stats.nDropped += 1
+                        return
+
+                if not block:
+                    raise queue.Full
+                if not blocked:
+                    blocked = True
+                    self.stats.nBlocked += 1
+                if timeout is None:
+                    self.notFull.wait()
+                    continue
+                if deadline is None:
+                    deadline = time.monotonic() + timeout
+                remaining = deadline - time.monotonic()
+                if remaining <= 0.0:
+                    raise queue.Full
+                self.notFull.wait(remaining)
+
+            self._append(self.mktData if isMktData else self.msgs, msg)
+            self.notEmpty.notify()
+
+    def put_nowait(self, msg):
+        self.put(msg, block=False)
+
+    def get(self, block=True, timeout=None):
+        with self.mutex:
+            _wait_not_empty(
+                self.notEmpty,
+                lambda: self.nMsgs or self.nSpillPending,
+                block,
+                timeout,
+            )
+
+            if not self.nMsgs:
+                self._replay()
+
+            (msgs, mktData) = (self.msgs, self.mktData)
+            if mktData and (not msgs or mktData[0][0] < msgs[0][0]):
+                msg = mktData.popleft()[1]
+            else:
+                msg = msgs.popleft()[1]
+            self.nMsgs -= 1
+            self.nBytes -= len(msg)
+            self.notFull.notify()
+            return msg
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def getBatch(self, block=True, timeout=None):
+        """see get_batch(), the spilled messages come at most by a queue full"""
+        with self.mutex:
+            _wait_not_empty(
+                self.notEmpty,
+                lambda: self.nMsgs or self.nSpillPending,
+                block,
+                timeout,
+            )
+            if not self.nMsgs:
+                self._replay()
+
+            if self.mktData:
+                msgs = [msg for (_, msg) in heapq.merge(self.msgs, self.mktData)]
+            else:
+                msgs = [msg for (_, msg) in self.msgs]
+            self.msgs.clear()
+            self.mktData.clear()
+            self.nMsgs = 0
+            self.nBytes = 0
+            self.notFull.notify_all()
+            return msgs
+
+    def _isFull(self, size):
+        if not self.nMsgs:
+            # always take one, however big, or it would never go through
+            return False
+        return (self.maxMsgs and self.nMsgs >= self.maxMsgs) or (
+            self.maxBytes and self.nBytes + size > self.maxBytes
+        )
+
+    def _append(self, msgs, msg):
+        msgs.append((self.nextSeqNo, msg))
+        self.nextSeqNo += 1
+        self.nMsgs += 1
+        self.nBytes += len(msg)
+
+    def _dropOldestMktData(self):
+        if not self.mktData:
+            return False
+        (_, msg) = self.mktData.popleft()
+        self.nMsgs -= 1
+        self.nBytes -= len(msg)
+        self.stats.nDropped += 1
+        return True
+
+    def _spill(self, msg):
+        if self.spillFile is None:
+            self.spillFile = tempfile.TemporaryFile(prefix="ibapi-msgs-")
+        self.spillFile.seek(self.spillWritePos)
+        self.spillFile.write(comm.SIZE_PREFIX.pack(len(msg)))
+        self.spillFile.write(msg)
+        self.spillWritePos = self.spillFile.tell()
+        self.nSpillPending += 1
+        self.stats.nSpilled += 1
+
+    def _replay(self):
+        """moves the spilled messages back in memory, as many as fit"""
+        self.spillFile.seek(self.spillReadPos)
+        while self.nSpillPending and not self._isFull(0):
+            size = comm.SIZE_PREFIX.unpack(self.spillFile.read(4))[0]
+            self._append(self.msgs, self.spillFile.read(size))
+            self.nSpillPending -= 1
+            self.stats.nReplayed += 1
+        self.spillReadPos = self.spillFile.tell()
+
+        if not self.nSpillPending:
+            self.spillFile.truncate(0)
+            self.spillReadPos = self.spillWritePos = 0
+        logger.debug("replayed spilled msgs, %d still spilled", self.nSpillPending)
+
+
+class ConflatingMsgQueue(object):
+    """Drop-in for the queue.Queue used as EClient.msg_queue, see
+    EClient.setMsgQueue().
+
+    A tick (see CONFLATED_IN) replaces the one still pending for the same
+    (reqId, tickType), and is queued at the back like any new message so the
+    order of the latest values is kept (eg: a newer bid price is not followed
+    by an older bid size). The other messages, eg: orders, executions and
+    errors, are never conflated."""
+
+    def __init__(self, msgIds=CONFLATED_IN):
+        self.msgIds = frozenset(str(msgId).encode() for msgId in msgIds)
+        self.msgs = collections.OrderedDict()  # seqNo -> msg
+        self.key2seqNo = {}
+        self.seqNo2key = {}
+        self.nextSeqNo = 0
+        self.mutex = threading.Lock()
+        self.notEmpty = threading.Condition(self.mutex)
+        self.stats = MsgQueueStats()
+
+    def qsize(self):
+        with self.mutex:
+            return len(self.msgs)
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def put(self, msg, block=True, timeout=None):
+        # msgId, version, reqId, tickType, rest
+        header = msg.split(b"\0", 4)
+        key = None
+        if header[0] in self.msgIds and len(header) == 5:
+            key = (header[2], header[3])
+
+        with self.mutex:
+            seqNo = self.nextSeqNo
+            self.nextSeqNo += 1
+            if key is not None:
+                prevSeqNo = self.key2seqNo.get(key, None)
+                if prevSeqNo is not None:
+                    del self.msgs[prevSeqNo]
+                    del self.seqNo2key[prevSeqNo]
+                    self.stats.nConflated += 1
+                self.key2seqNo[key] = seqNo
+                self.seqNo2key[seqNo] = key
+            self.msgs[seqNo] = msg
+            self.notEmpty.notify()
+
+    def put_nowait(self, msg):
+        self.put(msg, block=False)
+
+    def get(self, block=True, timeout=None):
+        with self.mutex:
+            _wait_not_empty(self.notEmpty, self.msgs.__len__, block, timeout)
+
+            (seqNo, msg) = self.msgs.popitem(last=False)
+            key = self.seqNo2key.pop(seqNo, None)
+            if key is not None:
+                del self.key2seqNo[key]
+            return msg
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def getBatch(self, block=True, timeout=None):
+        """see get_batch()"""
+        with self.mutex:
+            _wait_not_empty(self.notEmpty, self.msgs.__len__, block, timeout)
+            msgs = list(self.msgs.values())
+            self.msgs.clear()
+            self.key2seqNo.clear()
+            self.seqNo2key.clear()
+            return msgs
+
+
+class PriorityMsgQueue(object):
+    """Drop-in for the queue.Queue used as EClient.msg_queue, see
+    EClient.setMsgQueue().
+
+    lanes is a list of msg id sets, from the highest priority down; the
+    messages matching none of them go to an extra last lane. get() always
+    serves the highest priority non empty lane. Each lane is FIFO so the
+    order of the messages of a given reqId holds within a lane, not across
+    lanes (eg: an error may overtake the ticks of the same reqId)."""
+
+    def __init__(self, lanes=(ORDER_ACCOUNT_IN,)):
+        self.msgId2lane = {}
+        for idx, msgIds in enumerate(lanes):
+            for msgId in msgIds:
+                self.msgId2lane.setdefault(str(msgId).encode(), idx)
+        self.lanes = [collections.deque() for _ in range(len(lanes) + 1)]
+        self.defaultLane = self.lanes[-1]
+        self.nMsgs = 0
+        self.mutex = threading.Lock()
+        self.notEmpty = threading.Condition(self.mutex)
+
+    def qsize(self):
+        with self.mutex:
+            return self.nMsgs
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def put(self, msg, block=True, timeout=None):
+        # a frame without NUL has no msg id, it goes to the default lane
+        end = msg.find(b"\0")
+        idx = self.msgId2lane.get(msg[:end], None) if end >= 0 else None
+        lane = self.defaultLane if idx is None else self.lanes[idx]
+        with self.mutex:
+            lane.append(msg)
+            self.nMsgs += 1
+            self.notEmpty.notify()
+
+    def put_nowait(self, msg):
+        self.put(msg, block=False)
+
+    def get(self, block=True, timeout=None):
+        with self.mutex:
+            _wait_not_empty(self.notEmpty, lambda: self.nMsgs, block, timeout)
+            for lane in self.lanes:
+                if lane:
+                    self.nMsgs -= 1
+                    return lane.popleft()
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def getBatch(self, block=True, timeout=None):
+        """see get_batch(), the lanes come one after the other"""
+        with self.mutex:
+            _wait_not_empty(self.notEmpty, lambda: self.nMsgs, block, timeout)
+            msgs = []
+            for lane in self.lanes:
+                msgs.extend(lane)
+                lane.clear()
+            self.nMsgs = 0
+            return msgs
@@ -5,6 +5,10 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
 
 
 class Object(object):
+    # no instance dict here, so that the subclasses declaring __slots__ get
+    # none either; the others still get theirs
+    __slots__ = ()
+
     def __str__(self) -> None:
         """Posei Ibapi: __str__ method for Posei Ibapi"""
         # Posei Ibapi: Input validation for Posei Ibapi
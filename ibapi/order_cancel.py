@@ -3,10 +3,13 @@ Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is su
  and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
 """
 
+import logging
 from ibapi.const import UNSET_INTEGER
 from ibapi.object_implem import Object
 from ibapi.utils import intMaxString
 
+logger = logging.getLogger(__name__)
+
 class OrderCancel(Object):
     def __init__(self) -> None:
         # Posei Ibapi: Error handling improvement
@@ -3,12 +3,15 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
  and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
 """
 
+import logging
 from ibapi import comm
 from ibapi.const import UNSET_DOUBLE
 from ibapi.object_implem import Object
 from ibapi.enum_implem import Enum
 from ibapi.utils import decode
 
+logger = logging.getLogger(__name__)
+
 
 # TODO: add support for Rebate, P/L, ShortableShares conditions
 
@@ -3,8 +3,11 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
  and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
 """
 
+import logging
 from ibapi.const import UNSET_DOUBLE
 
+logger = logging.getLogger(__name__)
+
 
 class OrderState:
     def __init__(self):
@@ -28,10 +28,11 @@ from ibapi.server_versions import (
     MIN_SERVER_VER_PEGBEST_PEGMID_OFFSETS,
     MIN_SERVER_VER_CUSTOMER_ACCOUNT,
     MIN_SERVER_VER_PROFESSIONAL_CUSTOMER,
-    MIN_SERVER_VER_BOND_ACCRUED_INTEREST
+    MIN_SERVER_VER_BOND_ACCRUED_INTEREST,
+    MIN_SERVER_VER_AUTO_CANCEL_PARENT,
 )
 from ibapi.tag_value import TagValue
-from ibapi.utils import decode, SHOW_UNSET, isPegBenchOrder
+from ibapi.utils import SHOW_UNSET, BadMessage, isPegBenchOrder
 from ibapi.wrapper import DeltaNeutralContract
 from ibapi.softdollartier import SoftDollarTier
 
@@ -50,448 +51,747 @@ class OrderDecoder(Object):
         self.version = version
         self.serverVersion = serverVersion
 
+    def runDecodePlan(self, plan, fields):
+        """decodes the fields into self.contract, self.order and
+        self.orderState, see makeDecodePlan()"""
+        objs = (self.contract, self.order, self.orderState)
+        values = fields.fields
+        pos = fields.pos
+        try:
+            for target, steps in plan:
+                if target < SKIPPED:
+                    obj = objs[target]
+                    for attr, convert in steps:
+                        setattr(obj, attr, convert(values[pos]))
+                        pos += 1
+                elif target == SKIPPED:
+                    pos += steps
+                else:
+                    (meth, args) = steps
+                    fields.pos = pos
+                    meth(self, fields, *args)
+                    pos = fields.pos
+        except IndexError:
+            raise BadMessage("no more fields")
+        if pos > len(values):
+            raise BadMessage("no more fields")
+        fields.pos = pos
+
     def decodeOrderId(self, fields) -> None:
-        self.order.orderId = decode(int, fields)
+        self.order.orderId = fields.read_int()
 
     def decodeContractFields(self, fields) -> None:
-        self.contract.conId = decode(int, fields)
-        self.contract.symbol = decode(str, fields)
-        self.contract.secType = decode(str, fields)
-        self.contract.lastTradeDateOrContractMonth = decode(str, fields)
-        self.contract.strike = decode(float, fields)
-        self.contract.right = decode(str, fields)
+        self.contract.conId = fields.read_int()
+        self.contract.symbol = fields.read_str()
+        self.contract.secType = fields.read_str()
+        self.contract.lastTradeDateOrContractMonth = fields.read_str()
+        self.contract.strike = fields.read_float()
+        self.contract.right = fields.read_str()
         # Posei Ibapi: Code enhancement for Posei Ibapi
         if self.version >= 32:
-            self.contract.multiplier = decode(str, fields)
-        self.contract.exchange = decode(str, fields)
-        self.contract.currency = decode(str, fields)
-        self.contract.localSymbol = decode(str, fields)
+            self.contract.multiplier = fields.read_str()
+        self.contract.exchange = fields.read_str()
+        self.contract.currency = fields.read_str()
+        self.contract.localSymbol = fields.read_str()
         # Posei Ibapi: Error handling improvement
         if self.version >= 32:
-            self.contract.tradingClass = decode(str, fields)
+            self.contract.tradingClass = fields.read_str()
 
     def decodeAction(self, fields) -> None:
-        self.order.action = decode(str, fields)
+        self.order.action = fields.read_str()
 
     def decodeTotalQuantity(self, fields):
-        self.order.totalQuantity = decode(Decimal, fields)
+        self.order.totalQuantity = fields.read_decimal()
 
     def decodeOrderType(self, fields):
-        self.order.orderType = decode(str, fields)
+        self.order.orderType = fields.read_str()
 
     def decodeLmtPrice(self, fields):
         if self.version < 29:
-            self.order.lmtPrice = decode(float, fields)
+            self.order.lmtPrice = fields.read_float()
         else:
-            self.order.lmtPrice = decode(float, fields, SHOW_UNSET)
+            self.order.lmtPrice = fields.read_float(SHOW_UNSET)
 
     def decodeAuxPrice(self, fields):
         if self.version < 30:
-            self.order.auxPrice = decode(float, fields)
+            self.order.auxPrice = fields.read_float()
         else:
-            self.order.auxPrice = decode(float, fields, SHOW_UNSET)
+            self.order.auxPrice = fields.read_float(SHOW_UNSET)
 
     def decodeTIF(self, fields):
-        self.order.tif = decode(str, fields)
+        self.order.tif = fields.read_str()
 
     def decodeOcaGroup(self, fields):
-        self.order.ocaGroup = decode(str, fields)
+        self.order.ocaGroup = fields.read_str()
 
     def decodeAccount(self, fields):
-        self.order.account = decode(str, fields)
+        self.order.account = fields.read_str()
 
     def decodeOpenClose(self, fields):
-        self.order.openClose = decode(str, fields)
+        self.order.openClose = fields.read_str()
 
     def decodeOrigin(self, fields):
-        self.order.origin = decode(int, fields)
+        self.order.origin = fields.read_int()
 
     def decodeOrderRef(self, fields):
-        self.order.orderRef = decode(str, fields)
+        self.order.orderRef = fields.read_str()
 
     def decodeClientId(self, fields):
-        self.order.clientId = decode(int, fields)
+        self.order.clientId = fields.read_int()
 
     def decodePermId(self, fields):
-        self.order.permId = decode(int, fields)
+        self.order.permId = fields.read_int()
 
     def decodeOutsideRth(self, fields):
-        self.order.outsideRth = decode(bool, fields)
+        self.order.outsideRth = fields.read_bool()
 
     def decodeHidden(self, fields):
-        self.order.hidden = decode(bool, fields)
+        self.order.hidden = fields.read_bool()
 
     def decodeDiscretionaryAmt(self, fields):
-        self.order.discretionaryAmt = decode(float, fields)
+        self.order.discretionaryAmt = fields.read_float()
 
     def decodeGoodAfterTime(self, fields):
-        self.order.goodAfterTime = decode(str, fields)
+        self.order.goodAfterTime = fields.read_str()
 
     def skipSharesAllocation(self, fields):
-        _sharesAllocation = decode(str, fields)  # deprecated
+        _sharesAllocation = fields.read_str()  # deprecated
 
     def decodeFAParams(self, fields):
-        self.order.faGroup = decode(str, fields)
-        self.order.faMethod = decode(str, fields)
-        self.order.faPercentage = decode(str, fields)
+        self.order.faGroup = fields.read_str()
+        self.order.faMethod = fields.read_str()
+        self.order.faPercentage = fields.read_str()
         if self.serverVersion < MIN_SERVER_VER_FA_PROFILE_DESUPPORT:
-            _faProfile = decode(str, fields)  # skip deprecated faProfile field
+            _faProfile = fields.read_str()  # skip deprecated faProfile field
 
     def decodeModelCode(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_MODELS_SUPPORT:
-            self.order.modelCode = decode(str, fields)
+            self.order.modelCode = fields.read_str()
 
     def decodeGoodTillDate(self, fields):
-        self.order.goodTillDate = decode(str, fields)
+        self.order.goodTillDate = fields.read_str()
 
     def decodeRule80A(self, fields):
-        self.order.rule80A = decode(str, fields)
+        self.order.rule80A = fields.read_str()
 
     def decodePercentOffset(self, fields):
-        self.order.percentOffset = decode(float, fields, SHOW_UNSET)
+        self.order.percentOffset = fields.read_float(SHOW_UNSET)
 
     def decodeSettlingFirm(self, fields):
-        self.order.settlingFirm = decode(str, fields)
+        self.order.settlingFirm = fields.read_str()
 
     def decodeShortSaleParams(self, fields):
-        self.order.shortSaleSlot = decode(int, fields)
-        self.order.designatedLocation = decode(str, fields)
+        self.order.shortSaleSlot = fields.read_int()
+        self.order.designatedLocation = fields.read_str()
         if self.serverVersion == MIN_SERVER_VER_SSHORTX_OLD:
-            decode(int, fields)
+            fields.read_int()
         elif self.version >= 23:
-            self.order.exemptCode = decode(int, fields)
+            self.order.exemptCode = fields.read_int()
 
     def decodeAuctionStrategy(self, fields):
-        self.order.auctionStrategy = decode(int, fields)
+        self.order.auctionStrategy = fields.read_int()
 
     def decodeBoxOrderParams(self, fields):
-        self.order.startingPrice = decode(float, fields, SHOW_UNSET)
-        self.order.stockRefPrice = decode(float, fields, SHOW_UNSET)
-        self.order.delta = decode(float, fields, SHOW_UNSET)
+        self.order.startingPrice = fields.read_float(SHOW_UNSET)
+        self.order.stockRefPrice = fields.read_float(SHOW_UNSET)
+        self.order.delta = fields.read_float(SHOW_UNSET)
 
     def decodePegToStkOrVolOrderParams(self, fields):
-        self.order.stockRangeLower = decode(float, fields, SHOW_UNSET)
-        self.order.stockRangeUpper = decode(float, fields, SHOW_UNSET)
+        self.order.stockRangeLower = fields.read_float(SHOW_UNSET)
+        self.order.stockRangeUpper = fields.read_float(SHOW_UNSET)
 
     def decodeDisplaySize(self, fields):
-        self.order.displaySize = decode(int, fields, SHOW_UNSET)
+        self.order.displaySize = fields.read_int(SHOW_UNSET)
 
     def decodeBlockOrder(self, fields):
-        self.order.blockOrder = decode(bool, fields)
+        self.order.blockOrder = fields.read_bool()
 
     def decodeSweepToFill(self, fields):
-        self.order.sweepToFill = decode(bool, fields)
+        self.order.sweepToFill = fields.read_bool()
 
     def decodeAllOrNone(self, fields):
-        self.order.allOrNone = decode(bool, fields)
+        self.order.allOrNone = fields.read_bool()
 
     def decodeMinQty(self, fields):
-        self.order.minQty = decode(int, fields, SHOW_UNSET)
+        self.order.minQty = fields.read_int(SHOW_UNSET)
 
     def decodeOcaType(self, fields):
-        self.order.ocaType = decode(int, fields)
+        self.order.ocaType = fields.read_int()
 
     def skipETradeOnly(self, fields):
-        _eTradeOnly = decode(bool, fields)  # deprecated
+        _eTradeOnly = fields.read_bool()  # deprecated
 
     def skipFirmQuoteOnly(self, fields):
-        _firmQuoteOnly = decode(bool, fields)  # ` deprecated
+        _firmQuoteOnly = fields.read_bool()  # ` deprecated
 
     def skipNbboPriceCap(self, fields):
-        _nbboPriceCap = decode(float, fields, SHOW_UNSET)  # deprecated
+        _nbboPriceCap = fields.read_float(SHOW_UNSET)  # deprecated
 
     def decodeParentId(self, fields):
-        self.order.parentId = decode(int, fields)
+        self.order.parentId = fields.read_int()
 
     def decodeTriggerMethod(self, fields):
-        self.order.triggerMethod = decode(int, fields)
+        self.order.triggerMethod = fields.read_int()
 
     def decodeVolOrderParams(self, fields, readOpenOrderAttribs):
-        self.order.volatility = decode(float, fields, SHOW_UNSET)
-        self.order.volatilityType = decode(int, fields)
-        self.order.deltaNeutralOrderType = decode(str, fields)
-        self.order.deltaNeutralAuxPrice = decode(float, fields, SHOW_UNSET)
+        self.order.volatility = fields.read_float(SHOW_UNSET)
+        self.order.volatilityType = fields.read_int()
+        self.order.deltaNeutralOrderType = fields.read_str()
+        self.order.deltaNeutralAuxPrice = fields.read_float(SHOW_UNSET)
 
         if self.version >= 27 and self.order.deltaNeutralOrderType:
-            self.order.deltaNeutralConId = decode(int, fields)
+            self.order.deltaNeutralConId = fields.read_int()
             if readOpenOrderAttribs:
-                self.order.deltaNeutralSettlingFirm = decode(str, fields)
-                self.order.deltaNeutralClearingAccount = decode(str, fields)
-                self.order.deltaNeutralClearingIntent = decode(str, fields)
+                self.order.deltaNeutralSettlingFirm = fields.read_str()
+                self.order.deltaNeutralClearingAccount = fields.read_str()
+                self.order.deltaNeutralClearingIntent = fields.read_str()
 
         if self.version >= 31 and self.order.deltaNeutralOrderType:
             if readOpenOrderAttribs:
-                self.order.deltaNeutralOpenClose = decode(str, fields)
-            self.order.deltaNeutralShortSale = decode(bool, fields)
-            self.order.deltaNeutralShortSaleSlot = decode(int, fields)
-            self.order.deltaNeutralDesignatedLocation = decode(str, fields)
+                self.order.deltaNeutralOpenClose = fields.read_str()
+            self.order.deltaNeutralShortSale = fields.read_bool()
+            self.order.deltaNeutralShortSaleSlot = fields.read_int()
+            self.order.deltaNeutralDesignatedLocation = fields.read_str()
 
-        self.order.continuousUpdate = decode(bool, fields)
-        self.order.referencePriceType = decode(int, fields)
+        self.order.continuousUpdate = fields.read_bool()
+        self.order.referencePriceType = fields.read_int()
 
     def decodeTrailParams(self, fields):
-        self.order.trailStopPrice = decode(float, fields, SHOW_UNSET)
+        self.order.trailStopPrice = fields.read_float(SHOW_UNSET)
         if self.version >= 30:
-            self.order.trailingPercent = decode(float, fields, SHOW_UNSET)
+            self.order.trailingPercent = fields.read_float(SHOW_UNSET)
 
     def decodeBasisPoints(self, fields):
-        self.order.basisPoints = decode(float, fields, SHOW_UNSET)
-        self.order.basisPointsType = decode(int, fields, SHOW_UNSET)
+        self.order.basisPoints = fields.read_float(SHOW_UNSET)
+        self.order.basisPointsType = fields.read_int(SHOW_UNSET)
 
     def decodeComboLegs(self, fields):
-        self.contract.comboLegsDescrip = decode(str, fields)
+        self.contract.comboLegsDescrip = fields.read_str()
 
         if self.version >= 29:
-            comboLegsCount = decode(int, fields)
+            comboLegsCount = fields.read_int()
 
             if comboLegsCount > 0:
                 self.contract.comboLegs = []
                 for _ in range(comboLegsCount):
                     comboLeg = ComboLeg()
-                    comboLeg.conId = decode(int, fields)
-                    comboLeg.ratio = decode(int, fields)
-                    comboLeg.action = decode(str, fields)
-                    comboLeg.exchange = decode(str, fields)
-                    comboLeg.openClose = decode(int, fields)
-                    comboLeg.shortSaleSlot = decode(int, fields)
-                    comboLeg.designatedLocation = decode(str, fields)
-                    comboLeg.exemptCode = decode(int, fields)
+                    comboLeg.conId = fields.read_int()
+                    comboLeg.ratio = fields.read_int()
+                    comboLeg.action = fields.read_str()
+                    comboLeg.exchange = fields.read_str()
+                    comboLeg.openClose = fields.read_int()
+                    comboLeg.shortSaleSlot = fields.read_int()
+                    comboLeg.designatedLocation = fields.read_str()
+                    comboLeg.exemptCode = fields.read_int()
                     self.contract.comboLegs.append(comboLeg)
 
-            orderComboLegsCount = decode(int, fields)
+            orderComboLegsCount = fields.read_int()
             if orderComboLegsCount > 0:
                 self.order.orderComboLegs = []
                 for _ in range(orderComboLegsCount):
                     orderComboLeg = OrderComboLeg()
-                    orderComboLeg.price = decode(float, fields, SHOW_UNSET)
+                    orderComboLeg.price = fields.read_float(SHOW_UNSET)
                     self.order.orderComboLegs.append(orderComboLeg)
 
     def decodeSmartComboRoutingParams(self, fields):
         if self.version >= 26:
-            smartComboRoutingParamsCount = decode(int, fields)
+            smartComboRoutingParamsCount = fields.read_int()
             if smartComboRoutingParamsCount > 0:
                 self.order.smartComboRoutingParams = []
                 for _ in range(smartComboRoutingParamsCount):
                     tagValue = TagValue()
-                    tagValue.tag = decode(str, fields)
-                    tagValue.value = decode(str, fields)
+                    tagValue.tag = fields.read_str()
+                    tagValue.value = fields.read_str()
                     self.order.smartComboRoutingParams.append(tagValue)
 
     def decodeScaleOrderParams(self, fields):
         if self.version >= 20:
-            self.order.scaleInitLevelSize = decode(int, fields, SHOW_UNSET)
-            self.order.scaleSubsLevelSize = decode(int, fields, SHOW_UNSET)
+            self.order.scaleInitLevelSize = fields.read_int(SHOW_UNSET)
+            self.order.scaleSubsLevelSize = fields.read_int(SHOW_UNSET)
         else:
-            self.order.notSuppScaleNumComponents = decode(int, fields, SHOW_UNSET)
-            self.order.scaleInitLevelSize = decode(int, fields, SHOW_UNSET)
+            self.order.notSuppScaleNumComponents = fields.read_int(SHOW_UNSET)
+            self.order.scaleInitLevelSize = fields.read_int(SHOW_UNSET)
 
-        self.order.scalePriceIncrement = decode(float, fields, SHOW_UNSET)
+        self.order.scalePriceIncrement = fields.read_float(SHOW_UNSET)
 
         if (
             self.version >= 28
             and self.order.scalePriceIncrement != UNSET_DOUBLE
             and self.order.scalePriceIncrement > 0.0
         ):
-            self.order.scalePriceAdjustValue = decode(float, fields, SHOW_UNSET)
-            self.order.scalePriceAdjustInterval = decode(int, fields, SHOW_UNSET)
-            self.order.scaleProfitOffset = decode(float, fields, SHOW_UNSET)
-            self.order.scaleAutoReset = decode(bool, fields)
-            self.order.scaleInitPosition = decode(int, fields, SHOW_UNSET)
-            self.order.scaleInitFillQty = decode(int, fields, SHOW_UNSET)
-            self.order.scaleRandomPercent = decode(bool, fields)
+            self.order.scalePriceAdjustValue = fields.read_float(SHOW_UNSET)
+            self.order.scalePriceAdjustInterval = fields.read_int(SHOW_UNSET)
+            self.order.scaleProfitOffset = fields.read_float(SHOW_UNSET)
+            self.order.scaleAutoReset = fields.read_bool()
+            self.order.scaleInitPosition = fields.read_int(SHOW_UNSET)
+            self.order.scaleInitFillQty = fields.read_int(SHOW_UNSET)
+            self.order.scaleRandomPercent = fields.read_bool()
 
     def decodeHedgeParams(self, fields):
         if self.version >= 24:
-            self.order.hedgeType = decode(str, fields)
+            self.order.hedgeType = fields.read_str()
             if self.order.hedgeType:
-                self.order.hedgeParam = decode(str, fields)
+                self.order.hedgeParam = fields.read_str()
 
     def decodeOptOutSmartRouting(self, fields):
         if self.version >= 25:
-            self.order.optOutSmartRouting = decode(bool, fields)
+            self.order.optOutSmartRouting = fields.read_bool()
 
     def decodeClearingParams(self, fields):
-        self.order.clearingAccount = decode(str, fields)
-        self.order.clearingIntent = decode(str, fields)
+        self.order.clearingAccount = fields.read_str()
+        self.order.clearingIntent = fields.read_str()
 
     def decodeNotHeld(self, fields):
         if self.version >= 22:
-            self.order.notHeld = decode(bool, fields)
+            self.order.notHeld = fields.read_bool()
 
     def decodeDeltaNeutral(self, fields):
         if self.version >= 20:
-            deltaNeutralContractPresent = decode(bool, fields)
+            deltaNeutralContractPresent = fields.read_bool()
             if deltaNeutralContractPresent:
                 self.contract.deltaNeutralContract = DeltaNeutralContract()
-                self.contract.deltaNeutralContract.conId = decode(int, fields)
-                self.contract.deltaNeutralContract.delta = decode(float, fields)
-                self.contract.deltaNeutralContract.price = decode(float, fields)
+                self.contract.deltaNeutralContract.conId = fields.read_int()
+                self.contract.deltaNeutralContract.delta = fields.read_float()
+                self.contract.deltaNeutralContract.price = fields.read_float()
 
     def decodeAlgoParams(self, fields):
         if self.version >= 21:
-            self.order.algoStrategy = decode(str, fields)
+            self.order.algoStrategy = fields.read_str()
             if self.order.algoStrategy:
-                algoParamsCount = decode(int, fields)
+                algoParamsCount = fields.read_int()
                 if algoParamsCount > 0:
                     self.order.algoParams = []
                     for _ in range(algoParamsCount):
                         tagValue = TagValue()
-                        tagValue.tag = decode(str, fields)
-                        tagValue.value = decode(str, fields)
+                        tagValue.tag = fields.read_str()
+                        tagValue.value = fields.read_str()
                         self.order.algoParams.append(tagValue)
 
     def decodeSolicited(self, fields):
         if self.version >= 33:
-            self.order.solicited = decode(bool, fields)
+            self.order.solicited = fields.read_bool()
 
     def decodeOrderStatus(self, fields):
-        self.orderState.status = decode(str, fields)
+        self.orderState.status = fields.read_str()
 
     def decodeWhatIfInfoAndCommission(self, fields):
-        self.order.whatIf = decode(bool, fields)
+        self.order.whatIf = fields.read_bool()
         OrderDecoder.decodeOrderStatus(self, fields)
         if self.serverVersion >= MIN_SERVER_VER_WHAT_IF_EXT_FIELDS:
-            self.orderState.initMarginBefore = decode(str, fields)
-            self.orderState.maintMarginBefore = decode(str, fields)
-            self.orderState.equityWithLoanBefore = decode(str, fields)
-            self.orderState.initMarginChange = decode(str, fields)
-            self.orderState.maintMarginChange = decode(str, fields)
-            self.orderState.equityWithLoanChange = decode(str, fields)
-
-        self.orderState.initMarginAfter = decode(str, fields)
-        self.orderState.maintMarginAfter = decode(str, fields)
-        self.orderState.equityWithLoanAfter = decode(str, fields)
-
-        self.orderState.commission = decode(float, fields, SHOW_UNSET)
-        self.orderState.minCommission = decode(float, fields, SHOW_UNSET)
-        self.orderState.maxCommission = decode(float, fields, SHOW_UNSET)
-        self.orderState.commissionCurrency = decode(str, fields)
-        self.orderState.warningText = decode(str, fields)
+            self.orderState.initMarginBefore = fields.read_str()
+            self.orderState.maintMarginBefore = fields.read_str()
+            self.orderState.equityWithLoanBefore = fields.read_str()
+            self.orderState.initMarginChange = fields.read_str()
+            self.orderState.maintMarginChange = fields.read_str()
+            self.orderState.equityWithLoanChange = fields.read_str()
+
+        self.orderState.initMarginAfter = fields.read_str()
+        self.orderState.maintMarginAfter = fields.read_str()
+        self.orderState.equityWithLoanAfter = fields.read_str()
+
+        self.orderState.commission = fields.read_float(SHOW_UNSET)
+        self.orderState.minCommission = fields.read_float(SHOW_UNSET)
+        self.orderState.maxCommission = fields.read_float(SHOW_UNSET)
+        self.orderState.commissionCurrency = fields.read_str()
+        self.orderState.warningText = fields.read_str()
 
     def decodeVolRandomizeFlags(self, fields):
         if self.version >= 34:
-            self.order.randomizeSize = decode(bool, fields)
-            self.order.randomizePrice = decode(bool, fields)
+            self.order.randomizeSize = fields.read_bool()
+            self.order.randomizePrice = fields.read_bool()
 
     def decodePegToBenchParams(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_PEGGED_TO_BENCHMARK:
             if isPegBenchOrder(self.order.orderType):
-                self.order.referenceContractId = decode(int, fields)
-                self.order.isPeggedChangeAmountDecrease = decode(bool, fields)
-                self.order.peggedChangeAmount = decode(float, fields)
-                self.order.referenceChangeAmount = decode(float, fields)
-                self.order.referenceExchangeId = decode(str, fields)
+                self.order.referenceContractId = fields.read_int()
+                self.order.isPeggedChangeAmountDecrease = fields.read_bool()
+                self.order.peggedChangeAmount = fields.read_float()
+                self.order.referenceChangeAmount = fields.read_float()
+                self.order.referenceExchangeId = fields.read_str()
 
     def decodeConditions(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_PEGGED_TO_BENCHMARK:
-            conditionsSize = decode(int, fields)
+            conditionsSize = fields.read_int()
             if conditionsSize > 0:
                 self.order.conditions = []
                 for _ in range(conditionsSize):
-                    conditionType = decode(int, fields)
+                    conditionType = fields.read_int()
                     condition = order_condition.Create(conditionType)
                     condition.decode(fields)
                     self.order.conditions.append(condition)
 
-                self.order.conditionsIgnoreRth = decode(bool, fields)
-                self.order.conditionsCancelOrder = decode(bool, fields)
+                self.order.conditionsIgnoreRth = fields.read_bool()
+                self.order.conditionsCancelOrder = fields.read_bool()
 
     def decodeAdjustedOrderParams(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_PEGGED_TO_BENCHMARK:
-            self.order.adjustedOrderType = decode(str, fields)
-            self.order.triggerPrice = decode(float, fields)
+            self.order.adjustedOrderType = fields.read_str()
+            self.order.triggerPrice = fields.read_float()
             OrderDecoder.decodeStopPriceAndLmtPriceOffset(self, fields)
-            self.order.adjustedStopPrice = decode(float, fields)
-            self.order.adjustedStopLimitPrice = decode(float, fields)
-            self.order.adjustedTrailingAmount = decode(float, fields)
-            self.order.adjustableTrailingUnit = decode(int, fields)
+            self.order.adjustedStopPrice = fields.read_float()
+            self.order.adjustedStopLimitPrice = fields.read_float()
+            self.order.adjustedTrailingAmount = fields.read_float()
+            self.order.adjustableTrailingUnit = fields.read_int()
 
     def decodeStopPriceAndLmtPriceOffset(self, fields):
-        self.order.trailStopPrice = decode(float, fields)
-        self.order.lmtPriceOffset = decode(float, fields)
+        self.order.trailStopPrice = fields.read_float()
+        self.order.lmtPriceOffset = fields.read_float()
 
     def decodeSoftDollarTier(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_SOFT_DOLLAR_TIER:
-            name = decode(str, fields)
-            value = decode(str, fields)
-            displayName = decode(str, fields)
+            name = fields.read_str()
+            value = fields.read_str()
+            displayName = fields.read_str()
             self.order.softDollarTier = SoftDollarTier(name, value, displayName)
 
     def decodeCashQty(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_CASH_QTY:
-            self.order.cashQty = decode(float, fields)
+            self.order.cashQty = fields.read_float()
 
     def decodeDontUseAutoPriceForHedge(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_AUTO_PRICE_FOR_HEDGE:
-            self.order.dontUseAutoPriceForHedge = decode(bool, fields)
+            self.order.dontUseAutoPriceForHedge = fields.read_bool()
 
     def decodeIsOmsContainers(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_ORDER_CONTAINER:
-            self.order.isOmsContainer = decode(bool, fields)
+            self.order.isOmsContainer = fields.read_bool()
 
     def decodeDiscretionaryUpToLimitPrice(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_D_PEG_ORDERS:
-            self.order.discretionaryUpToLimitPrice = decode(bool, fields)
+            self.order.discretionaryUpToLimitPrice = fields.read_bool()
 
     def decodeAutoCancelDate(self, fields):
-        self.order.autoCancelDate = decode(str, fields)
+        self.order.autoCancelDate = fields.read_str()
 
     def decodeFilledQuantity(self, fields):
-        self.order.filledQuantity = decode(Decimal, fields)
+        self.order.filledQuantity = fields.read_decimal()
 
     def decodeRefFuturesConId(self, fields):
-        self.order.refFuturesConId = decode(int, fields)
+        self.order.refFuturesConId = fields.read_int()
 
     def decodeAutoCancelParent(self, fields, minVersionAutoCancelParent=MIN_CLIENT_VER):
         if self.serverVersion >= minVersionAutoCancelParent:
-            self.order.autoCancelParent = decode(bool, fields)
+            self.order.autoCancelParent = fields.read_bool()
 
     def decodeShareholder(self, fields):
-        self.order.shareholder = decode(str, fields)
+        self.order.shareholder = fields.read_str()
 
     def decodeImbalanceOnly(self, fields):
-        self.order.imbalanceOnly = decode(bool, fields)
+        self.order.imbalanceOnly = fields.read_bool()
 
     def decodeRouteMarketableToBbo(self, fields):
-        self.order.routeMarketableToBbo = decode(bool, fields)
+        self.order.routeMarketableToBbo = fields.read_bool()
 
     def decodeParentPermId(self, fields):
-        self.order.parentPermId = decode(int, fields)
+        self.order.parentPermId = fields.read_int()
 
     def decodeCompletedTime(self, fields):
-        self.orderState.completedTime = decode(str, fields)
+        self.orderState.completedTime = fields.read_str()
 
     def decodeCompletedStatus(self, fields):
-        self.orderState.completedStatus = decode(str, fields)
+        self.orderState.completedStatus = fields.read_str()
 
     def decodeUsePriceMgmtAlgo(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_PRICE_MGMT_ALGO:
-            self.order.usePriceMgmtAlgo = decode(bool, fields)
+            self.order.usePriceMgmtAlgo = fields.read_bool()
 
     def decodeDuration(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_DURATION:
-            self.order.duration = decode(int, fields, SHOW_UNSET)
+            self.order.duration = fields.read_int(SHOW_UNSET)
 
     def decodePostToAts(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_POST_TO_ATS:
-            self.order.postToAts = decode(int, fields, SHOW_UNSET)
+            self.order.postToAts = fields.read_int(SHOW_UNSET)
 
     def decodePegBestPegMidOrderAttributes(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_PEGBEST_PEGMID_OFFSETS:
-            self.order.minTradeQty = decode(int, fields, SHOW_UNSET)
-            self.order.minCompeteSize = decode(int, fields, SHOW_UNSET)
-            self.order.competeAgainstBestOffset = decode(float, fields, SHOW_UNSET)
-            self.order.midOffsetAtWhole = decode(float, fields, SHOW_UNSET)
-            self.order.midOffsetAtHalf = decode(float, fields, SHOW_UNSET)
+            self.order.minTradeQty = fields.read_int(SHOW_UNSET)
+            self.order.minCompeteSize = fields.read_int(SHOW_UNSET)
+            self.order.competeAgainstBestOffset = fields.read_float(SHOW_UNSET)
+            self.order.midOffsetAtWhole = fields.read_float(SHOW_UNSET)
+            self.order.midOffsetAtHalf = fields.read_float(SHOW_UNSET)
 
     def decodeCustomerAccount(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_CUSTOMER_ACCOUNT:
-            self.order.customerAccount = decode(str, fields)
+            self.order.customerAccount = fields.read_str()
 
     def decodeProfessionalCustomer(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_PROFESSIONAL_CUSTOMER:
-            self.order.professionalCustomer = decode(bool, fields)
+            self.order.professionalCustomer = fields.read_bool()
 
     def decodeBondAccruedInterest(self, fields):
         if self.serverVersion >= MIN_SERVER_VER_BOND_ACCRUED_INTEREST:
-            self.order.bondAccruedInterest = decode(str, fields)
+            self.order.bondAccruedInterest = fields.read_str()
+
+
+# the steps of OPEN_ORDER and COMPLETED_ORDER, (decode method, extra args...)
+OPEN_ORDER_STEPS = (
+    (OrderDecoder.decodeOrderId,),
+    (OrderDecoder.decodeContractFields,),
+    (OrderDecoder.decodeAction,),
+    (OrderDecoder.decodeTotalQuantity,),
+    (OrderDecoder.decodeOrderType,),
+    (OrderDecoder.decodeLmtPrice,),
+    (OrderDecoder.decodeAuxPrice,),
+    (OrderDecoder.decodeTIF,),
+    (OrderDecoder.decodeOcaGroup,),
+    (OrderDecoder.decodeAccount,),
+    (OrderDecoder.decodeOpenClose,),
+    (OrderDecoder.decodeOrigin,),
+    (OrderDecoder.decodeOrderRef,),
+    (OrderDecoder.decodeClientId,),
+    (OrderDecoder.decodePermId,),
+    (OrderDecoder.decodeOutsideRth,),
+    (OrderDecoder.decodeHidden,),
+    (OrderDecoder.decodeDiscretionaryAmt,),
+    (OrderDecoder.decodeGoodAfterTime,),
+    (OrderDecoder.skipSharesAllocation,),
+    (OrderDecoder.decodeFAParams,),
+    (OrderDecoder.decodeModelCode,),
+    (OrderDecoder.decodeGoodTillDate,),
+    (OrderDecoder.decodeRule80A,),
+    (OrderDecoder.decodePercentOffset,),
+    (OrderDecoder.decodeSettlingFirm,),
+    (OrderDecoder.decodeShortSaleParams,),
+    (OrderDecoder.decodeAuctionStrategy,),
+    (OrderDecoder.decodeBoxOrderParams,),
+    (OrderDecoder.decodePegToStkOrVolOrderParams,),
+    (OrderDecoder.decodeDisplaySize,),
+    (OrderDecoder.decodeBlockOrder,),
+    (OrderDecoder.decodeSweepToFill,),
+    (OrderDecoder.decodeAllOrNone,),
+    (OrderDecoder.decodeMinQty,),
+    (OrderDecoder.decodeOcaType,),
+    (OrderDecoder.skipETradeOnly,),
+    (OrderDecoder.skipFirmQuoteOnly,),
+    (OrderDecoder.skipNbboPriceCap,),
+    (OrderDecoder.decodeParentId,),
+    (OrderDecoder.decodeTriggerMethod,),
+    (OrderDecoder.decodeVolOrderParams, True),
+    (OrderDecoder.decodeTrailParams,),
+    (OrderDecoder.decodeBasisPoints,),
+    (OrderDecoder.decodeComboLegs,),
+    (OrderDecoder.decodeSmartComboRoutingParams,),
+    (OrderDecoder.decodeScaleOrderParams,),
+    (OrderDecoder.decodeHedgeParams,),
+    (OrderDecoder.decodeOptOutSmartRouting,),
+    (OrderDecoder.decodeClearingParams,),
+    (OrderDecoder.decodeNotHeld,),
+    (OrderDecoder.decodeDeltaNeutral,),
+    (OrderDecoder.decodeAlgoParams,),
+    (OrderDecoder.decodeSolicited,),
+    (OrderDecoder.decodeWhatIfInfoAndCommission,),
+    (OrderDecoder.decodeVolRandomizeFlags,),
+    (OrderDecoder.decodePegToBenchParams,),
+    (OrderDecoder.decodeConditions,),
+    (OrderDecoder.decodeAdjustedOrderParams,),
+    (OrderDecoder.decodeSoftDollarTier,),
+    (OrderDecoder.decodeCashQty,),
+    (OrderDecoder.decodeDontUseAutoPriceForHedge,),
+    (OrderDecoder.decodeIsOmsContainers,),
+    (OrderDecoder.decodeDiscretionaryUpToLimitPrice,),
+    (OrderDecoder.decodeUsePriceMgmtAlgo,),
+    (OrderDecoder.decodeDuration,),
+    (OrderDecoder.decodePostToAts,),
+    (OrderDecoder.decodeAutoCancelParent, MIN_SERVER_VER_AUTO_CANCEL_PARENT),
+    (OrderDecoder.decodePegBestPegMidOrderAttributes,),
+    (OrderDecoder.decodeCustomerAccount,),
+    (OrderDecoder.decodeProfessionalCustomer,),
+    (OrderDecoder.decodeBondAccruedInterest,),
+)
+
+COMPLETED_ORDER_STEPS = (
+    (OrderDecoder.decodeContractFields,),
+    (OrderDecoder.decodeAction,),
+    (OrderDecoder.decodeTotalQuantity,),
+    (OrderDecoder.decodeOrderType,),
+    (OrderDecoder.decodeLmtPrice,),
+    (OrderDecoder.decodeAuxPrice,),
+    (OrderDecoder.decodeTIF,),
+    (OrderDecoder.decodeOcaGroup,),
+    (OrderDecoder.decodeAccount,),
+    (OrderDecoder.decodeOpenClose,),
+    (OrderDecoder.decodeOrigin,),
+    (OrderDecoder.decodeOrderRef,),
+    (OrderDecoder.decodePermId,),
+    (OrderDecoder.decodeOutsideRth,),
+    (OrderDecoder.decodeHidden,),
+    (OrderDecoder.decodeDiscretionaryAmt,),
+    (OrderDecoder.decodeGoodAfterTime,),
+    (OrderDecoder.decodeFAParams,),
+    (OrderDecoder.decodeModelCode,),
+    (OrderDecoder.decodeGoodTillDate,),
+    (OrderDecoder.decodeRule80A,),
+    (OrderDecoder.decodePercentOffset,),
+    (OrderDecoder.decodeSettlingFirm,),
+    (OrderDecoder.decodeShortSaleParams,),
+    (OrderDecoder.decodeBoxOrderParams,),
+    (OrderDecoder.decodePegToStkOrVolOrderParams,),
+    (OrderDecoder.decodeDisplaySize,),
+    (OrderDecoder.decodeSweepToFill,),
+    (OrderDecoder.decodeAllOrNone,),
+    (OrderDecoder.decodeMinQty,),
+    (OrderDecoder.decodeOcaType,),
+    (OrderDecoder.decodeTriggerMethod,),
+    (OrderDecoder.decodeVolOrderParams, False),
+    (OrderDecoder.decodeTrailParams,),
+    (OrderDecoder.decodeComboLegs,),
+    (OrderDecoder.decodeSmartComboRoutingParams,),
+    (OrderDecoder.decodeScaleOrderParams,),
+    (OrderDecoder.decodeHedgeParams,),
+    (OrderDecoder.decodeClearingParams,),
+    (OrderDecoder.decodeNotHeld,),
+    (OrderDecoder.decodeDeltaNeutral,),
+    (OrderDecoder.decodeAlgoParams,),
+    (OrderDecoder.decodeSolicited,),
+    (OrderDecoder.decodeOrderStatus,),
+    (OrderDecoder.decodeVolRandomizeFlags,),
+    (OrderDecoder.decodePegToBenchParams,),
+    (OrderDecoder.decodeConditions,),
+    (OrderDecoder.decodeStopPriceAndLmtPriceOffset,),
+    (OrderDecoder.decodeCashQty,),
+    (OrderDecoder.decodeDontUseAutoPriceForHedge,),
+    (OrderDecoder.decodeIsOmsContainers,),
+    (OrderDecoder.decodeAutoCancelDate,),
+    (OrderDecoder.decodeFilledQuantity,),
+    (OrderDecoder.decodeRefFuturesConId,),
+    (OrderDecoder.decodeAutoCancelParent,),
+    (OrderDecoder.decodeShareholder,),
+    (OrderDecoder.decodeImbalanceOnly,),
+    (OrderDecoder.decodeRouteMarketableToBbo,),
+    (OrderDecoder.decodeParentPermId,),
+    (OrderDecoder.decodeCompletedTime,),
+    (OrderDecoder.decodeCompletedStatus,),
+    (OrderDecoder.decodePegBestPegMidOrderAttributes,),
+    (OrderDecoder.decodeCustomerAccount,),
+    (OrderDecoder.decodeProfessionalCustomer,),
+)
+
+# the decode methods whose reads depend on the values read, they are kept
+# as is in the plans
+DATA_DEPENDENT_STEPS = frozenset(
+    (
+        OrderDecoder.decodeVolOrderParams,
+        OrderDecoder.decodeComboLegs,
+        OrderDecoder.decodeSmartComboRoutingParams,
+        OrderDecoder.decodeScaleOrderParams,
+        OrderDecoder.decodeHedgeParams,
+        OrderDecoder.decodeDeltaNeutral,
+        OrderDecoder.decodeAlgoParams,
+        OrderDecoder.decodePegToBenchParams,
+        OrderDecoder.decodeConditions,
+        OrderDecoder.decodeSoftDollarTier,
+    )
+)
+
+# targets of the steps of a decode plan
+(CONTRACT, ORDER, ORDER_STATE, SKIPPED, METHOD) = range(5)
+
+
+class TracedObject(object):
+    """Stands for the Contract, Order or OrderState while a decode method is
+    traced: records what is set, refuses to be read."""
+
+    def __init__(self, target, sets):
+        object.__setattr__(self, "target", target)
+        object.__setattr__(self, "sets", sets)
+
+    def __setattr__(self, name, value):
+        self.sets.append((self.target, name, value))
+
+    def __getattr__(self, name):
+        raise ValueError(f"{name} is read while traced")
+
+
+class TracedToken(object):
+    """The value of a traced read: a decode method branching on it (==, !=,
+    truth value, hashing) can't be traced, it fails instead of taking one
+    branch for all the data. Such a method belongs to DATA_DEPENDENT_STEPS."""
+
+    __slots__ = ("readName",)
+
+    def __init__(self, readName):
+        self.readName = readName
+
+    def _refuse(self, *args):
+        raise ValueError(f"the value of {self.readName}() is used while traced")
+
+    __eq__ = __ne__ = __lt__ = __le__ = __gt__ = __ge__ = _refuse
+    __bool__ = __hash__ = __int__ = __float__ = __index__ = __str__ = _refuse
+
+
+class TracedCursor(object):
+    """Stands for the FieldCursor while a decode method is traced: each
+    read returns a new TracedToken and is recorded."""
+
+    def __init__(self):
+        self.reads = []
+
+    def __getattr__(self, name):
+        if not name.startswith("read_"):
+            raise AttributeError(name)
+
+        def read(*args):
+            token = TracedToken(name)
+            self.reads.append((token, name, args))
+            return token
+
+        return read
+
+
+def makeDecodePlan(steps, version, serverVersion, cursorClass):
+    """Resolves steps, see OPEN_ORDER_STEPS, for the given versions into a
+    flat list of (target, steps) run by runDecodePlan(). The decode methods
+    are traced once, with their version checks: the fields they read
+    become (attr, converter) setters of target, the consecutive ones of the
+    same target grouped, and the deprecated ones a number of SKIPPED
+    fields. Only the DATA_DEPENDENT_STEPS are kept, as (method, args) METHOD
+    steps."""
+
+    plan = []
+
+    def add(target, step):
+        if plan and plan[-1][0] == target and target != METHOD:
+            if target == SKIPPED:
+                plan[-1] = (SKIPPED, plan[-1][1] + 1)
+            else:
+                plan[-1][1].append(step)
+        elif target == SKIPPED:
+            plan.append((SKIPPED, 1))
+        elif target == METHOD:
+            plan.append((METHOD, step))
+        else:
+            plan.append((target, [step]))
+
+    for meth, *args in steps:
+        if meth in DATA_DEPENDENT_STEPS:
+            add(METHOD, (meth, tuple(args)))
+            continue
+
+        sets = []
+        tracer = OrderDecoder(
+            TracedObject(CONTRACT, sets),
+            TracedObject(ORDER, sets),
+            TracedObject(ORDER_STATE, sets),
+            version,
+            serverVersion,
+        )
+        cursor = TracedCursor()
+        meth(tracer, cursor, *args)
+
+        token2set = {id(value): (target, name) for (target, name, value) in sets}
+        if len(token2set) != len(sets):
+            raise ValueError(f"{meth.__name__} does not only set the fields read")
+        for token, readName, readArgs in cursor.reads:
+            (target, name) = token2set.pop(id(token), (SKIPPED, None))
+            if target == SKIPPED:
+                add(SKIPPED, None)
+            else:
+                add(target, (name, cursorClass.converters[(readName, readArgs)]))
+        if token2set:
+            raise ValueError(f"{meth.__name__} does not only set the fields read")
+
+    return [
+        (target, tuple(steps)) if target < SKIPPED else (target, steps)
+        for (target, steps) in plan
+    ]
@@ -5,50 +5,244 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
 # Posei Ibapi: Error handling improvement
 The EReader runs in a separate threads and is responsible for receiving the
 incoming messages.
-It will read the packets from the wire, use the low level IB messaging to
-remove the size prefix and put the rest in a Queue.
+The EReaderHub does the same for many connections from a single thread.
+It will read the packets from the wire into a reusable comm.RecvBuffer, use
+the low level IB messaging to remove the size prefix and put the rest in a
+Queue, or decode it right away with an InlineDecoder.
 """
 
+import concurrent.futures
 import logging
+import selectors
+import socket
+import threading
 from threading import Thread
 
 from ibapi import comm
+from ibapi.const import NO_VALID_ID, MAX_MSG_LEN
+from ibapi.errors import BAD_LENGTH
+from ibapi.utils import BadMessage
 
 logger = logging.getLogger(__name__)
 
 
 class EReader(Thread):
-    def __init__(self, conn, msg_queue) -> None:
+    def __init__(self, conn, msg_queue, ignoredMsgIds=()) -> None:
         """Posei Ibapi: __init__ method for Posei Ibapi"""
         logger.debug('Posei Ibapi: __init__ called')
         super().__init__()
         self.conn = conn
         self.msg_queue = msg_queue
+        self.ignoredMsgIds = ignoredMsgIds
 
     def run(self):
         """Posei Ibapi: run method for Posei Ibapi"""
         try:
             logger.debug("EReader thread started")
-            buf = b""
+            buf = comm.RecvBuffer(self.conn.options.recvBufSize, self.ignoredMsgIds)
             # Posei Ibapi: Error handling improvement
             while self.conn.isConnected():
-                data = self.conn.recvMsg()
-                logger.debug("reader loop, recvd size %d", len(data))
-                buf += data
-
-                while len(buf) > 0:
-                    (size, msg, buf) = comm.read_msg(buf)
-                    # logger.debug("resp %s", buf.decode('ascii'))
-                    logger.debug(
-                        "size:%d msg.size:%d msg:|%s| buf:%s|", size, len(msg), buf, "|"
-                    )
+                nRead = self.conn.recvInto(buf.writable())
+                logger.debug("reader loop, recvd size %d", nRead)
+                buf.commit(nRead)
 
-                    if msg:
-                        self.msg_queue.put(msg)
-                    else:
-                        logger.debug("more incoming packet(s) are needed ")
-                        break
+                for msg in buf.frames():
+                    logger.debug("size:%d msg:|%s|", len(msg), msg)
+                    self.msg_queue.put(msg)
+
+                if len(buf) > 0:
+                    logger.debug("more incoming packet(s) are needed ")
 
             logger.debug("EReader thread finished")
         except:
             logger.exception("unhandled exception in EReader thread")
+
+
+class InlineDecoder(object):
+    """Stands for the msg_queue of an EReader (or an EReaderHub) to decode
+    each message as soon as it is extracted, in the reader thread, without
+    going through a queue and EClient.run(). See EClient.setDecodeInline().
+
+    Threading contract:
+    - the EWrapper callbacks are called from the reader thread (the hub
+      thread with an EReaderHub, shared by all its clients), the first ones
+      possibly before connect() has returned in the calling thread
+    - nothing is read from the socket while a callback runs: a slow callback
+      delays all the following messages and, in the end, TWS itself
+    - the requests can be sent from the callbacks, as from any thread, but
+      the state shared by the callbacks and the other threads of the
+      application must be protected by the application
+    - EClient.run() is not needed; if called it only waits for the
+      disconnection, calling msgLoopTmo() every 200ms
+    - an exception escaping a callback is logged and ends the connection,
+      as it would end run()"""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    def put(self, msg):
+        client = self.client
+        if client.conn is None:
+            logger.debug("dropping msg received after disconnect()")
+            return
+        if len(msg) > MAX_MSG_LEN:
+            client.wrapper.error(
+                NO_VALID_ID, BAD_LENGTH.code(), f"{BAD_LENGTH.msg()}:{len(msg)}:{msg}"
+            )
+            client.disconnect()
+            return
+
+        try:
+            client.decoder.interpret(comm.read_fields(msg))
+            client.msgLoopRec()
+        except BadMessage:
+            logger.info("BadMessage")
+        except Exception:
+            logger.exception("unhandled exception while decoding, disconnecting")
+            client.disconnect()
+
+
+class EReaderHub(Thread):
+    """Single thread reading the incoming messages of many connections.
+
+    Instead of one EReader per EClient, each waking up on its socket timeout,
+    the hub waits on all the registered sockets with a selector (epoll where
+    available) and only wakes up when one of them is readable or when a
+    connection is registered/unregistered. The messages of a connection are
+    put in the msg_queue it was registered with, so EClient.run() works the
+    same way.
+
+    Use it with EClient.setReaderHub() before connect(); the hub must be
+    started once and is shared by all the clients.
+
+    register() and unregister() are carried out by the hub thread and return
+    a concurrent.futures.Future of it: an error registering a connection is
+    set on its future, and the hub goes on serving the other ones."""
+
+    def __init__(self) -> None:
+        super().__init__(name="EReaderHub", daemon=True)
+        self.selector = selectors.DefaultSelector()
+        self.conn2sock = {}
+        self.pending = []
+        self.lock = threading.Lock()
+        self.done = False
+        (self.wakeupRecv, self.wakeupSend) = socket.socketpair()
+        self.wakeupRecv.setblocking(False)
+        self.wakeupSend.setblocking(False)
+        self.selector.register(self.wakeupRecv, selectors.EVENT_READ)
+
+    def register(self, conn, msg_queue, ignoredMsgIds=()):
+        """starts reading conn, its messages go to msg_queue but the ones
+        with one of the ignoredMsgIds"""
+        return self._post((conn, msg_queue, ignoredMsgIds))
+
+    def unregister(self, conn):
+        """stops reading conn, to be called before disconnecting it"""
+        return self._post((conn, None, ()))
+
+    def stop(self):
+        self.done = True
+        self._wakeup()
+
+    def _post(self, op):
+        future = concurrent.futures.Future()
+        with self.lock:
+            if self.done:
+                future.cancel()
+                return future
+            self.pending.append(op + (future,))
+        self._wakeup()
+        return future
+
+    def _wakeup(self):
+        try:
+            self.wakeupSend.send(b"\0")
+        except (BlockingIOError, OSError):
+            # wakeup already pending or hub stopped
+            pass
+
+    def run(self):
+        try:
+            logger.debug("EReaderHub thread started")
+            while not self.done:
+                self._processPending()
+                try:
+                    events = self.selector.select()
+                except OSError:
+                    # some socket got closed behind our back
+                    logger.debug("select failed, purging closed connections")
+                    self._purge()
+                    continue
+
+                for key, _ in events:
+                    if key.data is None:
+                        self._drainWakeup()
+                    else:
+                        self._read(*key.data)
+            logger.debug("EReaderHub thread finished")
+        except:
+            logger.exception("unhandled exception in EReaderHub thread")
+        finally:
+            with self.lock:
+                self.done = True
+                (pending, self.pending) = (self.pending, [])
+            for *_, future in pending:
+                future.cancel()
+            self.selector.close()
+            self.wakeupRecv.close()
+            self.wakeupSend.close()
+
+    def _processPending(self):
+        with self.lock:
+            (pending, self.pending) = (self.pending, [])
+
+        for conn, msg_queue, ignoredMsgIds, future in pending:
+            try:
+                if msg_queue is None:
+                    self._unregister(conn)
+                elif conn.isConnected() and conn not in self.conn2sock:
+                    buf = comm.RecvBuffer(conn.options.recvBufSize, ignoredMsgIds)
+                    self.selector.register(
+                        conn.socket, selectors.EVENT_READ, (conn, msg_queue, buf)
+                    )
+                    self.conn2sock[conn] = conn.socket
+                    logger.debug("EReaderHub registered %s:%s", conn.host, conn.port)
+            except Exception as ex:
+                logger.exception("EReaderHub failed on %s:%s", conn.host, conn.port)
+                future.set_exception(ex)
+            else:
+                future.set_result(None)
+
+    def _unregister(self, conn):
+        sock = self.conn2sock.pop(conn, None)
+        if sock is not None:
+            try:
+                self.selector.unregister(sock)
+            except (KeyError, ValueError):
+                pass
+            logger.debug("EReaderHub unregistered %s:%s", conn.host, conn.port)
+
+    def _purge(self):
+        for conn in list(self.conn2sock):
+            if not conn.isConnected():
+                self._unregister(conn)
+
+    def _drainWakeup(self):
+        try:
+            while self.wakeupRecv.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _read(self, conn, msg_queue, buf):
+        try:
+            nRead = conn.recvInto(buf.writable())
+            buf.commit(nRead)
+            for msg in buf.frames():
+                msg_queue.put(msg)
+        except Exception:
+            logger.exception("unhandled exception reading %s:%s", conn.host, conn.port)
+            conn.disconnect()
+
+        if not conn.isConnected():
+            self._unregister(conn)
@@ -143,6 +143,20 @@ MIN_CLIENT_VER = 100
 MAX_CLIENT_VER = MIN_SERVER_VER_RFQ_FIELDS
 
 
+class ServerCapabilities:
+    """The MIN_SERVER_VER_* checks of a server version, resolved once at
+    the handshake: the attribute named after each constant without its
+    prefix, eg: TRADING_CLASS, is serverVersion >= MIN_SERVER_VER_TRADING_CLASS."""
+
+    PREFIX = "MIN_SERVER_VER_"
+
+    def __init__(self, serverVersion: int):
+        self.serverVersion = serverVersion
+        for (name, version) in globals().items():
+            if name.startswith(self.PREFIX):
+                setattr(self, name[len(self.PREFIX) :], serverVersion >= version)
+
+
 # Posei Ibapi: Code enhancement for Posei Ibapi
 # Posei Ibapi: Update - 20260101145712
 
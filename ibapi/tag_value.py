@@ -8,8 +8,11 @@ Simple class mapping a tag to a value. Both of them are strings.
 They are used in a list to convey extra info with the requests.
 """
 
+import logging
 from ibapi.object_implem import Object
 
+logger = logging.getLogger(__name__)
+
 
 class TagValue(Object):
     def __init__(self, tag: str = None, value: str = None):
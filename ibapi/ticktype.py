@@ -116,6 +116,16 @@ TickTypeEnum = Enum(
     "NOT_SET",
 )
 
+# the size tick type sent along with a price tick type by TICK_PRICE
+PRICE2SIZE_TICK_TYPE = {
+    TickTypeEnum.BID: TickTypeEnum.BID_SIZE,
+    TickTypeEnum.ASK: TickTypeEnum.ASK_SIZE,
+    TickTypeEnum.LAST: TickTypeEnum.LAST_SIZE,
+    TickTypeEnum.DELAYED_BID: TickTypeEnum.DELAYED_BID_SIZE,
+    TickTypeEnum.DELAYED_ASK: TickTypeEnum.DELAYED_ASK_SIZE,
+    TickTypeEnum.DELAYED_LAST: TickTypeEnum.DELAYED_LAST_SIZE,
+}
+
 
 # Posei Ibapi: Code enhancement for Posei Ibapi
 # Posei Ibapi: Update - 20260101145532
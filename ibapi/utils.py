@@ -14,6 +14,7 @@ from ibapi.const import (
     UNSET_DOUBLE,
     UNSET_LONG,
     UNSET_DECIMAL,
+    UNSET_DECIMAL_INT,
     DOUBLE_INFINITY,
     INFINITY_STR,
     
@@ -144,6 +145,146 @@ def decode(the_type, fields, show_unset=False, use_unicode=False):
     return n
 
 
+# the fields decoded as UNSET_DECIMAL, see decode()
+UNSET_DECIMAL_FIELDS = frozenset(
+    (b"", b"2147483647", b"9223372036854775807", b"1.7976931348623157E308")
+)
+
+
+class NumericMode:
+    """How the Decimal fields (sizes, quantities, volumes, ...) are decoded,
+    see EClient.setNumericMode(); the unset value is UNSET_DECIMAL, the
+    float UNSET_DOUBLE and the int UNSET_DECIMAL_INT (== UNSET_DECIMAL)."""
+
+    DECIMAL = "decimal"
+    FLOAT = "float"
+    INT_WHEN_INTEGRAL = "int-when-integral"  # a float otherwise
+
+
+class FieldCursor(object):
+    """Reads the fields of a message in order, with one method per type.
+
+    Same conversions as decode() but without its per field type dispatch
+    and logging. It still is an iterator over the raw fields so decode()
+    and next() work on it too."""
+
+    def __init__(self, fields, pos=0):
+        self.fields = fields
+        self.pos = pos
+
+    # (read method, args) -> the same conversion of a single field, for the
+    # decode plans, see orderdecoder.makeDecodePlan(); a subclass changing
+    # a read method has to change its converter too
+    converters = {
+        ("read_int", ()): lambda s: int(s) if s else 0,
+        ("read_int", (SHOW_UNSET,)): lambda s: int(s) if s else UNSET_INTEGER,
+        ("read_float", ()): lambda s: float(s) if s else 0.0,
+        ("read_float", (SHOW_UNSET,)): lambda s: float(s) if s else UNSET_DOUBLE,
+        ("read_decimal", ()): lambda s: (
+            UNSET_DECIMAL if s in UNSET_DECIMAL_FIELDS else Decimal(s.decode())
+        ),
+        ("read_str", ()): lambda s: s.decode(errors="backslashreplace"),
+        ("read_str", (True,)): lambda s: s.decode(
+            "unicode-escape", errors="backslashreplace"
+        ),
+        ("read_bool", ()): lambda s: int(s) != 0 if s else False,
+    }
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        pos = self.pos
+        if pos >= len(self.fields):
+            raise StopIteration
+        self.pos = pos + 1
+        return self.fields[pos]
+
+    def _next(self):
+        pos = self.pos
+        if pos >= len(self.fields):
+            raise BadMessage("no more fields")
+        self.pos = pos + 1
+        return self.fields[pos]
+
+    def skip(self, n=1) -> None:
+        if self.pos + n > len(self.fields):
+            raise BadMessage("no more fields")
+        self.pos += n
+
+    def read_int(self, show_unset=False) -> int:
+        s = self._next()
+        if not s:
+            return UNSET_INTEGER if show_unset else 0
+        return int(s)
+
+    def read_float(self, show_unset=False) -> float:
+        s = self._next()
+        if not s:
+            return UNSET_DOUBLE if show_unset else 0.0
+        return float(s)  # takes "Infinity" too
+
+    def read_decimal(self) -> Decimal:
+        s = self._next()
+        if s in UNSET_DECIMAL_FIELDS:
+            return UNSET_DECIMAL
+        return Decimal(s.decode())
+
+    def read_str(self, use_unicode=False) -> str:
+        s = self._next()
+        if use_unicode:
+            return s.decode("unicode-escape", errors="backslashreplace")
+        return s.decode(errors="backslashreplace")
+
+    def read_bool(self) -> bool:
+        s = self._next()
+        return int(s) != 0 if s else False
+
+
+class FloatFieldCursor(FieldCursor):
+    """FieldCursor for NumericMode.FLOAT"""
+
+    def read_decimal(self) -> float:
+        s = self._next()
+        if s in UNSET_DECIMAL_FIELDS:
+            return UNSET_DOUBLE
+        return float(s)
+
+    converters = {
+        **FieldCursor.converters,
+        ("read_decimal", ()): lambda s: (
+            UNSET_DOUBLE if s in UNSET_DECIMAL_FIELDS else float(s)
+        ),
+    }
+
+
+def intWhenIntegral(s):
+    """a Decimal field for NumericMode.INT_WHEN_INTEGRAL"""
+    if s in UNSET_DECIMAL_FIELDS:
+        return UNSET_DECIMAL_INT
+    try:
+        return int(s)
+    except ValueError:
+        f = float(s)
+        return int(f) if f.is_integer() else f
+
+
+class IntFieldCursor(FieldCursor):
+    """FieldCursor for NumericMode.INT_WHEN_INTEGRAL"""
+
+    def read_decimal(self):
+        return intWhenIntegral(self._next())
+
+    converters = {**FieldCursor.converters, ("read_decimal", ()): intWhenIntegral}
+
+
+NUMERIC_MODE2FIELD_CURSOR = {
+    NumericMode.DECIMAL: FieldCursor,
+    NumericMode.FLOAT: FloatFieldCursor,
+    NumericMode.INT_WHEN_INTEGRAL: IntFieldCursor,
+}
+
+
 def ExerciseStaticMethods(klass):
     import types
 
@@ -171,11 +312,20 @@ def intMaxString(val):
 
 
 def isAsciiPrintable(val):
+    if val.isascii() and val.isprintable():
+        return True  # the common case, without the per char loop
     return all(ord(c) >= 32 and ord(c) < 127 or ord(c) == 9 or ord(c) == 10 or ord(c) == 13 for c in val)
 
 
+def isUnsetDecimal(val) -> bool:
+    """whatever the NumericMode it was decoded with"""
+    return val == UNSET_DECIMAL or val == UNSET_DOUBLE
+
+
 def decimalMaxString(val: Decimal):
-    return f"{val:f}" if val != UNSET_DECIMAL else ""
+    if isUnsetDecimal(val):
+        return ""
+    return f"{val:f}" if type(val) is Decimal else str(val)
 
 
 def isPegBenchOrder(orderType: str):
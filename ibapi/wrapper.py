@@ -16,6 +16,7 @@ message use the 'unified version': the agreed up min version of both
 server and client.
 
 """
+import inspect
 import logging
 from decimal import Decimal
 
@@ -46,10 +47,12 @@ from ibapi.contract import Contract, ContractDetails, DeltaNeutralContract
 from ibapi.order import Order
 from ibapi.order_state import OrderState
 from ibapi.execution import Execution
+from ibapi.object_implem import Object
 
 from ibapi.commission_report import CommissionReport
+from ibapi.message import LAZY_IN
 from ibapi.ticktype import TickType
-from ibapi.utils import current_fn_name, log_
+from ibapi.utils import BadMessage, current_fn_name, log_
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +64,130 @@ def logAnswer(fnName, fnParams) -> None:
     log_(fnName, fnParams, "ANSWER")
 
 
+class WrapperEvent(Object):
+    """One decoded callback, eg: name='tickPrice' and
+    args=(reqId, tickType, price, attrib)."""
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __str__(self):
+        return f"{self.name}{self.args}"
+
+
+class EventRecorder:
+    """Stands for the EWrapper while a batch is decoded, see
+    EClient.runBatched(): every callback becomes a WrapperEvent appended
+    to events."""
+
+    def __init__(self):
+        self.events = []
+
+    def __getattr__(self, name):
+        def record(*args):
+            self.events.append(WrapperEvent(name, args))
+
+        # cached on the instance, __getattr__ is only hit once per name
+        setattr(self, name, record)
+        return record
+
+
+class LazyMsg(Object):
+    """A market data message of which only the header is decoded, see
+    EClient.setLazyMsgs(): msgId, version (None for the messages without
+    one) and reqId. The body is decoded on the first access to any other
+    attribute, these are the arguments of the callbacks the message stands
+    for, eg: tickType, price and attrib for a TICK_PRICE; on a name clash
+    the first callback wins, the size of a TICK_PRICE comes from its
+    tickSize. A message which is dropped is never decoded."""
+
+    def __init__(self, decoder, fields, msgId):
+        self.events = None
+        self.decoder = decoder
+        self.fields = fields
+        self.msgId = msgId
+        (versionIdx, reqIdIdx) = LAZY_IN[msgId]
+        try:
+            self.version = None if versionIdx is None else int(fields[versionIdx])
+            self.reqId = int(fields[reqIdIdx])
+        except (IndexError, ValueError):
+            raise BadMessage("bad header")
+
+    def __getattr__(self, name):
+        # only called for the attributes not set yet
+        if self.events is not None or name.startswith("__"):
+            raise AttributeError(name)
+        self.decode()
+        return getattr(self, name)
+
+    def process(self, wrapper):
+        # the shared decoder, which may be busy with the next messages,
+        # only gets a cursor of its own, the wrapper is given aside
+        decoder = self.decoder
+        handleInfo = decoder.msgId2handleInfo[self.msgId]
+        handleInfo.processMeth(decoder, decoder.fieldCursor(self.fields), wrapper)
+
+    def decode(self):
+        """decodes the body, once, and returns its WrapperEvents"""
+        if self.events is None:
+            recorder = EventRecorder()
+            self.process(recorder)
+            for event in reversed(recorder.events):
+                self.__dict__.update(zip(callbackParams(event.name), event.args))
+            self.events = recorder.events
+        return self.events
+
+    def dispatch(self, wrapper):
+        """calls the callbacks of wrapper as the Decoder would have"""
+        if self.events is None:
+            self.process(wrapper)
+        else:
+            for event in self.events:
+                getattr(wrapper, event.name)(*event.args)
+
+    def __str__(self):
+        return f"LazyMsg msgId: {self.msgId}, version: {self.version}, reqId: {self.reqId}"
+
+
+name2callbackParams = {}
+
+
+def callbackParams(name):
+    """the names of the arguments of the EWrapper callback name"""
+    params = name2callbackParams.get(name, None)
+    if params is None:
+        params = tuple(inspect.signature(getattr(EWrapper, name)).parameters)[1:]
+        name2callbackParams[name] = params
+    return params
+
+
+def overriddenCallbacks(wrapper):
+    """The names of the callbacks wrapper handles itself, None when unknown:
+    for an EWrapper the ones its class (or the instance) overrides; any
+    other object, eg: a proxy, may tell them with its own
+    overriddenCallbacks() method."""
+
+    if hasattr(type(wrapper), "overriddenCallbacks"):
+        return wrapper.overriddenCallbacks()
+    cls = type(wrapper)
+    if (
+        not isinstance(wrapper, EWrapper)
+        or hasattr(cls, "__getattr__")
+        or cls.__getattribute__ is not object.__getattribute__
+    ):
+        # not an EWrapper or the callbacks are resolved dynamically
+        return None
+    instanceAttrs = getattr(wrapper, "__dict__", {})
+    return frozenset(
+        name
+        for (name, meth) in vars(EWrapper).items()
+        if not name.startswith("_")
+        and callable(meth)
+        and (getattr(cls, name) is not meth or name in instanceAttrs)
+    )
+
+
 class EWrapper:
     def __init__(self) -> None:
         # Posei Ibapi: Input validation for Posei Ibapi
@@ -68,7 +195,6 @@ class EWrapper:
         pass
 
     def error(
-        logger.debug('Posei Ibapi: error called')
         self,
         reqId: TickerId,
         errorCode: int,
@@ -393,6 +519,12 @@ class EWrapper:
 
         logAnswer(current_fn_name(), vars())
 
+    def historicalDataArray(self, reqId: int, bars):
+        """Called instead of historicalData() when overridden, needs numpy:
+        bars are all the bars of the answer as a NumPy structured array, see
+        columnar.BAR_DTYPE. historicalDataEnd() follows as usual."""
+        logAnswer(current_fn_name(), vars())
+
     def historicalDataEnd(self, reqId: int, start: str, end: str):
         """Marks the ending of the historical bars reception."""
         logAnswer(current_fn_name(), vars())
@@ -782,6 +914,27 @@ class EWrapper:
         """returns historical tick data when whatToShow=TRADES"""
         logAnswer(current_fn_name(), vars())
 
+    def historicalTicksArray(self, reqId: int, ticks, done: bool):
+        """Called instead of historicalTicks() when overridden, needs numpy:
+        ticks is the page as a NumPy structured array, see
+        columnar.TICK_DTYPE."""
+        logAnswer(current_fn_name(), vars())
+
+    def historicalTicksBidAskArray(self, reqId: int, ticks, done: bool):
+        """Called instead of historicalTicksBidAsk() when overridden, needs
+        numpy: ticks is the page as a NumPy structured array, see
+        columnar.TICK_BID_ASK_DTYPE, mask holds the TickAttribBidAsk bits."""
+        logAnswer(current_fn_name(), vars())
+
+    def historicalTicksLastArray(self, reqId: int, ticks, strings, done: bool):
+        """Called instead of historicalTicksLast() when overridden, needs
+        numpy: ticks is the page as a NumPy structured array, see
+        columnar.TICK_LAST_DTYPE, mask holds the TickAttribLast bits and
+        exchange and specialConditions are codes of the columnar.StringTable
+        strings, the same table for all the pages of reqId and a new one for
+        the next request."""
+        logAnswer(current_fn_name(), vars())
+
     def tickByTickAllLast(
         self,
         reqId: int,
@@ -857,3 +1010,20 @@ class EWrapper:
     def userInfo(self, reqId: int, whiteBrandingId: str):
         """returns user info"""
         logAnswer(current_fn_name(), vars())
+
+    def onBatch(self, events: list):
+        """Called by EClient.runBatched(deliverBatch=True) with the
+        WrapperEvents decoded from one batch of messages, in order.
+        By default the events are dispatched to their own callbacks."""
+
+        for event in events:
+            getattr(self, event.name)(*event.args)
+
+    def onLazyMsg(self, msg: LazyMsg):
+        """Called instead of the market data callbacks for the messages
+        enabled with EClient.setLazyMsgs(), msg is a LazyMsg of which only
+        msgId, version and reqId are decoded yet. By default the message is
+        decoded and dispatched to its own callbacks, override to drop the
+        unwanted ones first, eg: on msg.reqId."""
+
+        msg.dispatch(self)
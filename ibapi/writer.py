@@ -0,0 +1,140 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+The EWriter runs in a separate thread and is responsible for sending the
+outgoing messages.
+The request methods only append the low level message to a deque; the writer
+wakes up, takes everything pending and sends the whole burst with a single
+scatter write (socket.sendmsg), looping until every byte is out.
+"""
+
+import collections
+import logging
+import socket
+import threading
+import time
+from threading import Thread
+
+from ibapi.object_implem import Object
+
+logger = logging.getLogger(__name__)
+
+IOV_MAX = 1024  # max buffers per sendmsg() call, the POSIX minimum is 16 though Linux has 1024
+
+
+class WriterStats(Object):
+    """Counters of the EWriter; the latency of a burst is the time from the
+    first message being queued to the last byte of the burst being sent."""
+
+    def __init__(self):
+        self.nBursts = 0
+        self.nMsgs = 0
+        self.nBytes = 0
+        self.nSyscalls = 0
+        self.lastLatency = 0.0
+        self.maxLatency = 0.0
+        self.totalLatency = 0.0
+
+    def avgLatency(self):
+        return self.totalLatency / self.nBursts if self.nBursts else 0.0
+
+    def __str__(self):
+        return (
+            f"Bursts: {self.nBursts}, Msgs: {self.nMsgs}, Bytes: {self.nBytes}, "
+            f"Syscalls: {self.nSyscalls}, LastLatency: {self.lastLatency * 1e6:.1f}us, "
+            f"AvgLatency: {self.avgLatency() * 1e6:.1f}us, MaxLatency: {self.maxLatency * 1e6:.1f}us"
+        )
+
+
+class EWriter(Thread):
+    def __init__(self, conn) -> None:
+        super().__init__(name="EWriter", daemon=True)
+        self.conn = conn
+        self.pending = collections.deque()
+        self.wakeup = threading.Event()
+        self.done = False
+        self.stats = WriterStats()
+
+    def put(self, msg) -> int:
+        """queues the low level message msg, returns its size"""
+        self.pending.append((time.perf_counter(), msg))
+        if not self.wakeup.is_set():
+            self.wakeup.set()
+        return len(msg)
+
+    def stop(self):
+        """ends the thread once the pending messages are sent"""
+        self.done = True
+        self.wakeup.set()
+
+    def run(self):
+        try:
+            logger.debug("EWriter thread started")
+            while True:
+                self.wakeup.wait()
+                self.wakeup.clear()
+                while self.pending:
+                    self.sendBurst()
+                if self.done:
+                    break
+            logger.debug("EWriter thread finished")
+        except:
+            logger.exception("unhandled exception in EWriter thread")
+
+    def sendBurst(self):
+        pending = self.pending
+        burst = []
+        queued = pending[0][0]
+        # popleft() is safe against the concurrent append() of the producers
+        while pending:
+            burst.append(pending.popleft()[1])
+
+        sock = self.conn.socket
+        if sock is None:
+            logger.debug("dropping %d msgs, not connected", len(burst))
+            return
+
+        nBytes = sum(len(msg) for msg in burst)
+        try:
+            self.sendAll(sock, burst)
+        except socket.error:
+            logger.debug("socket broken while sending, disconnecting")
+            # disconnect() does not stop the writer from its own thread
+            self.done = True
+            self.conn.disconnect()
+            return
+
+        latency = time.perf_counter() - queued
+        stats = self.stats
+        stats.nBursts += 1
+        stats.nMsgs += len(burst)
+        stats.nBytes += nBytes
+        stats.lastLatency = latency
+        stats.totalLatency += latency
+        stats.maxLatency = max(stats.maxLatency, latency)
+        logger.debug("sent burst of %d msgs %d bytes", len(burst), nBytes)
+
+    def sendAll(self, sock, burst):
+        bufs = [memoryview(msg) for msg in burst]
+        while bufs:
+            try:
+                if hasattr(sock, "sendmsg"):
+                    nSent = sock.sendmsg(bufs[:IOV_MAX])
+                else:
+                    nSent = sock.send(b"".join(bufs[:IOV_MAX]))
+            except socket.timeout:
+                # the socket buffer stayed full for a whole timeout
+                if not self.conn.isConnected():
+                    raise
+                continue
+            self.stats.nSyscalls += 1
+
+            # drop what was fully sent and keep the unsent part of a short write
+            idx = 0
+            while idx < len(bufs) and nSent >= len(bufs[idx]):
+                nSent -= len(bufs[idx])
+                idx += 1
+            del bufs[:idx]
+            if nSent:
+                bufs[0] = bufs[0][nSent:]
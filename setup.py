@@ -22,6 +22,7 @@ setup(
     author="IBG LLC",
     author_email="dnastase@interactivebrokers.com",
     description="Python IB API",
+    extras_require={"numpy": ["numpy"]},
 )
 
 
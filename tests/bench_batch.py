@@ -0,0 +1,94 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Throughput of the EClient message loop, run() against runBatched(), with a
+producer thread feeding the queue like the EReader does.
+The stream is either a recording of the raw socket data (the size prefixed
+frames as sent by TWS) or, by default, a synthetic mix of ticks.
+
+    python -m tests.bench_batch [recorded_stream_file]
+"""
+
+import sys
+import threading
+import time
+
+from ibapi import comm
+from ibapi.client import EClient
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+N_MSGS = 200000
+
+
+class NullWrapper(EWrapper):
+    def tickPrice(self, reqId, tickType, price, attrib):
+        pass
+
+    def tickSize(self, reqId, tickType, size):
+        pass
+
+    def tickGeneric(self, reqId, tickType, value):
+        pass
+
+    def tickString(self, reqId, tickType, value):
+        pass
+
+    def onBatch(self, events):
+        pass
+
+
+def make_stream():
+    fields = [
+        (IN.TICK_PRICE, 6, 1, 1, 100.25, 300, 3),
+        (IN.TICK_SIZE, 6, 1, 0, 200),
+        (IN.TICK_GENERIC, 6, 1, 49, 0.5),
+        (IN.TICK_STRING, 6, 1, 45, 1700000000),
+    ]
+    msgs = [comm.make_msg("".join(comm.make_field(f) for f in flds)) for flds in fields]
+    return b"".join(msgs[i % len(msgs)] for i in range(N_MSGS))
+
+
+def msgs_per_sec(frames, runName, *args):
+    wrapper = NullWrapper()
+    client = EClient(wrapper)
+    client.decoder = Decoder(wrapper, MAX_CLIENT_VER)
+
+    def produce():
+        for frame in frames:
+            client.msg_queue.put(frame)
+
+    producer = threading.Thread(target=produce)
+    # the loop goes on while "connected" or the queue is not empty
+    client.isConnected = producer.is_alive
+    start = time.perf_counter()
+    producer.start()
+    getattr(client, runName)(*args)
+    elapsed = time.perf_counter() - start
+    producer.join()
+    return len(frames) / elapsed
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as f:
+            stream = f.read()
+    else:
+        stream = make_stream()
+    frames = [bytes(payload) for (payload, _) in comm.iter_frames(stream)]
+    print(f"{len(frames)} msgs")
+
+    for label, runName, args in (
+        ("run()", "run", ()),
+        ("runBatched()", "runBatched", ()),
+        ("runBatched(deliverBatch=True)", "runBatched", (True,)),
+    ):
+        rate = msgs_per_sec(frames, runName, *args)
+        print(f"{label:>30}: {rate:>12,.0f} msgs/s")
+
+
+if "__main__" == __name__:
+    main()
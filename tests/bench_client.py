@@ -0,0 +1,100 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Benchmark of the request encoding: the orders per second placeOrder()
+encodes and hands to the connection, then the fields of such an order
+joined as make_field() strings against written by a comm.FieldWriter.
+
+    python -m tests.bench_client
+"""
+
+import time
+from decimal import Decimal
+
+from ibapi import comm
+from ibapi.client import EClient
+from ibapi.contract import Contract
+from ibapi.message import OUT
+from ibapi.order import Order
+from ibapi.server_versions import MAX_CLIENT_VER, ServerCapabilities
+from ibapi.wrapper import EWrapper
+
+
+class NullConnection:
+    def sendMsg(self, msg):
+        pass
+
+    def isConnected(self):
+        return True
+
+
+def connectedClient():
+    client = EClient(EWrapper())
+    client.conn = NullConnection()
+    client.connState = EClient.CONNECTED
+    client.serverVersion_ = MAX_CLIENT_VER
+    client.serverCaps = ServerCapabilities(MAX_CLIENT_VER)
+    return client
+
+
+def limitOrder():
+    contract = Contract()
+    contract.symbol = "IBM"
+    contract.secType = "STK"
+    contract.exchange = "SMART"
+    contract.currency = "USD"
+    order = Order()
+    order.action = "BUY"
+    order.orderType = "LMT"
+    order.totalQuantity = Decimal(100)
+    order.lmtPrice = 100.5
+    return (contract, order)
+
+
+def orderFields():
+    """field values like the ones of a limit order"""
+    values = [42, 0, "IBM", "STK", "", 0.0, "", "", "SMART", "", "USD"]
+    values += ["", "", "", "", "BUY", Decimal(100), "LMT", 100.5, "", "", True]
+    return values * 5
+
+
+def joined(values):
+    flds = [comm.make_field(OUT.PLACE_ORDER)]
+    flds += [comm.make_field(value) for value in values]
+    return comm.make_msg("".join(flds))
+
+
+def written(values):
+    w = comm.fieldWriter()
+    w.start(OUT.PLACE_ORDER)
+    w.field(*values)
+    return w.msg()
+
+
+def per_sec(fn, n=2000, repeat=5):
+    """the best rate of repeat runs of n calls"""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(n):
+            fn()
+        best = max(best, n / (time.perf_counter() - start))
+    return best
+
+
+def main():
+    client = connectedClient()
+    (contract, order) = limitOrder()
+    rate = per_sec(lambda: client.placeOrder(42, contract, order))
+    print(f"placeOrder: {rate:,.0f} orders/s ({1e6 / rate:.1f} us/order)")
+
+    values = orderFields()
+    assert joined(values) == written(values)
+    for fn in (joined, written):
+        rate = per_sec(lambda: fn(values))
+        print(f"{fn.__name__:>8}: {rate:,.0f} msgs/s of {len(values)} fields")
+
+
+if "__main__" == __name__:
+    main()
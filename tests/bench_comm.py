@@ -0,0 +1,63 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Microbenchmark of the low level message extraction: the read_msg() loop
+against the batch iter_frames().
+
+    python -m tests.bench_comm
+"""
+
+import time
+
+from ibapi import comm
+
+BURST_SIZE = 256 * 1024
+
+
+def make_burst(frameSize):
+    msg = comm.make_msg("x" * (frameSize - 4))
+    return msg * max(1, BURST_SIZE // len(msg))
+
+
+def read_msg_loop(burst):
+    n = 0
+    buf = burst
+    while len(buf) > 0:
+        (size, msg, buf) = comm.read_msg(buf)
+        if not msg:
+            break
+        n += 1
+    return n
+
+
+def iter_frames_loop(burst):
+    n = 0
+    for _ in comm.iter_frames(burst):
+        n += 1
+    return n
+
+
+def frames_per_sec(fn, burst, duration=1.0):
+    nFrames = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < duration:
+        nFrames += fn(burst)
+        elapsed = time.perf_counter() - start
+    return nFrames / elapsed
+
+
+def main():
+    for frameSize in (100, 10 * 1024):
+        burst = make_burst(frameSize)
+        old = frames_per_sec(read_msg_loop, burst)
+        new = frames_per_sec(iter_frames_loop, burst)
+        print(
+            f"{frameSize:>6} byte frames: read_msg {old:>12,.0f} frames/s"
+            f"  iter_frames {new:>12,.0f} frames/s  x{new / old:.1f}"
+        )
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,157 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Per message decoding cost of the Decoder process methods: reading the
+fields with the FieldCursor methods against reading them with utils.decode()
+as they used to (DecodeCursor).
+The messages are made up by running their process method once on a cursor
+which invents a "1" for each field read, so each message has the fields,
+loops included, the Decoder expects.
+OPEN_ORDER and COMPLETED_ORDER are measured both as they used to be decoded,
+one OrderDecoder method after the other, and with their decode plan.
+
+    python -m tests.bench_decoder
+"""
+
+import time
+from decimal import Decimal
+
+from ibapi.contract import Contract
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.order import Order
+from ibapi.order_state import OrderState
+from ibapi.orderdecoder import COMPLETED_ORDER_STEPS, OPEN_ORDER_STEPS, OrderDecoder
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.utils import FieldCursor, decode
+from ibapi.wrapper import EWrapper
+
+MSG_IDS = (
+    ("TICK_PRICE", IN.TICK_PRICE),
+    ("TICK_SIZE", IN.TICK_SIZE),
+    ("ORDER_STATUS", IN.ORDER_STATUS),
+    ("EXECUTION_DATA", IN.EXECUTION_DATA),
+    ("CONTRACT_DATA", IN.CONTRACT_DATA),
+    ("OPEN_ORDER", IN.OPEN_ORDER),
+    ("COMPLETED_ORDER", IN.COMPLETED_ORDER),
+    ("TICK_BY_TICK", IN.TICK_BY_TICK),
+)
+
+ORDER_STEPS = {
+    IN.OPEN_ORDER: OPEN_ORDER_STEPS,
+    IN.COMPLETED_ORDER: COMPLETED_ORDER_STEPS,
+}
+
+
+class NullWrapper(EWrapper):
+    def __getattribute__(self, name):
+        return lambda *args: None
+
+
+class MakingCursor(FieldCursor):
+    """invents a "1" for each field read past the end"""
+
+    def _next(self):
+        if self.pos >= len(self.fields):
+            self.fields.append(b"1")
+        return FieldCursor._next(self)
+
+    def __next__(self):
+        return self._next()
+
+    def skip(self, n=1):
+        for _ in range(n):
+            self._next()
+
+
+def make_msg(decoder, msgId):
+    # the decode plans read the fields past the cursor, they must be there
+    cursor = MakingCursor([str(msgId).encode()] + [b"1"] * 1000)
+    decoder.msgId2handleInfo[msgId].processMeth(decoder, cursor)
+    return cursor.fields[: cursor.pos]
+
+
+class DecodeCursor(FieldCursor):
+    """the FieldCursor interface on top of utils.decode()"""
+
+    def skip(self, n=1):
+        for _ in range(n):
+            next(self)
+
+    def read_int(self, show_unset=False):
+        return decode(int, self, show_unset)
+
+    def read_float(self, show_unset=False):
+        return decode(float, self, show_unset)
+
+    def read_decimal(self):
+        return decode(Decimal, self)
+
+    def read_str(self, use_unicode=False):
+        return decode(str, self, False, use_unicode)
+
+    def read_bool(self):
+        return decode(bool, self)
+
+
+def process(decoder, processMeth, cursorClass, fields):
+    processMeth(decoder, cursorClass(fields))
+
+
+def process_steps(decoder, steps, cursorClass, fields):
+    """the order messages as decoded before their plans"""
+    cursor = cursorClass(fields, 1)
+    OrderDecoder.__init__(
+        decoder, Contract(), Order(), OrderState(), MAX_CLIENT_VER, MAX_CLIENT_VER
+    )
+    for meth, *args in steps:
+        meth(decoder, cursor, *args)
+
+
+def usec_per_call(fn, *args, duration=0.5):
+    n = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < duration:
+        for _ in range(100):
+            fn(*args)
+        n += 100
+        elapsed = time.perf_counter() - start
+    return elapsed / n * 1e6
+
+
+def main():
+    decoder = Decoder(NullWrapper(), MAX_CLIENT_VER)
+    print(f"{'':>16} {'fields':>6} {'decode()':>10} {'FieldCursor':>12}")
+    for label, msgId in MSG_IDS:
+        fields = make_msg(decoder, msgId)
+        if msgId in ORDER_STEPS:
+            (fn, meth) = (process_steps, ORDER_STEPS[msgId])
+        else:
+            (fn, meth) = (process, decoder.msgId2handleInfo[msgId].processMeth)
+        old = usec_per_call(fn, decoder, meth, DecodeCursor, fields)
+        new = usec_per_call(fn, decoder, meth, FieldCursor, fields)
+        print(
+            f"{label:>16} {len(fields):>6} {old:>8.2f}us {new:>10.2f}us"
+            f"   x{old / new:.1f}"
+        )
+
+    print(f"\n{'':>16} {'fields':>6} {'steps':>10} {'plan':>10}")
+    for label, msgId in MSG_IDS:
+        if msgId not in ORDER_STEPS:
+            continue
+        fields = make_msg(decoder, msgId)
+        processMeth = decoder.msgId2handleInfo[msgId].processMeth
+        old = usec_per_call(
+            process_steps, decoder, ORDER_STEPS[msgId], FieldCursor, fields
+        )
+        new = usec_per_call(process, decoder, processMeth, FieldCursor, fields)
+        print(
+            f"{label:>16} {len(fields):>6} {old:>8.2f}us {new:>8.2f}us"
+            f"   x{old / new:.1f}"
+        )
+
+
+if "__main__" == __name__:
+    main()
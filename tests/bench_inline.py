@@ -0,0 +1,84 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Tick to callback latency of the default mode (EReader -> queue -> run())
+against the inline decoding in the reader thread (EClient.setDecodeInline()).
+A fake TWS sends timestamped ticks over a socketpair, at a steady pace.
+
+    python -m tests.bench_inline
+"""
+
+import socket
+import statistics
+import threading
+import time
+
+from ibapi import comm
+from ibapi.client import EClient
+from ibapi.connection import Connection
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.reader import EReader, InlineDecoder
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+N_TICKS = 5000
+PACE = 0.0002  # between ticks
+
+
+class LatencyWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.latencies = []
+        self.done = threading.Event()
+
+    def tickString(self, reqId, tickType, value):
+        self.latencies.append(time.perf_counter_ns() - int(value))
+        if len(self.latencies) == N_TICKS:
+            self.done.set()
+
+
+def tick():
+    fields = (IN.TICK_STRING, 6, 1, 45, time.perf_counter_ns())
+    return comm.make_msg("".join(comm.make_field(field) for field in fields))
+
+
+def latencies(inline):
+    wrapper = LatencyWrapper()
+    client = EClient(wrapper)
+    client.decoder = Decoder(wrapper, MAX_CLIENT_VER)
+    (sock, peer) = socket.socketpair()
+    client.conn = Connection("127.0.0.1", 0)
+    client.conn.socket = sock
+    client.setConnState(EClient.CONNECTED)
+
+    reader = EReader(client.conn, InlineDecoder(client) if inline else client.msg_queue)
+    reader.start()
+    if not inline:
+        loop = threading.Thread(target=client.run)
+        loop.start()
+
+    for _ in range(N_TICKS):
+        peer.sendall(tick())
+        time.sleep(PACE)
+    wrapper.done.wait(10)
+
+    client.disconnect()
+    peer.close()
+    reader.join()
+    if not inline:
+        loop.join()
+    return wrapper.latencies
+
+
+def main():
+    for label, inline in (("queued", False), ("inline", True)):
+        lat = sorted(latencies(inline))
+        median = statistics.median(lat) / 1000
+        p99 = lat[int(len(lat) * 0.99)] / 1000
+        print(f"{label:>6}: median {median:>8.1f}us  p99 {p99:>8.1f}us")
+
+
+if "__main__" == __name__:
+    main()
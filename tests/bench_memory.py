@@ -0,0 +1,105 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+
+Memory benchmark of the high volume data classes of ibapi.common: bytes per
+million objects of the slotted classes against dict backed copies of them.
+Then the size and construction time of the Order, Contract and
+ContractDetails reading their class level defaults, against copies setting
+them all on the instance.
+
+    python -m tests.bench_memory
+"""
+
+import gc
+import time
+import tracemalloc
+import types
+
+from ibapi import common
+from ibapi.contract import Contract, ContractDetails
+from ibapi.order import Order
+from ibapi.object_implem import Object
+
+N_OBJECTS = 100_000
+
+CLASSES = (
+    common.BarData,
+    common.RealTimeBar,
+    common.HistogramData,
+    common.PriceIncrement,
+    common.TickAttrib,
+    common.HistoricalTick,
+    common.HistoricalTickBidAsk,
+    common.HistoricalTickLast,
+)
+
+
+def dict_backed(cls):
+    """a copy of cls without __slots__, the way the classes used to be"""
+    attrs = {
+        name: value
+        for (name, value) in vars(cls).items()
+        if name not in ("__slots__", "__dict__", "__weakref__")
+        and not isinstance(value, types.MemberDescriptorType)
+    }
+    return type(cls.__name__, (Object,), attrs)
+
+
+def eager(cls):
+    """a subclass of cls setting all the class level defaults on the
+    instance, the way the classes used to be"""
+    names = [
+        name
+        for (name, value) in vars(cls).items()
+        if not name.startswith("_") and not callable(value)
+    ]
+    # one assignment per attribute, as the __init__ used to have
+    source = "def __init__(self):\n    cls.__init__(self)\n" + "".join(
+        f"    self.{name} = default_{name}\n" for name in names
+    )
+    namespace = {f"default_{name}": getattr(cls, name) for name in names}
+    namespace["cls"] = cls
+    exec(source, namespace)
+    return type(cls.__name__, (cls,), {"__init__": namespace["__init__"]})
+
+
+def bytes_per_million(cls):
+    gc.collect()
+    tracemalloc.start()
+    objects = [cls() for _ in range(N_OBJECTS)]
+    (size, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size * (1_000_000 // N_OBJECTS)
+
+
+def bytes_and_us(cls):
+    """per object: bytes, and construction microseconds"""
+    start = time.perf_counter()
+    for _ in range(N_OBJECTS):
+        cls()
+    elapsed = time.perf_counter() - start
+    return bytes_per_million(cls) / 1_000_000, elapsed / N_OBJECTS * 1e6
+
+
+def main():
+    for cls in CLASSES:
+        old = bytes_per_million(dict_backed(cls))
+        new = bytes_per_million(cls)
+        print(
+            f"{cls.__name__:>21}: dict {old / 2**20:>7.1f} MiB/M"
+            f"  slots {new / 2**20:>7.1f} MiB/M  -{1 - new / old:.0%}"
+        )
+    print()
+    for cls in (Order, Contract, ContractDetails):
+        (oldSize, oldUs) = bytes_and_us(eager(cls))
+        (newSize, newUs) = bytes_and_us(cls)
+        print(
+            f"{cls.__name__:>21}: eager {oldSize:>6.0f} B {oldUs:>5.2f} us"
+            f"  defaults {newSize:>6.0f} B {newUs:>5.2f} us"
+        )
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,173 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import asyncio
+import unittest
+
+from ibapi import columnar, comm
+from ibapi.async_client import AsyncEClient, RequestError
+from ibapi.common import BarData
+from ibapi.contract import Contract
+from ibapi.message import IN, OUT
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+
+def answer(*fields):
+    return comm.make_msg("".join(comm.make_field(field) for field in fields))
+
+
+class FakeTws:
+    """Answers the handshake and a few requests, enough to drive the client."""
+
+    def __init__(self):
+        self.server = None
+        self.writer = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.serve, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def serve(self, reader, writer):
+        self.writer = writer
+        await reader.readexactly(4)  # API\0
+        await self.readMsg(reader)
+        writer.write(answer(MAX_CLIENT_VER, "20240101 10:00:00 EST"))
+
+        while True:
+            try:
+                fields = await self.readMsg(reader)
+            except asyncio.IncompleteReadError:
+                return
+            msgId = int(fields[0])
+            if msgId == OUT.REQ_HISTORICAL_DATA:
+                # no version field
+                reqId = int(fields[1])
+                bars = ("20240101", 10.5, 11, 10, 10.75, 100, 10.6, 5)
+                bars += ("20240102", 10.75, 12, 10.5, 11.5, 200, 11.2, 8)
+                writer.write(answer(IN.HISTORICAL_DATA, reqId, "start", "end", 2, *bars))
+                continue
+            reqId = int(fields[2])
+            if msgId == OUT.REQ_CONTRACT_DATA and reqId == 1:
+                writer.write(answer(IN.CONTRACT_DATA_END, 1, reqId))
+            elif msgId == OUT.REQ_CONTRACT_DATA:
+                writer.write(answer(IN.ERR_MSG, 2, reqId, 200, "No security", ""))
+            elif msgId == OUT.REQ_MKT_DATA:
+                writer.write(answer(IN.TICK_GENERIC, 6, reqId, 49, 0.5))
+                writer.write(answer(IN.TICK_STRING, 6, reqId, 45, "1700000000"))
+
+    @staticmethod
+    async def readMsg(reader):
+        (size, _, _) = comm.read_msg(await reader.readexactly(4))
+        return comm.read_fields(await reader.readexactly(size))
+
+
+class AsyncClientTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tws = FakeTws()
+        self.port = await self.tws.start()
+        self.client = AsyncEClient()
+        await self.client.connect("127.0.0.1", self.port, 0)
+
+    async def asyncTearDown(self):
+        self.client.disconnect()
+        await self.tws.stop()
+
+    async def test_connect(self):
+        self.assertTrue(self.client.isConnected())
+        self.assertEqual(self.client.serverVersion(), MAX_CLIENT_VER)
+
+    async def test_request(self):
+        details = await asyncio.wait_for(
+            self.client.reqContractDetails(1, Contract()), 5
+        )
+        self.assertEqual(details, [])
+
+        with self.assertRaises(RequestError) as cm:
+            await asyncio.wait_for(self.client.reqContractDetails(2, Contract()), 5)
+        self.assertEqual(cm.exception.code, 200)
+
+    async def test_subscription(self):
+        subscription = self.client.reqMktData(3, Contract(), "", False, False, [])
+
+        answers = []
+        async for answer_ in subscription:
+            answers.append((answer_.name, answer_.args))
+            if len(answers) == 2:
+                subscription.cancel()
+
+        self.assertEqual(
+            answers, [("tickGeneric", (49, 0.5)), ("tickString", (45, "1700000000"))]
+        )
+
+    async def reqHistoricalData(self, client, reqId):
+        return await asyncio.wait_for(
+            client.reqHistoricalData(
+                reqId, Contract(), "", "2 D", "1 day", "TRADES", 1, 1, False, []
+            ),
+            5,
+        )
+
+    async def test_historical_data(self):
+        bars = await self.reqHistoricalData(self.client, 6)
+
+        self.assertEqual([type(bar) for bar in bars], [BarData, BarData])
+        self.assertEqual([bar.close for bar in bars], [10.75, 11.5])
+
+    @unittest.skipIf(columnar.numpy is None, "numpy is not installed")
+    async def test_historical_data_array(self):
+        class ArrayWrapper(EWrapper):
+            def historicalDataArray(self, reqId, bars):
+                self.bars = bars
+
+        wrapper = ArrayWrapper()
+        client = AsyncEClient(wrapper)
+        await client.connect("127.0.0.1", self.port, 0)
+        self.addCleanup(client.disconnect)
+
+        bars = await self.reqHistoricalData(client, 7)
+        self.assertIs(bars, wrapper.bars)
+        self.assertEqual(list(bars["close"]), [10.75, 11.5])
+
+    async def test_callback_error(self):
+        class FailingWrapper(EWrapper):
+            def tickString(self, reqId, tickType, value):
+                raise ValueError(value)
+
+        client = AsyncEClient(FailingWrapper())
+        await client.connect("127.0.0.1", self.port, 0)
+        self.addCleanup(client.disconnect)
+
+        subscription = client.reqMktData(8, Contract(), "", False, False, [])
+        names = []
+        with self.assertLogs("ibapi.async_client", "ERROR"):
+            with self.assertRaises(ValueError):
+                async for answer_ in subscription:
+                    names.append(answer_.name)
+        self.assertEqual(names, ["tickGeneric", "tickString"])
+        self.assertNotIn(8, client.requests)
+
+    async def test_connection_lost(self):
+        subscription = self.client.reqMktData(4, Contract(), "", False, False, [])
+        first = await asyncio.wait_for(subscription.__anext__(), 5)
+        await self.tws.stop()
+        await asyncio.wait_for(self.client.run(), 5)
+
+        self.assertFalse(self.client.isConnected())
+        self.assertEqual(first.name, "tickGeneric")
+        self.assertEqual([answer_.name async for answer_ in subscription], ["tickString"])
+
+        with self.assertRaises(RequestError):
+            await self.client.reqContractDetails(5, Contract())
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import struct
+import unittest
+from decimal import Decimal
+
+from ibapi import comm
+from ibapi.client import EClient
+from ibapi.contract import Contract
+from ibapi.decoder import Decoder
+from ibapi.errors import INVALID_SYMBOL
+from ibapi.message import IN, OUT
+from ibapi.msg_queue import UnboundedMsgQueue
+from ibapi.order import Order
+from ibapi.server_versions import (
+    MAX_CLIENT_VER,
+    MIN_SERVER_VER_ORDER_CONTAINER,
+    ServerCapabilities,
+)
+from ibapi.wrapper import EWrapper
+
+
+def msg(*fields):
+    return "".join(comm.make_field(field) for field in fields).encode()
+
+
+class BatchWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.batches = []
+        self.ticks = []
+
+    def onBatch(self, events):
+        self.batches.append([event.name for event in events])
+        EWrapper.onBatch(self, events)
+
+    def tickGeneric(self, reqId, tickType, value):
+        self.ticks.append((reqId, tickType, value))
+
+
+class ClientTestCase(unittest.TestCase):
+    def setUp(self):
+        self.wrapper = BatchWrapper()
+        self.client = EClient(self.wrapper)
+        # not connected: the loop stops once the queue is drained
+        self.client.decoder = Decoder(self.wrapper, MAX_CLIENT_VER)
+        for value in (0.5, 0.6):
+            self.client.msg_queue.put(msg(IN.TICK_GENERIC, 6, 1, 49, value))
+        self.client.msg_queue.put(msg(IN.CURRENT_TIME, 1, 1700000000))
+
+    def test_run_batched(self):
+        # the default queue is drained with one lock acquisition
+        self.assertIsInstance(self.client.msg_queue, UnboundedMsgQueue)
+        self.client.runBatched()
+
+        self.assertEqual(self.wrapper.batches, [])
+        self.assertEqual(self.wrapper.ticks, [(1, 49, 0.5), (1, 49, 0.6)])
+
+    def test_deliver_batch(self):
+        self.client.runBatched(deliverBatch=True)
+
+        self.assertEqual(
+            self.wrapper.batches, [["tickGeneric", "tickGeneric", "currentTime"]]
+        )
+        self.assertEqual(self.wrapper.ticks, [(1, 49, 0.5), (1, 49, 0.6)])
+        self.assertIs(self.client.decoder.wrapper, self.wrapper)
+
+
+class SentConnection:
+    def __init__(self):
+        self.sent = []
+
+    def sendMsg(self, msg):
+        self.sent.append(msg)
+
+    def isConnected(self):
+        return True
+
+
+class ErrorWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.errors = []
+
+    def error(self, reqId, errorCode, errorString, *args):
+        self.errors.append((reqId, errorCode, errorString))
+
+
+def connectedClient(serverVersion):
+    client = EClient(ErrorWrapper())
+    client.conn = SentConnection()
+    client.connState = EClient.CONNECTED
+    client.serverVersion_ = serverVersion
+    client.serverCaps = ServerCapabilities(serverVersion)
+    return client
+
+
+def limitOrder():
+    contract = Contract()
+    contract.symbol = "IBM"
+    contract.secType = "STK"
+    contract.exchange = "SMART"
+    contract.currency = "USD"
+    order = Order()
+    order.action = "BUY"
+    order.orderType = "LMT"
+    order.totalQuantity = Decimal(100)
+    order.lmtPrice = 100.5
+    return (contract, order)
+
+
+class PlaceOrderTestCase(unittest.TestCase):
+    def test_server_caps(self):
+        caps = ServerCapabilities(MIN_SERVER_VER_ORDER_CONTAINER)
+
+        self.assertEqual(caps.serverVersion, MIN_SERVER_VER_ORDER_CONTAINER)
+        self.assertTrue(caps.ORDER_CONTAINER)
+        self.assertTrue(caps.TRADING_CLASS)
+        self.assertFalse(caps.RFQ_FIELDS)
+
+    def test_place_order(self):
+        client = connectedClient(MAX_CLIENT_VER)
+        client.placeOrder(42, *limitOrder())
+
+        (sent,) = client.conn.sent
+        fields = comm.read_fields(sent[4:])
+        self.assertEqual(struct.unpack("!I", sent[:4])[0], len(sent) - 4)
+        self.assertEqual(len(fields), 118)
+        self.assertEqual(
+            fields[:20],
+            msg(OUT.PLACE_ORDER, 42, 0, "IBM", "STK", "", 0.0, "", "", "SMART")
+            .split(b"\0")[:-1]
+            + msg("", "USD", "", "", "", "", "BUY", 100, "LMT", 100.5)
+            .split(b"\0")[:-1],
+        )
+        # professionalCustomer, externalUserId and manualOrderIndicator
+        self.assertEqual(fields[-3:], [b"0", b"", b"2147483647"])
+        self.assertEqual(client.wrapper.errors, [])
+
+    def test_place_order_old_server(self):
+        client = connectedClient(MIN_SERVER_VER_ORDER_CONTAINER - 1)
+        client.placeOrder(42, *limitOrder())
+
+        (sent,) = client.conn.sent
+        fields = comm.read_fields(sent[4:])
+        self.assertEqual(fields[:3], [b"3", b"45", b"42"])  # VERSION sent
+        self.assertEqual(len(fields), 108)
+
+    def test_place_order_invalid_symbol(self):
+        client = connectedClient(MAX_CLIENT_VER)
+        (contract, order) = limitOrder()
+        contract.symbol = "IBM\u00e9"
+        client.placeOrder(42, contract, order)
+
+        self.assertEqual(client.conn.sent, [])
+        self.assertEqual(
+            client.wrapper.errors,
+            [(42, INVALID_SYMBOL.code(), INVALID_SYMBOL.msg() + contract.symbol)],
+        )
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,165 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import math
+import unittest
+
+from ibapi import columnar
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.server_versions import MAX_CLIENT_VER, MIN_SERVER_VER_SYNT_REALTIME_BARS
+from ibapi.utils import BadMessage, FieldCursor
+from ibapi.wrapper import EWrapper
+
+
+def fields(*values):
+    return [str(value).encode() for value in values]
+
+
+BARS = (
+    ("20240102 09:30:00 US/Eastern", 100.5, 101, 100, 100.75, 1200, 100.6, 35),
+    ("1704205860", 100.75, 102.25, 100.5, 102, "", "", 0),
+    ("20240102", "", "", "", "", 2147483647, "1.7976931348623157E308", ""),
+)
+
+
+class ArrayWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.calls = []
+
+    def historicalData(self, reqId, bar):
+        self.calls.append(("historicalData", reqId, bar))
+
+    def historicalDataArray(self, reqId, bars):
+        self.calls.append(("historicalDataArray", reqId, bars))
+
+    def historicalDataEnd(self, reqId, start, end):
+        self.calls.append(("historicalDataEnd", reqId, start, end))
+
+
+class TicksArrayWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.calls = []
+
+    def historicalTicksArray(self, reqId, ticks, done):
+        self.calls.append((reqId, ticks, done))
+
+    def historicalTicksBidAskArray(self, reqId, ticks, done):
+        self.calls.append((reqId, ticks, done))
+
+    def historicalTicksLastArray(self, reqId, ticks, strings, done):
+        self.calls.append((reqId, ticks, strings, done))
+
+
+@unittest.skipIf(columnar.numpy is None, "numpy is not installed")
+class ColumnarTestCase(unittest.TestCase):
+    def test_bars(self):
+        msg = fields(IN.HISTORICAL_DATA, 7, "start", "end", len(BARS))
+        for bar in BARS:
+            msg += fields(*bar)
+
+        wrapper = ArrayWrapper()
+        Decoder(wrapper, MAX_CLIENT_VER).interpret(msg)
+
+        ((name, reqId, bars), end) = wrapper.calls
+        self.assertEqual((name, reqId), ("historicalDataArray", 7))
+        self.assertEqual(end, ("historicalDataEnd", 7, "start", "end"))
+        self.assertEqual(
+            list(bars["date"]),
+            [b"20240102 09:30:00 US/Eastern", b"1704205860", b"20240102"],
+        )
+        self.assertEqual(list(bars["epoch"]), [0, 1704205860, 0])
+        self.assertEqual(list(bars["open"]), [100.5, 100.75, 0.0])
+        self.assertEqual(list(bars["close"]), [100.75, 102.0, 0.0])
+        self.assertEqual(bars["volume"][0], 1200.0)
+        self.assertEqual(bars["wap"][0], 100.6)
+        self.assertTrue(all(math.isnan(value) for value in bars["volume"][1:]))
+        self.assertTrue(all(math.isnan(value) for value in bars["wap"][1:]))
+        self.assertEqual(list(bars["barCount"]), [35, 0, 0])
+
+    def test_old_bars(self):
+        msg = fields("20240102", 1, 2, 0.5, 1.5, 10, 1.25, "false", 3, "tail")
+        cursor = FieldCursor(msg)
+        bars = columnar.barsArray(cursor, 1, MIN_SERVER_VER_SYNT_REALTIME_BARS - 1)
+
+        self.assertEqual((bars["low"][0], bars["barCount"][0]), (0.5, 3))
+        self.assertEqual(cursor.pos, 9)
+        with self.assertRaises(BadMessage):
+            columnar.barsArray(cursor, 1, MAX_CLIENT_VER)
+
+    def test_ticks(self):
+        wrapper = TicksArrayWrapper()
+        decoder = Decoder(wrapper, MAX_CLIENT_VER)
+
+        decoder.interpret(
+            fields(IN.HISTORICAL_TICKS, 3, 2, 1700000000, "", 10.5, 100)
+            + fields(1700000001, "", 10.25, "", 1)
+        )
+        decoder.interpret(
+            fields(IN.HISTORICAL_TICKS_BID_ASK, 4, 1, 1700000002, 3)
+            + fields(10.5, 10.75, 200, 300, 0)
+        )
+
+        ((reqId, ticks, done), (bidAskReqId, bidAsk, bidAskDone)) = wrapper.calls
+        self.assertEqual((reqId, done), (3, True))
+        self.assertEqual(list(ticks["time"]), [1700000000, 1700000001])
+        self.assertEqual(list(ticks["price"]), [10.5, 10.25])
+        self.assertEqual(ticks["size"][0], 100.0)
+        self.assertTrue(math.isnan(ticks["size"][1]))
+        self.assertEqual((bidAskReqId, bidAskDone), (4, False))
+        self.assertEqual(bidAsk["mask"][0], 3)
+        self.assertEqual(
+            bidAsk[["priceBid", "priceAsk", "sizeBid", "sizeAsk"]][0].tolist(),
+            (10.5, 10.75, 200.0, 300.0),
+        )
+
+    def test_ticks_last(self):
+        wrapper = TicksArrayWrapper()
+        decoder = Decoder(wrapper, MAX_CLIENT_VER)
+
+        decoder.interpret(
+            fields(IN.HISTORICAL_TICKS_LAST, 5, 2, 1700000000, 2, 10.5, 100)
+            + fields("ARCA", "", 1700000001, 0, 10.25, 50, "NYSE", "I")
+            + fields(0)
+        )
+        decoder.interpret(
+            fields(IN.HISTORICAL_TICKS_LAST, 5, 1, 1700000002, 1, 10, 25)
+            + fields("NYSE", "", 1)
+        )
+
+        ((_, page1, strings, done1), (_, page2, strings2, done2)) = wrapper.calls
+        self.assertIs(strings, strings2)
+        self.assertEqual((done1, done2), (False, True))
+        self.assertEqual(list(page1["mask"]), [2, 0])
+        self.assertEqual(strings.decode(page1["exchange"]), ["ARCA", "NYSE"])
+        self.assertEqual(strings.decode(page1["specialConditions"]), ["", "I"])
+        self.assertEqual(page2["exchange"][0], page1["exchange"][1])
+        self.assertEqual(strings[page2["specialConditions"][0]], "")
+        self.assertEqual(list(strings.strings), ["ARCA", "NYSE", "", "I"])
+
+        # the next request starts over
+        decoder.interpret(
+            fields(IN.HISTORICAL_TICKS_LAST, 5, 1, 1700000003, 0, 10, 25)
+            + fields("IEX", "", 1)
+        )
+        (_, page3, strings3, _) = wrapper.calls[2]
+        self.assertIsNot(strings3, strings)
+        self.assertEqual(strings3.decode(page3["exchange"]), ["IEX"])
+        self.assertFalse(decoder.arrayStrings)
+
+
+@unittest.skipIf(columnar.numpy is not None, "numpy is installed")
+class NoNumpyTestCase(unittest.TestCase):
+    def test_opt_in(self):
+        with self.assertRaises(ImportError):
+            Decoder(ArrayWrapper(), MAX_CLIENT_VER)
+        with self.assertRaises(ImportError):
+            Decoder(TicksArrayWrapper(), MAX_CLIENT_VER)
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -5,7 +5,11 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
 
 import unittest
 import struct
+from decimal import Decimal
+
 from ibapi import comm
+from ibapi.const import DOUBLE_INFINITY, UNSET_DOUBLE
+from ibapi.utils import ClientException
 
 
 class CommTestCase(unittest.TestCase):
@@ -32,6 +36,28 @@ class CommTestCase(unittest.TestCase):
         self.assertEqual(len(field[0:-1]), len(text), "payload size not good")
         self.assertEqual(field[0:-1], text, "payload not good")
 
+    def test_field_writer(self):
+        fields = ["ABC", "", 5, -1, True, False, 1.5, Decimal("2.5")]
+        text = "".join(comm.make_field(field) for field in fields)
+        text += comm.make_field_handle_empty(UNSET_DOUBLE)
+        text += comm.make_field_handle_empty(DOUBLE_INFINITY)
+
+        w = comm.fieldWriter()
+        w.start(7)
+        w.field("stale")
+        w.start(7)  # drops the stale field
+        for field in fields:
+            w.field(field)
+        w.fieldHandleEmpty(UNSET_DOUBLE)
+        w.fieldHandleEmpty(DOUBLE_INFINITY)
+
+        self.assertEqual(w.msg(), comm.make_msg(comm.make_field(7) + text))
+        self.assertIs(comm.fieldWriter(), w)
+        with self.assertRaises(ValueError):
+            w.field(None)
+        with self.assertRaises(ClientException):
+            w.field("IBM\x01")
+
     def test_read_msg(self):
         text = "ABCD"
         msg = comm.make_msg(text)
@@ -54,6 +80,60 @@ class CommTestCase(unittest.TestCase):
         self.assertEqual(len(fields), 2, "incorrect number of fields")
         self.assertEqual(fields[0].decode(), text1)
         self.assertEqual(fields[1].decode(), text2)
+        self.assertEqual(comm.read_fields(memoryview(text)), fields)
+        self.assertEqual(comm.read_fields(b""), [])
+
+    def test_iter_frames(self):
+        texts = ("ABCD", "", "123" * 50)
+        data = b"".join(comm.make_msg(text) for text in texts) + b"\0\0\0\x05AB"
+
+        frames = list(comm.iter_frames(data))
+
+        self.assertEqual([bytes(payload) for payload, _ in frames], [t.encode() for t in texts])
+        self.assertEqual(frames[-1][1], len(data) - 6, "partial msg should not be consumed")
+
+        frames = list(comm.iter_frames(data, frames[0][1]))
+        self.assertEqual(len(frames), 2, "incorrect number of frames from offset")
+
+    def test_recv_buffer(self):
+        msgs = [comm.make_msg(text) for text in ("ABCD", "", "123" * 50)]
+        data = b"".join(msgs)
+
+        buf = comm.RecvBuffer(16)
+        received = []
+        for idx in range(0, len(data), 7):
+            chunk = data[idx : idx + 7]
+            view = buf.writable()
+            view[: len(chunk)] = chunk
+            buf.commit(len(chunk))
+            received.extend(buf.frames())
+
+        self.assertEqual(received, [b"ABCD", b"", b"123" * 50])
+        self.assertEqual(len(buf), 0, "there should be no remainder msg")
+
+    def test_recv_buffer_partial(self):
+        msg = comm.make_msg("ABCD")
+
+        buf = comm.RecvBuffer(8)
+        for byte in msg[:-1]:
+            buf.writable()[0] = byte
+            buf.commit(1)
+            self.assertEqual(list(buf.frames()), [])
+
+        buf.writable()[0] = msg[-1]
+        buf.commit(1)
+        self.assertEqual(list(buf.frames()), [b"ABCD"])
+
+    def test_recv_buffer_ignored(self):
+        texts = ("1\x006\x001\x00", "12\x001\x00", "2\x006\x001\x00", "1")
+        data = b"".join(comm.make_msg(text) for text in texts)
+
+        buf = comm.RecvBuffer(64, ignoredMsgIds={1, 2})
+        buf.writable()[: len(data)] = data
+        buf.commit(len(data))
+
+        self.assertEqual(list(buf.frames()), [b"12\x001\x00"])
+        self.assertEqual(len(buf), 0, "the ignored msgs should be consumed too")
 
 
 if "__main__" == __name__:
@@ -0,0 +1,52 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import pickle
+import unittest
+
+from ibapi import common
+from ibapi.const import UNSET_DECIMAL
+
+
+class SlotsTestCase(unittest.TestCase):
+    def test_slots(self):
+        tick = common.HistoricalTickLast()
+        self.assertFalse(hasattr(tick, "__dict__"))
+        self.assertEqual((tick.price, tick.size, tick.exchange), (0.0, UNSET_DECIMAL, ""))
+        self.assertFalse(tick.tickAttribLast.unreported)
+        with self.assertRaises(AttributeError):
+            tick.typo = 1
+
+        bar = common.RealTimeBar(time=1, close=2.5)
+        copy = pickle.loads(pickle.dumps(bar))
+        self.assertEqual((copy.time, copy.close, copy.count), (1, 2.5, 0))
+        self.assertEqual(str(copy), str(bar))
+
+    def test_frozen(self):
+        attrib = common.TICK_ATTRIBS[6]
+        self.assertIsInstance(attrib, common.TickAttrib)
+        self.assertEqual(
+            (attrib.canAutoExecute, attrib.pastLimit, attrib.preOpen),
+            (False, True, True),
+        )
+        with self.assertRaises(AttributeError):
+            attrib.pastLimit = False
+
+        copy = pickle.loads(pickle.dumps(common.HISTORICAL_TICK_ATTRIBS_BID_ASK[1]))
+        self.assertEqual((copy.askPastHigh, copy.bidPastLow), (True, False))
+        with self.assertRaises(AttributeError):
+            copy.bidPastLow = True
+
+    def test_subclass(self):
+        class MyBar(common.BarData):
+            pass
+
+        bar = MyBar()
+        bar.note = "mine"
+        self.assertEqual((bar.note, bar.barCount), ("mine", 0))
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import socket
+import unittest
+
+from ibapi.connection import Connection, ConnectionOptions
+
+
+class ConnectionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = socket.socket()
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(1)
+
+    def tearDown(self):
+        self.server.close()
+
+    def connect(self, options):
+        conn = Connection("127.0.0.1", self.server.getsockname()[1], options)
+        conn.connect()
+        peer, _ = self.server.accept()
+        self.addCleanup(peer.close)
+        self.addCleanup(conn.disconnect)
+        return conn, peer
+
+    def test_options(self):
+        options = ConnectionOptions(recvBufSize=1024, soRcvBuf=65536, tcpNoDelay=True)
+        conn, _ = self.connect(options)
+
+        self.assertTrue(
+            conn.socket.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        )
+        self.assertGreaterEqual(
+            conn.socket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF), 65536
+        )
+        self.assertIsNone(conn.recvBuf)
+
+    def test_recv_msg(self):
+        conn, peer = self.connect(ConnectionOptions(recvBufSize=1024))
+
+        peer.sendall(b"A" * 1500)
+
+        chunks = []
+        while sum(len(chunk) for chunk in chunks) < 1500:
+            chunks.append(conn.recvMsg())
+
+        self.assertEqual(b"".join(chunks), b"A" * 1500)
+        self.assertTrue(all(len(chunk) <= 1024 for chunk in chunks))
+        self.assertEqual(len(conn.recvBuf), 1024)
+
+        peer.close()
+        self.assertEqual(conn.recvMsg(), b"")
+        self.assertFalse(conn.isConnected())
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import multiprocessing
+import socket
+import unittest
+from decimal import Decimal
+
+from ibapi import comm
+from ibapi.client import EClient
+from ibapi.common import TickAttrib
+from ibapi.connection import Connection
+from ibapi.contract import ComboLeg, Contract
+from ibapi.decode_process import DecodeProcess, EventRing, decode_event, encode_event
+from ibapi.message import IN
+from ibapi.order import Order
+from ibapi.order_condition import PriceCondition
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+
+class EventsWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.events = []
+
+    def tickGeneric(self, reqId, tickType, value):
+        self.events.append(("tickGeneric", reqId, tickType, value))
+
+    def currentTime(self, time):
+        self.events.append(("currentTime", time))
+
+    def connectionClosed(self):
+        self.events.append(("connectionClosed",))
+
+
+class DecodeProcessTestCase(unittest.TestCase):
+    def test_codec(self):
+        attrib = TickAttrib()
+        attrib.canAutoExecute = True
+        contract = Contract()
+        contract.symbol = "IBM"
+        contract.comboLegs = [ComboLeg()]
+        order = Order()
+        order.totalQuantity = Decimal("100")
+        order.conditions = [PriceCondition(price=100.5)]
+        order.unknownAttr = "set by hand"
+
+        (name, args) = decode_event(encode_event("tickPrice", (1, 2, 100.25, attrib)))
+        self.assertEqual(name, "tickPrice")
+        self.assertEqual(args[:3], [1, 2, 100.25])
+        self.assertEqual(type(args[3]), TickAttrib)
+        self.assertEqual(
+            (args[3].canAutoExecute, args[3].pastLimit, args[3].preOpen),
+            (True, False, False),
+        )
+
+        values = (None, True, 2**70, "é", Decimal("1.5"), {"a": (1, 2)}, {3})
+        event = encode_event("openOrder", (contract, order, values))
+        (name, args) = decode_event(event)
+        self.assertEqual(str(args[0]), str(contract))
+        self.assertEqual(args[0].comboLegs[0].__class__, ComboLeg)
+        self.assertEqual(args[1].totalQuantity, Decimal("100"))
+        self.assertEqual(args[1].conditions[0].price, 100.5)
+        self.assertEqual(args[1].unknownAttr, "set by hand")
+        self.assertEqual(args[2], values)
+
+    def test_ring(self):
+        ring = EventRing(128)
+        self.addCleanup(ring.close)
+        peer = EventRing(name=ring.name, lock=ring.lock)
+        self.addCleanup(peer.close)
+
+        records = [bytes([n]) * (n * 5) for n in range(1, 12)]
+        received = []
+        for record in records:
+            self.assertTrue(ring.put(record))
+            received.extend(peer.getAll())
+        self.assertEqual(received, records)
+        self.assertFalse(ring.put(b"x" * 61))
+
+    def test_ring_full(self):
+        ring = EventRing(128)
+        self.addCleanup(ring.close)
+        peer = EventRing(name=ring.name, lock=ring.lock)
+        self.addCleanup(peer.close)
+
+        self.assertTrue(ring.put(b"a" * 56))
+        self.assertTrue(ring.put(b"b" * 56))
+        self.assertFalse(ring.put(b"c" * 56, stopped=lambda: True))
+        self.assertEqual(peer.getAll(), [b"a" * 56, b"b" * 56])
+        self.assertTrue(ring.put(b"c" * 56))
+        self.assertEqual(peer.getAll(), [b"c" * 56])
+
+    def test_ring_doorbell(self):
+        doorbell = multiprocessing.Semaphore(0)
+        ring = EventRing(128, doorbell=doorbell)
+        self.addCleanup(ring.close)
+        peer = EventRing(name=ring.name, lock=ring.lock)
+        self.addCleanup(peer.close)
+
+        for record in (b"a", b"b", b"c"):
+            ring.put(record)
+        # rung once, when the ring was empty
+        self.assertTrue(doorbell.acquire(False))
+        self.assertFalse(doorbell.acquire(False))
+
+        self.assertEqual(peer.getAll(), [b"a", b"b", b"c"])
+        self.assertFalse(peer.pending)
+        ring.put(b"d")
+        self.assertTrue(doorbell.acquire(False))
+
+        class PutWhileReading:
+            """puts e between the reads of the positions by getAll()"""
+
+            def __init__(self):
+                self.entered = 0
+
+            def __enter__(self):
+                self.entered += 1
+                if self.entered == 2:
+                    ring.put(b"e")
+                ring.lock.acquire()
+
+            def __exit__(self, *exc):
+                ring.lock.release()
+
+        peer.lock = PutWhileReading()
+        self.assertEqual(peer.getAll(), [b"d"])
+        self.assertTrue(peer.pending)  # not rung again, read anyway
+        self.assertFalse(doorbell.acquire(False))
+        self.assertEqual(peer.getAll(), [b"e"])
+        self.assertFalse(peer.pending)
+
+    def test_decode_process(self):
+        wrapper = EventsWrapper()
+        client = EClient(wrapper)
+        (sock, peer) = socket.socketpair()
+        client.conn = Connection("127.0.0.1", 0)
+        client.conn.socket = sock
+        client.setConnState(EClient.CONNECTED)
+        client.setDecodeProcess(DecodeProcess(ringSize=1024))
+        client.decodeProcess.start(client.conn, MAX_CLIENT_VER)
+
+        fields = [(IN.TICK_GENERIC, 6, 1, 49, n / 10) for n in range(100)]
+        fields.append((IN.CURRENT_TIME, 1, 1700000000))
+        peer.sendall(
+            b"".join(
+                comm.make_msg("".join(comm.make_field(f) for f in flds))
+                for flds in fields
+            )
+        )
+        peer.close()
+        client.run()
+
+        self.assertEqual(
+            wrapper.events,
+            [("tickGeneric", 1, 49, n / 10) for n in range(100)]
+            + [("currentTime", 1700000000), ("connectionClosed",)],
+        )
+        self.assertIsNone(client.decodeProcess.process)
+
+    def test_array_callbacks(self):
+        class ArrayWrapper(EWrapper):
+            def historicalDataArray(self, reqId, bars):
+                pass
+
+        client = EClient(ArrayWrapper())
+        with self.assertRaises(ValueError):
+            client.setDecodeProcess(DecodeProcess())
+        self.assertIsNone(client.decodeProcess)
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,411 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import inspect
+import unittest
+from decimal import Decimal
+
+from ibapi.const import (
+    NO_VALID_ID,
+    UNSET_DECIMAL,
+    UNSET_DECIMAL_INT,
+    UNSET_DOUBLE,
+    UNSET_INTEGER,
+)
+from ibapi.common import TICK_ATTRIBS, TICK_ATTRIBS_BID_ASK
+from ibapi.contract import Contract
+from ibapi.decoder import Decoder, HandleInfo
+from ibapi.errors import BAD_MESSAGE
+from ibapi.message import IN, LAZY_IN
+from ibapi.order import Order
+from ibapi.order_state import OrderState
+from ibapi.orderdecoder import (
+    COMPLETED_ORDER_STEPS,
+    OPEN_ORDER_STEPS,
+    OrderDecoder,
+    makeDecodePlan,
+)
+from ibapi.server_versions import (
+    MAX_CLIENT_VER,
+    MIN_SERVER_VER_ENCODE_MSG_ASCII7,
+    MIN_SERVER_VER_ORDER_CONTAINER,
+    MIN_SERVER_VER_PAST_LIMIT,
+    MIN_SERVER_VER_PEGGED_TO_BENCHMARK,
+    MIN_SERVER_VER_SSHORTX_OLD,
+)
+from ibapi.utils import (
+    BadMessage,
+    FieldCursor,
+    FloatFieldCursor,
+    NumericMode,
+    decimalMaxString,
+)
+from ibapi.wrapper import EventRecorder, EWrapper, overriddenCallbacks
+
+
+def fields(*values):
+    return [str(value).encode() for value in values]
+
+
+class RecordingWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.calls = []
+
+    def tickGeneric(self, reqId: int, tickType: int, value: float):
+        self.calls.append(("tickGeneric", reqId, tickType, value))
+
+    def tickString(self, reqId: int, tickType: int, value: str):
+        self.calls.append(("tickString", reqId, tickType, value))
+
+    def tickPrice(self, reqId, tickType, price, attrib):
+        self.calls.append(("tickPrice", reqId, tickType, price, attrib.pastLimit))
+
+    def tickSize(self, reqId, tickType, size):
+        self.calls.append(("tickSize", reqId, tickType, size))
+
+    def error(self, reqId, errorCode, errorString, advancedOrderRejectJson=""):
+        self.calls.append(("error", reqId, errorCode, errorString))
+
+    def sizeOf(self, reqId: int, size: Decimal):
+        self.calls.append(("sizeOf", reqId, size))
+
+    def realtimeBar(self, reqId, time, open_, high, low, close, volume, wap, count):
+        self.calls.append(
+            ("realtimeBar", reqId, time, open_, high, low, close, volume, wap, count)
+        )
+
+
+def objectState(value):
+    if isinstance(value, (list, tuple)):
+        return [objectState(item) for item in value]
+    if hasattr(value, "__dict__"):
+        return (type(value), {k: objectState(v) for (k, v) in vars(value).items()})
+    return value
+
+
+class OrderWrapper(EWrapper):
+    def openOrder(self, orderId, contract, order, orderState):
+        self.decoded = (contract, order, orderState)
+
+    def completedOrder(self, contract, order, orderState):
+        self.decoded = (contract, order, orderState)
+
+
+class LazyWrapper(RecordingWrapper):
+    def __init__(self, paused):
+        RecordingWrapper.__init__(self)
+        self.paused = paused
+        self.msgs = []
+
+    def onLazyMsg(self, msg):
+        self.msgs.append(msg)
+        if msg.reqId not in self.paused:
+            msg.dispatch(self)
+
+
+class DecoderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.wrapper = RecordingWrapper()
+        self.decoder = Decoder(self.wrapper, MAX_CLIENT_VER)
+
+    def test_compiled_handlers(self):
+        self.decoder.interpret(fields(IN.TICK_GENERIC, 6, 1, 49, 0.5))
+        self.decoder.interpret(fields(IN.TICK_STRING, 6, 1, 45, "a\\\\b"))
+        self.decoder.interpret(fields(IN.TICK_GENERIC, 6, 1))  # bad length
+
+        self.assertEqual(
+            self.wrapper.calls,
+            [("tickGeneric", 1, 49, 0.5), ("tickString", 1, 45, "a\\b")],
+        )
+        self.assertEqual(set(self.decoder.handlers), {IN.TICK_GENERIC, IN.TICK_STRING})
+
+    def test_process_msgs(self):
+        self.decoder.interpret(fields(IN.TICK_PRICE, 6, 1, 1, 100.5, 300, 2))
+        self.decoder.interpret(fields(IN.ERR_MSG, 2, 1, 200, "No security", ""))
+        with self.assertRaises(BadMessage):
+            self.decoder.interpret(fields(IN.TICK_SIZE, 6, 1))
+
+        self.assertEqual(
+            self.wrapper.calls,
+            [
+                ("tickPrice", 1, 1, 100.5, True),
+                ("tickSize", 1, 0, Decimal(300)),
+                ("error", 1, 200, "No security"),
+                ("error", NO_VALID_ID, BAD_MESSAGE.code(), BAD_MESSAGE.msg() + "2,6,1"),
+            ],
+        )
+
+    def test_realtime_bar(self):
+        self.decoder.interpret(
+            fields(IN.REAL_TIME_BARS, 3, 4, 1700000000, 10.5, 11, 10, 10.75)
+            + fields(1200, 10.6, 7)
+        )
+
+        self.assertEqual(
+            self.wrapper.calls,
+            [
+                ("realtimeBar", 4, 1700000000, 10.5, 11.0, 10.0, 10.75)
+                + (Decimal(1200), Decimal("10.6"), 7)
+            ],
+        )
+
+    def test_tick_attribs(self):
+        attribs = []
+
+        class AttribWrapper(RecordingWrapper):
+            def tickPrice(self, *args):
+                attribs.append(args[-1])
+                RecordingWrapper.tickPrice(self, *args)
+
+            def tickByTickBidAsk(self, *args):
+                attribs.append(args[-1])
+
+        self.wrapper = AttribWrapper()
+        self.decoder = Decoder(self.wrapper, MAX_CLIENT_VER)
+
+        for mask in (5, 13, 5):
+            self.decoder.interpret(fields(IN.TICK_PRICE, 6, 1, 4, 100.5, 300, mask))
+        self.decoder.interpret(
+            fields(IN.TICK_BY_TICK, 1, 3, 1700000000, 10, 10.5, 1, 2, 1)
+        )
+        self.decoder.serverVersion = MIN_SERVER_VER_PAST_LIMIT
+        self.decoder.interpret(fields(IN.TICK_PRICE, 6, 1, 68, 100.5, 300, 5))
+        self.decoder.serverVersion = MIN_SERVER_VER_PAST_LIMIT - 1
+        self.decoder.interpret(fields(IN.TICK_PRICE, 6, 1, 4, 100.5, 300, 2))
+
+        expected = [TICK_ATTRIBS[5]] * 3 + [TICK_ATTRIBS_BID_ASK[1]]
+        expected += [TICK_ATTRIBS[1], TICK_ATTRIBS[0]]
+        self.assertEqual([id(attrib) for attrib in attribs], list(map(id, expected)))
+        self.assertTrue(attribs[0].preOpen and not attribs[0].pastLimit)
+        self.assertTrue(attribs[3].bidPastLow and not attribs[3].askPastHigh)
+        with self.assertRaises(AttributeError):
+            attribs[0].preOpen = False
+        # the LAST and DELAYED_LAST sizes
+        self.assertEqual(
+            [call[2] for call in self.wrapper.calls if call[0] == "tickSize"],
+            [5, 5, 5, 71, 5],
+        )
+
+    def test_numeric_modes(self):
+        msgs = [fields(IN.TICK_SIZE, 6, 1, 0, size) for size in ("300", "0.5", "")]
+        for numericMode, sizes, text in (
+            (NumericMode.DECIMAL, [Decimal(300), Decimal("0.5"), UNSET_DECIMAL], "300"),
+            (NumericMode.FLOAT, [300.0, 0.5, UNSET_DOUBLE], "300.0"),
+            (NumericMode.INT_WHEN_INTEGRAL, [300, 0.5, UNSET_DECIMAL_INT], "300"),
+        ):
+            wrapper = RecordingWrapper()
+            decoder = Decoder(wrapper, MAX_CLIENT_VER, numericMode)
+            for msg in msgs:
+                decoder.interpret(msg)
+
+            decoded = [call[3] for call in wrapper.calls]
+            self.assertEqual(decoded, sizes)
+            self.assertEqual(
+                [type(size) for size in decoded], [type(size) for size in sizes]
+            )
+            self.assertEqual(decimalMaxString(decoded[0]), text)
+            self.assertEqual(decimalMaxString(decoded[2]), "")
+
+    def test_recompiled(self):
+        self.decoder.serverVersion = MIN_SERVER_VER_ENCODE_MSG_ASCII7 - 1
+        self.decoder.interpret(fields(IN.TICK_STRING, 6, 1, 45, "a\\\\b"))
+        self.decoder.serverVersion = MIN_SERVER_VER_ENCODE_MSG_ASCII7
+        self.decoder.interpret(fields(IN.TICK_STRING, 6, 1, 45, "a\\\\b"))
+        other = RecordingWrapper()
+        self.decoder.wrapper = other
+        self.decoder.interpret(fields(IN.TICK_GENERIC, 6, 2, 49, 0.5))
+
+        self.assertEqual(
+            self.wrapper.calls,
+            [("tickString", 1, 45, "a\\\\b"), ("tickString", 1, 45, "a\\b")],
+        )
+        self.assertEqual(other.calls, [("tickGeneric", 2, 49, 0.5)])
+
+    def test_decimal(self):
+        handleInfo = HandleInfo(wrap=RecordingWrapper.sizeOf)
+        handleInfo.wrapperParams = inspect.signature(RecordingWrapper.sizeOf).parameters
+
+        self.decoder.interpretWithSignature(fields(0, 1, 7, "1.5"), handleInfo)
+        self.decoder.compileHandler(handleInfo)(fields(0, 1, 7, ""))
+
+        self.assertEqual(
+            self.wrapper.calls,
+            [("sizeOf", 7, Decimal("1.5")), ("sizeOf", 7, UNSET_DECIMAL)],
+        )
+
+    def test_lazy_msgs(self):
+        wrapper = LazyWrapper(paused={2})
+        decoder = Decoder(wrapper, MAX_CLIENT_VER, lazyMsgIds=LAZY_IN)
+        decoder.interpret(fields(IN.TICK_PRICE, 6, 1, 1, 100.5, 300, 2))
+        decoder.interpret(fields(IN.TICK_PRICE, 6, 2, 1, 99.5, 100, 0))
+        decoder.interpret(fields(IN.TICK_BY_TICK, 3, 4, 1700000000, 100.25))
+        decoder.interpret(fields(IN.MARKET_DEPTH_L2, 1, 4, 0, "MM", 0, 1, 100.5, 5, 1))
+        decoder.interpret(fields(IN.TICK_GENERIC, 6, 2, 49, 0.5))  # not lazy
+
+        self.assertEqual(
+            wrapper.calls,
+            [
+                ("tickPrice", 1, 1, 100.5, True),
+                ("tickSize", 1, 0, Decimal(300)),
+                ("tickGeneric", 2, 49, 0.5),
+            ],
+        )
+        (tickPrice, paused, tickByTick, depth) = wrapper.msgs
+        self.assertEqual((paused.msgId, paused.version, paused.reqId), (IN.TICK_PRICE, 6, 2))
+        self.assertIsNone(paused.events)  # never decoded
+        self.assertEqual((paused.tickType, paused.price, paused.size), (1, 99.5, Decimal(100)))
+        self.assertEqual([event.name for event in paused.decode()], ["tickPrice", "tickSize"])
+        with self.assertRaises(AttributeError):
+            paused.bidPrice
+        self.assertEqual((tickByTick.version, tickByTick.time), (None, 1700000000))
+        self.assertEqual(tickByTick.midPoint, 100.25)
+        self.assertEqual((depth.marketMaker, depth.side, depth.isSmartDepth), ("MM", 1, True))
+
+        other = RecordingWrapper()
+        paused.dispatch(other)
+        self.assertEqual(
+            other.calls, [("tickPrice", 2, 1, 99.5, False), ("tickSize", 2, 0, Decimal(100))]
+        )
+
+        with self.assertRaises(BadMessage):
+            decoder.interpret(fields(IN.TICK_SIZE, 6))
+        with self.assertRaises(ValueError):
+            Decoder(wrapper, MAX_CLIENT_VER, lazyMsgIds={IN.ERR_MSG})
+
+    def test_ignored_msgs(self):
+        self.assertEqual(
+            overriddenCallbacks(self.wrapper),
+            {
+                "tickGeneric",
+                "tickString",
+                "tickPrice",
+                "tickSize",
+                "error",
+                "realtimeBar",
+            },
+        )
+        # opt-in only
+        self.assertEqual(self.decoder.ignoredMsgIds, frozenset())
+        decoder = Decoder(self.wrapper, MAX_CLIENT_VER, denyMsgIds={IN.TICK_EFP})
+        self.assertEqual(decoder.ignoredMsgIds, {IN.TICK_EFP})
+
+        decoder = Decoder(self.wrapper, MAX_CLIENT_VER, maskUnhandled=True)
+        ignored = decoder.ignoredMsgIds
+        for msgId in (IN.TICK_GENERIC, IN.TICK_PRICE, IN.TICK_SIZE, IN.ERR_MSG):
+            self.assertNotIn(msgId, ignored)
+        for msgId in (IN.OPEN_ORDER, IN.HISTORICAL_DATA, IN.TICK_BY_TICK):
+            self.assertIn(msgId, ignored)
+
+        decoder.interpret(fields(IN.MARKET_DEPTH, 1, 1, 0, 0, 1, 100.5))  # short
+        self.assertEqual(self.wrapper.calls, [])
+
+        decoder = Decoder(
+            EWrapper(),
+            MAX_CLIENT_VER,
+            allowMsgIds={IN.OPEN_ORDER},
+            denyMsgIds={IN.ERR_MSG},
+            maskUnhandled=True,
+        )
+        self.assertNotIn(IN.OPEN_ORDER, decoder.ignoredMsgIds)
+        self.assertIn(IN.ERR_MSG, decoder.ignoredMsgIds)
+        self.assertIn(IN.TICK_PRICE, decoder.ignoredMsgIds)
+
+        # everything may be used
+        decoder = Decoder(
+            EventRecorder(), MAX_CLIENT_VER, denyMsgIds={IN.ERR_MSG}, maskUnhandled=True
+        )
+        self.assertEqual(decoder.ignoredMsgIds, {IN.ERR_MSG})
+        wrapper = LazyWrapper(paused=())
+        decoder = Decoder(
+            wrapper, MAX_CLIENT_VER, lazyMsgIds={IN.TICK_BY_TICK}, maskUnhandled=True
+        )
+        self.assertNotIn(IN.TICK_BY_TICK, decoder.ignoredMsgIds)
+
+    def test_declared_callbacks(self):
+        for msgId, handleInfo in Decoder.msgId2handleInfo.items():
+            self.assertTrue(handleInfo.callbacks, msgId)
+            for name in handleInfo.callbacks:
+                self.assertTrue(callable(getattr(EWrapper, name, None)), name)
+        self.assertEqual(
+            Decoder.msgId2handleInfo[IN.TICK_PRICE].callbacks, {"tickPrice", "tickSize"}
+        )
+        self.assertIsNone(HandleInfo(proc=Decoder.processTickPriceMsg).callbacks)
+
+    def test_order_plans(self):
+        def raised(fn, *args):
+            try:
+                fn(*args)
+            except Exception as ex:
+                return type(ex)
+            return None
+
+        nDecoded = 0
+        for serverVersion in (
+            MIN_SERVER_VER_SSHORTX_OLD,
+            MIN_SERVER_VER_PEGGED_TO_BENCHMARK,
+            MIN_SERVER_VER_ORDER_CONTAINER - 1,
+            MAX_CLIENT_VER,
+        ):
+            # uniform fields, then mixed ones: each field of a plan is
+            # decoded from different values across the runs
+            mixed = [
+                [(b"1", b"0", b"")[(n * 7 + seed) % 3] for n in range(400)]
+                for seed in range(3)
+            ]
+            for values, cursorClass in [
+                ([b"1"] * 400, FieldCursor),
+                ([b"0"] * 400, FieldCursor),
+                ([b""] * 400, FieldCursor),
+                ([b"1"] * 400, FloatFieldCursor),
+            ] + [(values, FieldCursor) for values in mixed]:
+                for msgId, steps, process in (
+                    (IN.OPEN_ORDER, OPEN_ORDER_STEPS, Decoder.processOpenOrder),
+                    (IN.COMPLETED_ORDER, COMPLETED_ORDER_STEPS, Decoder.processCompletedOrderMsg),
+                ):
+                    msg = [str(msgId).encode()] + values
+                    wrapper = OrderWrapper()
+                    decoder = Decoder(wrapper, serverVersion)
+                    planned = cursorClass(msg)
+                    plannedError = raised(process, decoder, planned)
+
+                    # the way the process methods used to decode
+                    stepped = cursorClass(msg, 1)
+                    version = serverVersion
+                    if msgId == IN.COMPLETED_ORDER:
+                        version = UNSET_INTEGER
+                    elif serverVersion < MIN_SERVER_VER_ORDER_CONTAINER:
+                        version = stepped.read_int()
+                    decoded = (Contract(), Order(), OrderState())
+                    OrderDecoder.__init__(decoder, *decoded, version, serverVersion)
+                    steppedError = raised(
+                        lambda: [meth(decoder, stepped, *args) for meth, *args in steps]
+                    )
+
+                    # the mixed fields may not make a valid order
+                    self.assertEqual(plannedError, steppedError)
+                    self.assertEqual(planned.pos, stepped.pos)
+                    if plannedError is None:
+                        nDecoded += 1
+                        self.assertEqual(
+                            objectState(wrapper.decoded), objectState(decoded)
+                        )
+
+        self.assertGreater(nDecoded, 40)
+        self.assertIn((IN.OPEN_ORDER, MAX_CLIENT_VER, MAX_CLIENT_VER, FieldCursor), Decoder.orderPlans)
+
+        # a step branching on what it reads can't be planned
+        def decodeBranching(self, fields):
+            if fields.read_bool():
+                self.order.hidden = True
+
+        with self.assertRaises(ValueError):
+            makeDecodePlan([(decodeBranching,)], 0, MAX_CLIENT_VER, FieldCursor)
+        with self.assertRaises(BadMessage):
+            Decoder.processOpenOrder(self.decoder, FieldCursor(fields(IN.OPEN_ORDER, 1, 2)))
+
+
+if "__main__" == __name__:
+    unittest.main()
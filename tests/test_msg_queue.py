@@ -0,0 +1,227 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import queue
+import threading
+import time
+import unittest
+
+from ibapi.message import IN
+from ibapi.msg_queue import (
+    BoundedMsgQueue,
+    ConflatingMsgQueue,
+    OverflowPolicy,
+    PriorityMsgQueue,
+    UnboundedMsgQueue,
+    get_batch,
+)
+
+
+def msg(msgId, *fields):
+    return "".join(f"{field}\0" for field in (msgId,) + fields).encode()
+
+
+class MsgQueueTestCase(unittest.TestCase):
+    def test_block(self):
+        q = BoundedMsgQueue(maxMsgs=2, policy=OverflowPolicy.BLOCK)
+        q.put(msg(IN.TICK_PRICE, "1"))
+        q.put(msg(IN.TICK_PRICE, "2"))
+        with self.assertRaises(queue.Full):
+            q.put(msg(IN.TICK_PRICE, "3"), timeout=0.01)
+
+        producer = threading.Thread(target=q.put, args=(msg(IN.TICK_PRICE, "4"),))
+        producer.start()
+        self.assertEqual(q.get(), msg(IN.TICK_PRICE, "1"))
+        producer.join(5)
+
+        self.assertEqual(
+            [q.get_nowait() for _ in range(2)],
+            [msg(IN.TICK_PRICE, "2"), msg(IN.TICK_PRICE, "4")],
+        )
+        self.assertEqual(q.stats.nBlocked, 2)
+        with self.assertRaises(queue.Empty):
+            q.get(timeout=0.01)
+
+    def test_drop_oldest_mkt_data(self):
+        q = BoundedMsgQueue(maxMsgs=3, policy=OverflowPolicy.DROP_OLDEST_MKT_DATA)
+        q.put(msg(IN.ORDER_STATUS, "a"))
+        q.put(msg(IN.TICK_PRICE, "1"))
+        q.put(msg(IN.TICK_SIZE, "2"))
+        q.put(msg(IN.EXECUTION_DATA, "b"))
+        q.put(msg(IN.TICK_PRICE, "3"))
+
+        self.assertEqual(
+            [q.get_nowait() for _ in range(q.qsize())],
+            [msg(IN.ORDER_STATUS, "a"), msg(IN.EXECUTION_DATA, "b"), msg(IN.TICK_PRICE, "3")],
+        )
+        self.assertEqual(q.stats.nDropped, 2)
+
+    def test_drop_keeps_events(self):
+        q = BoundedMsgQueue(maxMsgs=3, policy=OverflowPolicy.DROP_OLDEST_MKT_DATA)
+        tick = msg(IN.TICK_PRICE, "1")
+        q.put(msg(IN.TICK_BY_TICK, "a"))
+        q.put(tick)
+        q.put(msg(IN.TICK_STRING, "b"))
+        q.put(tick)  # the same msg queued twice, the oldest goes
+        q.put(msg(IN.REAL_TIME_BARS, "c"))
+        with self.assertRaises(queue.Full):
+            q.put(msg(IN.MARKET_DEPTH, "d"), block=False)
+
+        self.assertEqual(q.qsize(), 3)
+        self.assertEqual(
+            [q.get_nowait() for _ in range(q.qsize())],
+            [msg(IN.TICK_BY_TICK, "a"), msg(IN.TICK_STRING, "b"), msg(IN.REAL_TIME_BARS, "c")],
+        )
+        self.assertEqual(q.stats.nDropped, 2)
+        self.assertTrue(q.empty())
+
+    def test_drop_bounded(self):
+        q = BoundedMsgQueue(maxMsgs=10, policy=OverflowPolicy.DROP_OLDEST_MKT_DATA)
+        q.put(msg(IN.ORDER_STATUS, "a"))
+        for n in range(100000):
+            q.put(msg(IN.TICK_PRICE, n))
+
+        # the dropped msgs are gone, not just uncounted
+        self.assertEqual(q.qsize(), 10)
+        self.assertEqual(len(q.msgs) + len(q.mktData), 10)
+        self.assertEqual(q.stats.nDropped, 100000 - 9)
+        self.assertEqual(
+            get_batch(q),
+            [msg(IN.ORDER_STATUS, "a")]
+            + [msg(IN.TICK_PRICE, n) for n in range(100000 - 9, 100000)],
+        )
+
+    def test_put_timeout(self):
+        q = BoundedMsgQueue(maxMsgs=1, policy=OverflowPolicy.BLOCK)
+        q.put(msg(IN.TICK_PRICE, "1"))
+
+        def wakeups():
+            # wake the producer up without making room
+            for _ in range(10):
+                time.sleep(0.02)
+                with q.mutex:
+                    q.notFull.notify_all()
+
+        waker = threading.Thread(target=wakeups)
+        waker.start()
+        start = time.monotonic()
+        with self.assertRaises(queue.Full):
+            q.put(msg(IN.TICK_PRICE, "2"), timeout=0.05)
+        self.assertLess(time.monotonic() - start, 0.15)
+        waker.join(5)
+
+    def test_spill(self):
+        q = BoundedMsgQueue(maxMsgs=0, maxBytes=20, policy=OverflowPolicy.SPILL_TO_FILE)
+        msgs = [msg(IN.TICK_PRICE, str(n) * n) for n in range(10)]
+        for m in msgs:
+            q.put(m)
+
+        self.assertEqual(q.qsize(), len(msgs))
+        self.assertGreater(q.stats.nSpilled, 0)
+        self.assertEqual([q.get_nowait() for _ in msgs], msgs)
+        self.assertEqual(q.stats.nSpilled, q.stats.nReplayed)
+        self.assertTrue(q.empty())
+
+    def test_spill_recovery(self):
+        q = BoundedMsgQueue(maxMsgs=2, policy=OverflowPolicy.SPILL_TO_FILE)
+        msgs = [msg(IN.TICK_PRICE, n) for n in range(6)]
+        for m in msgs[:3]:
+            q.put(m)
+        self.assertEqual(q.stats.nSpilled, 1)
+
+        # once one is spilled the following ones are too, in order
+        self.assertEqual(q.get_nowait(), msgs[0])
+        q.put(msgs[3])
+        self.assertEqual(q.stats.nSpilled, 2)
+        self.assertEqual([q.get_nowait() for _ in range(3)], msgs[1:4])
+        self.assertEqual(q.nSpillPending, 0)
+        self.assertEqual(q.spillWritePos, 0)
+
+        # caught up: back to memory
+        q.put(msgs[4])
+        q.put(msgs[5])
+        self.assertEqual(q.stats.nSpilled, 2)
+        self.assertEqual(get_batch(q), msgs[4:])
+        self.assertTrue(q.empty())
+
+    def test_conflate(self):
+        q = ConflatingMsgQueue()
+        q.put(msg(IN.TICK_PRICE, 6, 1, 1, 100.0, 100, 0))
+        q.put(msg(IN.TICK_SIZE, 6, 1, 0, 200))
+        q.put(msg(IN.ORDER_STATUS, 1))
+        q.put(msg(IN.TICK_PRICE, 6, 1, 1, 100.5, 300, 0))
+        q.put(msg(IN.TICK_PRICE, 6, 2, 1, 99.0, 100, 0))
+        q.put(msg(IN.ORDER_STATUS, 1))
+
+        self.assertEqual(q.qsize(), 5)
+        self.assertEqual(q.stats.nConflated, 1)
+        self.assertEqual(
+            [q.get_nowait() for _ in range(5)],
+            [
+                msg(IN.TICK_SIZE, 6, 1, 0, 200),
+                msg(IN.ORDER_STATUS, 1),
+                msg(IN.TICK_PRICE, 6, 1, 1, 100.5, 300, 0),
+                msg(IN.TICK_PRICE, 6, 2, 1, 99.0, 100, 0),
+                msg(IN.ORDER_STATUS, 1),
+            ],
+        )
+        self.assertTrue(q.empty())
+
+    def test_priority_lanes(self):
+        q = PriorityMsgQueue()
+        q.put(msg(IN.TICK_PRICE, 6, 1, 1, 100.0, 100, 0))
+        q.put(msg(IN.TICK_SIZE, 6, 1, 0, 200))
+        q.put(msg(IN.ORDER_STATUS, 7, "Submitted"))
+        q.put(msg(IN.TICK_PRICE, 6, 1, 1, 100.5, 300, 0))
+        q.put(msg(IN.ORDER_STATUS, 7, "Filled"))
+        q.put(msg(IN.EXECUTION_DATA, 7))
+
+        self.assertEqual(
+            [q.get_nowait() for _ in range(q.qsize())],
+            [
+                msg(IN.ORDER_STATUS, 7, "Submitted"),
+                msg(IN.ORDER_STATUS, 7, "Filled"),
+                msg(IN.EXECUTION_DATA, 7),
+                msg(IN.TICK_PRICE, 6, 1, 1, 100.0, 100, 0),
+                msg(IN.TICK_SIZE, 6, 1, 0, 200),
+                msg(IN.TICK_PRICE, 6, 1, 1, 100.5, 300, 0),
+            ],
+        )
+        with self.assertRaises(queue.Empty):
+            q.get(timeout=0.01)
+
+    def test_priority_bad_frames(self):
+        q = PriorityMsgQueue()
+        q.put(b"")
+        q.put(str(IN.ORDER_STATUS).encode())  # no NUL
+        q.put(msg(IN.ORDER_STATUS, 7))
+
+        self.assertEqual(
+            get_batch(q), [msg(IN.ORDER_STATUS, 7), b"", str(IN.ORDER_STATUS).encode()]
+        )
+
+    def test_get_batch(self):
+        ticks = [msg(IN.TICK_PRICE, 6, 1, 1, 100.0), msg(IN.TICK_SIZE, 6, 1, 0, 200)]
+        status = msg(IN.ORDER_STATUS, 7, "Filled")
+        for q in (
+            queue.Queue(),
+            UnboundedMsgQueue(),
+            BoundedMsgQueue(),
+            PriorityMsgQueue(),
+        ):
+            for m in ticks + [status]:
+                q.put(m)
+            if isinstance(q, PriorityMsgQueue):
+                expected = [status] + ticks
+            else:
+                expected = ticks + [status]
+            self.assertEqual(get_batch(q), expected)
+            self.assertTrue(q.empty())
+            with self.assertRaises(queue.Empty):
+                get_batch(q, timeout=0.01)
+
+
+if "__main__" == __name__:
+    unittest.main()
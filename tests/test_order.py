@@ -0,0 +1,39 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import unittest
+
+from ibapi.const import UNSET_DECIMAL, UNSET_DOUBLE
+from ibapi.contract import Contract, ContractDetails, FundAssetType
+from ibapi.order import Order
+
+
+class ClassDefaultsTestCase(unittest.TestCase):
+    def test_order(self):
+        (order, other) = (Order(), Order())
+        self.assertEqual(
+            (order.lmtPrice, order.totalQuantity), (UNSET_DOUBLE, UNSET_DECIMAL)
+        )
+        self.assertTrue(order.transmit)
+        self.assertEqual(set(vars(order)), {"softDollarTier", "conditions"})
+
+        order.lmtPrice = 10.5
+        order.conditions.append("cond")
+        order.softDollarTier.name = "tier"
+        self.assertEqual(order.lmtPrice, 10.5)
+        self.assertEqual(other.lmtPrice, UNSET_DOUBLE)
+        self.assertEqual(Order.lmtPrice, UNSET_DOUBLE)
+        self.assertEqual((other.conditions, other.softDollarTier.name), ([], ""))
+
+    def test_contract(self):
+        details = ContractDetails()
+        details.contract.comboLegs.append("leg")
+        self.assertEqual(ContractDetails().contract.comboLegs, [])
+        self.assertEqual(details.fundAssetType, FundAssetType.NoneItem)
+        self.assertIsNone(Contract().deltaNeutralContract)
+
+
+if "__main__" == __name__:
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import queue
+import socket
+import threading
+import time
+import unittest
+
+from ibapi import comm
+from ibapi.client import EClient
+from ibapi.connection import Connection
+from ibapi.decoder import Decoder
+from ibapi.message import IN
+from ibapi.reader import EReader, EReaderHub, InlineDecoder
+from ibapi.server_versions import MAX_CLIENT_VER
+from ibapi.wrapper import EWrapper
+
+
+def make_conn():
+    (sock, peer) = socket.socketpair()
+    conn = Connection("127.0.0.1", 0)
+    conn.socket = sock
+    return conn, peer
+
+
+class ReaderTestCase(unittest.TestCase):
+    def test_reader(self):
+        conn, peer = make_conn()
+        msg_queue = queue.Queue()
+        reader = EReader(conn, msg_queue)
+        reader.start()
+
+        texts = ["x" * n for n in range(0, 3000, 7)]
+        peer.sendall(b"".join(comm.make_msg(text) for text in texts))
+        peer.close()
+        reader.join(5)
+
+        self.assertFalse(conn.isConnected())
+        self.assertEqual(
+            [msg_queue.get_nowait().decode() for _ in texts], texts
+        )
+
+    def test_reader_hub(self):
+        hub = EReaderHub()
+        hub.start()
+        self.addCleanup(hub.stop)
+
+        conns = [make_conn() for _ in range(3)]
+        queues = [queue.Queue() for _ in conns]
+        for (conn, _), msg_queue in zip(conns, queues):
+            hub.register(conn, msg_queue)
+
+        for idx, (_, peer) in enumerate(conns):
+            peer.sendall(comm.make_msg(f"msg{idx}") + comm.make_msg("end"))
+
+        for idx, msg_queue in enumerate(queues):
+            self.assertEqual(msg_queue.get(timeout=5), f"msg{idx}".encode())
+            self.assertEqual(msg_queue.get(timeout=5), b"end")
+
+        (conn, peer) = conns[0]
+        peer.close()
+        deadline = time.monotonic() + 5
+        while conn.isConnected() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(conn.isConnected())
+
+        (conn, peer) = conns[1]
+        hub.unregister(conn)
+        conn.disconnect()
+        (conn, peer) = conns[2]
+        peer.sendall(comm.make_msg("still there"))
+        self.assertEqual(queues[2].get(timeout=5), b"still there")
+
+    def test_reader_hub_errors(self):
+        hub = EReaderHub()
+        hub.start()
+
+        (broken, brokenPeer) = make_conn()
+        broken.socket.close()  # registering it fails
+        self.addCleanup(brokenPeer.close)
+        failed = hub.register(broken, queue.Queue())
+        with self.assertRaises(ValueError):
+            failed.result(5)
+
+        (conn, peer) = make_conn()
+        self.addCleanup(peer.close)
+        msg_queue = queue.Queue()
+        hub.register(conn, msg_queue).result(5)
+        peer.sendall(comm.make_msg("still served"))
+        self.assertEqual(msg_queue.get(timeout=5), b"still served")
+
+        hub.stop()
+        hub.join(5)
+        self.assertTrue(hub.unregister(conn).cancelled())
+        conn.disconnect()
+
+    def test_inline_decoder(self):
+        ticks = []
+        threads = set()
+
+        class Wrapper(EWrapper):
+            def tickGeneric(self, reqId, tickType, value):
+                threads.add(threading.current_thread())
+                if value < 0:
+                    raise ValueError(value)
+                ticks.append((reqId, tickType, value))
+
+        client = EClient(Wrapper())
+        client.decoder = Decoder(client.wrapper, MAX_CLIENT_VER)
+        conn, peer = make_conn()
+        client.conn = conn
+        client.setConnState(EClient.CONNECTED)
+        reader = EReader(conn, InlineDecoder(client))
+        reader.start()
+
+        for value in (0.5, 0.6, -1, 0.7):
+            text = "".join(
+                comm.make_field(field) for field in (IN.TICK_GENERIC, 6, 1, 49, value)
+            )
+            peer.sendall(comm.make_msg(text))
+        reader.join(5)
+        peer.close()
+
+        # the exception of the third callback ended the connection
+        self.assertEqual(ticks, [(1, 49, 0.5), (1, 49, 0.6)])
+        self.assertEqual(threads, {reader})
+        self.assertFalse(client.isConnected())
+        self.assertTrue(client.msg_queue.empty())
+
+
+if "__main__" == __name__:
+    unittest.main()
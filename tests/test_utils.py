@@ -4,9 +4,11 @@ Copyright (C) 2019 Interactive Brokers LLC. All rights reserved. This code is su
 """
 
 import unittest
+from decimal import Decimal
 
+from ibapi.const import UNSET_DECIMAL, UNSET_DOUBLE, UNSET_INTEGER
 from ibapi.enum_implem import Enum
-from ibapi.utils import setattr_log
+from ibapi.utils import BadMessage, FieldCursor, SHOW_UNSET, decode, setattr_log
 
 
 class UtilsTestCase(unittest.TestCase):
@@ -48,6 +50,46 @@ class UtilsTestCase(unittest.TestCase):
         print(o)
         # import code; code.interact(local=locals())
 
+    def test_field_cursor(self):
+        fields = [b"", b"12", b"", b"1.5", b"Infinity", b"", b"2147483647", b"0.1"]
+        fields += [b"1", b"0", b"", b"caf\xc3\xa9", b"a\\nb"]
+        cursor = FieldCursor(fields)
+
+        self.assertEqual(
+            [cursor.read_int(), cursor.read_int(), cursor.read_int(SHOW_UNSET)],
+            [0, 12, UNSET_INTEGER],
+        )
+        self.assertEqual(
+            [cursor.read_float(), cursor.read_float(), cursor.read_float(SHOW_UNSET)],
+            [1.5, float("inf"), UNSET_DOUBLE],
+        )
+        self.assertEqual(
+            [cursor.read_decimal(), cursor.read_decimal()],
+            [UNSET_DECIMAL, Decimal("0.1")],
+        )
+        self.assertEqual(
+            [cursor.read_bool(), cursor.read_bool(), cursor.read_bool()],
+            [True, False, False],
+        )
+        self.assertEqual(cursor.read_str(), "caf\u00e9")
+        self.assertEqual(cursor.read_str(True), "a\nb")
+        with self.assertRaises(BadMessage):
+            cursor.read_str()
+
+        # same results as decode()
+        for the_type in (int, float, str, bool, Decimal):
+            for field in (b"", b"1", b"7", b"2147483647"):
+                name = f"read_{the_type.__name__.lower()}"
+                read = getattr(FieldCursor([field]), name)
+                self.assertEqual(read(), decode(the_type, iter([field])))
+
+        cursor = FieldCursor([b"1", b"2", b"3"])
+        cursor.skip()
+        self.assertEqual(next(cursor), b"2")
+        self.assertEqual(decode(int, cursor), 3)
+        with self.assertRaises(BadMessage):
+            cursor.skip()
+
 
 if "__main__" == __name__:
     unittest.main()
@@ -0,0 +1,85 @@
+"""
+Copyright (C) 2024 Interactive Brokers LLC. All rights reserved. This code is subject to the terms
+ and conditions of the IB API Non-Commercial License or the IB API Commercial License, as applicable.
+"""
+
+import socket
+import unittest
+
+from ibapi import comm
+from ibapi.connection import Connection, ConnectionOptions
+from ibapi.writer import EWriter
+
+
+class TrickleSocket:
+    """accepts at most a few bytes per call, like a congested socket"""
+
+    def __init__(self):
+        self.data = b""
+
+    def sendmsg(self, bufs):
+        data = b"".join(bufs)[:7]
+        self.data += data
+        return len(data)
+
+
+class WriterTestCase(unittest.TestCase):
+    def test_short_writes(self):
+        writer = EWriter(None)
+        sock = TrickleSocket()
+        msgs = [comm.make_msg(str(n) * n) for n in range(10)]
+
+        writer.sendAll(sock, msgs)
+
+        self.assertEqual(sock.data, b"".join(msgs))
+        self.assertEqual(writer.stats.nSyscalls, (len(sock.data) + 6) // 7)
+
+    def test_writer(self):
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        self.addCleanup(server.close)
+
+        conn = Connection(
+            "127.0.0.1", server.getsockname()[1], ConnectionOptions(useWriter=True)
+        )
+        conn.connect()
+        (peer, _) = server.accept()
+        self.addCleanup(peer.close)
+
+        msgs = [comm.make_msg(f"order {n}") for n in range(300)]
+        for msg in msgs:
+            conn.sendMsg(msg)
+        writer = conn.writer
+        conn.disconnect()
+
+        data = b""
+        while True:
+            chunk = peer.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+
+        self.assertEqual(data, b"".join(msgs))
+        self.assertFalse(writer.is_alive())
+        self.assertEqual(writer.stats.nMsgs, 300)
+        self.assertLessEqual(writer.stats.nBursts, 300)
+
+    def test_send_failure(self):
+        (sock, peer) = socket.socketpair()
+        conn = Connection("127.0.0.1", 0)
+        conn.socket = sock
+        conn.writer = writer = EWriter(conn)
+        writer.start()
+
+        peer.close()
+        sock.shutdown(socket.SHUT_WR)  # the next send fails
+        conn.sendMsg(comm.make_msg("lost"))
+
+        writer.join(5)
+        self.assertFalse(writer.is_alive())
+        self.assertFalse(conn.isConnected())
+
+
+if "__main__" == __name__:
+    unittest.main()